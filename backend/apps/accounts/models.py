@@ -4,6 +4,39 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 
+# Role permissions, in bit order. The position of each name is its bit in
+# Role.permission_bits; append new permissions at the end so stored bitmaps stay valid.
+PERMISSION_FIELDS = (
+    'can_sales',
+    'can_inventory',
+    'can_products',
+    'can_customers',
+    'can_reports',
+    'can_staff',
+    'can_settings',
+    'can_dashboard',
+)
+PERMISSION_BITS = {name: 1 << index for index, name in enumerate(PERMISSION_FIELDS)}
+ALL_PERMISSION_BITS = (1 << len(PERMISSION_FIELDS)) - 1
+
+
+def permission_bits_for(names):
+    """Build a permission bitmap from an iterable of permission names"""
+    bits = 0
+    for name in names:
+        bits |= PERMISSION_BITS.get(name, 0)
+    return bits
+
+
+# Fallback permissions for users without a staff Role (legacy User.role field)
+ROLE_FALLBACK_BITS = {
+    'admin': ALL_PERMISSION_BITS,
+    'manager': permission_bits_for(['can_sales', 'can_inventory', 'can_products', 'can_customers', 'can_reports', 'can_dashboard']),
+    'cashier': permission_bits_for(['can_sales', 'can_customers', 'can_dashboard']),
+    'staff': permission_bits_for(['can_sales', 'can_dashboard']),
+}
+
+
 class User(AbstractUser):
     """Custom User model extending Django's AbstractUser"""
     email = models.EmailField(unique=True)
@@ -59,6 +92,28 @@ class User(AbstractUser):
             return staff_role.name.lower()
         return self.role
     
+    @property
+    def permission_bits(self):
+        """Resolved permission bitmap (see PERMISSION_FIELDS).
+
+        Read from the precomputed Role.permission_bits; authentication loads
+        `staff_profile__role` together with the user, so this costs no queries.
+        Memoized on the instance for the lifetime of the request.
+        """
+        bits = getattr(self, '_permission_bits', None)
+        if bits is None:
+            if self.is_saas_admin or self.is_superuser:
+                bits = ALL_PERMISSION_BITS
+            else:
+                staff_role = self.staff_role
+                if staff_role:
+                    bits = staff_role.permission_bits
+                else:
+                    # Fallback to basic role checking for backward compatibility
+                    bits = ROLE_FALLBACK_BITS.get(self.role, PERMISSION_BITS['can_dashboard'])
+            self._permission_bits = bits
+        return bits
+    
     def has_permission(self, permission):
         """Check if user has a specific permission through their role
         
@@ -68,26 +123,13 @@ class User(AbstractUser):
         Returns:
             bool: True if user has permission
         """
-        # SaaS admins have all permissions
-        if self.is_saas_admin or self.is_superuser:
-            return True
-        
-        # Check through staff role
-        staff_role = self.staff_role
-        if staff_role:
-            return getattr(staff_role, permission, False)
-        
-        # Fallback to basic role checking for backward compatibility
-        if self.role == 'admin':
-            return True
-        elif self.role == 'manager':
-            return permission in ['can_sales', 'can_inventory', 'can_products', 'can_customers', 'can_reports', 'can_dashboard']
-        elif self.role == 'cashier':
-            return permission in ['can_sales', 'can_customers', 'can_dashboard']
-        elif self.role == 'staff':
-            return permission in ['can_sales', 'can_dashboard']
-        
-        return False
+        bit = PERMISSION_BITS.get(permission)
+        if bit is None:
+            # Unknown permission: only unrestricted users pass
+            if self.is_saas_admin or self.is_superuser:
+                return True
+            return self.role == 'admin' and not self.staff_role
+        return bool(self.permission_bits & bit)
     
     def get_permissions(self):
         """Get dictionary of all permissions for this user
@@ -95,53 +137,8 @@ class User(AbstractUser):
         Returns:
             dict: Dictionary with permission names as keys and boolean values
         """
-        permissions = {
-            'can_sales': False,
-            'can_inventory': False,
-            'can_products': False,
-            'can_customers': False,
-            'can_reports': False,
-            'can_staff': False,
-            'can_settings': False,
-            'can_dashboard': True,
-        }
-        
-        # SaaS admins have all permissions
-        if self.is_saas_admin or self.is_superuser:
-            return {key: True for key in permissions}
-        
-        # Check through staff role
-        staff_role = self.staff_role
-        if staff_role:
-            for key in permissions:
-                permissions[key] = getattr(staff_role, key, False)
-            return permissions
-        
-        # Fallback to basic role checking
-        if self.role == 'admin':
-            permissions = {key: True for key in permissions}
-        elif self.role == 'manager':
-            permissions.update({
-                'can_sales': True,
-                'can_inventory': True,
-                'can_products': True,
-                'can_customers': True,
-                'can_reports': True,
-                'can_dashboard': True,
-            })
-        elif self.role == 'cashier':
-            permissions.update({
-                'can_sales': True,
-                'can_customers': True,
-                'can_dashboard': True,
-            })
-        elif self.role == 'staff':
-            permissions.update({
-                'can_sales': True,
-                'can_dashboard': True,
-            })
-        
-        return permissions
+        bits = self.permission_bits
+        return {name: bool(bits & bit) for name, bit in PERMISSION_BITS.items()}
 
 
 # Signal to create Staff profile when User is created (if they have a tenant)
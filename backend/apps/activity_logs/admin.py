@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ActivityLog
+from .models import ActivityLog, ArchivedActivityLog
 
 
 @admin.register(ActivityLog)
@@ -57,3 +57,12 @@ class ActivityLogAdmin(admin.ModelAdmin):
         """Only SaaS admins can delete logs"""
         return request.user.is_saas_admin
 
+
+@admin.register(ArchivedActivityLog)
+class ArchivedActivityLogAdmin(ActivityLogAdmin):
+    """Admin interface for archived activity logs - Read-only"""
+    list_filter = [
+        'action',
+        'module',
+        'tenant',
+    ]
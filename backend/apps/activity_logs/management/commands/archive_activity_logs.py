@@ -0,0 +1,35 @@
+"""
+Management command to move old activity logs to the archive table
+Run monthly from cron, after the month has closed
+"""
+from django.core.management.base import BaseCommand
+
+from apps.activity_logs.retention import archive_activity_logs
+
+
+class Command(BaseCommand):
+    help = 'Archive activity logs from months before the retention window (chunked INSERT ... SELECT + DELETE)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            help='Whole months to keep besides the current one (default: ACTIVITY_LOG_RETENTION_MONTHS setting)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Rows per chunk (default: ACTIVITY_LOG_ARCHIVE_CHUNK_SIZE setting)',
+        )
+        parser.add_argument(
+            '--tenant',
+            type=int,
+            help='Archive only this tenant ID',
+        )
+
+    def handle(self, *args, **options):
+        stats = archive_activity_logs(options.get('months'), options.get('chunk_size'), options.get('tenant'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {stats['archived']} log(s) before {stats['cutoff']} "
+            f"in {stats['chunks']} chunk(s), {stats['seconds']}s"
+        ))
@@ -0,0 +1,37 @@
+"""
+Management command to rebuild activity daily counts from the logs
+Use once after deploying the rollup, or after writing logs outside ActivityLog.save()
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.activity_logs.retention import rebuild_daily_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute activity counts per tenant, day, user, action and module'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='First day to rebuild, YYYY-MM-DD (default: 90 days ago)',
+        )
+        parser.add_argument(
+            '--tenant',
+            type=int,
+            help='Rebuild only this tenant ID',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_date(options['since']) if options.get('since') else timezone.localdate() - timedelta(days=90)
+        except ValueError:
+            since = None
+        if not since:
+            raise CommandError('--since must be YYYY-MM-DD')
+
+        rows = rebuild_daily_counts(since, options.get('tenant'))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} activity count row(s) since {since}"))
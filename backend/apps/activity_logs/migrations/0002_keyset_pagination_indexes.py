@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity_logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='activity_lo_tenant__f92502_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['tenant', '-created_at', '-id'], name='activity_lo_tenant__d718d7_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0005_add_logo_field'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('activity_logs', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedActivityLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('login', 'Login'), ('logout', 'Logout'), ('create', 'Create'), ('update', 'Update'), ('delete', 'Delete'), ('view', 'View'), ('refund', 'Refund'), ('discount', 'Discount'), ('cash_movement', 'Cash Movement'), ('inventory_adjustment', 'Inventory Adjustment'), ('shift_open', 'Shift Open'), ('shift_close', 'Shift Close'), ('settings_change', 'Settings Change'), ('security', 'Security Event'), ('export', 'Export'), ('import', 'Import')], max_length=50)),
+                ('module', models.CharField(choices=[('sales', 'Sales'), ('inventory', 'Inventory'), ('products', 'Products'), ('customers', 'Customers'), ('payments', 'Payments'), ('shifts', 'Shifts'), ('cash', 'Cash Management'), ('settings', 'Settings'), ('users', 'Users'), ('auth', 'Authentication'), ('reports', 'Reports'), ('suppliers', 'Suppliers'), ('restaurant', 'Restaurant')], max_length=50)),
+                ('resource_type', models.CharField(blank=True, max_length=100)),
+                ('resource_id', models.CharField(blank=True, max_length=100)),
+                ('description', models.TextField()),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.TextField(blank=True)),
+                ('request_path', models.CharField(blank=True, max_length=500)),
+                ('request_method', models.CharField(blank=True, max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_activity_logs', to='tenants.tenant')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_activity_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Activity Log',
+                'verbose_name_plural': 'Archived Activity Logs',
+                'db_table': 'activity_logs_archive',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['tenant', '-created_at'], name='activity_lo_tenant__b3b5b4_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('action', models.CharField(choices=[('login', 'Login'), ('logout', 'Logout'), ('create', 'Create'), ('update', 'Update'), ('delete', 'Delete'), ('view', 'View'), ('refund', 'Refund'), ('discount', 'Discount'), ('cash_movement', 'Cash Movement'), ('inventory_adjustment', 'Inventory Adjustment'), ('shift_open', 'Shift Open'), ('shift_close', 'Shift Close'), ('settings_change', 'Settings Change'), ('security', 'Security Event'), ('export', 'Export'), ('import', 'Import')], max_length=50)),
+                ('module', models.CharField(choices=[('sales', 'Sales'), ('inventory', 'Inventory'), ('products', 'Products'), ('customers', 'Customers'), ('payments', 'Payments'), ('shifts', 'Shifts'), ('cash', 'Cash Management'), ('settings', 'Settings'), ('users', 'Users'), ('auth', 'Authentication'), ('reports', 'Reports'), ('suppliers', 'Suppliers'), ('restaurant', 'Restaurant')], max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_daily_counts', to='tenants.tenant')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_daily_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Activity Daily Count',
+                'verbose_name_plural': 'Activity Daily Counts',
+                'db_table': 'activity_daily_counts',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['tenant', 'day'], name='activity_da_tenant__813f1b_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='activitydailycount',
+            constraint=models.UniqueConstraint(fields=('tenant', 'day', 'user', 'action', 'module'), name='activity_daily_counts_user_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='activitydailycount',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('tenant', 'day', 'action', 'module'), name='activity_daily_counts_system_uniq'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -122,7 +122,7 @@ class ActivityLog(models.Model):
         verbose_name_plural = 'Activity Logs'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['tenant', '-created_at']),
+            models.Index(fields=['tenant', '-created_at', '-id']),
             models.Index(fields=['tenant', 'user', '-created_at']),
             models.Index(fields=['tenant', 'module', '-created_at']),
             models.Index(fields=['tenant', 'action', '-created_at']),
@@ -137,5 +137,97 @@ class ActivityLog(models.Model):
         if self.pk:
             # If this is an update, raise an error
             raise ValueError("ActivityLog records are immutable and cannot be updated")
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            ActivityDailyCount.increment(
+                self.tenant_id, timezone.localdate(self.created_at), self.user_id, self.action, self.module
+            )
+
+
+class ActivityDailyCount(models.Model):
+    """
+    Activity per tenant, day, user, action and module, maintained as logs are written.
+
+    Audit dashboards aggregate this table instead of scanning ActivityLog, and
+    counts survive archival of the raw log.
+    """
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='activity_daily_counts')
+    day = models.DateField()
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_daily_counts')
+    action = models.CharField(max_length=50, choices=ActivityLog.ACTION_CHOICES)
+    module = models.CharField(max_length=50, choices=ActivityLog.MODULE_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'activity_daily_counts'
+        verbose_name = 'Activity Daily Count'
+        verbose_name_plural = 'Activity Daily Counts'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'day', 'user', 'action', 'module'],
+                name='activity_daily_counts_user_uniq',
+            ),
+            # NULLs are distinct in unique indexes, so system activity needs its own
+            models.UniqueConstraint(
+                fields=['tenant', 'day', 'action', 'module'],
+                condition=models.Q(user__isnull=True),
+                name='activity_daily_counts_system_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant_id} {self.day} {self.action}/{self.module}: {self.count}"
+
+    @classmethod
+    def increment(cls, tenant_id, day, user_id, action, module, amount=1):
+        """Add amount to a counter row, creating it on first use"""
+        counter = cls.objects.filter(tenant_id=tenant_id, day=day, user_id=user_id, action=action, module=module)
+        if counter.update(count=models.F('count') + amount):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    tenant_id=tenant_id, day=day, user_id=user_id, action=action, module=module, count=amount
+                )
+        except IntegrityError:
+            # Created concurrently by another writer
+            counter.update(count=models.F('count') + amount)
+
+
+class ArchivedActivityLog(models.Model):
+    """
+    Activity logs moved out of the hot table by archive_activity_logs.
+
+    Same columns as ActivityLog with only the index needed to look up a
+    tenant's history; daily counts stay in ActivityDailyCount.
+    """
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='archived_activity_logs')
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_activity_logs')
+    action = models.CharField(max_length=50, choices=ActivityLog.ACTION_CHOICES)
+    module = models.CharField(max_length=50, choices=ActivityLog.MODULE_CHOICES)
+    resource_type = models.CharField(max_length=100, blank=True)
+    resource_id = models.CharField(max_length=100, blank=True)
+    description = models.TextField()
+    metadata = models.JSONField(default=dict, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.TextField(blank=True)
+    request_path = models.CharField(max_length=500, blank=True)
+    request_method = models.CharField(max_length=10, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'activity_logs_archive'
+        verbose_name = 'Archived Activity Log'
+        verbose_name_plural = 'Archived Activity Logs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user or 'System'} - {self.get_action_display()} - {self.get_module_display()} - {self.created_at}"
 
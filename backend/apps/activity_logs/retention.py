@@ -0,0 +1,112 @@
+"""
+Activity log retention
+Keeps the hot activity_logs table small: whole months older than the
+retention window are moved to activity_logs_archive in primary-key chunks,
+each chunk one INSERT ... SELECT plus DELETE in its own transaction. Daily
+counts in ActivityDailyCount are untouched, so summaries still cover
+archived months.
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ActivityDailyCount, ActivityLog, ArchivedActivityLog
+
+logger = logging.getLogger(__name__)
+
+
+def archive_cutoff(months=None, today=None):
+    """Start of the oldest month kept in the hot table"""
+    months = getattr(settings, 'ACTIVITY_LOG_RETENTION_MONTHS', 3) if months is None else months
+    today = today or timezone.localdate()
+    month_index = today.year * 12 + today.month - 1 - months
+    first = date(month_index // 12, month_index % 12 + 1, 1)
+    return timezone.make_aware(datetime.combine(first, datetime.min.time()))
+
+
+def archive_activity_logs(months=None, chunk_size=None, tenant_id=None):
+    """
+    Move activity logs from months before the retention window to the archive table.
+
+    Args:
+        months: Whole months to keep besides the current one (default ACTIVITY_LOG_RETENTION_MONTHS)
+        chunk_size: Rows per chunk (default ACTIVITY_LOG_ARCHIVE_CHUNK_SIZE)
+        tenant_id: Archive only this tenant
+
+    Returns:
+        Dict with cutoff, archived row count, chunks and seconds
+    """
+    started = time.monotonic()
+    cutoff = archive_cutoff(months)
+    chunk_size = chunk_size or getattr(settings, 'ACTIVITY_LOG_ARCHIVE_CHUNK_SIZE', 5000)
+
+    old = ActivityLog.objects.filter(created_at__lt=cutoff)
+    if tenant_id is not None:
+        old = old.filter(tenant_id=tenant_id)
+
+    columns = ', '.join(
+        connection.ops.quote_name(field.column) for field in ArchivedActivityLog._meta.concrete_fields
+    )
+    insert_sql = (
+        f"INSERT INTO {ArchivedActivityLog._meta.db_table} ({columns}) "
+        f"SELECT {columns} FROM {ActivityLog._meta.db_table} WHERE id IN (%s)"
+    )
+
+    stats = {'cutoff': cutoff.isoformat(), 'archived': 0, 'chunks': 0}
+    while True:
+        ids = list(old.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(insert_sql % ', '.join(['%s'] * len(ids)), ids)
+            ActivityLog.objects.filter(pk__in=ids).delete()
+        stats['archived'] += len(ids)
+        stats['chunks'] += 1
+
+    stats['seconds'] = round(time.monotonic() - started, 4)
+    logger.info(
+        f"Archived {stats['archived']} activity log(s) before {stats['cutoff']} "
+        f"in {stats['chunks']} chunk(s), {stats['seconds']}s"
+    )
+    return stats
+
+
+def rebuild_daily_counts(since, tenant_id=None):
+    """
+    Recompute ActivityDailyCount from the hot and archived logs from a day onwards.
+
+    Returns:
+        Number of counter rows written
+    """
+    start = timezone.make_aware(datetime.combine(since, datetime.min.time()))
+    totals = defaultdict(int)
+    for model in (ActivityLog, ArchivedActivityLog):
+        logs = model.objects.filter(created_at__gte=start)
+        if tenant_id is not None:
+            logs = logs.filter(tenant_id=tenant_id)
+        rows = logs.order_by().annotate(day=TruncDate('created_at')).values(
+            'tenant_id', 'day', 'user_id', 'action', 'module'
+        ).annotate(count=Count('id'))
+        for row in rows:
+            totals[(row['tenant_id'], row['day'], row['user_id'], row['action'], row['module'])] += row['count']
+
+    with transaction.atomic():
+        stale = ActivityDailyCount.objects.filter(day__gte=since)
+        if tenant_id is not None:
+            stale = stale.filter(tenant_id=tenant_id)
+        stale.delete()
+        ActivityDailyCount.objects.bulk_create([
+            ActivityDailyCount(tenant_id=tenant, day=day, user_id=user, action=action, module=module, count=count)
+            for (tenant, day, user, action, module), count in totals.items()
+        ], batch_size=1000)
+
+    logger.info(f"Rebuilt {len(totals)} activity daily count(s) since {since}")
+    return len(totals)
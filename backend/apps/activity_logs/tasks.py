@@ -0,0 +1,14 @@
+"""
+Activity log tasks
+Monthly archival on the maintenance queue. Rows are moved and deleted in
+the same transaction, so a rerun only picks up what is left.
+"""
+from celery import shared_task
+
+from . import retention
+
+
+@shared_task(name='activity_logs.archive_activity_logs')
+def archive_activity_logs(months=None):
+    """Move activity logs older than the retention window to the archive"""
+    return retention.archive_activity_logs(months)
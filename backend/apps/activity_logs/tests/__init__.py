@@ -0,0 +1 @@
+# Test module for activity_logs app
@@ -0,0 +1,104 @@
+"""
+Activity daily count and archival tests
+"""
+
+from datetime import timedelta
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.activity_logs.models import ActivityDailyCount, ActivityLog, ArchivedActivityLog
+from apps.activity_logs.retention import archive_activity_logs, archive_cutoff
+from apps.activity_logs.utils import log_activity
+from apps.activity_logs.views import ActivityLogViewSet
+from apps.tenants.models import Tenant
+
+
+class ActivityRollupTests(TestCase):
+    """Test daily counts, the grouped summary and monthly archival"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Audit Tenant")
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="pass", tenant=self.tenant, role='admin'
+        )
+        self.cashier = User.objects.create_user(username="cash", email="cash@example.com", password="pass", tenant=self.tenant)
+        self.factory = APIRequestFactory()
+
+    def _log(self, user, action=ActivityLog.ACTION_CREATE, module=ActivityLog.MODULE_SALES):
+        return log_activity(tenant=self.tenant, user=user, action=action, module=module, description="test")
+
+    def _summary(self, **params):
+        request = self.factory.get('/api/v1/activity-logs/summary/', params)
+        force_authenticate(request, user=self.admin)
+        request.tenant = self.tenant
+        return ActivityLogViewSet.as_view({'get': 'summary'})(request)
+
+    def test_writes_maintain_daily_counts(self):
+        """Each log increments its (day, user, action, module) counter, system logs included"""
+        self._log(self.cashier)
+        self._log(self.cashier)
+        self._log(None, action=ActivityLog.ACTION_SECURITY, module=ActivityLog.MODULE_AUTH)
+        self._log(None, action=ActivityLog.ACTION_SECURITY, module=ActivityLog.MODULE_AUTH)
+
+        today = timezone.localdate()
+        self.assertEqual(ActivityDailyCount.objects.get(user=self.cashier, day=today).count, 2)
+        self.assertEqual(ActivityDailyCount.objects.get(user__isnull=True, day=today).count, 2)
+
+    def test_summary_from_grouped_counts(self):
+        """Summary totals come from two grouped queries regardless of choice count"""
+        for _ in range(3):
+            self._log(self.cashier)
+        self._log(self.admin, action=ActivityLog.ACTION_DELETE, module=ActivityLog.MODULE_PRODUCTS)
+
+        with self.assertNumQueries(2):
+            response = self._summary(days=7)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_actions'], 4)
+        self.assertEqual(response.data['action_counts'], {'Create': 3, 'Delete': 1})
+        self.assertEqual(response.data['module_counts'], {'Sales': 3, 'Products': 1})
+        self.assertEqual(response.data['top_users'][0], {
+            'user__email': 'cash@example.com', 'user__name': self.cashier.name, 'count': 3,
+        })
+
+    def test_summary_is_tenant_scoped_and_date_bounded(self):
+        other = Tenant.objects.create(name="Other")
+        log_activity(tenant=other, user=None, action='create', module='sales', description="elsewhere")
+        ActivityDailyCount.objects.create(
+            tenant=self.tenant, day=timezone.localdate() - timedelta(days=60), action='create', module='sales', count=5
+        )
+        self._log(self.cashier)
+
+        self.assertEqual(self._summary(days=30).data['total_actions'], 1)
+        self.assertEqual(self._summary(days=90).data['total_actions'], 6)
+        self.assertEqual(self._summary(date_from='2026-02-30').status_code, 400)
+
+    def test_archive_moves_old_months_and_keeps_counts(self):
+        """Logs before the retention window move to the archive; summaries still see them"""
+        old = self._log(self.cashier)
+        recent = self._log(self.cashier)
+        ActivityLog.objects.filter(pk=old.pk).update(created_at=archive_cutoff(3) - timedelta(days=1))
+
+        stats = archive_activity_logs(months=3, chunk_size=1)
+
+        self.assertEqual(stats['archived'], 1)
+        self.assertEqual(list(ActivityLog.objects.values_list('pk', flat=True)), [recent.pk])
+        archived = ArchivedActivityLog.objects.get()
+        self.assertEqual((archived.pk, archived.user_id, archived.description), (old.pk, self.cashier.pk, "test"))
+        self.assertEqual(self._summary(days=30).data['total_actions'], 2)
+
+    def test_rebuild_counts_command(self):
+        """The rebuild command recomputes counters from hot and archived logs"""
+        self._log(self.cashier)
+        ActivityDailyCount.objects.all().delete()
+
+        call_command('rebuild_activity_counts', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(ActivityDailyCount.objects.get().count, 1)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_activity_counts', since='2026-02-30', stdout=open('/dev/null', 'w'))
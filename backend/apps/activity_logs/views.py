@@ -1,13 +1,18 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Sum
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from collections import defaultdict
 from datetime import timedelta
-from .models import ActivityLog
+from .models import ActivityLog, ActivityDailyCount
 from .serializers import ActivityLogSerializer
 from apps.tenants.permissions import TenantFilterMixin, IsTenantAdmin, IsSaaSAdmin
 from rest_framework.permissions import IsAuthenticated
+from primepos.db_routing import replica_reads
+from primepos.pagination import KeysetOptInPagination
 
 
 class ActivityLogViewSet(TenantFilterMixin, viewsets.ReadOnlyModelViewSet):
@@ -18,6 +23,7 @@ class ActivityLogViewSet(TenantFilterMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ActivityLog.objects.all()
     serializer_class = ActivityLogSerializer
     permission_classes = [IsAuthenticated, IsTenantAdmin | IsSaaSAdmin]
+    pagination_class = KeysetOptInPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['action', 'module', 'user', 'resource_type']
     search_fields = ['description', 'resource_id', 'user__email', 'user__name']
@@ -70,41 +76,63 @@ class ActivityLogViewSet(TenantFilterMixin, viewsets.ReadOnlyModelViewSet):
         
         return queryset.select_related('user', 'tenant')
     
+    def get_daily_counts(self, request):
+        """ActivityDailyCount rows visible to the user, scoped like get_queryset"""
+        counts = ActivityDailyCount.objects.all()
+        if request.user.is_saas_admin:
+            return counts
+        tenant = getattr(request, 'tenant', None) or request.user.tenant
+        return counts.filter(tenant=tenant) if tenant else counts.none()
+    
     @action(detail=False, methods=['get'])
+    @replica_reads
     def summary(self, request):
-        """Get summary statistics for activity logs"""
-        queryset = self.get_queryset()
+        """
+        Get summary statistics for activity logs
+        
+        Built from the daily activity counts, so cost depends on the number
+        of days and users rather than on log volume. Ranges are whole days:
+        the last `days` days (default 30) or date_from/date_to.
+        """
+        counts = self.get_daily_counts(request)
         
-        # Get date range from query params or default to last 30 days
-        days = int(request.query_params.get('days', 30))
-        date_from = timezone.now() - timedelta(days=days)
-        queryset = queryset.filter(created_at__gte=date_from)
+        try:
+            days = int(request.query_params.get('days', 30))
+        except (TypeError, ValueError):
+            return Response({"detail": "days must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Count by action
-        action_counts = {}
-        for action_code, action_label in ActivityLog.ACTION_CHOICES:
-            count = queryset.filter(action=action_code).count()
-            if count > 0:
-                action_counts[action_label] = count
+        try:
+            date_from = parse_date((request.query_params.get('date_from') or '')[:10])
+            date_to = parse_date((request.query_params.get('date_to') or '')[:10])
+        except ValueError:
+            # Well-formed but impossible dates such as 2026-02-30
+            return Response(
+                {"detail": "date_from and date_to must be valid YYYY-MM-DD dates"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        counts = counts.filter(day__gte=date_from or timezone.localdate(timezone.now() - timedelta(days=days)))
+        if date_to:
+            counts = counts.filter(day__lte=date_to)
         
-        # Count by module
-        module_counts = {}
-        for module_code, module_label in ActivityLog.MODULE_CHOICES:
-            count = queryset.filter(module=module_code).count()
-            if count > 0:
-                module_counts[module_label] = count
+        action_labels = dict(ActivityLog.ACTION_CHOICES)
+        module_labels = dict(ActivityLog.MODULE_CHOICES)
+        action_counts = defaultdict(int)
+        module_counts = defaultdict(int)
+        total = 0
+        for row in counts.order_by().values('action', 'module').annotate(count=Sum('count')):
+            action_counts[action_labels.get(row['action'], row['action'])] += row['count']
+            module_counts[module_labels.get(row['module'], row['module'])] += row['count']
+            total += row['count']
         
         # Top users
-        from django.db.models import Count
-        top_users = queryset.values('user__email', 'user__name').annotate(
-            count=Count('id')
+        top_users = counts.order_by().values('user__email', 'user__name').annotate(
+            count=Sum('count')
         ).order_by('-count')[:10]
         
         return Response({
-            'total_actions': queryset.count(),
+            'total_actions': total,
             'date_range_days': days,
-            'action_counts': action_counts,
-            'module_counts': module_counts,
+            'action_counts': dict(action_counts),
+            'module_counts': dict(module_counts),
             'top_users': list(top_users),
         })
-
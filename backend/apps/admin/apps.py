@@ -6,3 +6,6 @@ class AdminConfig(AppConfig):
     name = 'apps.admin'
     label = 'platform_admin'  # Change label to avoid conflict with Django's admin
 
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.admin.signals  # noqa
@@ -0,0 +1,34 @@
+"""
+Management command to rebuild the platform metrics snapshot
+Use once after deploying it to backfill history, or after importing sales
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.admin.metrics import refresh_platform_metrics
+
+
+class Command(BaseCommand):
+    help = 'Recompute daily tenant and platform metrics from today back to --since'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='First day to rebuild, YYYY-MM-DD (default: 90 days ago)',
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        try:
+            since = parse_date(options['since']) if options.get('since') else today - timedelta(days=90)
+        except ValueError:
+            since = None
+        if not since or since > today:
+            raise CommandError('--since must be a YYYY-MM-DD date no later than today')
+
+        # Running totals build on earlier days, so always rebuild through today
+        rows = refresh_platform_metrics(since, today)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt platform metrics for {len(rows)} day(s) from {since}"))
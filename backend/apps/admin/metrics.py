@@ -0,0 +1,195 @@
+"""
+Platform metrics
+Rolls sales, tenants, outlets and users up into TenantDailyMetrics (one row
+per tenant and day) and PlatformDailyMetrics (one row per day), so the SaaS
+admin dashboard reads a small daily table instead of summing every sale on
+the platform.
+
+The periodic refresh recomputes the last PLATFORM_METRICS_REFRESH_DAYS days,
+and the running totals carry over from the day before. Sales on older days
+still change: offline sync backdates sales to when the till rang them up,
+and sales can be edited or deleted. Those changes mark their day with a
+PlatformMetricsDirtyDay (mark_days_changed, called from the Sale signals in
+signals.py and from offline sync's bulk insert), and the next refresh starts
+from the earliest dirty day, so every later day and running total is
+recomputed too. Bulk writes that bypass signals must call mark_days_changed
+themselves. The first refresh (or a rebuild from scratch) sums the sales
+before its range once.
+"""
+import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.sales.models import Sale
+from apps.tenants.models import Tenant
+
+from .models import PlatformDailyMetrics, PlatformMetricsDirtyDay, TenantDailyMetrics
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FIELDS = (
+    'day', 'revenue', 'sales_count', 'tenants', 'active_tenants', 'new_tenants', 'outlets', 'active_outlets', 'users',
+)
+TENANT_HISTORY_FIELDS = ('day', 'revenue', 'sales_count', 'outlets', 'active_outlets', 'users')
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _days(start_day, end_day):
+    return [start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)]
+
+
+def _daily_sales(start_day, end_day):
+    """(tenant_id, day) -> (revenue, sales count) for sales created in the range"""
+    rows = Sale.objects.filter(
+        created_at__gte=_day_start(start_day),
+        created_at__lt=_day_start(end_day + timedelta(days=1)),
+    ).order_by().annotate(day=TruncDate('created_at')).values('tenant_id', 'day').annotate(
+        revenue=Sum('total'), sales_count=Count('id'),
+    )
+    return {(row['tenant_id'], row['day']): (row['revenue'], row['sales_count']) for row in rows}
+
+
+def _sizes(day):
+    """Outlet and user counts per tenant, and platform-wide tenant counts, at the end of day"""
+    day_end = _day_start(day + timedelta(days=1))
+    outlets = Outlet.objects.filter(created_at__lt=day_end).order_by().values('tenant_id').annotate(
+        outlets=Count('id'), active_outlets=Count('id', filter=Q(is_active=True)),
+    )
+    users = User.objects.filter(created_at__lt=day_end).order_by().values('tenant_id').annotate(users=Count('id'))
+    tenants = Tenant.objects.filter(created_at__lt=day_end)
+    type_distribution = tenants.order_by().values('type').annotate(count=Count('id')).order_by('type')
+    tenant_counts = tenants.aggregate(
+        tenants=Count('id'),
+        active_tenants=Count('id', filter=Q(is_active=True)),
+        new_tenants=Count('id', filter=Q(created_at__gte=_day_start(day))),
+        new_tenants_30d=Count('id', filter=Q(created_at__gte=_day_start(day - timedelta(days=29)))),
+    )
+    return (
+        list(tenants.values_list('id', flat=True)),
+        {row['tenant_id']: row for row in outlets},
+        {row['tenant_id']: row['users'] for row in users},
+        list(type_distribution),
+        tenant_counts,
+    )
+
+
+def _totals_before(day):
+    """Running revenue and sales count up to the end of the day before day"""
+    previous = PlatformDailyMetrics.objects.filter(day=day - timedelta(days=1)).first()
+    if previous is not None:
+        return previous.total_revenue, previous.total_sales
+    if PlatformDailyMetrics.objects.filter(day__lt=day).exists():
+        logger.warning(f"Platform metrics have a gap before {day}; summing earlier sales")
+    totals = Sale.objects.filter(created_at__lt=_day_start(day)).aggregate(revenue=Sum('total'), count=Count('id'))
+    return totals['revenue'] or Decimal('0'), totals['count']
+
+
+def refresh_platform_metrics(start_day, end_day):
+    """
+    Recompute tenant and platform metrics for a day range.
+
+    Running totals of later days build on the range, so a range should end
+    on the latest day that has metrics (normally today).
+
+    Returns:
+        The PlatformDailyMetrics rows written, oldest first
+    """
+    sales = _daily_sales(start_day, end_day)
+    total_revenue, total_sales = _totals_before(start_day)
+    tenant_rows, platform_rows = [], []
+
+    for day in _days(start_day, end_day):
+        tenant_ids, outlets, users, type_distribution, tenant_counts = _sizes(day)
+        platform = PlatformDailyMetrics(day=day, type_distribution=type_distribution, **tenant_counts)
+        platform.users = sum(users.values())
+        day_sales = [totals for (_, sale_day), totals in sales.items() if sale_day == day]
+        platform.revenue = sum((revenue for revenue, _ in day_sales), Decimal('0'))
+        platform.sales_count = sum(count for _, count in day_sales)
+
+        for tenant_id in tenant_ids:
+            revenue, sales_count = sales.get((tenant_id, day), (Decimal('0'), 0))
+            row = TenantDailyMetrics(
+                tenant_id=tenant_id,
+                day=day,
+                revenue=revenue,
+                sales_count=sales_count,
+                outlets=outlets.get(tenant_id, {}).get('outlets', 0),
+                active_outlets=outlets.get(tenant_id, {}).get('active_outlets', 0),
+                users=users.get(tenant_id, 0),
+            )
+            tenant_rows.append(row)
+            platform.outlets += row.outlets
+            platform.active_outlets += row.active_outlets
+
+        total_revenue += platform.revenue
+        total_sales += platform.sales_count
+        platform.total_revenue, platform.total_sales = total_revenue, total_sales
+        platform_rows.append(platform)
+
+    with transaction.atomic():
+        TenantDailyMetrics.objects.filter(day__gte=start_day, day__lte=end_day).delete()
+        PlatformDailyMetrics.objects.filter(day__gte=start_day, day__lte=end_day).delete()
+        TenantDailyMetrics.objects.bulk_create(tenant_rows, batch_size=500)
+        PlatformDailyMetrics.objects.bulk_create(platform_rows)
+
+    logger.debug(f"Refreshed platform metrics for {start_day}..{end_day} ({len(tenant_rows)} tenant row(s))")
+    return platform_rows
+
+
+def _window_start(today):
+    """First day the periodic refresh recomputes anyway"""
+    return today - timedelta(days=max(1, getattr(settings, 'PLATFORM_METRICS_REFRESH_DAYS', 2)) - 1)
+
+
+def mark_days_changed(days):
+    """Have the next refresh re-roll these days if they are older than its window"""
+    window_start = _window_start(timezone.localdate())
+    stale = {day for day in days if day < window_start}
+    if stale:
+        PlatformMetricsDirtyDay.objects.bulk_create(
+            [PlatformMetricsDirtyDay(day=day) for day in stale], ignore_conflicts=True
+        )
+
+
+def refresh_recent_platform_metrics():
+    """
+    Recompute the last PLATFORM_METRICS_REFRESH_DAYS days (default 2:
+    yesterday and today), or from the earliest dirty day if that is older.
+    """
+    today = timezone.localdate()
+    start_day = _window_start(today)
+
+    # Clear the markers before reading sales: a change committed after this
+    # marks its day again for the next refresh instead of being lost
+    dirty = dict(PlatformMetricsDirtyDay.objects.filter(day__lte=today).values_list('id', 'day'))
+    if dirty:
+        PlatformMetricsDirtyDay.objects.filter(pk__in=dirty).delete()
+        start_day = min(start_day, *dirty.values())
+
+    try:
+        return refresh_platform_metrics(start_day, today)
+    except Exception:
+        PlatformMetricsDirtyDay.objects.bulk_create(
+            [PlatformMetricsDirtyDay(day=day) for day in dirty.values()], ignore_conflicts=True
+        )
+        raise
+
+
+def _plain(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def history(rows, fields=HISTORY_FIELDS):
+    """Time series of daily metric rows, oldest first"""
+    return [{field: _plain(getattr(row, field)) for field in fields} for row in sorted(rows, key=lambda row: row.day)]
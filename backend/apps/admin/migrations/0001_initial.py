@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tenants', '0005_add_logo_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformDailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('tenants', models.PositiveIntegerField(default=0)),
+                ('active_tenants', models.PositiveIntegerField(default=0)),
+                ('new_tenants', models.PositiveIntegerField(default=0)),
+                ('new_tenants_30d', models.PositiveIntegerField(default=0)),
+                ('outlets', models.PositiveIntegerField(default=0)),
+                ('active_outlets', models.PositiveIntegerField(default=0)),
+                ('users', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sales_count', models.PositiveIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_sales', models.PositiveBigIntegerField(default=0)),
+                ('type_distribution', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Platform Daily Metrics',
+                'verbose_name_plural': 'Platform Daily Metrics',
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TenantDailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sales_count', models.PositiveIntegerField(default=0)),
+                ('outlets', models.PositiveIntegerField(default=0)),
+                ('active_outlets', models.PositiveIntegerField(default=0)),
+                ('users', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to='tenants.tenant')),
+            ],
+            options={
+                'verbose_name': 'Tenant Daily Metrics',
+                'verbose_name_plural': 'Tenant Daily Metrics',
+                'ordering': ['day', 'tenant'],
+                'indexes': [models.Index(fields=['day'], name='platform_ad_day_7a0923_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tenantdailymetrics',
+            constraint=models.UniqueConstraint(fields=('tenant', 'day'), name='platform_admin_tenantmetrics_tenant_day_uniq'),
+        ),
+    ]
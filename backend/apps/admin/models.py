@@ -0,0 +1,84 @@
+from django.db import models
+from apps.tenants.models import Tenant
+
+
+class TenantDailyMetrics(models.Model):
+    """
+    One tenant's sales and size for one day, rolled up for the SaaS admin.
+
+    Revenue and sales count cover the sales created that (local) day. The
+    outlet and user counts are those that existed at the end of the day.
+    """
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='daily_metrics')
+    day = models.DateField()
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sales_count = models.PositiveIntegerField(default=0)
+    outlets = models.PositiveIntegerField(default=0)
+    active_outlets = models.PositiveIntegerField(default=0)
+    users = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Tenant Daily Metrics'
+        verbose_name_plural = 'Tenant Daily Metrics'
+        ordering = ['day', 'tenant']
+        constraints = [
+            models.UniqueConstraint(fields=['tenant', 'day'], name='platform_admin_tenantmetrics_tenant_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant_id} {self.day}: {self.revenue}"
+
+
+class PlatformDailyMetrics(models.Model):
+    """
+    Platform-wide snapshot for one day, rolled up from TenantDailyMetrics.
+
+    total_revenue and total_sales are running totals up to and including
+    the day, so the latest row answers "all time" questions on its own.
+    """
+    day = models.DateField(unique=True)
+    tenants = models.PositiveIntegerField(default=0)
+    active_tenants = models.PositiveIntegerField(default=0)
+    new_tenants = models.PositiveIntegerField(default=0)
+    new_tenants_30d = models.PositiveIntegerField(default=0)
+    outlets = models.PositiveIntegerField(default=0)
+    active_outlets = models.PositiveIntegerField(default=0)
+    users = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sales_count = models.PositiveIntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_sales = models.PositiveBigIntegerField(default=0)
+    type_distribution = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Platform Daily Metrics'
+        verbose_name_plural = 'Platform Daily Metrics'
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day}: {self.tenants} tenants, {self.total_revenue} revenue"
+
+
+class PlatformMetricsDirtyDay(models.Model):
+    """
+    A day whose sales changed after the periodic refresh stopped covering it.
+
+    Set when a sale on an older day is created (offline sync backdates
+    sales), edited or deleted; the next refresh re-rolls from the earliest
+    dirty day and clears the markers.
+    """
+    day = models.DateField(unique=True)
+    marked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Platform Metrics Dirty Day'
+        verbose_name_plural = 'Platform Metrics Dirty Days'
+        ordering = ['day']
+
+    def __str__(self):
+        return str(self.day)
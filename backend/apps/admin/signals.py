@@ -0,0 +1,18 @@
+"""
+Django signals marking platform metrics days whose sales changed
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.sales.models import Sale
+
+from .metrics import mark_days_changed
+
+
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+def mark_sale_day_changed(sender, instance, **kwargs):
+    """Re-roll the sale's day if the periodic refresh no longer covers it"""
+    if instance.created_at:
+        mark_days_changed([timezone.localdate(instance.created_at)])
@@ -0,0 +1,187 @@
+"""
+Platform metrics snapshot tests
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.admin.metrics import refresh_platform_metrics, refresh_recent_platform_metrics
+from apps.admin.models import PlatformDailyMetrics, PlatformMetricsDirtyDay, TenantDailyMetrics
+from apps.admin.views import platform_analytics, tenant_analytics
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.sales.models import Sale
+from apps.sales.views import SaleViewSet
+from apps.tenants.models import Tenant
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+
+
+class PlatformMetricsTests(TestCase):
+    """Test the daily tenant and platform metrics rollup and its endpoints"""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+        self.shop = Tenant.objects.create(name="Shop", type='retail')
+        self.cafe = Tenant.objects.create(name="Cafe", type='restaurant')
+        self.admin = User.objects.create_user(username="saas", email="saas@example.com", password="pass")
+        self.admin.is_saas_admin = True
+        self.admin.save()
+        self.shop_outlet = Outlet.objects.create(tenant=self.shop, name="Main")
+        self.cafe_outlet = Outlet.objects.create(tenant=self.cafe, name="Cafe", is_active=False)
+        User.objects.create_user(username="cashier", email="cashier@example.com", password="pass", tenant=self.shop)
+        self._backdate(Tenant.objects.all(), self.yesterday)
+        self._backdate(Outlet.objects.all(), self.yesterday)
+        self._backdate(User.objects.all(), self.yesterday)
+        self.factory = APIRequestFactory()
+        self.receipts = 0
+
+    def _backdate(self, queryset, day):
+        queryset.update(created_at=at(day, 8))
+
+    def _sale(self, outlet, total, day):
+        self.receipts += 1
+        sale = Sale.objects.create(
+            tenant=outlet.tenant, outlet=outlet, receipt_number=f"P-{self.receipts}",
+            subtotal=Decimal(total), total=Decimal(total), payment_method='cash',
+        )
+        self._backdate(Sale.objects.filter(pk=sale.pk), day)
+        return sale
+
+    def _get(self, view, *args, **params):
+        request = self.factory.get('/api/v1/admin/analytics/', params)
+        force_authenticate(request, user=self.admin)
+        return view(request, *args)
+
+    def test_refresh_rolls_up_tenants_and_platform(self):
+        self._sale(self.shop_outlet, "10.00", self.yesterday)
+        self._sale(self.shop_outlet, "5.50", self.today)
+        self._sale(self.cafe_outlet, "20.00", self.today)
+
+        refresh_platform_metrics(self.yesterday, self.today)
+
+        shop = TenantDailyMetrics.objects.get(tenant=self.shop, day=self.today)
+        self.assertEqual((shop.revenue, shop.sales_count), (Decimal("5.50"), 1))
+        self.assertEqual((shop.outlets, shop.active_outlets, shop.users), (1, 1, 1))
+        self.assertEqual(TenantDailyMetrics.objects.filter(day=self.yesterday).count(), 2)
+
+        platform = PlatformDailyMetrics.objects.get(day=self.today)
+        self.assertEqual((platform.revenue, platform.sales_count), (Decimal("25.50"), 2))
+        self.assertEqual((platform.total_revenue, platform.total_sales), (Decimal("35.50"), 3))
+        self.assertEqual((platform.tenants, platform.active_tenants, platform.new_tenants_30d), (2, 2, 2))
+        self.assertEqual((platform.outlets, platform.active_outlets, platform.users), (2, 1, 2))
+        self.assertEqual(
+            platform.type_distribution, [{'type': 'restaurant', 'count': 1}, {'type': 'retail', 'count': 1}]
+        )
+
+    def test_incremental_refresh_carries_running_totals(self):
+        """The recent refresh only reads recent sales and builds on the day before"""
+        old = self.today - timedelta(days=5)
+        self._sale(self.shop_outlet, "100.00", old)
+        refresh_platform_metrics(old, self.yesterday)
+
+        self._sale(self.shop_outlet, "1.00", self.today)
+        # Old days are not read again unless marked dirty (update() bypasses the signals)
+        Sale.objects.filter(created_at__lt=at(self.yesterday, 0)).update(total=Decimal("999.00"))
+        with self.settings(PLATFORM_METRICS_REFRESH_DAYS=1):
+            refresh_recent_platform_metrics()
+
+        platform = PlatformDailyMetrics.objects.get(day=self.today)
+        self.assertEqual((platform.total_revenue, platform.total_sales), (Decimal("101.00"), 2))
+        self.assertEqual(PlatformDailyMetrics.objects.count(), 6)
+
+        # Refreshing again leaves the same rows
+        with self.settings(PLATFORM_METRICS_REFRESH_DAYS=1):
+            refresh_recent_platform_metrics()
+        self.assertEqual(PlatformDailyMetrics.objects.get(day=self.today).total_revenue, Decimal("101.00"))
+        self.assertEqual(TenantDailyMetrics.objects.filter(day=self.today).count(), 2)
+
+    def test_backdated_offline_sale_rerolls_its_day(self):
+        """A sale synced days after it was rung up lands on its own day and in the totals"""
+        old = self.today - timedelta(days=5)
+        self._backdate(Tenant.objects.all(), old)
+        refresh_platform_metrics(old, self.today)
+
+        product = Product.objects.create(
+            tenant=self.shop, outlet=self.shop_outlet, name="Soda", retail_price=Decimal("25.00"), stock=10
+        )
+        request = self.factory.post('/api/v1/sales/sync/', {'outlet': self.shop_outlet.id, 'sales': [{
+            'client_id': str(uuid.uuid4()),
+            'payment_method': 'cash',
+            'created_at': at(old, 10).isoformat(),
+            'items': [{'product_id': product.id, 'quantity': 2, 'price': '25.00'}],
+        }]}, format='json')
+        force_authenticate(request, user=User.objects.get(username="cashier"))
+        request.tenant = self.shop
+        self.assertEqual(SaleViewSet.as_view({'post': 'sync'})(request).data['created'], 1)
+        self.assertTrue(PlatformMetricsDirtyDay.objects.filter(day=old).exists())
+
+        refresh_recent_platform_metrics()
+
+        self.assertEqual(PlatformDailyMetrics.objects.get(day=old).revenue, Decimal("50.00"))
+        self.assertEqual(TenantDailyMetrics.objects.get(tenant=self.shop, day=old).sales_count, 1)
+        self.assertEqual(PlatformDailyMetrics.objects.get(day=self.today).total_revenue, Decimal("50.00"))
+        self.assertFalse(PlatformMetricsDirtyDay.objects.exists())
+
+    def test_edited_and_deleted_sales_reroll_their_day(self):
+        old = self.today - timedelta(days=5)
+        self._backdate(Tenant.objects.all(), old)
+        sale = self._sale(self.shop_outlet, "10.00", old)
+        refresh_platform_metrics(old, self.today)
+
+        sale.refresh_from_db()
+        sale.total = Decimal("30.00")
+        sale.save()
+        refresh_recent_platform_metrics()
+        self.assertEqual(PlatformDailyMetrics.objects.get(day=old).revenue, Decimal("30.00"))
+        self.assertEqual(PlatformDailyMetrics.objects.get(day=self.today).total_revenue, Decimal("30.00"))
+
+        sale.delete()
+        refresh_recent_platform_metrics()
+        self.assertEqual(PlatformDailyMetrics.objects.get(day=old).sales_count, 0)
+        self.assertEqual(PlatformDailyMetrics.objects.get(day=self.today).total_sales, 0)
+
+    def test_platform_analytics_reads_snapshot(self):
+        self._sale(self.shop_outlet, "10.00", self.yesterday)
+        refresh_platform_metrics(self.yesterday, self.today)
+        self._sale(self.cafe_outlet, "99.00", self.today)  # Not in the snapshot yet
+
+        with self.assertNumQueries(1):
+            data = self._get(platform_analytics).data
+        self.assertEqual(data['total_revenue'], 10.0)
+        self.assertEqual((data['total_tenants'], data['total_outlets'], data['total_users']), (2, 2, 2))
+        self.assertEqual([day['day'] for day in data['history']], [self.yesterday, self.today])
+        self.assertEqual(data['history'][0]['revenue'], 10.0)
+
+        self.assertEqual(len(self._get(platform_analytics, days=1).data['history']), 1)
+        self.assertEqual(self._get(platform_analytics, days='x').status_code, 400)
+
+    def test_platform_analytics_builds_missing_snapshot(self):
+        self._sale(self.shop_outlet, "10.00", self.yesterday)
+        data = self._get(platform_analytics).data
+        self.assertEqual(data['total_revenue'], 10.0)
+        self.assertTrue(PlatformDailyMetrics.objects.filter(day=self.today).exists())
+
+    def test_tenant_analytics(self):
+        self._sale(self.shop_outlet, "10.00", self.yesterday)
+        self._sale(self.shop_outlet, "2.50", self.today)
+        call_command('rebuild_platform_metrics', since=self.yesterday.isoformat(), stdout=open('/dev/null', 'w'))
+
+        data = self._get(tenant_analytics, self.shop.id).data
+        self.assertEqual((data['revenue'], data['sales_count']), (12.5, 2))
+        self.assertEqual([day['revenue'] for day in data['history']], [10.0, 2.5])
+        self.assertEqual(self._get(tenant_analytics, 0).status_code, 404)
+
+    def test_rebuild_rejects_impossible_dates(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_platform_metrics', since='2026-02-30', stdout=open('/dev/null', 'w'))
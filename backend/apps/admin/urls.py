@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AdminTenantViewSet, platform_analytics
+from .views import AdminTenantViewSet, platform_analytics, tenant_analytics
 
 router = DefaultRouter()
 router.register(r'admin/tenants', AdminTenantViewSet, basename='admin-tenant')
@@ -8,5 +8,6 @@ router.register(r'admin/tenants', AdminTenantViewSet, basename='admin-tenant')
 urlpatterns = [
     path('', include(router.urls)),
     path('admin/analytics/', platform_analytics, name='platform-analytics'),
+    path('admin/analytics/tenants/<int:tenant_id>/', tenant_analytics, name='tenant-analytics'),
 ]
 
@@ -4,15 +4,16 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count, Sum, Q
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from datetime import timedelta
 from apps.tenants.models import Tenant
 from apps.tenants.serializers import TenantSerializer
 from apps.tenants.permissions import IsSaaSAdmin
-from apps.outlets.models import Outlet
-from apps.accounts.models import User
-from apps.sales.models import Sale
+from primepos.db_routing import replica_reads
+from .metrics import TENANT_HISTORY_FIELDS, history, refresh_platform_metrics
+from .models import PlatformDailyMetrics, TenantDailyMetrics
+
+MAX_HISTORY_DAYS = 366
 
 
 class AdminTenantViewSet(viewsets.ModelViewSet):
@@ -58,35 +59,65 @@ class AdminTenantViewSet(viewsets.ModelViewSet):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsSaaSAdmin])
+@replica_reads
 def platform_analytics(request):
-    """Platform-wide analytics for SaaS admin"""
-    # Total tenants
-    total_tenants = Tenant.objects.count()
-    active_tenants = Tenant.objects.filter(is_active=True).count()
-    
-    # Total outlets
-    total_outlets = Outlet.objects.count()
+    """
+    Platform-wide analytics for SaaS admin
     
-    # Total users
-    total_users = User.objects.count()
+    Read from the daily platform metrics snapshot (refreshed by the
+    platform_admin.refresh_platform_metrics task), with `days` days of
+    history (default 30, at most MAX_HISTORY_DAYS).
+    """
+    days, error = _history_days(request)
+    if error:
+        return error
     
-    # Revenue (from all sales)
-    total_revenue = Sale.objects.aggregate(Sum('total'))['total__sum'] or 0
+    rows = list(PlatformDailyMetrics.objects.order_by('-day')[:days])
+    if not rows:
+        # No snapshot yet (first call after deploying); build today's
+        today = timezone.localdate()
+        rows = refresh_platform_metrics(today, today)
+    latest = max(rows, key=lambda row: row.day)
     
-    # Tenant growth (last 30 days)
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    new_tenants = Tenant.objects.filter(created_at__gte=thirty_days_ago).count()
+    return Response({
+        'total_tenants': latest.tenants,
+        'active_tenants': latest.active_tenants,
+        'total_outlets': latest.outlets,
+        'total_users': latest.users,
+        'total_revenue': float(latest.total_revenue),
+        'total_sales': latest.total_sales,
+        'new_tenants_30d': latest.new_tenants_30d,
+        'type_distribution': latest.type_distribution,
+        'as_of': latest.updated_at,
+        'history': history(rows),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsSaaSAdmin])
+@replica_reads
+def tenant_analytics(request, tenant_id):
+    """Daily sales and size history of one tenant for SaaS admin"""
+    days, error = _history_days(request)
+    if error:
+        return error
     
-    # Business type distribution
-    type_distribution = Tenant.objects.values('type').annotate(count=Count('id'))
+    tenant = get_object_or_404(Tenant, pk=tenant_id)
+    rows = list(TenantDailyMetrics.objects.filter(tenant=tenant).order_by('-day')[:days])
     
     return Response({
-        'total_tenants': total_tenants,
-        'active_tenants': active_tenants,
-        'total_outlets': total_outlets,
-        'total_users': total_users,
-        'total_revenue': float(total_revenue),
-        'new_tenants_30d': new_tenants,
-        'type_distribution': list(type_distribution),
+        'tenant': tenant.id,
+        'tenant_name': tenant.name,
+        'revenue': float(sum(row.revenue for row in rows)),
+        'sales_count': sum(row.sales_count for row in rows),
+        'history': history(rows, TENANT_HISTORY_FIELDS),
     })
 
+
+def _history_days(request):
+    """Days of history requested, or an error response"""
+    try:
+        days = int(request.query_params.get('days', 30))
+    except (TypeError, ValueError):
+        return None, Response({"detail": "days must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    return min(max(days, 1), MAX_HISTORY_DAYS), None
@@ -23,7 +23,7 @@ class TabAdmin(admin.ModelAdmin):
     search_fields = ['tab_number', 'customer_name', 'customer__name']
     ordering = ['-opened_at']
     inlines = [TabItemInline]
-    readonly_fields = ['tab_number', 'subtotal', 'total', 'opened_at', 'closed_at']
+    readonly_fields = ['tab_number', 'subtotal', 'total', 'item_count', 'opened_at', 'closed_at']
 
 
 @admin.register(TabItem)
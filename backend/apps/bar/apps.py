@@ -5,3 +5,7 @@ class BarConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.bar'
     verbose_name = 'Bar Management'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.bar.signals  # noqa
@@ -0,0 +1,33 @@
+"""
+Management command to reconcile bar tab totals from their items
+Tab totals are maintained incrementally; this repairs any drift
+"""
+from django.core.management.base import BaseCommand
+from apps.bar.models import Tab
+from apps.bar.services import TabService
+
+
+class Command(BaseCommand):
+    help = 'Recompute bar tab subtotal/total/item_count from tab items'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            type=int,
+            help='Reconcile only tabs for a specific tenant ID',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Include closed and merged tabs (default: open tabs only)',
+        )
+
+    def handle(self, *args, **options):
+        tabs = Tab.objects.all()
+        if not options['all']:
+            tabs = tabs.filter(status='open')
+        if options.get('tenant'):
+            tabs = tabs.filter(tenant_id=options['tenant'])
+
+        count = TabService.reconcile(tabs.iterator())
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {count} tab(s)'))
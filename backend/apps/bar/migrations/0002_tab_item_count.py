@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:12
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_item_count(apps, schema_editor):
+    """Backfill item_count and totals for existing tabs from their items"""
+    Tab = apps.get_model('bar', 'Tab')
+    TabItem = apps.get_model('bar', 'TabItem')
+    totals = {
+        row['tab_id']: row
+        for row in TabItem.objects.filter(is_voided=False).values('tab_id').annotate(
+            subtotal=Sum('total'), item_count=Sum('quantity')
+        )
+    }
+    tabs = list(Tab.objects.filter(pk__in=totals.keys()))
+    for tab in tabs:
+        row = totals[tab.pk]
+        tab.item_count = row['item_count'] or 0
+        tab.subtotal = row['subtotal'] or 0
+        tab.total = tab.subtotal - tab.discount + tab.tax
+    Tab.objects.bulk_update(tabs, ['item_count', 'subtotal', 'total'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bar', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tab',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0, help_text='Total quantity of non-voided items (maintained incrementally)'),
+        ),
+        migrations.RunPython(populate_item_count, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@
 Bar Management Models - Tabs, Tables, and Bar-specific functionality
 """
 from django.db import models
+from django.db.models import F, Sum
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from decimal import Decimal
@@ -12,6 +13,7 @@ from apps.outlets.models import Outlet
 from apps.accounts.models import User
 from apps.products.models import Product, ProductUnit
 from apps.customers.models import Customer
+from apps.outlets.floor_plan import FloorPlanService, BAR
 
 
 class BarTable(models.Model):
@@ -157,7 +159,7 @@ class Tab(models.Model):
     opened_at = models.DateTimeField(auto_now_add=True)
     closed_at = models.DateTimeField(null=True, blank=True)
     
-    # Financial summary (updated on each item add/remove)
+    # Financial summary (maintained incrementally on each item add/void)
     subtotal = models.DecimalField(
         max_digits=10, 
         decimal_places=2, 
@@ -182,6 +184,10 @@ class Tab(models.Model):
         default=Decimal('0'),
         validators=[MinValueValidator(Decimal('0'))]
     )
+    item_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Total quantity of non-voided items (maintained incrementally)"
+    )
     
     # Limit/Credit control
     credit_limit = models.DecimalField(
@@ -242,6 +248,11 @@ class Tab(models.Model):
     
     def generate_tab_number(self):
         """Generate unique tab number: TAB-YYYYMMDD-XXXX"""
+        return Tab.generate_tab_numbers(1)[0]
+    
+    @staticmethod
+    def generate_tab_numbers(count):
+        """Generate `count` consecutive tab numbers with a single lookup"""
         today = timezone.now().strftime('%Y%m%d')
         prefix = f"TAB-{today}-"
         
@@ -259,21 +270,58 @@ class Tab(models.Model):
         else:
             new_num = 1
         
-        return f"{prefix}{new_num:04d}"
+        return [f"{prefix}{num:04d}" for num in range(new_num, new_num + count)]
+    
+    def apply_item_delta(self, amount, quantity):
+        """
+        Shift the running totals by an item delta in a single UPDATE.
+
+        The arithmetic happens in the database (F expressions), so concurrent
+        bartenders adding rounds to the same tab cannot lose each other's
+        writes, and the cost does not grow with the number of items.
+        """
+        if not amount and not quantity:
+            return
+        Tab.objects.filter(pk=self.pk).update(
+            subtotal=F('subtotal') + amount,
+            total=F('total') + amount,
+            item_count=F('item_count') + quantity,
+            updated_at=timezone.now(),
+        )
+        self.refresh_from_db(fields=['subtotal', 'total', 'item_count', 'updated_at'])
+        self.floor_plan_changed()
+    
+    def set_discount(self, discount):
+        """Set the tab-level discount and derive total from the stored subtotal"""
+        Tab.objects.filter(pk=self.pk).update(
+            discount=discount,
+            total=F('subtotal') - discount + F('tax'),
+            updated_at=timezone.now(),
+        )
+        self.refresh_from_db(fields=['subtotal', 'discount', 'total', 'updated_at'])
+        self.floor_plan_changed()
+    
+    def floor_plan_changed(self):
+        """Refresh the seated table's floor plan entry (total, item count) after commit"""
+        if self.table_id:
+            FloorPlanService.tables_changed(BAR, self.outlet_id, [self.table_id])
     
     def recalculate_totals(self):
-        """Recalculate tab totals from items"""
-        items = self.items.filter(is_voided=False)
-        self.subtotal = sum(item.total for item in items)
+        """
+        Reconcile tab totals from its items.
+
+        Item writes keep the totals current through apply_item_delta(), so
+        this full recompute is only needed to repair drift (admin edits, raw
+        SQL, data imports).
+        """
+        totals = self.items.filter(is_voided=False).aggregate(
+            subtotal=Sum('total'),
+            item_count=Sum('quantity'),
+        )
+        self.subtotal = totals['subtotal'] or Decimal('0')
+        self.item_count = totals['item_count'] or 0
         self.total = self.subtotal - self.discount + self.tax
-        self.save(update_fields=['subtotal', 'total', 'updated_at'])
-    
-    @property
-    def item_count(self):
-        """Get total number of items on tab"""
-        return self.items.filter(is_voided=False).aggregate(
-            total=models.Sum('quantity')
-        )['total'] or 0
+        self.save(update_fields=['subtotal', 'item_count', 'total', 'updated_at'])
     
     @property
     def display_name(self):
@@ -373,13 +421,47 @@ class TabItem(models.Model):
     def __str__(self):
         return f"{self.quantity}x {self.product.name} - {self.tab.tab_number}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this row contributes to the tab so save() can apply a delta
+        if not {'total', 'quantity', 'is_voided'} & instance.get_deferred_fields():
+            instance._persisted_contribution = instance.contribution()
+        return instance
+    
+    def calculate_total(self):
+        """Line total after the item discount"""
+        return (self.price * self.quantity) - self.discount
+    
+    def contribution(self):
+        """(amount, quantity) this item adds to its tab's running totals"""
+        if self.is_voided or self.total is None:
+            return Decimal('0'), 0
+        return self.total, self.quantity
+    
     def save(self, *args, **kwargs):
         # Calculate total before saving
-        self.total = (self.price * self.quantity) - self.discount
+        self.total = self.calculate_total()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'total' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['total']
+        
+        if self._state.adding:
+            previous = (Decimal('0'), 0)
+        else:
+            previous = getattr(self, '_persisted_contribution', None)
+            if previous is None:
+                persisted = TabItem.objects.filter(pk=self.pk).values('total', 'quantity', 'is_voided').first()
+                if persisted and not persisted['is_voided']:
+                    previous = (persisted['total'], persisted['quantity'])
+                else:
+                    previous = (Decimal('0'), 0)
+        
         super().save(*args, **kwargs)
         
-        # Recalculate tab totals
-        self.tab.recalculate_totals()
+        current = self.contribution()
+        self._persisted_contribution = current
+        self.tab.apply_item_delta(current[0] - previous[0], current[1] - previous[1])
     
     def void(self, voided_by, reason=''):
         """Void this item (soft delete)"""
@@ -387,7 +469,7 @@ class TabItem(models.Model):
         self.voided_by = voided_by
         self.voided_at = timezone.now()
         self.void_reason = reason
-        self.save()
+        self.save(update_fields=['is_voided', 'voided_by', 'voided_at', 'void_reason', 'updated_at'])
 
 
 class TabTransfer(models.Model):
@@ -66,7 +66,7 @@ class TabItemSerializer(serializers.ModelSerializer):
 class TabItemCreateSerializer(serializers.Serializer):
     """Serializer for adding items to a tab"""
     product_id = serializers.IntegerField()
-    unit_id = serializers.UUIDField(required=False, allow_null=True)
+    unit_id = serializers.IntegerField(required=False, allow_null=True)
     quantity = serializers.IntegerField(min_value=1, default=1)
     price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
     discount = serializers.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'))
@@ -208,6 +208,27 @@ class TransferTabSerializer(serializers.Serializer):
         return value
 
 
+class TabMoveSerializer(serializers.Serializer):
+    """A single tab move within a bulk transfer"""
+    tab_id = serializers.UUIDField()
+    to_table_id = serializers.UUIDField(required=False, allow_null=True)
+
+
+class BulkTransferTabsSerializer(serializers.Serializer):
+    """Serializer for moving several tabs between tables at once"""
+    moves = TabMoveSerializer(many=True, allow_empty=False)
+    reason = serializers.CharField(required=False, allow_blank=True, default='')
+    
+    def validate_moves(self, value):
+        tab_ids = [move['tab_id'] for move in value]
+        if len(set(tab_ids)) != len(tab_ids):
+            raise serializers.ValidationError("Each tab can only be moved once")
+        table_ids = [move['to_table_id'] for move in value if move.get('to_table_id')]
+        if len(set(table_ids)) != len(table_ids):
+            raise serializers.ValidationError("Each table can only receive one tab")
+        return value
+
+
 class MergeTabsSerializer(serializers.Serializer):
     """Serializer for merging multiple tabs into one"""
     source_tab_ids = serializers.ListField(
@@ -228,13 +249,13 @@ class MergeTabsSerializer(serializers.Serializer):
         return value
     
     def validate_source_tab_ids(self, value):
+        tabs = Tab.objects.only('id', 'tab_number', 'status').in_bulk(value)
         for tab_id in value:
-            try:
-                tab = Tab.objects.get(id=tab_id)
-                if tab.status != 'open':
-                    raise serializers.ValidationError(f"Tab {tab.tab_number} is not open")
-            except Tab.DoesNotExist:
+            tab = tabs.get(tab_id)
+            if tab is None:
                 raise serializers.ValidationError(f"Tab {tab_id} not found")
+            if tab.status != 'open':
+                raise serializers.ValidationError(f"Tab {tab.tab_number} is not open")
         return value
     
     def validate(self, data):
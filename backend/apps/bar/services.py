@@ -0,0 +1,279 @@
+"""
+Bar tab services - set-based item writes that keep tab totals incremental
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, F, Sum, TextField, UUIDField, Value, When
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from apps.outlets.floor_plan import FloorPlanService, BAR
+
+from .models import BarTable, Tab, TabItem, TabMerge, TabTransfer
+
+
+class TabService:
+    """
+    Service for writing tab items and restructuring tabs.
+
+    Items are moved between tabs by re-parenting rows with UPDATE statements
+    rather than copying and voiding them one at a time, and each affected tab
+    receives a single totals delta.
+    """
+
+    @staticmethod
+    def add_items(tab, items):
+        """
+        Insert several items on a tab and update its totals once.
+
+        Args:
+            tab: Tab the items belong to
+            items: Unsaved TabItem instances (tab is assigned here)
+
+        Returns:
+            List of created TabItem instances
+        """
+        if not items:
+            return []
+
+        amount = Decimal('0')
+        quantity = 0
+        for item in items:
+            item.tab = tab
+            item.total = item.calculate_total()
+            item_amount, item_quantity = item.contribution()
+            amount += item_amount
+            quantity += item_quantity
+
+        with transaction.atomic():
+            created = TabItem.objects.bulk_create(items)
+            tab.apply_item_delta(amount, quantity)
+
+        for item in created:
+            item._persisted_contribution = item.contribution()
+        return created
+
+    @staticmethod
+    def reconcile(tabs):
+        """
+        Recompute totals from items for the given tabs.
+
+        Args:
+            tabs: Iterable of Tab instances or a Tab queryset
+
+        Returns:
+            Number of tabs reconciled
+        """
+        count = 0
+        for tab in tabs:
+            tab.recalculate_totals()
+            count += 1
+        return count
+
+    @staticmethod
+    def merge_tabs(target, sources, user, reason=''):
+        """
+        Merge open tabs into a target tab.
+
+        Non-voided items are re-parented onto the target in one UPDATE (their
+        notes are prefixed with the source tab number); voided items stay on
+        the source tab for the audit trail. Source tabs are marked merged and
+        their tables released.
+
+        Args:
+            target: Tab receiving the items
+            sources: Tabs to merge into target
+            user: User performing the merge
+            reason: Optional reason recorded on each TabMerge
+
+        Returns:
+            List of created TabMerge records
+        """
+        sources = list(sources)
+        if not sources:
+            return []
+        source_ids = [tab.pk for tab in sources]
+        now = timezone.now()
+
+        with transaction.atomic():
+            moving = TabItem.objects.filter(tab_id__in=source_ids, is_voided=False)
+            moved = moving.aggregate(amount=Sum('total'), quantity=Sum('quantity'))
+
+            merges = TabMerge.objects.bulk_create([
+                TabMerge(
+                    target_tab=target,
+                    source_tab=source,
+                    source_total=source.total,
+                    merged_by=user,
+                    reason=reason,
+                )
+                for source in sources
+            ])
+
+            moving.update(
+                tab=target,
+                notes=Concat(
+                    Case(
+                        *[
+                            When(tab_id=source.pk, then=Value(f"[From Tab #{source.tab_number}] "))
+                            for source in sources
+                        ],
+                        default=Value(''),
+                        output_field=TextField(),
+                    ),
+                    F('notes'),
+                    output_field=TextField(),
+                ),
+                updated_at=now,
+            )
+
+            BarTable.objects.filter(current_tab_id__in=source_ids).update(
+                current_tab=None, status='available', updated_at=now
+            )
+            Tab.objects.filter(pk__in=source_ids).update(
+                status='merged',
+                merged_into=target,
+                closed_at=now,
+                closed_by=user,
+                subtotal=Decimal('0'),
+                total=Decimal('0'),
+                item_count=0,
+                updated_at=now,
+            )
+            target.apply_item_delta(moved['amount'] or Decimal('0'), moved['quantity'] or 0)
+            TabService._tables_changed(
+                target.outlet_id, [source.table_id for source in sources]
+            )
+
+        return merges
+
+    @staticmethod
+    def split_by_items(tab, item_groups, user):
+        """
+        Split a tab by moving groups of items onto new tabs.
+
+        The first group stays on the original tab; every other group becomes a
+        new tab. Item ids that are not live items of `tab` are ignored.
+
+        Args:
+            tab: Tab being split
+            item_groups: List of item id lists
+            user: User performing the split
+
+        Returns:
+            List of new Tab instances (one per moved group)
+        """
+        groups = [list(ids) for ids in item_groups[1:]]
+        if not groups:
+            return []
+
+        all_ids = {item_id for ids in groups for item_id in ids}
+        live = {
+            row['id']: row
+            for row in tab.items.filter(id__in=all_ids, is_voided=False).values('id', 'total', 'quantity')
+        }
+
+        with transaction.atomic():
+            numbers = Tab.generate_tab_numbers(len(groups))
+            new_tabs = Tab.objects.bulk_create([
+                Tab(
+                    tenant_id=tab.tenant_id,
+                    outlet_id=tab.outlet_id,
+                    tab_number=numbers[idx],
+                    customer_name=f"{tab.display_name} (Split {idx + 2})",
+                    opened_by=user,
+                    notes=f"Split from Tab #{tab.tab_number}",
+                )
+                for idx in range(len(groups))
+            ])
+
+            moved_amount = Decimal('0')
+            moved_quantity = 0
+            seen = set()
+            for new_tab, ids in zip(new_tabs, groups):
+                # An item listed in several groups goes to the first one
+                group_ids = [item_id for item_id in ids if item_id in live and item_id not in seen]
+                seen.update(group_ids)
+                if not group_ids:
+                    continue
+                amount = sum((live[item_id]['total'] for item_id in group_ids), Decimal('0'))
+                quantity = sum(live[item_id]['quantity'] for item_id in group_ids)
+
+                TabItem.objects.filter(id__in=group_ids).update(tab=new_tab, updated_at=timezone.now())
+                new_tab.apply_item_delta(amount, quantity)
+                moved_amount += amount
+                moved_quantity += quantity
+
+            tab.apply_item_delta(-moved_amount, -moved_quantity)
+
+        return new_tabs
+
+    @staticmethod
+    def transfer_tabs(moves, user, reason=''):
+        """
+        Move tabs between tables.
+
+        Old tables are released and new tables occupied with one UPDATE each,
+        and the TabTransfer history is written with a single bulk insert.
+        Releasing happens first, so tabs can swap tables within one call.
+
+        Args:
+            moves: List of (tab, to_table) pairs; to_table may be None (walk-up)
+            user: User performing the transfer
+            reason: Optional reason recorded on each TabTransfer
+
+        Returns:
+            List of created TabTransfer records
+        """
+        if not moves:
+            return []
+        now = timezone.now()
+        tab_ids = [tab.pk for tab, _ in moves]
+
+        with transaction.atomic():
+            transfers = TabTransfer.objects.bulk_create([
+                TabTransfer(
+                    tab=tab,
+                    from_table_id=tab.table_id,
+                    to_table=to_table,
+                    transferred_by=user,
+                    reason=reason,
+                )
+                for tab, to_table in moves
+            ])
+
+            BarTable.objects.filter(current_tab_id__in=tab_ids).update(
+                current_tab=None, status='available', updated_at=now
+            )
+            Tab.objects.filter(pk__in=tab_ids).update(
+                table_id=Case(
+                    *[When(pk=tab.pk, then=Value(to_table.pk if to_table else None)) for tab, to_table in moves],
+                    output_field=UUIDField(),
+                ),
+                updated_at=now,
+            )
+            seated = [(tab, to_table) for tab, to_table in moves if to_table is not None]
+            if seated:
+                BarTable.objects.filter(pk__in=[to_table.pk for _, to_table in seated]).update(
+                    current_tab_id=Case(
+                        *[When(pk=to_table.pk, then=Value(tab.pk)) for tab, to_table in seated],
+                        output_field=UUIDField(),
+                    ),
+                    status='occupied',
+                    updated_at=now,
+                )
+
+            TabService._tables_changed(
+                moves[0][0].outlet_id,
+                [tab.table_id for tab, _ in moves] + [to_table.pk for _, to_table in seated],
+            )
+
+        for tab, to_table in moves:
+            tab.table = to_table
+        return transfers
+
+    @staticmethod
+    def _tables_changed(outlet_id, table_ids):
+        """Refresh floor plan entries for tables touched by a queryset update"""
+        FloorPlanService.tables_changed(BAR, outlet_id, table_ids)
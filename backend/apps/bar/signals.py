@@ -0,0 +1,20 @@
+"""
+Django signals keeping the bar floor plan snapshot current
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.outlets.floor_plan import FloorPlanService, BAR
+from .models import BarTable, Tab
+
+
+@receiver(post_save, sender=BarTable)
+@receiver(post_delete, sender=BarTable)
+def refresh_bar_floor_plan(sender, instance, **kwargs):
+    """Refresh the table's floor plan entry (status, current tab) after commit"""
+    FloorPlanService.tables_changed(BAR, instance.outlet_id, [instance.pk])
+
+
+@receiver(post_save, sender=Tab)
+def refresh_floor_plan_for_tab(sender, instance, **kwargs):
+    """Tab edits (customer name, status) show on the seated table"""
+    instance.floor_plan_changed()
@@ -0,0 +1,132 @@
+"""
+Bulk merge/split/transfer tests for bar tabs
+"""
+
+import uuid
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.bar.models import BarTable, Tab, TabItem, TabMerge, TabTransfer
+from apps.bar.services import TabService
+from apps.bar.views import TabViewSet
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.tenants.models import Tenant
+
+
+class TabRestructuringTests(TestCase):
+    """Test set-based tab merge, split and transfer"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Bar Tenant")
+        self.user = User.objects.create_user(username="bartender", email="bar@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Bar")
+        self.product = Product.objects.create(
+            tenant=self.tenant, outlet=self.outlet, name="Lager", retail_price=Decimal("5.00")
+        )
+
+    def _open_tab(self, table=None, items=1):
+        tab = Tab.objects.create(tenant=self.tenant, outlet=self.outlet, opened_by=self.user, table=table)
+        if table:
+            table.open_tab(tab)
+        TabService.add_items(tab, [
+            TabItem(product=self.product, quantity=1, price=Decimal("5.00"), added_by=self.user)
+            for _ in range(items)
+        ])
+        return tab
+
+    def _table(self, number):
+        return BarTable.objects.create(tenant=self.tenant, outlet=self.outlet, number=number)
+
+    def test_merge_ten_tabs_in_constant_queries(self):
+        """Merging re-parents items in one UPDATE regardless of source count"""
+        target = self._open_tab(items=2)
+        sources = [self._open_tab(table=self._table(f"T{i}"), items=3) for i in range(10)]
+        voided = TabItem.objects.filter(tab=sources[0]).first()
+        voided.void(self.user, "Wrong drink")
+
+        with self.assertNumQueries(9):
+            TabService.merge_tabs(target, sources, self.user, reason="Party")
+
+        target.refresh_from_db()
+        self.assertEqual(target.item_count, 2 + 29)
+        self.assertEqual(target.subtotal, Decimal("155.00"))
+        # Incremental totals agree with a full reconcile
+        target.recalculate_totals()
+        self.assertEqual(target.subtotal, Decimal("155.00"))
+
+        self.assertEqual(TabMerge.objects.filter(target_tab=target).count(), 10)
+        self.assertFalse(BarTable.objects.filter(status='occupied').exists())
+        self.assertEqual(Tab.objects.filter(status='merged', merged_into=target).count(), 10)
+        # Voided items stay with their source tab for the audit trail
+        self.assertEqual(TabItem.objects.get(pk=voided.pk).tab_id, sources[0].pk)
+        moved = TabItem.objects.filter(tab=target, notes__startswith=f"[From Tab #{sources[1].tab_number}]")
+        self.assertEqual(moved.count(), 3)
+
+    def test_split_by_items_moves_groups(self):
+        """Split moves item groups to new tabs and adjusts both sides once"""
+        tab = self._open_tab(items=5)
+        ids = list(tab.items.values_list('id', flat=True))
+
+        new_tabs = TabService.split_by_items(tab, [ids[:1], ids[1:3], ids[3:] + [uuid.uuid4()]], self.user)
+
+        self.assertEqual(len(new_tabs), 2)
+        self.assertEqual(len({t.tab_number for t in new_tabs}), 2)
+        tab.refresh_from_db()
+        self.assertEqual(tab.item_count, 1)
+        self.assertEqual(tab.subtotal, Decimal("5.00"))
+        for new_tab in new_tabs:
+            new_tab.refresh_from_db()
+            self.assertEqual(new_tab.item_count, 2)
+            self.assertEqual(new_tab.total, Decimal("10.00"))
+
+    def test_transfer_swaps_tables(self):
+        """Bulk transfer can swap two tabs' tables and records history"""
+        table_a, table_b = self._table("A"), self._table("B")
+        tab_a, tab_b = self._open_tab(table=table_a), self._open_tab(table=table_b)
+
+        transfers = TabService.transfer_tabs([(tab_a, table_b), (tab_b, table_a)], self.user, reason="Swap")
+
+        self.assertEqual(len(transfers), 2)
+        self.assertEqual(TabTransfer.objects.count(), 2)
+        table_a.refresh_from_db()
+        table_b.refresh_from_db()
+        self.assertEqual(table_a.current_tab_id, tab_b.pk)
+        self.assertEqual(table_b.current_tab_id, tab_a.pk)
+        self.assertEqual(Tab.objects.get(pk=tab_a.pk).table_id, table_b.pk)
+
+    def test_transfer_to_walk_up_releases_table(self):
+        """Transferring to no table frees the old one"""
+        table = self._table("C")
+        tab = self._open_tab(table=table)
+
+        TabService.transfer_tabs([(tab, None)], self.user)
+
+        table.refresh_from_db()
+        self.assertEqual(table.status, 'available')
+        self.assertIsNone(table.current_tab_id)
+        self.assertIsNone(Tab.objects.get(pk=tab.pk).table_id)
+
+    def test_merge_endpoint_is_tenant_scoped(self):
+        """The merge action only merges tabs belonging to the request tenant"""
+        target, source = self._open_tab(), self._open_tab(items=2)
+        other_tenant = Tenant.objects.create(name="Other Bar")
+        foreign = Tab.objects.create(tenant=other_tenant, opened_by=self.user)
+
+        def merge(source_ids):
+            request = APIRequestFactory().post('/api/v1/bar/tabs/merge/', {
+                'target_tab_id': str(target.pk), 'source_tab_ids': [str(pk) for pk in source_ids],
+            }, format='json')
+            force_authenticate(request, user=self.user)
+            request.tenant = self.tenant
+            return TabViewSet.as_view({'post': 'merge'})(request)
+
+        self.assertEqual(merge([foreign.pk]).status_code, 404)
+        response = merge([source.pk])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['merged_count'], 1)
+        self.assertEqual(response.data['target_tab']['item_count'], 3)
+        self.assertEqual(len(response.data['target_tab']['items']), 3)
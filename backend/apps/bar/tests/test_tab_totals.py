@@ -0,0 +1,103 @@
+"""
+Incremental bar tab totals tests
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.bar.models import Tab, TabItem
+from apps.bar.services import TabService
+from apps.bar.views import TabViewSet
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.tenants.models import Tenant
+
+
+class TabTotalsTests(TestCase):
+    """Test that item writes maintain tab totals with deltas"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Bar Tenant")
+        self.user = User.objects.create_user(username="bartender", email="bar@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Bar")
+        self.product = Product.objects.create(
+            tenant=self.tenant, outlet=self.outlet, name="Lager", retail_price=Decimal("5.00")
+        )
+        self.tab = Tab.objects.create(tenant=self.tenant, outlet=self.outlet, opened_by=self.user)
+
+    def _item(self, quantity=1, price="5.00", discount="0"):
+        return TabItem(
+            product=self.product,
+            quantity=quantity,
+            price=Decimal(price),
+            discount=Decimal(discount),
+            added_by=self.user,
+        )
+
+    def _assert_totals(self, subtotal, item_count):
+        tab = Tab.objects.get(pk=self.tab.pk)
+        self.assertEqual(tab.subtotal, Decimal(subtotal))
+        self.assertEqual(tab.total, Decimal(subtotal) - tab.discount + tab.tax)
+        self.assertEqual(tab.item_count, item_count)
+
+    def test_add_and_void_apply_deltas(self):
+        """Adding and voiding items shift totals without re-reading items"""
+        first = TabItem.objects.create(tab=self.tab, product=self.product, quantity=2, price=Decimal("5.00"))
+        self._assert_totals("10.00", 2)
+
+        # Adding to a tab that already has items costs the same number of queries
+        with self.assertNumQueries(3):
+            TabItem.objects.create(tab=self.tab, product=self.product, quantity=1, price=Decimal("4.00"))
+        self._assert_totals("14.00", 3)
+
+        first.void(self.user, "Spilled")
+        self._assert_totals("4.00", 1)
+        self.assertEqual(self.tab.total, Decimal("4.00"))
+
+    def test_editing_an_item_applies_difference(self):
+        """Changing quantity on a saved item adjusts totals by the difference"""
+        item = TabItem.objects.create(tab=self.tab, product=self.product, quantity=1, price=Decimal("5.00"))
+        item = TabItem.objects.get(pk=item.pk)
+        item.quantity = 3
+        item.save()
+        self._assert_totals("15.00", 3)
+
+    def test_bulk_add_updates_totals_once(self):
+        """TabService.add_items inserts a round with one INSERT and one tab UPDATE"""
+        items = [self._item(quantity=1) for _ in range(50)] + [self._item(quantity=2, discount="1.00")]
+        # Savepoint, bulk INSERT, tab UPDATE, tab refresh, savepoint release
+        with self.assertNumQueries(5):
+            created = TabService.add_items(self.tab, items)
+        self.assertEqual(len(created), 51)
+        self._assert_totals("259.00", 52)
+
+    def test_reconcile_repairs_drift(self):
+        """recalculate_totals rebuilds totals from the items"""
+        TabService.add_items(self.tab, [self._item(quantity=2), self._item(quantity=1)])
+        Tab.objects.filter(pk=self.tab.pk).update(subtotal=Decimal("0"), total=Decimal("0"), item_count=0)
+
+        self.tab.refresh_from_db()
+        self.tab.recalculate_totals()
+        self._assert_totals("15.00", 3)
+
+    def test_add_items_endpoint(self):
+        """The add_items action writes the round through the bulk path"""
+        factory = APIRequestFactory()
+        payload = {'items': [
+            {'product_id': self.product.id, 'quantity': 2},
+            {'product_id': self.product.id, 'quantity': 1, 'price': '3.00'},
+            {'product_id': 999999, 'quantity': 1},
+        ]}
+        request = factory.post(f'/api/v1/bar/tabs/{self.tab.pk}/add_items/', payload, format='json')
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        response = TabViewSet.as_view({'post': 'add_items'})(request, pk=str(self.tab.pk))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['items']), 2)
+        self.assertEqual(response.data['errors'][0]['index'], 2)
+        self.assertEqual(response.data['tab_total'], 13.0)
+        self._assert_totals("13.00", 3)
@@ -12,16 +12,19 @@ from decimal import Decimal
 
 from apps.tenants.permissions import TenantFilterMixin
 from apps.customers.models import Customer
+from apps.outlets.floor_plan import FloorPlanService, BAR
+from apps.products.models import Product, ProductUnit
 from apps.sales.models import Sale, SaleItem
 from apps.shifts.models import Shift
 
-from .models import BarTable, Tab, TabItem, TabTransfer, TabMerge
+from .models import BarTable, Tab, TabItem, TabTransfer
+from .services import TabService
 from .serializers import (
     BarTableSerializer,
     TabSerializer, TabListSerializer, TabItemSerializer, TabItemCreateSerializer,
     OpenTabSerializer, CloseTabSerializer, TransferTabSerializer,
-    MergeTabsSerializer, SplitTabSerializer, VoidItemSerializer,
-    TabTransferSerializer, TabMergeSerializer
+    MergeTabsSerializer, SplitTabSerializer, VoidItemSerializer, BulkTransferTabsSerializer,
+    TabTransferSerializer
 )
 
 
@@ -82,13 +85,25 @@ class BarTableViewSet(TenantFilterMixin, viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def floor_plan(self, request):
-        """Get all tables formatted for floor plan display"""
-        queryset = self.get_queryset().filter(is_active=True)
-        serializer = self.get_serializer(queryset, many=True)
+        """
+        Get all tables formatted for floor plan display
+        Served from the cached per-outlet snapshot; live changes are pushed on
+        ws/floor-plan/<outlet_id>/.
+        """
+        outlet = self.get_outlet_for_request(request)
+        if outlet:
+            snapshot = FloorPlanService.get_snapshot(BAR, outlet.id)
+            tables = snapshot['tables']
+            version = snapshot['version']
+        else:
+            # No outlet selected: build the tenant-wide plan directly
+            queryset = self.get_queryset().filter(is_active=True).select_related('current_tab__customer')
+            tables = self.get_serializer(queryset, many=True).data
+            version = None
         
         # Group by location
         locations = {}
-        for table in serializer.data:
+        for table in tables:
             location = table.get('location') or 'Main Area'
             if location not in locations:
                 locations[location] = []
@@ -96,13 +111,9 @@ class BarTableViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         
         return Response({
             'locations': locations,
-            'tables': serializer.data,
-            'summary': {
-                'total': queryset.count(),
-                'available': queryset.filter(status='available').count(),
-                'occupied': queryset.filter(status='occupied').count(),
-                'reserved': queryset.filter(status='reserved').count(),
-            }
+            'tables': tables,
+            'summary': FloorPlanService.summarize(tables),
+            'version': version,
         })
 
 
@@ -136,7 +147,7 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         
         return queryset.select_related(
             'customer', 'table', 'opened_by', 'closed_by'
-        ).prefetch_related('items__product', 'items__variation', 'items__added_by')
+        ).prefetch_related('items__product', 'items__added_by')
     
     # ==================== OPEN TAB ====================
     @action(detail=False, methods=['post'])
@@ -205,7 +216,6 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         
         # Get product and unit (variations deprecated)
         product = Product.objects.get(id=data['product_id'])
-        variation = None
         unit = None
         if data.get('unit_id'):
             unit = ProductUnit.objects.get(id=data['unit_id'])
@@ -222,7 +232,6 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         item = TabItem.objects.create(
             tab=tab,
             product=product,
-            variation=None,
             unit=unit,
             quantity=data['quantity'],
             price=price,
@@ -260,38 +269,40 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        created_items = []
+        new_items = []
         errors = []
         
-        with transaction.atomic():
-            for idx, item_data in enumerate(items_data):
-                serializer = TabItemCreateSerializer(data=item_data)
-                if not serializer.is_valid():
-                    errors.append({'index': idx, 'errors': serializer.errors})
-                    continue
-                
-                data = serializer.validated_data
-                product = Product.objects.get(id=data['product_id'])
-                unit = None
-                if data.get('unit_id'):
-                    unit = ProductUnit.objects.get(id=data['unit_id'])
+        for idx, item_data in enumerate(items_data):
+            serializer = TabItemCreateSerializer(data=item_data)
+            if not serializer.is_valid():
+                errors.append({'index': idx, 'errors': serializer.errors})
+                continue
+            new_items.append(serializer.validated_data)
+        
+        products = Product.objects.in_bulk({data['product_id'] for data in new_items})
+        units = ProductUnit.objects.in_bulk({data['unit_id'] for data in new_items if data.get('unit_id')})
+        
+        pending = []
+        for data in new_items:
+            product = products[data['product_id']]
+            unit = units.get(data['unit_id']) if data.get('unit_id') else None
 
-                price = data.get('price')
-                if price is None:
-                    price = unit.retail_price if unit else product.price
+            price = data.get('price')
+            if price is None:
+                price = unit.retail_price if unit else product.price
 
-                item = TabItem.objects.create(
-                    tab=tab,
-                    product=product,
-                    variation=None,
-                    unit=unit,
-                    quantity=data['quantity'],
-                    price=price,
-                    discount=data.get('discount', Decimal('0')),
-                    added_by=request.user,
-                    notes=data.get('notes', ''),
-                )
-                created_items.append(item)
+            pending.append(TabItem(
+                product=product,
+                unit=unit,
+                quantity=data['quantity'],
+                price=price,
+                discount=data.get('discount', Decimal('0')),
+                added_by=request.user,
+                notes=data.get('notes', ''),
+            ))
+        
+        # One INSERT for the round and one UPDATE for the tab totals
+        created_items = TabService.add_items(tab, pending)
         
         return Response({
             'items': TabItemSerializer(created_items, many=True).data,
@@ -370,9 +381,7 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
                 )
         
         # Update tab
-        tab.discount = discount_amount
-        tab.total = tab.subtotal - discount_amount + tab.tax
-        tab.save(update_fields=['discount', 'total', 'updated_at'])
+        tab.set_discount(discount_amount)
         
         return Response({
             'tab': TabSerializer(tab).data,
@@ -417,8 +426,7 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
             if data.get('discount_type') == 'percentage':
                 additional_discount = (tab.subtotal * additional_discount) / 100
             
-            tab.discount = additional_discount
-            tab.recalculate_totals()
+            tab.set_discount(additional_discount)
             
             # Get active shift
             shift = Shift.objects.filter(
@@ -542,35 +550,66 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
         
-        with transaction.atomic():
-            from_table = tab.table
-            to_table = None
-            
-            if data.get('to_table_id'):
-                to_table = BarTable.objects.get(id=data['to_table_id'])
-            
-            # Record the transfer
-            TabTransfer.objects.create(
-                tab=tab,
-                from_table=from_table,
-                to_table=to_table,
-                transferred_by=request.user,
-                reason=data.get('reason', ''),
-            )
-            
-            # Release old table
-            if from_table:
-                from_table.close_tab()
-            
-            # Assign to new table
-            tab.table = to_table
-            tab.save(update_fields=['table', 'updated_at'])
-            
-            if to_table:
-                to_table.open_tab(tab)
+        to_table = None
+        if data.get('to_table_id'):
+            to_table = BarTable.objects.get(id=data['to_table_id'])
+        
+        TabService.transfer_tabs([(tab, to_table)], request.user, data.get('reason', ''))
         
         return Response(TabSerializer(tab).data)
     
+    @action(detail=False, methods=['post'])
+    def bulk_transfer(self, request):
+        """
+        Move several tabs between tables in one request (e.g. re-seating a party)
+        Tables may be swapped between the tabs being moved.
+        """
+        serializer = BulkTransferTabsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        tenant = self.require_tenant(request)
+        
+        moves_data = data['moves']
+        tabs = Tab.objects.filter(
+            tenant=tenant, status='open', id__in=[move['tab_id'] for move in moves_data]
+        ).in_bulk()
+        tables = BarTable.objects.filter(
+            tenant=tenant, id__in=[move['to_table_id'] for move in moves_data if move.get('to_table_id')]
+        ).in_bulk()
+        
+        moves = []
+        for move in moves_data:
+            tab = tabs.get(move['tab_id'])
+            if tab is None:
+                return Response(
+                    {'error': f"Open tab {move['tab_id']} not found"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            to_table = None
+            if move.get('to_table_id'):
+                to_table = tables.get(move['to_table_id'])
+                if to_table is None:
+                    return Response(
+                        {'error': f"Table {move['to_table_id']} not found"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                # Target must be free, or held by one of the tabs being moved
+                if to_table.status == 'out_of_service' or (
+                    to_table.current_tab_id and to_table.current_tab_id not in tabs
+                ):
+                    return Response(
+                        {'error': f"Table {to_table.number} is not available"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+            moves.append((tab, to_table))
+        
+        transfers = TabService.transfer_tabs(moves, request.user, data.get('reason', ''))
+        
+        return Response({
+            'tabs': TabListSerializer([tab for tab, _ in moves], many=True).data,
+            'transfers': TabTransferSerializer(transfers, many=True).data,
+        })
+    
     # ==================== MERGE TABS ====================
     @action(detail=False, methods=['post'])
     def merge(self, request):
@@ -581,53 +620,24 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         serializer = MergeTabsSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
+        tenant = self.require_tenant(request)
         
-        with transaction.atomic():
-            target_tab = Tab.objects.get(id=data['target_tab_id'])
-            source_tabs = Tab.objects.filter(id__in=data['source_tab_ids'])
-            
-            for source_tab in source_tabs:
-                # Record the merge
-                TabMerge.objects.create(
-                    target_tab=target_tab,
-                    source_tab=source_tab,
-                    source_total=source_tab.total,
-                    merged_by=request.user,
-                    reason=data.get('reason', ''),
-                )
-                
-                # Move items to target tab
-                for item in source_tab.items.filter(is_voided=False):
-                    # Create copy in target tab
-                    TabItem.objects.create(
-                        tab=target_tab,
-                        product=item.product,
-                        variation=item.variation,
-                        unit=item.unit,
-                        quantity=item.quantity,
-                        price=item.price,
-                        discount=item.discount,
-                        added_by=item.added_by,  # Keep original bartender
-                        notes=f"[From Tab #{source_tab.tab_number}] {item.notes}",
-                    )
-                
-                # Release table if assigned
-                if source_tab.table:
-                    source_tab.table.close_tab()
-                
-                # Mark source tab as merged
-                source_tab.status = 'merged'
-                source_tab.merged_into = target_tab
-                source_tab.closed_at = timezone.now()
-                source_tab.closed_by = request.user
-                source_tab.save()
-            
-            # Recalculate target tab totals
-            target_tab.recalculate_totals()
+        tabs = Tab.objects.filter(tenant=tenant).in_bulk(
+            [data['target_tab_id'], *data['source_tab_ids']]
+        )
+        target_tab = tabs.get(data['target_tab_id'])
+        source_tabs = [tabs[tab_id] for tab_id in data['source_tab_ids'] if tab_id in tabs]
+        if target_tab is None or len(source_tabs) != len(data['source_tab_ids']):
+            return Response(
+                {'error': 'Tab not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        TabService.merge_tabs(target_tab, source_tabs, request.user, data.get('reason', ''))
         
         return Response({
             'target_tab': TabSerializer(target_tab).data,
-            'merged_count': source_tabs.count(),
+            'merged_count': len(source_tabs),
         })
     
     # ==================== SPLIT TAB ====================
@@ -649,76 +659,37 @@ class TabViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
         
-        with transaction.atomic():
-            if data['split_type'] == 'equal':
-                # Equal split - create payment tabs
-                num_splits = data['number_of_splits']
-                amount_per_split = tab.total / num_splits
-                
-                # The original tab keeps all items but we return split amounts for payment
-                splits = []
-                for i in range(num_splits):
-                    splits.append({
-                        'split_number': i + 1,
-                        'amount': float(amount_per_split),
-                    })
-                
-                return Response({
-                    'split_type': 'equal',
-                    'original_total': float(tab.total),
-                    'splits': splits,
-                    'message': 'Process each split payment separately'
-                })
+        if data['split_type'] == 'equal':
+            # Equal split - create payment tabs
+            num_splits = data['number_of_splits']
+            amount_per_split = tab.total / num_splits
             
-            else:  # split_by_items
-                item_groups = data['item_groups']
-                new_tabs = []
-                
-                for group_idx, item_ids in enumerate(item_groups):
-                    # Skip first group - keep on original tab
-                    if group_idx == 0:
-                        continue
-                    
-                    # Create new tab
-                    new_tab = Tab.objects.create(
-                        tenant=tab.tenant,
-                        outlet=tab.outlet,
-                        customer_name=f"{tab.display_name} (Split {group_idx + 1})",
-                        opened_by=request.user,
-                        notes=f"Split from Tab #{tab.tab_number}",
-                    )
-                    
-                    # Move items to new tab
-                    for item_id in item_ids:
-                        try:
-                            item = tab.items.get(id=item_id, is_voided=False)
-                            # Create copy in new tab
-                            TabItem.objects.create(
-                                tab=new_tab,
-                                product=item.product,
-                                variation=item.variation,
-                                unit=item.unit,
-                                quantity=item.quantity,
-                                price=item.price,
-                                discount=item.discount,
-                                added_by=item.added_by,
-                                notes=item.notes,
-                            )
-                            # Void from original tab
-                            item.void(request.user, f"Split to Tab #{new_tab.tab_number}")
-                        except TabItem.DoesNotExist:
-                            continue
-                    
-                    new_tabs.append(new_tab)
-                
-                # Recalculate original tab
-                tab.recalculate_totals()
-                
-                return Response({
-                    'split_type': 'by_items',
-                    'original_tab': TabSerializer(tab).data,
-                    'new_tabs': TabListSerializer(new_tabs, many=True).data,
+            # The original tab keeps all items but we return split amounts for payment
+            splits = []
+            for i in range(num_splits):
+                splits.append({
+                    'split_number': i + 1,
+                    'amount': float(amount_per_split),
                 })
+            
+            return Response({
+                'split_type': 'equal',
+                'original_total': float(tab.total),
+                'splits': splits,
+                'message': 'Process each split payment separately'
+            })
+        
+        # split_by_items: first group stays on the original tab
+        new_tabs = TabService.split_by_items(tab, data['item_groups'], request.user)
+        
+        # Items moved off the tab; drop the stale prefetched list before serializing
+        tab._prefetched_objects_cache = {}
+        
+        return Response({
+            'split_type': 'by_items',
+            'original_tab': TabSerializer(tab).data,
+            'new_tabs': TabListSerializer(new_tabs, many=True).data,
+        })
     
     # ==================== SUMMARY/STATS ====================
     @action(detail=False, methods=['get'])
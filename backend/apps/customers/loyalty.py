@@ -0,0 +1,211 @@
+"""
+Loyalty and spend ledger
+Customer balances (total_spent, loyalty_points, last_visit) are only ever
+changed with UPDATE statements on those columns, applying deltas with F()
+expressions, so concurrent checkouts for the same customer add up instead of
+overwriting each other and never rewrite the rest of the row. Every point
+movement is recorded as a LoyaltyTransaction, written in bulk.
+
+Points earned at checkout come from the tenant's earning rules, stored in
+Tenant.settings['loyalty']['earning_rules'], for example:
+
+    [
+        {"type": "spend", "points": 1, "per": "100"},
+        {"type": "visit", "points": 5, "min_total": "1000", "payment_methods": ["cash", "mobile"]}
+    ]
+
+'spend' rules award points for every full `per` of the sale total, 'visit'
+rules a flat amount per sale. min_total and payment_methods restrict either.
+The points of a batch of sales are applied in the same UPDATE as their spend.
+"""
+import logging
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Case, DecimalField, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Customer, LoyaltyTransaction
+
+logger = logging.getLogger(__name__)
+
+RULE_TYPES = ('spend', 'visit')
+MONEY = DecimalField(max_digits=10, decimal_places=2)
+
+
+class EarningRule:
+    """One rule of a tenant's loyalty earning rules"""
+
+    def __init__(self, rule_type, points, per=None, min_total=None, payment_methods=None):
+        self.rule_type = rule_type
+        self.points = points
+        self.per = per
+        self.min_total = min_total
+        self.payment_methods = set(payment_methods) if payment_methods else None
+
+    @classmethod
+    def parse(cls, data):
+        """
+        Build a rule from its settings entry.
+
+        Raises:
+            ValueError: If the entry is not a valid rule
+        """
+        try:
+            rule_type = data['type']
+            points = int(data['points'])
+            per = Decimal(str(data['per'])) if rule_type == 'spend' else None
+            min_total = Decimal(str(data['min_total'])) if data.get('min_total') is not None else None
+        except (KeyError, TypeError, ValueError, InvalidOperation) as e:
+            raise ValueError(f"Invalid earning rule {data!r}: {e}")
+        if rule_type not in RULE_TYPES:
+            raise ValueError(f"Unknown earning rule type: {rule_type}")
+        if points < 0 or (per is not None and per <= 0):
+            raise ValueError(f"Invalid earning rule {data!r}: points and per must be positive")
+        return cls(rule_type, points, per, min_total, data.get('payment_methods'))
+
+    def points_for(self, sale):
+        """Points this rule awards for a sale"""
+        if self.payment_methods is not None and sale.payment_method not in self.payment_methods:
+            return 0
+        if self.min_total is not None and sale.total < self.min_total:
+            return 0
+        if self.rule_type == 'spend':
+            return int(sale.total // self.per) * self.points
+        return self.points
+
+
+def earning_rules(tenant):
+    """Parsed earning rules of a tenant; invalid entries are logged and skipped"""
+    loyalty = (tenant.settings or {}).get('loyalty') or {}
+    rules = []
+    for data in loyalty.get('earning_rules') or []:
+        try:
+            rules.append(EarningRule.parse(data))
+        except ValueError as e:
+            logger.warning(f"Tenant {tenant.id}: skipping loyalty rule: {e}")
+    return rules
+
+
+def points_for_sale(rules, sale):
+    """Total points a sale earns under a set of rules"""
+    return sum(rule.points_for(sale) for rule in rules)
+
+
+def _per_customer(amounts, customer_ids, output_field):
+    """Expression evaluating to each customer's amount within one UPDATE of customer_ids"""
+    if len(customer_ids) == 1:
+        return Value(amounts.get(next(iter(customer_ids)), 0), output_field=output_field)
+    return Case(
+        *[When(pk=customer_id, then=Value(amount)) for customer_id, amount in amounts.items()],
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+class LoyaltyLedger:
+    """Apply spend and loyalty point changes to customers"""
+
+    @staticmethod
+    def record_sales(sales, now=None):
+        """
+        Add the spend and earned points of sales to their customers.
+
+        One UPDATE covers every customer in the batch and the earned
+        transactions are bulk-created. Call inside the sales' transaction.
+
+        Returns:
+            Dict of customer id -> points earned
+        """
+        now = now or timezone.now()
+        rules_by_tenant = {}
+        spent = defaultdict(Decimal)
+        earned = defaultdict(int)
+        entries = []
+
+        for sale in sales:
+            if not sale.customer_id:
+                continue
+            if sale.tenant_id not in rules_by_tenant:
+                rules_by_tenant[sale.tenant_id] = earning_rules(sale.tenant)
+            spent[sale.customer_id] += sale.total
+
+            points = points_for_sale(rules_by_tenant[sale.tenant_id], sale)
+            if points:
+                earned[sale.customer_id] += points
+                entries.append(LoyaltyTransaction(
+                    customer_id=sale.customer_id,
+                    sale=sale,
+                    transaction_type='earned',
+                    points=points,
+                    reason=f"Sale {sale.receipt_number}",
+                ))
+
+        if not spent:
+            return {}
+
+        changes = {
+            'total_spent': F('total_spent') + _per_customer(spent, spent, MONEY),
+            'last_visit': now,
+        }
+        if earned:
+            changes['loyalty_points'] = F('loyalty_points') + _per_customer(earned, spent, IntegerField())
+        Customer.objects.filter(pk__in=spent).update(**changes)
+        LoyaltyTransaction.objects.bulk_create(entries, batch_size=500)
+        return dict(earned)
+
+    @staticmethod
+    def reverse_sale(sale):
+        """Take a refunded sale's spend and the points it earned back off its customer"""
+        if not sale.customer_id:
+            return 0
+
+        net = LoyaltyTransaction.objects.filter(sale=sale).aggregate(
+            points=Sum(Case(
+                When(transaction_type='earned', then=F('points')),
+                When(transaction_type='reversed', then=-F('points')),
+                default=Value(0),
+            ))
+        )['points'] or 0
+
+        changes = {'total_spent': Greatest(F('total_spent') - Value(sale.total), Value(Decimal('0')), output_field=MONEY)}
+        if net > 0:
+            changes['loyalty_points'] = Greatest(F('loyalty_points') - net, 0)
+        Customer.objects.filter(pk=sale.customer_id).update(**changes)
+
+        if net > 0:
+            LoyaltyTransaction.objects.create(
+                customer_id=sale.customer_id,
+                sale=sale,
+                transaction_type='reversed',
+                points=net,
+                reason=f"Refund of sale {sale.receipt_number}",
+            )
+        return max(net, 0)
+
+    @staticmethod
+    def adjust_points(customer, transaction_type, points, reason=''):
+        """
+        Manually earn, redeem or set a customer's points.
+
+        'earned' adds, 'redeemed' subtracts (never below zero) and 'adjusted'
+        sets the balance. The customer's loyalty_points is refreshed.
+        """
+        if transaction_type == 'earned':
+            balance = F('loyalty_points') + abs(points)
+        elif transaction_type == 'redeemed':
+            balance = Greatest(F('loyalty_points') - abs(points), 0)
+        elif transaction_type == 'adjusted':
+            balance = max(0, points)
+        else:
+            raise ValueError(f"Unknown loyalty transaction type: {transaction_type}")
+
+        Customer.objects.filter(pk=customer.pk).update(loyalty_points=balance)
+        customer.refresh_from_db(fields=['loyalty_points'])
+        return LoyaltyTransaction.objects.create(
+            customer=customer,
+            transaction_type=transaction_type,
+            points=abs(points) if transaction_type != 'adjusted' else points,
+            reason=reason,
+        )
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:00
+
+import re
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# Trigram indexes match the UPPER(col::text) expressions apps.customers.search filters on
+CREATE_SEARCH_INDEXES = """
+CREATE INDEX IF NOT EXISTS customers_name_trgm_idx ON customers_customer USING gin ((UPPER(name::text)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS customers_email_trgm_idx ON customers_customer USING gin ((UPPER(email::text)) gin_trgm_ops);
+"""
+
+DROP_SEARCH_INDEXES = """
+DROP INDEX IF EXISTS customers_email_trgm_idx;
+DROP INDEX IF EXISTS customers_name_trgm_idx;
+"""
+
+
+def fill_phone_digits(apps, schema_editor):
+    """Copy the digits of every phone number into phone_digits"""
+    Customer = apps.get_model('customers', 'Customer')
+    customers = list(Customer.objects.exclude(phone='').only('id', 'phone'))
+    for customer in customers:
+        customer.phone_digits = re.sub(r'\D', '', customer.phone)
+    Customer.objects.bulk_update(customers, ['phone_digits'], batch_size=1000)
+
+
+def create_search_indexes(apps, schema_editor):
+    """Trigram indexes (PostgreSQL only)"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SEARCH_INDEXES)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_customer_credit_enabled_customer_credit_limit_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='customer',
+            name='phone_digits',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['phone_digits'], name='customers_phone_digits_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(fill_phone_digits, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '1007_sale_client_id'),
+        ('customers', '0003_customer_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loyaltytransaction',
+            name='sale',
+            field=models.ForeignKey(blank=True, help_text='Sale that earned the points, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='loyalty_transactions', to='sales.sale'),
+        ),
+        migrations.AlterField(
+            model_name='loyaltytransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('earned', 'Earned'), ('redeemed', 'Redeemed'), ('adjusted', 'Adjusted'), ('reversed', 'Reversed')], max_length=20),
+        ),
+    ]
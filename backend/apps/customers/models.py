@@ -1,3 +1,5 @@
+import re
+
 from django.db import models
 from django.core.validators import MinValueValidator
 from decimal import Decimal
@@ -19,6 +21,8 @@ class Customer(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(blank=True)
     phone = models.CharField(max_length=20, blank=True)
+    # Digits of phone only, for prefix lookups while the cashier types (see apps.customers.search)
+    phone_digits = models.CharField(max_length=20, blank=True, editable=False)
     address = models.TextField(blank=True)
     
     loyalty_points = models.IntegerField(default=0, validators=[MinValueValidator(0)])
@@ -61,10 +65,23 @@ class Customer(models.Model):
             models.Index(fields=['outlet']),
             models.Index(fields=['email']),
             models.Index(fields=['phone']),
+            models.Index(fields=['phone_digits'], name='customers_phone_digits_idx', opclasses=['varchar_pattern_ops']),
         ]
 
     def __str__(self):
         return self.name
+
+    @staticmethod
+    def normalize_phone(phone):
+        """Digits of a phone number ('+265 (0)99-123' -> '265099123')"""
+        return re.sub(r'\D', '', phone or '')
+
+    def save(self, *args, **kwargs):
+        self.phone_digits = self.normalize_phone(self.phone)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'phone' in update_fields and 'phone_digits' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['phone_digits']
+        super().save(*args, **kwargs)
     
     @property
     def outstanding_balance(self):
@@ -105,9 +122,14 @@ class LoyaltyTransaction(models.Model):
         ('earned', 'Earned'),
         ('redeemed', 'Redeemed'),
         ('adjusted', 'Adjusted'),
+        ('reversed', 'Reversed'),
     ]
 
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='loyalty_transactions')
+    sale = models.ForeignKey(
+        'sales.Sale', on_delete=models.SET_NULL, null=True, blank=True, related_name='loyalty_transactions',
+        help_text="Sale that earned the points, if any"
+    )
     transaction_type = models.CharField(max_length=20, choices=TRANSACTION_TYPES)
     points = models.IntegerField()
     reason = models.TextField(blank=True)
@@ -0,0 +1,59 @@
+"""
+Customer search
+Cashiers look customers up by phone number far more often than by name.
+A term that looks like a phone number ('099 12', '+265-99') is matched as a
+prefix of phone_digits, which is indexed with varchar_pattern_ops so the
+LIKE 'digits%' lookup is an index range scan on any locale. Other terms
+match name and email; on PostgreSQL through the trigram indexes created in
+migration 0003, ranked by word similarity.
+"""
+import re
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Case, FloatField, Q, TextField, Value, When
+from django.db.models.functions import Cast, Length, Upper
+
+from primepos.search import is_postgres
+
+from .models import Customer
+
+PHONE_TERM = re.compile(r'^\+?[\d\s().-]+$')
+MIN_PHONE_DIGITS = 2
+
+
+def _phone_prefix(term):
+    """Digits of term if it reads as (part of) a phone number, else None"""
+    if not PHONE_TERM.match(term):
+        return None
+    digits = Customer.normalize_phone(term)
+    return digits if len(digits) >= MIN_PHONE_DIGITS else None
+
+
+def search_customers(queryset, term):
+    """
+    Filter customers matching term and annotate them with search_rank.
+
+    Phone matches rank by how much of the number was typed, so the exact
+    number sorts before longer numbers sharing its prefix.
+    """
+    digits = _phone_prefix(term)
+    if digits:
+        return queryset.filter(phone_digits__startswith=digits).annotate(
+            search_rank=Cast(Value(len(digits)), FloatField()) / Cast(Length('phone_digits'), FloatField())
+        )
+
+    matches = Q(name__icontains=term) | Q(email__istartswith=term)
+    rank = Case(
+        When(email__iexact=term, then=Value(3.0)),
+        When(name__istartswith=term, then=Value(1.0)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+    if is_postgres(queryset):
+        name = Upper(Cast('name', TextField()))
+        matches |= Q(TrigramWordSimilar(name, Value(term.upper())))
+        rank = rank + TrigramWordSimilarity(Value(term.upper()), name)
+
+    return queryset.filter(matches).annotate(search_rank=rank)
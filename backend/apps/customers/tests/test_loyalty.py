@@ -0,0 +1,121 @@
+"""
+Loyalty ledger tests
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.customers.loyalty import EarningRule, LoyaltyLedger, earning_rules
+from apps.customers.models import Customer, LoyaltyTransaction
+from apps.customers.views import CustomerViewSet
+from apps.outlets.models import Outlet
+from apps.sales.models import Sale
+from apps.tenants.models import Tenant
+
+
+class LoyaltyLedgerTests(TestCase):
+    """Test spend and point changes applied as column updates"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Loyalty Tenant", settings={'loyalty': {'earning_rules': [
+            {'type': 'spend', 'points': 1, 'per': '100'},
+            {'type': 'visit', 'points': 5, 'min_total': '1000', 'payment_methods': ['cash']},
+        ]}})
+        self.user = User.objects.create_user(username="till", email="till@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        self.customer = Customer.objects.create(tenant=self.tenant, name="Carol", loyalty_points=10)
+
+    def _sale(self, number, total, payment_method='cash', customer=None):
+        return Sale.objects.create(
+            tenant=self.tenant, outlet=self.outlet, user=self.user, receipt_number=number,
+            customer=customer or self.customer, subtotal=Decimal(total), total=Decimal(total),
+            payment_method=payment_method,
+        )
+
+    def test_rules(self):
+        spend, visit = earning_rules(self.tenant)
+        sale = Sale(total=Decimal("1250.00"), payment_method='cash')
+        self.assertEqual(spend.points_for(sale), 12)
+        self.assertEqual(visit.points_for(sale), 5)
+
+        sale.payment_method = 'card'
+        self.assertEqual(visit.points_for(sale), 0)
+
+    def test_invalid_rules_are_skipped(self):
+        self.tenant.settings = {'loyalty': {'earning_rules': [
+            {'type': 'spend', 'points': 1, 'per': '0'}, {'type': 'bonus', 'points': 1}, {'type': 'visit', 'points': 2},
+        ]}}
+        rules = earning_rules(self.tenant)
+        self.assertEqual([rule.rule_type for rule in rules], ['visit'])
+        with self.assertRaises(ValueError):
+            EarningRule.parse({'type': 'spend', 'points': 'x', 'per': 10})
+
+    def test_batch_is_one_update(self):
+        """Spend and points of every customer in a batch land in one UPDATE"""
+        other = Customer.objects.create(tenant=self.tenant, name="Dan")
+        sales = [self._sale("R-1", "1000.00"), self._sale("R-2", "250.00", 'card'), self._sale("R-3", "99.00", customer=other)]
+
+        with self.assertNumQueries(2):
+            earned = LoyaltyLedger.record_sales(sales)
+
+        self.assertEqual(earned, {self.customer.id: 17})
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.total_spent, Decimal("1250.00"))
+        self.assertEqual(self.customer.loyalty_points, 27)
+        self.assertIsNotNone(self.customer.last_visit)
+        other.refresh_from_db()
+        self.assertEqual((other.total_spent, other.loyalty_points), (Decimal("99.00"), 0))
+        self.assertEqual(LoyaltyTransaction.objects.filter(transaction_type='earned').count(), 2)
+
+    def test_stale_instances_do_not_overwrite(self):
+        """Checkouts holding an old copy of the customer still add up"""
+        stale = Customer.objects.get(pk=self.customer.pk)
+        LoyaltyLedger.record_sales([self._sale("R-1", "300.00")])
+        stale.name = "Carol B"
+        stale.save(update_fields=['name'])
+        LoyaltyLedger.record_sales([self._sale("R-2", "200.00")])
+
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.total_spent, Decimal("500.00"))
+        self.assertEqual(self.customer.loyalty_points, 15)
+
+    def test_refund_reverses_spend_and_points(self):
+        sale = self._sale("R-1", "1000.00")
+        LoyaltyLedger.record_sales([sale])
+
+        self.assertEqual(LoyaltyLedger.reverse_sale(sale), 15)
+        self.assertEqual(LoyaltyLedger.reverse_sale(sale), 0)
+
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.total_spent, Decimal("0"))
+        self.assertEqual(self.customer.loyalty_points, 10)
+        self.assertTrue(LoyaltyTransaction.objects.filter(sale=sale, transaction_type='reversed', points=15).exists())
+
+
+class AdjustPointsTests(TestCase):
+    """Test the manual points adjustment endpoint"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Loyalty Tenant")
+        self.user = User.objects.create_user(username="mgr", email="mgr@example.com", password="pass", tenant=self.tenant)
+        self.customer = Customer.objects.create(tenant=self.tenant, name="Carol", loyalty_points=10)
+        self.factory = APIRequestFactory()
+
+    def _adjust(self, **data):
+        request = self.factory.post(f'/api/v1/customers/{self.customer.id}/adjust_points/', data, format='json')
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return CustomerViewSet.as_view({'post': 'adjust_points'})(request, pk=self.customer.id)
+
+    def test_earn_and_redeem(self):
+        self.assertEqual(self._adjust(points=5, type='earned').data['loyalty_points'], 15)
+        self.assertEqual(self._adjust(points=40, type='redeemed').data['loyalty_points'], 0)
+        self.assertEqual(self._adjust(points=7).data['loyalty_points'], 7)
+        self.assertEqual(LoyaltyTransaction.objects.filter(customer=self.customer).count(), 3)
+
+    def test_invalid_input(self):
+        self.assertEqual(self._adjust(points='lots', type='earned').status_code, 400)
+        self.assertEqual(self._adjust(points=5, type='reversed').status_code, 400)
@@ -0,0 +1,50 @@
+"""
+Customer search tests (SQLite fallback path)
+"""
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.customers.models import Customer
+from apps.customers.views import CustomerViewSet
+from apps.tenants.models import Tenant
+
+
+class CustomerSearchTests(TestCase):
+    """Test phone prefix and name search on the customer list"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Search Tenant")
+        self.user = User.objects.create_user(username="cashier", email="cashier@example.com", password="pass", tenant=self.tenant)
+        Customer.objects.create(tenant=self.tenant, name="Alice Banda", phone="+265 991 234 567", email="alice@example.com")
+        Customer.objects.create(tenant=self.tenant, name="Banda Stores", phone="0991-234", email="orders@banda.mw")
+        Customer.objects.create(tenant=self.tenant, name="Chikondi", phone="0888 000 111")
+        self.factory = APIRequestFactory()
+
+    def _search(self, term):
+        request = self.factory.get('/api/v1/customers/', {'search': term})
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        response = CustomerViewSet.as_view({'get': 'list'})(request)
+        data = response.data
+        return [customer['name'] for customer in data.get('results', data) if isinstance(customer, dict)]
+
+    def test_phone_digits_are_kept_in_sync(self):
+        customer = Customer.objects.get(name="Chikondi")
+        self.assertEqual(customer.phone_digits, "0888000111")
+
+        customer.phone = "(0999) 12-34"
+        customer.save(update_fields=['phone'])
+        customer.refresh_from_db()
+        self.assertEqual(customer.phone_digits, "09991234")
+
+    def test_phone_prefix_ignores_formatting(self):
+        self.assertEqual(self._search("0991 23"), ["Banda Stores"])
+        self.assertEqual(self._search("+265 99"), ["Alice Banda"])
+
+    def test_name_prefix_ranks_first(self):
+        self.assertEqual(self._search("banda"), ["Banda Stores", "Alice Banda"])
+
+    def test_email_prefix(self):
+        self.assertEqual(self._search("alice@"), ["Alice Banda"])
@@ -7,9 +7,12 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db import transaction
 from django.utils import timezone
 from decimal import Decimal
-from .models import Customer, LoyaltyTransaction, CreditPayment
+from .models import Customer, CreditPayment
+from .loyalty import LoyaltyLedger
 from .serializers import CustomerSerializer, LoyaltyTransactionSerializer, CreditPaymentSerializer
 from apps.tenants.permissions import TenantFilterMixin
+from primepos.search import RankedSearchFilter
+from .search import search_customers
 from apps.sales.models import Sale
 
 
@@ -18,9 +21,10 @@ class CustomerViewSet(viewsets.ModelViewSet, TenantFilterMixin):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, RankedSearchFilter]
     filterset_fields = ['tenant', 'outlet', 'is_active']
     search_fields = ['name', 'email', 'phone']
+    search_function = staticmethod(search_customers)
     ordering_fields = ['name', 'created_at', 'total_spent']
     ordering = ['name']
     
@@ -78,8 +82,8 @@ class CustomerViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         
         # Create notification for new customer (Square POS-like)
         try:
-            from apps.notifications.services import NotificationService
-            NotificationService.notify_customer_created(customer)
+            from apps.notifications.tasks import notify_on_commit
+            notify_on_commit('customer_created', customer)
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -138,25 +142,22 @@ class CustomerViewSet(viewsets.ModelViewSet, TenantFilterMixin):
                 {"detail": "points is required"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        try:
+            points = int(points)
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "points must be a whole number"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if transaction_type not in ('earned', 'redeemed', 'adjusted'):
+            return Response(
+                {"detail": "type must be one of: earned, redeemed, adjusted"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
+        # Balance changes are column-only F() updates, safe against concurrent sales
         with transaction.atomic():
-            # Adjust points
-            if transaction_type == 'earned':
-                customer.loyalty_points += abs(points)
-            elif transaction_type == 'redeemed':
-                customer.loyalty_points = max(0, customer.loyalty_points - abs(points))
-            else:  # adjusted
-                customer.loyalty_points = max(0, points)
-            
-            customer.save()
-            
-            # Record transaction
-            LoyaltyTransaction.objects.create(
-                customer=customer,
-                transaction_type=transaction_type,
-                points=abs(points) if transaction_type != 'adjusted' else points,
-                reason=reason
-            )
+            LoyaltyLedger.adjust_points(customer, transaction_type, points, reason)
         
         serializer = self.get_serializer(customer)
         return Response(serializer.data)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_remove_batch_variation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['tenant', 'outlet', '-created_at', '-id'], name='inventory_s_tenant__c2eced_idx'),
+        ),
+    ]
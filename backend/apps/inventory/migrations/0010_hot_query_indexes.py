@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='batch',
+            index=models.Index(condition=models.Q(('quantity__gt', 0)), fields=['product', 'outlet', 'expiry_date', 'created_at'], name='inventory_batch_sellable_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['outlet', 'product', 'movement_type', 'created_at'], name='inventory_s_outlet__bf7d3e_idx'),
+        ),
+    ]
@@ -37,6 +37,12 @@ class Batch(models.Model):
             models.Index(fields=['outlet']),
             models.Index(fields=['expiry_date']),
             models.Index(fields=['product', 'outlet']),
+            # FIFO deduction / available stock: non-empty batches by expiry
+            models.Index(
+                fields=['product', 'outlet', 'expiry_date', 'created_at'],
+                condition=Q(quantity__gt=0),
+                name='inventory_batch_sellable_idx',
+            ),
         ]
         ordering = ['expiry_date', 'created_at']
 
@@ -95,6 +101,10 @@ class StockMovement(models.Model):
             models.Index(fields=['outlet']),
             models.Index(fields=['movement_type']),
             models.Index(fields=['created_at']),
+            # Keyset pagination: outlet movement history ordered by (created_at, id)
+            models.Index(fields=['tenant', 'outlet', '-created_at', '-id']),
+            # Per-product movement history (valuation report)
+            models.Index(fields=['outlet', 'product', 'movement_type', 'created_at']),
         ]
 
     def __str__(self):
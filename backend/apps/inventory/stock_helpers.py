@@ -4,6 +4,7 @@ Handles batch-aware stock operations with expiry tracking
 """
 import logging
 from django.db import transaction
+from django.db.models import Sum
 from django.utils import timezone
 from decimal import Decimal
 from datetime import timedelta
@@ -33,13 +34,14 @@ def get_available_stock(unit, outlet):
     else:
         product = unit
     
-    batches = Batch.objects.filter(
+    # Aggregate in the database (served by inventory_batch_sellable_idx)
+    total = Batch.objects.filter(
         product=product,
         outlet=outlet,
         expiry_date__gt=today,
         quantity__gt=0
-    )
-    return sum(batch.quantity for batch in batches)
+    ).aggregate(total=Sum('quantity'))['total']
+    return total or 0
 
 
 def get_batch_for_sale(product, outlet, required_quantity):
@@ -242,6 +244,134 @@ def add_stock(product, outlet, quantity, batch_number, expiry_date, cost_price=N
     return batch
 
 
+@transaction.atomic
+def add_stock_bulk(outlet, lines, user=None, reference_id='', reason=''):
+    """
+    Add stock for many lines at one outlet (add_stock semantics, bulk queries)
+    Batches are matched on (product, batch_number); new ones are bulk created,
+    existing ones locked and bulk updated. Movements are written with one
+    bulk_create and LocationStock is synced once per product.
+
+    Args:
+        outlet: Outlet instance
+        lines: list of dicts with product, quantity, batch_number,
+            expiry_date and optional cost_price
+        user: User instance
+        reference_id: str - reference to purchase order/delivery
+        reason: str - reason for addition
+
+    Returns:
+        list of Batch instances, one per line
+    """
+    if not lines:
+        return []
+    now = timezone.now()
+
+    keys = {(line['product'].pk, line['batch_number']) for line in lines}
+    batches = {
+        (batch.product_id, batch.batch_number): batch
+        for batch in Batch.objects.select_for_update().filter(
+            outlet=outlet,
+            product_id__in={product_id for product_id, _ in keys},
+            batch_number__in={batch_number for _, batch_number in keys},
+        )
+    }
+    existing = set(batches)
+
+    line_batches = []
+    for line in lines:
+        product = line['product']
+        key = (product.pk, line['batch_number'])
+        batch = batches.get(key)
+        if batch is None:
+            batch = Batch(
+                tenant_id=product.tenant_id,
+                outlet=outlet,
+                product=product,
+                batch_number=line['batch_number'],
+                expiry_date=line['expiry_date'],
+                quantity=0,
+            )
+            batches[key] = batch
+        batch.quantity += line['quantity']
+        if line.get('cost_price') is not None:
+            batch.cost_price = line['cost_price']
+        batch.updated_at = now
+        line_batches.append(batch)
+
+    Batch.objects.bulk_create(
+        [batch for key, batch in batches.items() if key not in existing], batch_size=500
+    )
+    Batch.objects.bulk_update(
+        [batch for key, batch in batches.items() if key in existing],
+        ['quantity', 'cost_price', 'updated_at'],
+        batch_size=500,
+    )
+
+    StockMovement.objects.bulk_create([
+        StockMovement(
+            tenant_id=line['product'].tenant_id,
+            batch=batch,
+            product=line['product'],
+            outlet=outlet,
+            user=user,
+            movement_type='purchase',
+            quantity=line['quantity'],
+            reference_id=reference_id,
+            reason=reason or f"Stock addition - Batch {line['batch_number']}",
+        )
+        for line, batch in zip(lines, line_batches)
+    ], batch_size=500)
+
+    sync_location_stocks(outlet, {line['product'].pk: line['product'] for line in lines}.values())
+
+    logger.info(f"Added {len(lines)} stock line(s) at {outlet.name} ({reference_id or 'no reference'})")
+    return line_batches
+
+
+def sync_location_stocks(outlet, products):
+    """
+    Set LocationStock quantities from non-expired batches for several products
+    One grouped aggregate plus one bulk write, creating missing rows
+
+    Args:
+        outlet: Outlet instance
+        products: iterable of Product instances
+    """
+    products = {product.pk: product for product in products}
+    if not products:
+        return
+    now = timezone.now()
+    today = now.date()
+
+    totals = dict(
+        Batch.objects.filter(
+            outlet=outlet,
+            product_id__in=products,
+            expiry_date__gt=today,
+            quantity__gt=0,
+        ).order_by().values('product_id').annotate(total=Sum('quantity')).values_list('product_id', 'total')
+    )
+    stocks = {
+        stock.product_id: stock
+        for stock in LocationStock.objects.select_for_update().filter(outlet=outlet, product_id__in=products)
+    }
+    for stock in stocks.values():
+        stock.quantity = totals.get(stock.product_id, 0)
+        stock.updated_at = now
+    LocationStock.objects.bulk_update(list(stocks.values()), ['quantity', 'updated_at'], batch_size=500)
+    LocationStock.objects.bulk_create([
+        LocationStock(
+            product=product,
+            outlet=outlet,
+            tenant_id=product.tenant_id,
+            quantity=totals.get(product_id, 0),
+        )
+        for product_id, product in products.items()
+        if product_id not in stocks
+    ], batch_size=500)
+
+
 @transaction.atomic
 def adjust_stock(product, outlet, new_quantity, user, reason='Stock adjustment'):
     """
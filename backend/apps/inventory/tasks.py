@@ -0,0 +1,20 @@
+"""
+Inventory tasks
+The nightly expiry sweep runs on the maintenance queue. Only batches that
+still hold stock are expired, so a repeated sweep finds nothing to do.
+"""
+import logging
+
+from celery import shared_task
+
+from .stock_helpers import mark_expired_batches
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='inventory.sweep_expired_batches')
+def sweep_expired_batches():
+    """Write off every batch past its expiry date"""
+    expired = mark_expired_batches()
+    logger.info(f"Expiry sweep marked {expired} batch(es) as expired")
+    return expired
@@ -14,6 +14,7 @@ from .serializers import StockMovementSerializer, StockTakeSerializer, StockTake
 from .stock_helpers import get_available_stock, deduct_stock, add_stock, adjust_stock, mark_expired_batches, get_expiring_soon
 from apps.products.models import Product
 from apps.tenants.permissions import TenantFilterMixin
+from primepos.pagination import KeysetOptInPagination
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class StockMovementViewSet(viewsets.ModelViewSet, TenantFilterMixin):
     queryset = StockMovement.objects.select_related('product', 'outlet', 'user')
     serializer_class = StockMovementSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetOptInPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['tenant', 'product', 'outlet', 'movement_type']
     ordering_fields = ['created_at']
@@ -58,8 +60,7 @@ class StockMovementViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         if not is_saas_admin:
             if tenant:
                 queryset = queryset.filter(tenant=tenant)
-                count = queryset.count()
-                logger.info(f"Applied tenant filter: {tenant.id} ({tenant.name}) - {count} movements found")
+                logger.info(f"Applied tenant filter: {tenant.id} ({tenant.name})")
             else:
                 logger.error(f"CRITICAL: No tenant found for user {user.email} (ID: {user.id}). User must have a tenant assigned to view inventory.")
                 logger.error(f"User tenant: {user_tenant}, Request tenant: {request_tenant}")
@@ -561,7 +562,7 @@ def adjust(request):
         # Also update legacy Product.stock field for backward compatibility
         old_stock = product.stock
         product.stock = max(0, product.stock + quantity)
-        product.save()
+        product.save(update_fields=['stock', 'updated_at'])
         logger.info(f"Product stock updated: {old_stock} -> {product.stock}")
         
         # Record movement (product-based)
@@ -738,7 +739,7 @@ def receive(request):
             # Also update legacy Product.stock field for backward compatibility
             old_stock = product.stock
             product.stock += quantity
-            product.save()
+            product.save(update_fields=['stock', 'updated_at'])
             logger.info(f"Product stock updated: {old_stock} -> {product.stock}")
             
             # Update cost if provided
@@ -747,7 +748,7 @@ def receive(request):
                     cost_decimal = Decimal(str(cost))
                     if cost_decimal >= 0:
                         product.cost = cost_decimal
-                        product.save()
+                        product.save(update_fields=['cost', 'updated_at'])
                         logger.info(f"Product cost updated: {product.cost}")
                 except (ValueError, TypeError):
                     logger.warning(f"Invalid cost value: {cost}, skipping cost update")
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def populate_outlet_and_counters(apps, schema_editor):
+    """Promote metadata.outlet_id to the outlet column and count unread notifications"""
+    Notification = apps.get_model('notifications', 'Notification')
+    NotificationCounter = apps.get_model('notifications', 'NotificationCounter')
+    Outlet = apps.get_model('outlets', 'Outlet')
+
+    outlet_tenants = dict(Outlet.objects.values_list('id', 'tenant_id'))
+    by_outlet = {}
+    for pk, tenant_id, metadata in Notification.objects.filter(
+        metadata__has_key='outlet_id'
+    ).values_list('id', 'tenant_id', 'metadata').iterator():
+        try:
+            outlet_id = int(metadata.get('outlet_id'))
+        except (TypeError, ValueError):
+            continue
+        if outlet_tenants.get(outlet_id) == tenant_id:
+            by_outlet.setdefault(outlet_id, []).append(pk)
+    for outlet_id, ids in by_outlet.items():
+        for start in range(0, len(ids), 1000):
+            Notification.objects.filter(pk__in=ids[start:start + 1000]).update(outlet_id=outlet_id)
+
+    NotificationCounter.objects.bulk_create([
+        NotificationCounter(tenant_id=row['tenant_id'], user_id=row['user_id'], unread=row['n'])
+        for row in Notification.objects.filter(read=False).values('tenant_id', 'user_id').annotate(n=Count('id')).order_by()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outlets', '0005_alter_printer_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tenants', '0005_add_logo_field'),
+        ('notifications', '0002_notificationpreference_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Notification Counter',
+                'verbose_name_plural': 'Notification Counters',
+                'db_table': 'notification_counters',
+            },
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='outlet',
+            field=models.ForeignKey(blank=True, help_text='Outlet the notification is about (if specific)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='outlets.outlet'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['tenant', 'outlet', 'read', '-created_at'], name='notificatio_tenant__e5845c_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationcounter',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_counters', to='tenants.tenant'),
+        ),
+        migrations.AddField(
+            model_name='notificationcounter',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notification_counters', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationcounter',
+            constraint=models.UniqueConstraint(fields=('tenant', 'user'), name='notification_counters_tenant_user_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationcounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('tenant',), name='notification_counters_tenant_wide_uniq'),
+        ),
+        migrations.RunPython(populate_outlet_and_counters, migrations.RunPython.noop),
+    ]
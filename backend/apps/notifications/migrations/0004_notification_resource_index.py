@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_outlet_and_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['tenant', 'resource_type', 'resource_id'], name='notificatio_tenant__0c906a_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -54,6 +55,14 @@ class Notification(models.Model):
         db_index=True,
         help_text="User to whom the notification is directed (if specific)"
     )
+    outlet = models.ForeignKey(
+        'outlets.Outlet',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='notifications',
+        help_text="Outlet the notification is about (if specific)"
+    )
     type = models.CharField(max_length=20, choices=TYPE_CHOICES, default=TYPE_SYSTEM, db_index=True)
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default=PRIORITY_NORMAL, db_index=True)
     title = models.CharField(max_length=255)
@@ -74,6 +83,8 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['tenant', 'read', '-created_at']),
             models.Index(fields=['user', 'read', '-created_at']),
+            models.Index(fields=['tenant', 'outlet', 'read', '-created_at']),
+            models.Index(fields=['tenant', 'resource_type', 'resource_id']),
             models.Index(fields=['type', '-created_at']),
             models.Index(fields=['priority', '-created_at']),
         ]
@@ -82,6 +93,69 @@ class Notification(models.Model):
         return f"[{self.get_priority_display()}] {self.title} ({'Read' if self.read else 'Unread'})"
 
 
+class NotificationCounter(models.Model):
+    """
+    Unread notification count per tenant and user.
+
+    The row with no user counts unread tenant-wide notifications, which every
+    user of the tenant sees, so a user's unread total is their own row plus
+    the tenant row. Rows are adjusted as notifications are created, read and
+    deleted (see apps.notifications.signals and NotificationService).
+    """
+    tenant = models.ForeignKey('tenants.Tenant', on_delete=models.CASCADE, related_name='notification_counters')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='notification_counters')
+    unread = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'notification_counters'
+        verbose_name = 'Notification Counter'
+        verbose_name_plural = 'Notification Counters'
+        constraints = [
+            models.UniqueConstraint(fields=['tenant', 'user'], name='notification_counters_tenant_user_uniq'),
+            # NULLs are distinct in unique indexes, so the tenant-wide row needs its own
+            models.UniqueConstraint(
+                fields=['tenant'],
+                condition=models.Q(user__isnull=True),
+                name='notification_counters_tenant_wide_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant_id}/{self.user_id or 'all'}: {self.unread}"
+
+    @classmethod
+    def adjust(cls, tenant_id, user_id, delta):
+        """Add delta (negative when notifications are read) to a counter, never below zero"""
+        if not delta:
+            return
+        counter = cls.objects.filter(tenant_id=tenant_id, user_id=user_id)
+        if counter.update(unread=Greatest(models.F('unread') + delta, 0), updated_at=timezone.now()):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(tenant_id=tenant_id, user_id=user_id, unread=max(delta, 0))
+        except IntegrityError:
+            # Created concurrently by another writer
+            counter.update(unread=Greatest(models.F('unread') + delta, 0), updated_at=timezone.now())
+
+    @classmethod
+    def unread_for(cls, tenant_id, user_id):
+        """Unread notifications visible to a user: their own plus tenant-wide"""
+        return cls.objects.filter(
+            models.Q(user_id=user_id) | models.Q(user__isnull=True), tenant_id=tenant_id
+        ).aggregate(total=models.Sum('unread'))['total'] or 0
+
+    @classmethod
+    def unread_by_user(cls, tenant_id, user_ids):
+        """Unread totals for several users of a tenant in one query"""
+        rows = dict(cls.objects.filter(
+            models.Q(user_id__in=user_ids) | models.Q(user__isnull=True), tenant_id=tenant_id
+        ).values_list('user_id', 'unread'))
+        tenant_wide = rows.get(None, 0)
+        return {user_id: rows.get(user_id, 0) + tenant_wide for user_id in user_ids}
+
+
 class NotificationPreference(models.Model):
     """
     User notification preferences for controlling which notifications they receive.
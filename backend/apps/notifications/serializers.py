@@ -9,12 +9,20 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = [
-            'id', 'tenant', 'tenant_name', 'user', 'user_details', 'type', 'priority',
+            'id', 'tenant', 'tenant_name', 'user', 'user_details', 'outlet', 'type', 'priority',
             'title', 'message', 'resource_type', 'resource_id', 'link', 'metadata',
             'read', 'created_at', 'updated_at'
         ]
         read_only_fields = ('id', 'tenant', 'tenant_name', 'user_details', 'created_at', 'updated_at')
 
+    def validate_outlet(self, value):
+        """Outlet must belong to the request tenant"""
+        request = self.context.get('request')
+        tenant = getattr(request, 'tenant', None) if request else None
+        if value and tenant and value.tenant_id != tenant.id:
+            raise serializers.ValidationError("Outlet does not belong to your tenant.")
+        return value
+
     def get_user_details(self, obj):
         if obj.user:
             return {
@@ -2,10 +2,13 @@
 Notification Service for creating notifications automatically when events occur.
 Square POS-like notification system.
 """
+from collections import Counter
+from django.db import transaction
 from django.utils import timezone
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Notification
+from primepos.celery import enqueue_on_commit
+from .models import Notification, NotificationCounter
 from .serializers import NotificationSerializer
 
 channel_layer = get_channel_layer()
@@ -14,6 +17,52 @@ channel_layer = get_channel_layer()
 class NotificationService:
     """Service for creating and managing notifications"""
     
+    @staticmethod
+    def mark_read(notification):
+        """
+        Mark one notification read and lower its unread counter.
+        
+        Returns:
+            True if the notification was unread
+        """
+        updated = Notification.objects.filter(pk=notification.pk, read=False).update(
+            read=True, updated_at=timezone.now()
+        )
+        notification.read = True
+        if updated:
+            NotificationCounter.adjust(notification.tenant_id, notification.user_id, -1)
+        return bool(updated)
+    
+    @staticmethod
+    def mark_all_read(queryset):
+        """
+        Mark every unread notification in queryset read with one UPDATE.
+        
+        Returns:
+            Number of notifications marked read
+        """
+        with transaction.atomic():
+            # Lock the rows so a concurrent mark_read cannot decrement them twice
+            unread = list(
+                Notification.objects.select_for_update()
+                .filter(pk__in=queryset.filter(read=False).values('pk'))
+                .values_list('pk', 'tenant_id', 'user_id')
+            )
+            if not unread:
+                return 0
+            Notification.objects.filter(pk__in=[pk for pk, _, _ in unread]).update(
+                read=True, updated_at=timezone.now()
+            )
+            for (tenant_id, user_id), count in Counter((tenant_id, user_id) for _, tenant_id, user_id in unread).items():
+                NotificationCounter.adjust(tenant_id, user_id, -count)
+        return len(unread)
+    
+    @staticmethod
+    def _push(notification):
+        """Queue the WebSocket fan-out of a notification for after commit"""
+        from .tasks import push_notification
+        enqueue_on_commit(push_notification, notification.pk)
+    
     @staticmethod
     def _send_websocket_notification(notification):
         """Send notification via WebSocket to relevant users"""
@@ -35,11 +84,7 @@ class NotificationService:
                     }
                 )
                 # Also send unread count update
-                unread_count = Notification.objects.filter(
-                    tenant=notification.tenant,
-                    user=notification.user,
-                    read=False
-                ).count()
+                unread_count = NotificationCounter.unread_for(notification.tenant_id, notification.user_id)
                 async_to_sync(channel_layer.group_send)(
                     f'notifications_{notification.user.id}',
                     {
@@ -51,26 +96,22 @@ class NotificationService:
                 # Send to all users in the tenant (general notifications)
                 from django.contrib.auth import get_user_model
                 User = get_user_model()
-                tenant_users = User.objects.filter(tenant=notification.tenant)
-                for user in tenant_users:
+                user_ids = list(User.objects.filter(tenant=notification.tenant).values_list('id', flat=True))
+                unread_counts = NotificationCounter.unread_by_user(notification.tenant_id, user_ids)
+                for user_id in user_ids:
                     async_to_sync(channel_layer.group_send)(
-                        f'notifications_{user.id}',
+                        f'notifications_{user_id}',
                         {
                             'type': 'notification_message',
                             'notification': notification_data
                         }
                     )
                     # Also send unread count update
-                    unread_count = Notification.objects.filter(
-                        tenant=notification.tenant,
-                        user=user,
-                        read=False
-                    ).count()
                     async_to_sync(channel_layer.group_send)(
-                        f'notifications_{user.id}',
+                        f'notifications_{user_id}',
                         {
                             'type': 'notification_count',
-                            'unread_count': unread_count
+                            'unread_count': unread_counts[user_id]
                         }
                     )
         except Exception as e:
@@ -126,6 +167,7 @@ class NotificationService:
         """Create notification when a sale is completed"""
         notification = Notification.objects.create(
             tenant=sale.tenant,
+            outlet=sale.outlet,
             type=Notification.TYPE_SALE,
             priority=Notification.PRIORITY_NORMAL,
             title=f"Sale Completed: {sale.receipt_number}",
@@ -141,10 +183,11 @@ class NotificationService:
                 'outlet_id': sale.outlet.id if sale.outlet else None,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
         
         # Also send real-time sale update to all users in the tenant/outlet
-        NotificationService._send_sale_update(sale, 'created')
+        from .tasks import push_sale_update
+        enqueue_on_commit(push_sale_update, sale.pk, 'created')
     
     @staticmethod
     def notify_low_stock(product_or_unit, outlet=None):
@@ -168,6 +211,7 @@ class NotificationService:
 
         notification = Notification.objects.create(
             tenant=product.tenant,
+            outlet=outlet,
             type=Notification.TYPE_STOCK,
             priority=Notification.PRIORITY_HIGH,
             title=f"Low Stock Alert: {product_name}",
@@ -184,13 +228,14 @@ class NotificationService:
                 'outlet_id': outlet.id if outlet else None,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
     
     @staticmethod
     def notify_shift_opened(shift):
         """Create notification when a shift is opened"""
         notification = Notification.objects.create(
             tenant=shift.outlet.tenant,
+            outlet=shift.outlet,
             type=Notification.TYPE_SYSTEM,
             priority=Notification.PRIORITY_NORMAL,
             title=f"Shift Opened: {shift.outlet.name}",
@@ -206,7 +251,7 @@ class NotificationService:
                 'opening_cash': str(shift.opening_cash_balance),
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
     
     @staticmethod
     def notify_shift_closed(shift):
@@ -219,6 +264,7 @@ class NotificationService:
         
         notification = Notification.objects.create(
             tenant=shift.outlet.tenant,
+            outlet=shift.outlet,
             type=Notification.TYPE_SYSTEM,
             priority=Notification.PRIORITY_NORMAL if difference == 0 else Notification.PRIORITY_HIGH,
             title=f"Shift Closed: {shift.outlet.name}",
@@ -235,7 +281,7 @@ class NotificationService:
                 'difference': str(difference) if difference is not None else None,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
     
     @staticmethod
     def notify_customer_created(customer):
@@ -256,7 +302,7 @@ class NotificationService:
                 'phone': customer.phone,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
     
     @staticmethod
     def notify_staff_added(staff):
@@ -277,7 +323,7 @@ class NotificationService:
                 'role': staff.role.name if staff.role else None,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
     
     @staticmethod
     def notify_delivery_created(delivery):
@@ -298,7 +344,7 @@ class NotificationService:
                 'status': delivery.status,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
     
     @staticmethod
     def notify_delivery_status_changed(delivery, old_status, new_status):
@@ -337,7 +383,7 @@ class NotificationService:
                 'new_status': new_status,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
     
     @staticmethod
     def notify_payment_received(payment):
@@ -360,4 +406,4 @@ class NotificationService:
                 'sale_id': payment.sale.id if payment.sale else None,
             }
         )
-        NotificationService._send_websocket_notification(notification)
+        NotificationService._push(notification)
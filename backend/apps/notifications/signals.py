@@ -0,0 +1,28 @@
+"""
+Django signals keeping unread notification counters current
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Notification, NotificationCounter
+
+
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, raw=False, **kwargs):
+    """New unread notifications raise the recipient's (or the tenant-wide) counter"""
+    if created and not raw and not instance.read:
+        NotificationCounter.adjust(instance.tenant_id, instance.user_id, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, origin=None, **kwargs):
+    """
+    Deleting an unread notification lowers its counter.
+
+    Skipped when the delete cascades from a tenant or user; their counters
+    go with them.
+    """
+    model = getattr(origin, 'model', None) or type(origin)
+    if instance.read or (origin is not None and not issubclass(model, Notification)):
+        return
+    NotificationCounter.adjust(instance.tenant_id, instance.user_id, -1)
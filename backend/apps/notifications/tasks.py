@@ -0,0 +1,87 @@
+"""
+Notification tasks
+Notifications for request-driven events are created by a worker after the
+request's transaction commits, and the WebSocket fan-out of every
+notification (one group_send per tenant user) runs on the notifications
+queue instead of inside the request.
+
+Tasks are idempotent: notify skips an event whose notification already
+exists, and pushes only repeat messages clients already key by id.
+"""
+import logging
+from operator import attrgetter
+
+from celery import shared_task
+from django.apps import apps
+
+from primepos.celery import enqueue_on_commit
+
+from .models import Notification
+from .services import NotificationService
+
+logger = logging.getLogger(__name__)
+
+# event -> (model label, NotificationService method, notification type, title prefix
+#           of the notification it creates, attribute path to the tenant id)
+EVENTS = {
+    'sale_completed': ('sales.Sale', 'notify_sale_completed', Notification.TYPE_SALE, 'Sale Completed', 'tenant_id'),
+    'customer_created': (
+        'customers.Customer', 'notify_customer_created', Notification.TYPE_CUSTOMER, 'New Customer', 'tenant_id',
+    ),
+    'shift_opened': ('shifts.Shift', 'notify_shift_opened', Notification.TYPE_SYSTEM, 'Shift Opened', 'outlet.tenant_id'),
+    'shift_closed': ('shifts.Shift', 'notify_shift_closed', Notification.TYPE_SYSTEM, 'Shift Closed', 'outlet.tenant_id'),
+    'staff_added': ('staff.Staff', 'notify_staff_added', Notification.TYPE_STAFF, 'New Staff Member', 'tenant_id'),
+}
+
+
+def notify_on_commit(event, instance):
+    """Create the notification for an event once the current transaction commits"""
+    if event not in EVENTS:
+        raise ValueError(f"Unknown notification event: {event}")
+    enqueue_on_commit(notify, event, instance.pk)
+
+
+@shared_task(name='notifications.notify')
+def notify(event, object_id):
+    """Create (and push) the notification for an event unless it already exists"""
+    model_label, method, notification_type, title_prefix, tenant_attr = EVENTS[event]
+    model = apps.get_model(model_label)
+
+    instance = model.objects.filter(pk=object_id).first()
+    if instance is None:
+        logger.info(f"Skipping {event} notification: {model_label} {object_id} no longer exists")
+        return False
+
+    # Served by the (tenant, resource_type, resource_id) index
+    if Notification.objects.filter(
+        tenant_id=attrgetter(tenant_attr)(instance),
+        resource_type=model.__name__,
+        resource_id=str(object_id),
+        type=notification_type,
+        title__startswith=title_prefix,
+    ).exists():
+        logger.debug(f"Notification for {event} {object_id} already exists")
+        return False
+
+    getattr(NotificationService, method)(instance)
+    return True
+
+
+@shared_task(name='notifications.push_notification')
+def push_notification(notification_id):
+    """Send a notification and the new unread counts over WebSockets"""
+    notification = Notification.objects.select_related('user', 'tenant').filter(pk=notification_id).first()
+    if notification is None:
+        return
+    NotificationService._send_websocket_notification(notification)
+
+
+@shared_task(name='notifications.push_sale_update')
+def push_sale_update(sale_id, action='created'):
+    """Send a sale to the tenant's sales lists over WebSockets"""
+    from apps.sales.models import Sale
+
+    sale = Sale.objects.filter(pk=sale_id).first()
+    if sale is None:
+        return
+    NotificationService._send_sale_update(sale, action)
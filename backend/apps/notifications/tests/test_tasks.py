@@ -0,0 +1,83 @@
+"""
+Notification task tests (tasks run eagerly under manage.py test)
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.customers.models import Customer
+from apps.notifications.models import Notification
+from apps.notifications.tasks import notify, notify_on_commit
+from apps.tenants.models import Tenant
+
+
+class NotificationTaskTests(TestCase):
+    """Test post-commit notification creation and WebSocket fan-out"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Task Tenant")
+        self.user = User.objects.create_user(username="ann", email="ann@example.com", password="pass", tenant=self.tenant)
+        self.customer = Customer.objects.create(tenant=self.tenant, name="Carol")
+
+    def test_notification_is_created_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            notify_on_commit('customer_created', self.customer)
+            self.assertFalse(Notification.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        notification = Notification.objects.get()
+        self.assertEqual(notification.resource_type, 'Customer')
+        self.assertEqual(notification.resource_id, str(self.customer.id))
+
+    def test_notify_is_idempotent(self):
+        """A redelivered task does not notify twice"""
+        self.assertTrue(notify('customer_created', self.customer.id))
+        self.assertFalse(notify('customer_created', self.customer.id))
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_notify_dedupes_within_tenant(self):
+        """Only the event's own tenant and notification type count as already notified"""
+        Notification.objects.create(
+            tenant=Tenant.objects.create(name="Other"), type=Notification.TYPE_CUSTOMER, title="New Customer",
+            message="elsewhere", resource_type='Customer', resource_id=str(self.customer.id),
+        )
+        Notification.objects.create(
+            tenant=self.tenant, type=Notification.TYPE_SYSTEM, title="New Customer import",
+            message="other type", resource_type='Customer', resource_id=str(self.customer.id),
+        )
+
+        self.assertTrue(notify('customer_created', self.customer.id))
+
+    def test_nothing_is_sent_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    notify_on_commit('customer_created', self.customer)
+                    raise RuntimeError("checkout failed")
+            except RuntimeError:
+                pass
+
+        self.assertFalse(Notification.objects.exists())
+
+    def test_unknown_event_is_rejected(self):
+        with self.assertRaises(ValueError):
+            notify_on_commit('customer_deleted', self.customer)
+
+    def test_notification_is_pushed_to_tenant_users(self):
+        """The WebSocket fan-out runs as its own task once the notification commits"""
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(f'notifications_{self.user.id}', channel)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notify('customer_created', self.customer.id)
+
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message['type'], 'notification_message')
+        self.assertEqual(message['notification']['resource_id'], str(self.customer.id))
+        count = async_to_sync(layer.receive)(channel)
+        self.assertEqual(count, {'type': 'notification_count', 'unread_count': 1})
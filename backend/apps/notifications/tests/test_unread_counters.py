@@ -0,0 +1,101 @@
+"""
+Unread notification counter tests
+"""
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.notifications.models import Notification, NotificationCounter
+from apps.notifications.views import NotificationViewSet
+from apps.outlets.models import Outlet
+from apps.tenants.models import Tenant
+
+
+class NotificationCounterTests(TestCase):
+    """Test maintained unread counters, outlet filtering and the grouped summary"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Bell Tenant")
+        self.user = User.objects.create_user(username="ann", email="ann@example.com", password="pass", tenant=self.tenant)
+        self.other = User.objects.create_user(username="bob", email="bob@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        self.factory = APIRequestFactory()
+
+    def _notify(self, user=None, outlet=None, **extra):
+        fields = {'type': Notification.TYPE_SALE, 'title': "Hello", 'message': "World"}
+        fields.update(extra)
+        return Notification.objects.create(tenant=self.tenant, user=user, outlet=outlet, **fields)
+
+    def _call(self, action, method='get', pk=None, user=None, **params):
+        request = getattr(self.factory, method)(f'/api/v1/notifications/{action}/', params)
+        force_authenticate(request, user=user or self.user)
+        request.tenant = self.tenant
+        view = NotificationViewSet.as_view({method: action})
+        return view(request, pk=pk) if pk else view(request)
+
+    def test_counters_follow_create_and_read(self):
+        """Own and tenant-wide unread notifications add up; reading lowers the count"""
+        mine = self._notify(self.user)
+        self._notify(self.other)
+        broadcast = self._notify()
+
+        self.assertEqual(NotificationCounter.unread_for(self.tenant.id, self.user.id), 2)
+        self.assertEqual(NotificationCounter.unread_for(self.tenant.id, self.other.id), 2)
+
+        self._call('mark_read', 'post', pk=mine.pk)
+        self._call('mark_read', 'post', pk=mine.pk)
+        self.assertEqual(NotificationCounter.unread_for(self.tenant.id, self.user.id), 1)
+
+        self._call('mark_read', 'post', pk=broadcast.pk)
+        self.assertEqual(NotificationCounter.unread_for(self.tenant.id, self.other.id), 1)
+
+    def test_unread_count_is_one_query(self):
+        """The bell reads the counter rows instead of counting notifications"""
+        for _ in range(5):
+            self._notify(self.user)
+        self._notify()
+
+        with self.assertNumQueries(1):
+            response = self._call('unread_count')
+
+        self.assertEqual(response.data['unread_count'], 6)
+
+    def test_mark_all_read_and_delete(self):
+        self._notify(self.user)
+        self._notify(self.user)
+        self._notify()
+        unread = self._notify(self.other)
+
+        response = self._call('mark_all_read', 'post')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(NotificationCounter.unread_for(self.tenant.id, self.user.id), 0)
+        self.assertEqual(NotificationCounter.unread_for(self.tenant.id, self.other.id), 1)
+        unread.delete()
+        self.assertEqual(NotificationCounter.unread_for(self.tenant.id, self.other.id), 0)
+
+    def test_outlet_filter_uses_column(self):
+        """outlet_id filters on the promoted outlet column"""
+        self._notify(self.user, outlet=self.outlet)
+        self._notify(self.user)
+
+        response = self._call('unread_count', outlet_id=self.outlet.id)
+        self.assertEqual(response.data['unread_count'], 1)
+        response = self._call('list', outlet_id=self.outlet.id)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_summary_from_one_grouped_query(self):
+        self._notify(self.user, priority=Notification.PRIORITY_HIGH)
+        self._notify(type=Notification.TYPE_STOCK)
+        Notification.objects.filter(type=Notification.TYPE_STOCK).update(read=True)
+        self._notify(self.other)
+
+        with self.assertNumQueries(1):
+            response = self._call('summary')
+
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['unread'], 1)
+        self.assertEqual(response.data['read'], 1)
+        self.assertEqual(response.data['by_type'], {'sale': 1, 'stock': 1})
+        self.assertEqual(response.data['by_priority'], {'high': 1, 'normal': 1})
@@ -4,9 +4,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.utils import timezone
 from django.db.models import Q, Count
-from .models import Notification, NotificationPreference
+from collections import defaultdict
+from .models import Notification, NotificationCounter, NotificationPreference
+from .services import NotificationService
 from .serializers import NotificationSerializer, NotificationPreferenceSerializer
 from apps.tenants.permissions import TenantFilterMixin
 from rest_framework.permissions import IsAuthenticated
@@ -37,16 +38,10 @@ class NotificationViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         # Filter by tenant
         queryset = queryset.filter(tenant=tenant)
         
-        # Filter by outlet if provided (check metadata for outlet_id)
-        outlet_id = self.request.query_params.get('outlet_id')
-        if outlet_id:
-            try:
-                outlet_id_int = int(outlet_id)
-                # Filter by metadata containing outlet_id
-                queryset = queryset.filter(metadata__outlet_id=outlet_id_int)
-            except (ValueError, TypeError):
-                # If outlet_id is not a valid integer, ignore the filter
-                pass
+        # Filter by outlet if provided
+        outlet_id = self.get_outlet_id_param()
+        if outlet_id is not None:
+            queryset = queryset.filter(outlet_id=outlet_id)
         
         # Filter by user: show user-specific notifications OR tenant-wide (user=null)
         user = self.request.user
@@ -54,50 +49,82 @@ class NotificationViewSet(TenantFilterMixin, viewsets.ModelViewSet):
         
         return queryset.select_related('tenant', 'user')
     
+    def get_outlet_id_param(self):
+        """outlet_id query param as an int, or None if missing or invalid"""
+        try:
+            return int(self.request.query_params.get('outlet_id'))
+        except (ValueError, TypeError):
+            return None
+    
     def perform_create(self, serializer):
         """Set tenant and user when creating notification"""
         tenant = getattr(self.request, 'tenant', None)
         serializer.save(tenant=tenant)
     
+    def perform_update(self, serializer):
+        """Move the unread count when an update changes read or the recipient"""
+        before = (serializer.instance.read, serializer.instance.user_id)
+        notification = serializer.save()
+        if (notification.read, notification.user_id) != before:
+            was_read, old_user_id = before
+            if not was_read:
+                NotificationCounter.adjust(notification.tenant_id, old_user_id, -1)
+            if not notification.read:
+                NotificationCounter.adjust(notification.tenant_id, notification.user_id, 1)
+    
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark notification as read"""
         notification = self.get_object()
         if not notification.read:
-            notification.read = True
-            notification.save(update_fields=['read', 'updated_at'])
+            NotificationService.mark_read(notification)
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'], url_path='mark-all-read')
     def mark_all_read(self, request):
         """Mark all unread notifications as read"""
-        queryset = self.get_queryset().filter(read=False)
-        count = queryset.update(read=True, updated_at=timezone.now())
+        count = NotificationService.mark_all_read(self.get_queryset())
         return Response({'message': f'{count} notifications marked as read.'})
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        """Get count of unread notifications"""
-        count = self.get_queryset().filter(read=False).count()
+        """
+        Get count of unread notifications
+        
+        Read from the maintained counters; per-outlet counts use the indexed
+        outlet column.
+        """
+        tenant = getattr(request, 'tenant', None)
+        if not tenant:
+            return Response({'unread_count': 0})
+        if self.get_outlet_id_param() is not None:
+            count = self.get_queryset().filter(read=False).count()
+        else:
+            count = NotificationCounter.unread_for(tenant.id, request.user.id)
         return Response({'unread_count': count})
     
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        """Get notification summary"""
-        queryset = self.get_queryset()
+        """Get notification summary from one grouped query"""
+        rows = self.get_queryset().order_by().values('type', 'priority', 'read').annotate(count=Count('id'))
         
-        total = queryset.count()
-        unread = queryset.filter(read=False).count()
-        by_type = queryset.values('type').annotate(count=Count('id'))
-        by_priority = queryset.values('priority').annotate(count=Count('id'))
+        total = unread = 0
+        by_type = defaultdict(int)
+        by_priority = defaultdict(int)
+        for row in rows:
+            total += row['count']
+            if not row['read']:
+                unread += row['count']
+            by_type[row['type']] += row['count']
+            by_priority[row['priority']] += row['count']
         
         return Response({
             'total': total,
             'unread': unread,
             'read': total - unread,
-            'by_type': {item['type']: item['count'] for item in by_type},
-            'by_priority': {item['priority']: item['count'] for item in by_priority},
+            'by_type': dict(by_type),
+            'by_priority': dict(by_priority),
         })
 
 
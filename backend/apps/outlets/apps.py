@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class OutletsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.outlets'
-
+    
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.outlets.signals  # noqa
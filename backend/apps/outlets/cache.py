@@ -0,0 +1,48 @@
+"""
+Outlet resolution cache
+Maps (tenant_id, outlet_id) -> Outlet in the shared cache (primepos.cache) so
+that validating the X-Outlet-ID header / ?outlet= param does not hit the
+database on every request. Entries are dropped by the outlet
+post_save/post_delete signals in every process, not just the one that saved.
+"""
+from django.conf import settings
+
+from primepos.cache import cached
+
+
+def _ttl():
+    return getattr(settings, 'OUTLET_CACHE_TTL', 300)
+
+
+@cached('outlets', ttl=_ttl)
+def _load_outlet(tenant_id, outlet_id):
+    from .models import Outlet
+
+    filters = {'id': outlet_id}
+    if tenant_id is not None:
+        filters['tenant_id'] = tenant_id
+    return Outlet.objects.filter(**filters).first()
+
+
+def resolve_outlet(outlet_id, tenant_id=None):
+    """
+    Resolve an outlet by ID, optionally scoped to a tenant, via the cache.
+    
+    Args:
+        outlet_id: Outlet ID (int or numeric string)
+        tenant_id: Tenant ID to scope the lookup, or None for an unscoped (SaaS admin) lookup
+    
+    Returns:
+        Outlet instance or None if not found / invalid ID
+    """
+    try:
+        outlet_id = int(outlet_id)
+    except (ValueError, TypeError):
+        return None
+    return _load_outlet(tenant_id, outlet_id)
+
+
+def invalidate_outlet(outlet):
+    """Drop the tenant-scoped and unscoped (SaaS admin) entries for an outlet"""
+    _load_outlet.forget(outlet.tenant_id, outlet.pk)
+    _load_outlet.forget(None, outlet.pk)
@@ -0,0 +1,117 @@
+"""
+WebSocket consumers for outlet-wide live state (floor plan)
+"""
+import json
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.utils import timezone
+
+from .floor_plan import FloorPlanService, BAR, RESTAURANT
+
+
+@database_sync_to_async
+def get_scope_user(scope):
+    """
+    Resolve the connecting user from the session or a ``?token=`` JWT.
+
+    Browsers cannot set Authorization headers on WebSocket handshakes, so the
+    SPA passes its access token in the query string.
+    """
+    user = scope.get('user')
+    if user is not None and user.is_authenticated:
+        return user
+
+    token = parse_qs(scope.get('query_string', b'').decode()).get('token')
+    if not token:
+        return None
+
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+    from apps.tenants.authentication import TenantJWTAuthentication
+
+    auth = TenantJWTAuthentication()
+    try:
+        return auth.get_user(auth.get_validated_token(token[0]))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+
+
+@database_sync_to_async
+def get_outlet_for_user(user, outlet_id):
+    """Return the outlet if the user may see it"""
+    from .cache import resolve_outlet
+
+    if getattr(user, 'is_saas_admin', False):
+        return resolve_outlet(outlet_id)
+    if not user.tenant_id:
+        return None
+    return resolve_outlet(outlet_id, user.tenant_id)
+
+
+class FloorPlanConsumer(AsyncWebsocketConsumer):
+    """WebSocket consumer streaming floor plan changes for one outlet"""
+
+    async def connect(self):
+        """Authenticate, join the outlet group and send the current snapshot"""
+        self.group_name = None
+        user = await get_scope_user(self.scope)
+        if not user:
+            await self.close()
+            return
+
+        outlet = await get_outlet_for_user(user, self.scope['url_route']['kwargs']['outlet_id'])
+        if not outlet:
+            await self.close()
+            return
+
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        kind = query.get('kind', [None])[0]
+        self.kinds = [kind] if kind in (BAR, RESTAURANT) else [BAR, RESTAURANT]
+        self.outlet_id = outlet.id
+        self.group_name = FloorPlanService.group_name(outlet.id)
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        for kind in self.kinds:
+            snapshot = await database_sync_to_async(FloorPlanService.get_snapshot)(kind, self.outlet_id)
+            await self.send(text_data=json.dumps({'type': 'floor_plan_snapshot', **snapshot}))
+
+    async def disconnect(self, close_code):
+        """Leave the outlet group"""
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data):
+        """Handle ping and snapshot requests from the client"""
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+
+        message_type = data.get('type')
+        if message_type == 'ping':
+            await self.send(text_data=json.dumps({
+                'type': 'pong',
+                'timestamp': timezone.now().isoformat()
+            }))
+        elif message_type == 'snapshot':
+            # Clients that detect a version gap ask for a full resync
+            for kind in self.kinds:
+                snapshot = await database_sync_to_async(FloorPlanService.get_snapshot)(kind, self.outlet_id)
+                await self.send(text_data=json.dumps({'type': 'floor_plan_snapshot', **snapshot}))
+
+    async def floor_plan_update(self, event):
+        """Forward table deltas for the kinds this client follows"""
+        if event['kind'] not in self.kinds:
+            return
+        await self.send(text_data=json.dumps({
+            'type': 'floor_plan_update',
+            'kind': event['kind'],
+            'version': event['version'],
+            'tables': event['tables'],
+            'removed': event.get('removed', []),
+            'summary': event['summary'],
+        }))
@@ -0,0 +1,322 @@
+"""
+Floor plan state service
+Keeps a compact per-outlet occupancy snapshot (table -> status, open tab/order,
+total, guests) in the Django cache so host stands and bar screens read one
+cached document instead of serializing every table on each poll.
+
+Each table entry is cached under its own key and the outlet keeps an index of
+its table ids, so concurrent updates to different tables never overwrite each
+other. Writers call FloorPlanService.tables_changed() after a table, tab or
+order changes; the affected entries are re-read after commit, written back to
+the cache and pushed to the outlet's Channels group.
+"""
+import logging
+from collections import Counter
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+BAR = 'bar'
+RESTAURANT = 'restaurant'
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _money(value):
+    return float(value) if value is not None else None
+
+
+def build_bar_entries(outlet_id, table_ids=None):
+    """Build floor plan entries for active bar tables with one query"""
+    from apps.bar.models import BarTable
+
+    queryset = BarTable.objects.filter(outlet_id=outlet_id, is_active=True)
+    if table_ids is not None:
+        queryset = queryset.filter(pk__in=table_ids)
+    rows = queryset.values(
+        'id', 'outlet_id', 'number', 'table_type', 'capacity', 'status', 'location',
+        'position_x', 'position_y', 'notes', 'is_active', 'created_at', 'updated_at',
+        'current_tab_id', 'current_tab__tab_number', 'current_tab__customer_name',
+        'current_tab__customer__name', 'current_tab__total', 'current_tab__item_count',
+        'current_tab__opened_at',
+    )
+
+    entries = []
+    for row in rows:
+        summary = None
+        if row['current_tab_id']:
+            tab_number = row['current_tab__tab_number']
+            summary = {
+                'id': str(row['current_tab_id']),
+                'tab_number': tab_number,
+                'customer_name': (
+                    row['current_tab__customer_name']
+                    or row['current_tab__customer__name']
+                    or f"Table {row['number']}"
+                ),
+                'total': _money(row['current_tab__total']),
+                'item_count': row['current_tab__item_count'],
+                'opened_at': _iso(row['current_tab__opened_at']),
+            }
+        entries.append({
+            'id': str(row['id']),
+            'outlet': row['outlet_id'],
+            'number': row['number'],
+            'table_type': row['table_type'],
+            'capacity': row['capacity'],
+            'status': row['status'],
+            'location': row['location'],
+            'position_x': row['position_x'],
+            'position_y': row['position_y'],
+            'current_tab': str(row['current_tab_id']) if row['current_tab_id'] else None,
+            'current_tab_summary': summary,
+            'guests': None,
+            'notes': row['notes'],
+            'is_active': row['is_active'],
+            'created_at': _iso(row['created_at']),
+            'updated_at': _iso(row['updated_at']),
+        })
+    return entries
+
+
+def build_restaurant_entries(outlet_id, table_ids=None):
+    """Build floor plan entries for active restaurant tables and their open orders"""
+    from apps.restaurant.models import Table
+    from apps.sales.models import Sale
+
+    queryset = Table.objects.filter(outlet_id=outlet_id, is_active=True)
+    if table_ids is not None:
+        queryset = queryset.filter(pk__in=table_ids)
+    rows = list(queryset.values(
+        'id', 'outlet_id', 'number', 'capacity', 'status', 'location',
+        'notes', 'is_active', 'created_at', 'updated_at',
+    ))
+
+    # Latest pending order per table
+    open_orders = {}
+    if rows:
+        orders = Sale.objects.filter(
+            table_id__in=[row['id'] for row in rows], status='pending'
+        ).order_by('table_id', '-created_at').values(
+            'id', 'table_id', 'receipt_number', 'total', 'guests', 'created_at'
+        )
+        for order in orders:
+            open_orders.setdefault(order['table_id'], order)
+
+    entries = []
+    for row in rows:
+        order = open_orders.get(row['id'])
+        entries.append({
+            'id': row['id'],
+            'outlet': row['outlet_id'],
+            'number': row['number'],
+            'capacity': row['capacity'],
+            'status': row['status'],
+            'location': row['location'],
+            'current_order': {
+                'id': order['id'],
+                'receipt_number': order['receipt_number'],
+                'total': _money(order['total']),
+                'guests': order['guests'],
+                'opened_at': _iso(order['created_at']),
+            } if order else None,
+            'guests': order['guests'] if order else None,
+            'notes': row['notes'],
+            'is_active': row['is_active'],
+            'created_at': _iso(row['created_at']),
+            'updated_at': _iso(row['updated_at']),
+        })
+    return entries
+
+
+class FloorPlanService:
+    """Service for reading and updating cached floor plan snapshots"""
+
+    builders = {
+        BAR: build_bar_entries,
+        RESTAURANT: build_restaurant_entries,
+    }
+
+    @staticmethod
+    def ttl():
+        return getattr(settings, 'FLOOR_PLAN_CACHE_TTL', 600)
+
+    @staticmethod
+    def group_name(outlet_id):
+        """Channels group receiving floor plan updates for an outlet"""
+        return f'floor_plan_{outlet_id}'
+
+    @staticmethod
+    def _index_key(kind, outlet_id):
+        return f'floor_plan:{kind}:{outlet_id}:index'
+
+    @staticmethod
+    def _version_key(kind, outlet_id):
+        return f'floor_plan:{kind}:{outlet_id}:version'
+
+    @staticmethod
+    def _entry_key(kind, table_id):
+        return f'floor_plan:{kind}:table:{table_id}'
+
+    @classmethod
+    def _store(cls, kind, entries):
+        if entries:
+            cache.set_many({cls._entry_key(kind, entry['id']): entry for entry in entries}, cls.ttl())
+
+    @classmethod
+    def _version(cls, kind, outlet_id):
+        return cache.get(cls._version_key(kind, outlet_id), 0)
+
+    @classmethod
+    def _bump_version(cls, kind, outlet_id):
+        key = cls._version_key(kind, outlet_id)
+        cache.add(key, 0, None)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, None)
+            return 1
+
+    @staticmethod
+    def summarize(entries):
+        """Status counts and open balance for a list of entries"""
+        statuses = Counter(entry['status'] for entry in entries)
+        open_total = Decimal('0')
+        for entry in entries:
+            current = entry.get('current_tab_summary') or entry.get('current_order')
+            if current and current.get('total') is not None:
+                open_total += Decimal(str(current['total']))
+        return {
+            'total': len(entries),
+            'available': statuses.get('available', 0),
+            'occupied': statuses.get('occupied', 0),
+            'reserved': statuses.get('reserved', 0),
+            'out_of_service': statuses.get('out_of_service', 0),
+            'open_total': float(open_total),
+        }
+
+    @classmethod
+    def get_entries(cls, kind, outlet_id):
+        """
+        Return cached table entries for an outlet, building what is missing.
+
+        Args:
+            kind: 'bar' or 'restaurant'
+            outlet_id: Outlet ID
+
+        Returns:
+            List of entry dicts ordered as the table index
+        """
+        builder = cls.builders[kind]
+        index_key = cls._index_key(kind, outlet_id)
+        table_ids = cache.get(index_key)
+
+        if table_ids is None:
+            entries = builder(outlet_id)
+            cls._store(kind, entries)
+            cache.set(index_key, [entry['id'] for entry in entries], cls.ttl())
+            return entries
+
+        keys = {cls._entry_key(kind, table_id): table_id for table_id in table_ids}
+        cached = cache.get_many(list(keys))
+        missing = [table_id for key, table_id in keys.items() if key not in cached]
+        if missing:
+            rebuilt = builder(outlet_id, missing)
+            cls._store(kind, rebuilt)
+            cached.update({cls._entry_key(kind, entry['id']): entry for entry in rebuilt})
+
+        # Entries for tables since moved to another outlet are skipped
+        return [
+            cached[key] for key in keys
+            if key in cached and cached[key]['outlet'] == outlet_id
+        ]
+
+    @classmethod
+    def get_snapshot(cls, kind, outlet_id):
+        """
+        Return the floor plan document for an outlet.
+
+        Returns:
+            Dict with kind, outlet, version, tables and summary
+        """
+        entries = cls.get_entries(kind, outlet_id)
+        return {
+            'kind': kind,
+            'outlet': outlet_id,
+            'version': cls._version(kind, outlet_id),
+            'tables': entries,
+            'summary': cls.summarize(entries),
+        }
+
+    @classmethod
+    def invalidate(cls, kind, outlet_id):
+        """Drop the outlet index so the next read rebuilds it"""
+        cache.delete(cls._index_key(kind, outlet_id))
+
+    @classmethod
+    def refresh_tables(cls, kind, outlet_id, table_ids):
+        """
+        Re-read the given tables, update their cached entries and push them.
+
+        Args:
+            kind: 'bar' or 'restaurant'
+            outlet_id: Outlet the tables belong to
+            table_ids: IDs of changed tables
+
+        Returns:
+            List of refreshed entries
+        """
+        table_ids = {str(table_id) if kind == BAR else table_id for table_id in table_ids if table_id}
+        if not table_ids or outlet_id is None:
+            return []
+
+        entries = cls.builders[kind](outlet_id, table_ids)
+        cls._store(kind, entries)
+
+        # Tables added, deactivated or deleted change the outlet's table list
+        index = cache.get(cls._index_key(kind, outlet_id))
+        found = {entry['id'] for entry in entries}
+        if index is not None and (found - set(index) or table_ids - found):
+            cls.invalidate(kind, outlet_id)
+            cache.delete_many([cls._entry_key(kind, table_id) for table_id in table_ids - found])
+
+        version = cls._bump_version(kind, outlet_id)
+        cls._push(kind, outlet_id, version, entries, removed=sorted(str(t) for t in table_ids - found))
+        return entries
+
+    @classmethod
+    def tables_changed(cls, kind, outlet_id, table_ids):
+        """Refresh tables once the current transaction commits"""
+        table_ids = [table_id for table_id in table_ids if table_id]
+        if not table_ids or outlet_id is None:
+            return
+        transaction.on_commit(lambda: cls.refresh_tables(kind, outlet_id, table_ids))
+
+    @classmethod
+    def _push(cls, kind, outlet_id, version, entries, removed=()):
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(
+                cls.group_name(outlet_id),
+                {
+                    'type': 'floor_plan_update',
+                    'kind': kind,
+                    'version': version,
+                    'tables': entries,
+                    'removed': list(removed),
+                    'summary': cls.summarize(cls.get_entries(kind, outlet_id)),
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Failed to push floor plan update for outlet {outlet_id}: {e}")
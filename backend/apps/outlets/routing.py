@@ -0,0 +1,9 @@
+"""
+WebSocket URL routing for outlet live state
+"""
+from django.urls import re_path
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(r'ws/floor-plan/(?P<outlet_id>\d+)/$', consumers.FloorPlanConsumer.as_asgi()),
+]
@@ -0,0 +1,14 @@
+"""
+Django signals for outlet cache invalidation
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Outlet
+from .cache import invalidate_outlet
+
+
+@receiver(post_save, sender=Outlet)
+@receiver(post_delete, sender=Outlet)
+def invalidate_outlet_cache(sender, instance, **kwargs):
+    """Drop cached lookups for an outlet whenever it changes or is removed"""
+    invalidate_outlet(instance)
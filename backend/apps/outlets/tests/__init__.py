@@ -0,0 +1 @@
+# Test module for outlets app
@@ -0,0 +1,133 @@
+"""
+Cached floor plan snapshot tests
+"""
+
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.bar.models import BarTable, Tab, TabItem
+from apps.bar.services import TabService
+from apps.bar.views import BarTableViewSet
+from apps.outlets.floor_plan import FloorPlanService, BAR, RESTAURANT
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.restaurant.models import Table
+from apps.sales.models import Sale
+from apps.tenants.models import Tenant
+
+
+class FloorPlanServiceTests(TestCase):
+    """Test the per-outlet occupancy snapshot and its updates"""
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Floor Tenant")
+        self.user = User.objects.create_user(username="host", email="host@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Venue")
+        self.product = Product.objects.create(
+            tenant=self.tenant, outlet=self.outlet, name="Lager", retail_price=Decimal("5.00")
+        )
+        self.tables = [
+            BarTable.objects.create(tenant=self.tenant, outlet=self.outlet, number=f"B{i}", location="Main Bar")
+            for i in range(5)
+        ]
+
+    def _open_tab(self, table):
+        with self.captureOnCommitCallbacks(execute=True):
+            tab = Tab.objects.create(
+                tenant=self.tenant, outlet=self.outlet, table=table, opened_by=self.user, customer_name="Sam"
+            )
+            table.open_tab(tab)
+        return tab
+
+    def _entry(self, kind, table_id):
+        snapshot = FloorPlanService.get_snapshot(kind, self.outlet.id)
+        return next(entry for entry in snapshot['tables'] if entry['id'] == table_id)
+
+    def test_warm_snapshot_needs_no_queries(self):
+        """After the first build the floor plan is read from cache only"""
+        with self.assertNumQueries(1):
+            snapshot = FloorPlanService.get_snapshot(BAR, self.outlet.id)
+        self.assertEqual(snapshot['summary']['total'], 5)
+
+        with self.assertNumQueries(0):
+            snapshot = FloorPlanService.get_snapshot(BAR, self.outlet.id)
+        self.assertEqual(snapshot['summary']['available'], 5)
+
+    def test_tab_changes_update_entry_and_push(self):
+        """Opening, adding to and transferring a tab update the cached entries"""
+        FloorPlanService.get_snapshot(BAR, self.outlet.id)
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(FloorPlanService.group_name(self.outlet.id), channel)
+
+        tab = self._open_tab(self.tables[0])
+        entry = self._entry(BAR, str(self.tables[0].pk))
+        self.assertEqual(entry['status'], 'occupied')
+        self.assertEqual(entry['current_tab_summary']['customer_name'], "Sam")
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message['type'], 'floor_plan_update')
+        self.assertEqual(message['summary']['occupied'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TabService.add_items(tab, [
+                TabItem(product=self.product, quantity=3, price=Decimal("5.00"), added_by=self.user)
+            ])
+        entry = self._entry(BAR, str(self.tables[0].pk))
+        self.assertEqual(entry['current_tab_summary']['total'], 15.0)
+        self.assertEqual(entry['current_tab_summary']['item_count'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TabService.transfer_tabs([(tab, self.tables[1])], self.user)
+        snapshot = FloorPlanService.get_snapshot(BAR, self.outlet.id)
+        by_id = {entry['id']: entry for entry in snapshot['tables']}
+        self.assertEqual(by_id[str(self.tables[0].pk)]['status'], 'available')
+        self.assertEqual(by_id[str(self.tables[1].pk)]['current_tab'], str(tab.pk))
+        self.assertEqual(snapshot['summary']['open_total'], 15.0)
+
+    def test_new_and_deactivated_tables_rebuild_index(self):
+        """Changes to the outlet's table list are reflected in the snapshot"""
+        FloorPlanService.get_snapshot(BAR, self.outlet.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            BarTable.objects.create(tenant=self.tenant, outlet=self.outlet, number="B9")
+            self.tables[0].is_active = False
+            self.tables[0].save()
+
+        snapshot = FloorPlanService.get_snapshot(BAR, self.outlet.id)
+        numbers = {entry['number'] for entry in snapshot['tables']}
+        self.assertIn("B9", numbers)
+        self.assertNotIn("B0", numbers)
+
+    def test_restaurant_snapshot_shows_open_orders(self):
+        """Restaurant entries carry the table's pending order, total and guests"""
+        table = Table.objects.create(tenant=self.tenant, outlet=self.outlet, number="R1", status='occupied')
+        FloorPlanService.get_snapshot(RESTAURANT, self.outlet.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Sale.objects.create(
+                tenant=self.tenant, outlet=self.outlet, user=self.user, table=table, guests=4,
+                receipt_number="FLOOR-001", subtotal=Decimal("42.00"), total=Decimal("42.00"), status='pending',
+            )
+
+        entry = self._entry(RESTAURANT, table.pk)
+        self.assertEqual(entry['guests'], 4)
+        self.assertEqual(entry['current_order']['total'], 42.0)
+
+    def test_bar_floor_plan_endpoint(self):
+        """The floor_plan action serves the cached snapshot grouped by location"""
+        self._open_tab(self.tables[2])
+        request = APIRequestFactory().get('/api/v1/bar/tables/floor_plan/', {'outlet': self.outlet.id})
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        response = BarTableViewSet.as_view({'get': 'floor_plan'})(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['locations']['Main Bar']), 5)
+        self.assertEqual(response.data['summary']['occupied'], 1)
+        self.assertEqual(response.data['summary']['available'], 4)
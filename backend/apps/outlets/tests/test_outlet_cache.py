@@ -0,0 +1,61 @@
+"""
+Outlet resolution cache tests
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.outlets.models import Outlet
+from apps.tenants.models import Tenant
+from apps.tenants.permissions import TenantFilterMixin
+from apps.accounts.models import User
+
+
+class OutletCacheTests(TestCase):
+    """Test request memo + shared cache for get_outlet_for_request"""
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Cache Tenant")
+        self.other_tenant = Tenant.objects.create(name="Other Tenant")
+        self.user = User.objects.create_user(username="cacheuser", email="cache@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        self.foreign_outlet = Outlet.objects.create(tenant=self.other_tenant, name="Elsewhere")
+        self.mixin = TenantFilterMixin()
+
+    def _request(self, outlet_id):
+        http_request = APIRequestFactory().get('/api/v1/sales/', HTTP_X_OUTLET_ID=str(outlet_id))
+        http_request.tenant = self.tenant
+        force_authenticate(http_request, user=self.user)
+        request = Request(http_request)
+        request.user = self.user
+        return request
+
+    def test_header_lookup_is_cached(self):
+        """Second request for the same outlet costs no queries"""
+        with self.assertNumQueries(1):
+            self.assertEqual(self.mixin.get_outlet_for_request(self._request(self.outlet.id)), self.outlet)
+
+        request = self._request(self.outlet.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.mixin.get_outlet_for_request(request), self.outlet)
+            self.assertEqual(self.mixin.get_outlet_for_request(request), self.outlet)
+
+    def test_cross_tenant_outlet_rejected(self):
+        """Outlets of another tenant never resolve"""
+        self.assertIsNone(self.mixin.get_outlet_for_request(self._request(self.foreign_outlet.id)))
+        self.assertIsNone(self.mixin.get_outlet_for_request(self._request('not-a-number')))
+
+    def test_save_and_delete_invalidate(self):
+        """Outlet signals drop stale cache entries"""
+        self.mixin.get_outlet_for_request(self._request(self.outlet.id))
+
+        self.outlet.name = "Renamed"
+        self.outlet.save()
+        self.assertEqual(self.mixin.get_outlet_for_request(self._request(self.outlet.id)).name, "Renamed")
+
+        outlet_id = self.outlet.id
+        self.outlet.delete()
+        self.assertIsNone(self.mixin.get_outlet_for_request(self._request(outlet_id)))
@@ -5,3 +5,6 @@ class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.products'
 
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.products.signals  # noqa
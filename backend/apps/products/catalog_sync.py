@@ -0,0 +1,142 @@
+"""
+POS catalogue delta sync
+Tills cache an outlet's products, selling units and categories locally and
+refresh them from a cursor instead of reloading the product list. The cursor
+is the outlet's CatalogSequence number: a client sends the last cursor it
+applied and receives every object changed after it, in columnar form (a
+column list plus one row per object) so payloads stay small in JSON and
+msgpack alike.
+
+Stock and cost are not part of the catalogue; tills read stock through the
+regular stock endpoints. Snapshots are cached per outlet and cursor: any
+catalogue change moves the cursor, so a cached snapshot is never stale.
+"""
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+
+from primepos.cache import cached
+
+from .models import CatalogChange, CatalogSequence, Category, Product, ProductUnit
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_COLUMNS = (
+    'id', 'category_id', 'name', 'sku', 'barcode', 'retail_price', 'wholesale_price',
+    'wholesale_enabled', 'minimum_wholesale_quantity', 'unit', 'low_stock_threshold',
+    'image', 'is_active', 'updated_at',
+)
+UNIT_COLUMNS = (
+    'id', 'product_id', 'unit_name', 'conversion_factor', 'retail_price', 'wholesale_price',
+    'low_stock_threshold', 'is_active', 'sort_order', 'updated_at',
+)
+CATEGORY_COLUMNS = ('id', 'name', 'description')
+
+ENTITIES = {
+    'product': ('products', PRODUCT_COLUMNS),
+    'unit': ('units', UNIT_COLUMNS),
+    'category': ('categories', CATEGORY_COLUMNS),
+}
+
+
+def _encode(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _table(queryset, columns):
+    return {
+        'columns': list(columns),
+        'rows': [[_encode(value) for value in row] for row in queryset.values_list(*columns)],
+    }
+
+
+def _snapshot_ttl():
+    return getattr(settings, 'CATALOG_SNAPSHOT_CACHE_TTL', 300)
+
+
+@cached('catalog_snapshots', ttl=_snapshot_ttl)
+def _snapshot_tables(tenant_id, outlet_id, cursor):
+    """Catalogue tables of an outlet, cached under the cursor they were read at"""
+    tables = {}
+    for entity, queryset in CatalogSyncService.querysets(outlet_id, tenant_id).items():
+        key, columns = ENTITIES[entity]
+        tables[key] = _table(queryset, columns)
+    return tables
+
+
+class CatalogSyncService:
+    """Service for building catalogue snapshots and deltas for tills"""
+
+    @staticmethod
+    def querysets(outlet_id, tenant_id):
+        """Catalogue querysets for an outlet, keyed by entity"""
+        return {
+            'product': Product.objects.filter(outlet_id=outlet_id).order_by('id'),
+            'unit': ProductUnit.objects.filter(product__outlet_id=outlet_id).order_by('id'),
+            'category': Category.objects.filter(tenant_id=tenant_id).order_by('id'),
+        }
+
+    @classmethod
+    def snapshot(cls, outlet):
+        """Full catalogue for a till with no (or an unusable) cursor"""
+        # Read the cursor first: anything committed after this is re-sent later
+        cursor = CatalogSequence.current(outlet.pk)
+        result = {'cursor': cursor, 'reset': True, 'has_more': False}
+        result.update(_snapshot_tables(outlet.tenant_id, outlet.pk, cursor))
+        result['deleted'] = {key: [] for key, _ in ENTITIES.values()}
+        return result
+
+    @classmethod
+    def changes_since(cls, outlet, cursor, limit=None):
+        """
+        Catalogue changes for an outlet after a cursor.
+
+        Args:
+            outlet: Outlet the till belongs to
+            cursor: Last cursor the till applied (0 for a full snapshot)
+            limit: Max changed objects per page (default CATALOG_SYNC_PAGE_SIZE)
+
+        Returns:
+            Dict with cursor, has_more, reset, products/units/categories
+            tables and deleted id lists. reset means the till must replace
+            its catalogue rather than merge into it.
+        """
+        limit = limit or getattr(settings, 'CATALOG_SYNC_PAGE_SIZE', 1000)
+        if cursor <= 0 or cursor > CatalogSequence.current(outlet.pk):
+            return cls.snapshot(outlet)
+
+        changes = list(
+            CatalogChange.objects.filter(outlet=outlet, seq__gt=cursor)
+            .order_by('seq').values_list('seq', 'entity', 'object_id')[:limit + 1]
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        changed = {entity: [] for entity in ENTITIES}
+        for _, entity, object_id in changes:
+            changed[entity].append(object_id)
+
+        result = {
+            'cursor': changes[-1][0] if changes else cursor,
+            'reset': False,
+            'has_more': has_more,
+            'deleted': {},
+        }
+        for entity, queryset in cls.querysets(outlet.pk, outlet.tenant_id).items():
+            key, columns = ENTITIES[entity]
+            table = _table(queryset.filter(pk__in=changed[entity]), columns) if changed[entity] else {
+                'columns': list(columns), 'rows': [],
+            }
+            present = {row[0] for row in table['rows']}
+            result[key] = table
+            # Logged but gone (or no longer in this outlet) means deleted
+            result['deleted'][key] = [object_id for object_id in changed[entity] if object_id not in present]
+
+        logger.debug(f"Catalog delta for outlet {outlet.pk}: {len(changes)} change(s) after {cursor}")
+        return result
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outlets', '0005_alter_printer_options'),
+        ('products', '0016_alter_itemvariation_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_seq', models.PositiveBigIntegerField(default=0)),
+                ('outlet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_sequence', to='outlets.outlet')),
+            ],
+            options={
+                'verbose_name': 'Catalog Sequence',
+                'verbose_name_plural': 'Catalog Sequences',
+                'db_table': 'products_catalogsequence',
+            },
+        ),
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveBigIntegerField()),
+                ('entity', models.CharField(choices=[('product', 'Product'), ('unit', 'Product Unit'), ('category', 'Category')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('outlet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_changes', to='outlets.outlet')),
+            ],
+            options={
+                'verbose_name': 'Catalog Change',
+                'verbose_name_plural': 'Catalog Changes',
+                'db_table': 'products_catalogchange',
+                'ordering': ['outlet', 'seq'],
+                'indexes': [models.Index(fields=['outlet', 'entity', 'object_id'], name='products_ca_outlet__d50245_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='catalogchange',
+            constraint=models.UniqueConstraint(fields=('outlet', 'seq'), name='products_catalogchange_outlet_seq_uniq'),
+        ),
+    ]
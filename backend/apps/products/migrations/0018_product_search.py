@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:00
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Trigram indexes match the UPPER(col::text) expressions apps.products.search
+# filters on; the tsvector over name and description is kept current by a trigger.
+CREATE_SEARCH_INDEXES = """
+CREATE INDEX IF NOT EXISTS products_name_trgm_idx ON products_product USING gin ((UPPER(name::text)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS products_sku_trgm_idx ON products_product USING gin ((UPPER(sku::text)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS products_barcode_trgm_idx ON products_product USING gin ((UPPER(barcode::text)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS products_search_vector_idx ON products_product USING gin (search_vector);
+
+DROP TRIGGER IF EXISTS products_search_vector_update ON products_product;
+CREATE TRIGGER products_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, description ON products_product
+    FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(search_vector, 'pg_catalog.simple', name, description);
+
+UPDATE products_product
+SET search_vector = to_tsvector('pg_catalog.simple', coalesce(name, '') || ' ' || coalesce(description, ''));
+"""
+
+DROP_SEARCH_INDEXES = """
+DROP TRIGGER IF EXISTS products_search_vector_update ON products_product;
+DROP INDEX IF EXISTS products_search_vector_idx;
+DROP INDEX IF EXISTS products_barcode_trgm_idx;
+DROP INDEX IF EXISTS products_sku_trgm_idx;
+DROP INDEX IF EXISTS products_name_trgm_idx;
+"""
+
+
+def create_search_indexes(apps, schema_editor):
+    """Trigram / full-text indexes and trigger (PostgreSQL only)"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SEARCH_INDEXES)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0017_catalog_change_log'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
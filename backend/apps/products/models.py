@@ -1,4 +1,5 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models, transaction
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from apps.tenants.models import Tenant
@@ -55,6 +56,8 @@ class Product(models.Model):
     unit = models.CharField(max_length=50, default='pcs')
     image = models.ImageField(upload_to='products/', blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # Maintained by a database trigger on PostgreSQL (see apps.products.search)
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -261,3 +264,102 @@ class ProductUnit(models.Model):
         return False
 
 
+
+
+class CatalogSequence(models.Model):
+    """Per-outlet counter ordering catalogue changes for delta sync"""
+    outlet = models.OneToOneField('outlets.Outlet', on_delete=models.CASCADE, related_name='catalog_sequence')
+    last_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'products_catalogsequence'
+        verbose_name = 'Catalog Sequence'
+        verbose_name_plural = 'Catalog Sequences'
+
+    def __str__(self):
+        return f"{self.outlet_id}: {self.last_seq}"
+
+    @classmethod
+    def allocate(cls, outlet_id, count=1):
+        """
+        Reserve the next count sequence numbers for an outlet.
+
+        The counter row stays locked until the surrounding transaction
+        commits, so changes to one outlet's catalogue commit in sequence
+        order and a client cursor never skips a change committed late.
+
+        Returns:
+            The last allocated number
+        """
+        table = cls._meta.db_table
+        if connection.vendor in ('postgresql', 'sqlite'):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (outlet_id, last_seq) VALUES (%s, %s) "
+                    f"ON CONFLICT (outlet_id) DO UPDATE SET last_seq = {table}.last_seq + %s "
+                    f"RETURNING last_seq",
+                    [outlet_id, count, count],
+                )
+                return cursor.fetchone()[0]
+
+        with transaction.atomic():
+            sequence, _ = cls.objects.select_for_update().get_or_create(outlet_id=outlet_id)
+            cls.objects.filter(pk=sequence.pk).update(last_seq=models.F('last_seq') + count)
+            return sequence.last_seq + count
+
+    @classmethod
+    def current(cls, outlet_id):
+        """Last committed sequence number for an outlet (0 if nothing changed yet)"""
+        return cls.objects.filter(outlet_id=outlet_id).values_list('last_seq', flat=True).first() or 0
+
+
+class CatalogChange(models.Model):
+    """
+    Change log for an outlet's POS catalogue.
+
+    Holds one row per changed object: recording a change replaces the
+    object's previous row, so the log never grows beyond the catalogue plus
+    its tombstones. A row does not say what changed; delta sync reads the
+    object's current state and reports it deleted when it no longer exists.
+    """
+    ENTITY_CHOICES = [
+        ('product', 'Product'),
+        ('unit', 'Product Unit'),
+        ('category', 'Category'),
+    ]
+
+    outlet = models.ForeignKey('outlets.Outlet', on_delete=models.CASCADE, related_name='catalog_changes')
+    seq = models.PositiveBigIntegerField()
+    entity = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'products_catalogchange'
+        verbose_name = 'Catalog Change'
+        verbose_name_plural = 'Catalog Changes'
+        ordering = ['outlet', 'seq']
+        constraints = [
+            models.UniqueConstraint(fields=['outlet', 'seq'], name='products_catalogchange_outlet_seq_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['outlet', 'entity', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.outlet_id}#{self.seq} {self.entity} {self.object_id}"
+
+    @classmethod
+    def record(cls, outlet_id, entity, object_ids):
+        """Log that objects of one entity changed in an outlet's catalogue"""
+        object_ids = list(dict.fromkeys(object_ids))
+        if not object_ids:
+            return
+        with transaction.atomic():
+            last = CatalogSequence.allocate(outlet_id, len(object_ids))
+            cls.objects.filter(outlet_id=outlet_id, entity=entity, object_id__in=object_ids).delete()
+            first = last - len(object_ids) + 1
+            cls.objects.bulk_create([
+                cls(outlet_id=outlet_id, seq=first + offset, entity=entity, object_id=object_id)
+                for offset, object_id in enumerate(object_ids)
+            ], batch_size=500)
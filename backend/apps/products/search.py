@@ -0,0 +1,56 @@
+"""
+Product search
+Tills search the catalogue on every keystroke, by name, SKU or scanned
+barcode. On PostgreSQL the match runs through the GIN indexes created in
+migration 0018: trigram indexes on UPPER(name/sku/barcode) serve the ILIKE
+and word-similarity lookups, and the trigger-maintained search_vector serves
+prefix full-text matches over name and description.
+
+Ranking: an exact SKU or barcode match comes first, then names starting with
+the term, then the closest trigram / full-text matches.
+"""
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import Case, F, FloatField, Q, TextField, Value, When
+from django.db.models.functions import Cast, Upper
+
+from primepos.search import is_postgres, prefix_tsquery
+
+EXACT_CODE_RANK = 3.0
+NAME_PREFIX_RANK = 1.0
+
+
+def _code_rank(term):
+    return Case(
+        When(Q(sku__iexact=term) | Q(barcode__iexact=term), then=Value(EXACT_CODE_RANK)),
+        When(name__istartswith=term, then=Value(NAME_PREFIX_RANK)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def search_products(queryset, term):
+    """
+    Filter products matching term and annotate them with search_rank.
+
+    Args:
+        queryset: Product queryset (already tenant/outlet scoped)
+        term: Search text as typed or scanned
+    """
+    matches = Q(name__icontains=term) | Q(sku__istartswith=term) | Q(barcode__istartswith=term)
+
+    if not is_postgres(queryset):
+        matches |= Q(description__icontains=term)
+        return queryset.filter(matches).annotate(search_rank=_code_rank(term))
+
+    name = Upper(Cast('name', TextField()))
+    rank = _code_rank(term) + TrigramWordSimilarity(Value(term.upper()), name)
+    matches |= Q(TrigramWordSimilar(name, Value(term.upper())))
+
+    tsquery = prefix_tsquery(term)
+    if tsquery:
+        query = SearchQuery(tsquery, config='simple', search_type='raw')
+        matches |= Q(search_vector=query)
+        rank = rank + SearchRank(F('search_vector'), query)
+
+    return queryset.filter(matches).annotate(search_rank=rank)
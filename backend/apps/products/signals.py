@@ -0,0 +1,94 @@
+"""
+Django signals recording POS catalogue changes for delta sync
+"""
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import CatalogChange, Category, Product, ProductUnit
+
+# Saves that only touch these fields do not change what a till caches
+NON_CATALOG_FIELDS = frozenset({'stock', 'cost', 'updated_at'})
+
+
+def _deleted_directly(sender, origin):
+    """True unless the delete cascades from an outlet, tenant or parent product"""
+    model = getattr(origin, 'model', None) or type(origin)
+    return origin is None or issubclass(model, sender)
+
+
+def _tenant_outlet_ids(tenant_id):
+    from apps.outlets.models import Outlet
+    return list(Outlet.objects.filter(tenant_id=tenant_id).values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Product)
+def record_product_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Log saved products, skipping stock and cost-only updates"""
+    if raw or (update_fields and frozenset(update_fields) <= NON_CATALOG_FIELDS):
+        return
+    CatalogChange.record(instance.outlet_id, 'product', [instance.pk])
+
+
+@receiver(post_delete, sender=Product)
+def record_product_delete(sender, instance, origin=None, **kwargs):
+    """Log deleted products so tills receive a tombstone"""
+    if not _deleted_directly(sender, origin):
+        return
+    CatalogChange.record(instance.outlet_id, 'product', [instance.pk])
+
+
+@receiver(post_save, sender=ProductUnit)
+def record_unit_change(sender, instance, raw=False, **kwargs):
+    """Log saved selling units against their product's outlet"""
+    if raw:
+        return
+    outlet_id = Product.objects.filter(pk=instance.product_id).values_list('outlet_id', flat=True).first()
+    if outlet_id:
+        CatalogChange.record(outlet_id, 'unit', [instance.pk])
+
+
+@receiver(post_delete, sender=ProductUnit)
+def record_unit_delete(sender, instance, origin=None, **kwargs):
+    """
+    Log deleted selling units.
+
+    Units removed along with their product are skipped: the product's
+    tombstone already tells the till to drop them.
+    """
+    if not _deleted_directly(sender, origin):
+        return
+    outlet_id = Product.objects.filter(pk=instance.product_id).values_list('outlet_id', flat=True).first()
+    if outlet_id:
+        CatalogChange.record(outlet_id, 'unit', [instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def record_category_change(sender, instance, raw=False, **kwargs):
+    """Categories are shared by every outlet of the tenant"""
+    if raw:
+        return
+    for outlet_id in _tenant_outlet_ids(instance.tenant_id):
+        CatalogChange.record(outlet_id, 'category', [instance.pk])
+
+
+@receiver(post_delete, sender=Category)
+def record_category_delete(sender, instance, origin=None, **kwargs):
+    """Log deleted categories in every outlet of the tenant"""
+    if not _deleted_directly(sender, origin):
+        return
+    for outlet_id in _tenant_outlet_ids(instance.tenant_id):
+        CatalogChange.record(outlet_id, 'category', [instance.pk])
+
+
+@receiver(pre_delete, sender=Category)
+def record_uncategorized_products(sender, instance, origin=None, **kwargs):
+    """Deleting a category nulls product.category with a plain UPDATE; log those products"""
+    if not _deleted_directly(sender, origin):
+        return
+    by_outlet = defaultdict(list)
+    for product_id, outlet_id in Product.objects.filter(category=instance).values_list('id', 'outlet_id'):
+        by_outlet[outlet_id].append(product_id)
+    for outlet_id, product_ids in by_outlet.items():
+        CatalogChange.record(outlet_id, 'product', product_ids)
@@ -0,0 +1,61 @@
+"""
+Product search tests (SQLite fallback path)
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.products.views import ProductViewSet
+from apps.tenants.models import Tenant
+from primepos.search import prefix_tsquery
+
+
+class ProductSearchTests(TestCase):
+    """Test ranked product search on the list endpoint"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Search Tenant")
+        self.user = User.objects.create_user(username="till", email="till@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        for name, sku, barcode in [
+            ("Orange Juice", "JUI-001", "600100"),
+            ("Blood Orange", "FRU-002", "600200"),
+            ("Apple", "ORA-9", "700300"),
+            ("Bread", "BRD-001", "6001"),
+        ]:
+            Product.objects.create(
+                tenant=self.tenant, outlet=self.outlet, name=name, sku=sku, barcode=barcode,
+                retail_price=Decimal("1.00"), stock=10
+            )
+        self.factory = APIRequestFactory()
+
+    def _search(self, term, **params):
+        request = self.factory.get('/api/v1/products/', {'outlet': self.outlet.id, 'search': term, **params})
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        response = ProductViewSet.as_view({'get': 'list'})(request)
+        data = response.data
+        return [product['name'] for product in data.get('results', data) if isinstance(product, dict)]
+
+    def test_name_prefix_ranks_above_substring(self):
+        self.assertEqual(self._search("orange"), ["Orange Juice", "Blood Orange"])
+
+    def test_exact_barcode_comes_first(self):
+        """A scanned barcode puts its product before others sharing the prefix"""
+        self.assertEqual(self._search("6001"), ["Bread", "Orange Juice"])
+
+    def test_sku_prefix_matches(self):
+        self.assertEqual(self._search("ora-"), ["Apple"])
+
+    def test_explicit_ordering_wins(self):
+        self.assertEqual(self._search("orange", ordering="name"), ["Blood Orange", "Orange Juice"])
+
+    def test_prefix_tsquery(self):
+        self.assertEqual(prefix_tsquery("coca co"), "coca:* & co:*")
+        self.assertEqual(prefix_tsquery("it's"), "it:* & s:*")
+        self.assertEqual(prefix_tsquery("&|!"), "")
@@ -2,11 +2,17 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .models import Product, Category, ProductUnit
 from .serializers import ProductSerializer, CategorySerializer, ProductUnitSerializer
 from apps.tenants.permissions import TenantFilterMixin
+from primepos.renderers import MessagePackRenderer
+from primepos.db_routing import replica_reads
+from primepos.search import RankedSearchFilter
+from .catalog_sync import CatalogSyncService
+from .search import search_products
 from django.db import transaction
 from decimal import Decimal
 import logging
@@ -110,9 +116,10 @@ class ProductViewSet(viewsets.ModelViewSet, TenantFilterMixin):
     queryset = Product.objects.select_related('category', 'tenant', 'outlet')
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, RankedSearchFilter]
     filterset_fields = ['tenant', 'outlet', 'category', 'is_active']
     search_fields = ['name', 'sku', 'barcode', 'description']
+    search_function = staticmethod(search_products)
     ordering_fields = ['name', 'retail_price', 'wholesale_price', 'price', 'stock', 'created_at']
     ordering = ['name']
     
@@ -150,8 +157,7 @@ class ProductViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         if not is_saas_admin:
             if tenant:
                 queryset = queryset.filter(tenant=tenant)
-                count = queryset.count()
-                logger.info(f"Applied tenant filter: {tenant.id} ({tenant.name}) - {count} products found")
+                logger.debug(f"Applied tenant filter: {tenant.id} ({tenant.name})")
             else:
                 logger.error(f"CRITICAL: No tenant found for user {user.email} (ID: {user.id}). User must have a tenant assigned to view products.")
                 logger.error(f"User tenant: {user_tenant}, Request tenant: {request_tenant}")
@@ -164,7 +170,7 @@ class ProductViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             outlet = self.get_outlet_for_request(self.request)
             if outlet:
                 queryset = queryset.filter(outlet=outlet)
-                logger.info(f"Applied outlet filter: {outlet.id} ({outlet.name}) - {queryset.count()} products found")
+                logger.debug(f"Applied outlet filter: {outlet.id} ({outlet.name})")
             else:
                 # If no outlet specified, return empty queryset (products require outlet)
                 logger.warning(f"No outlet specified in request - returning empty queryset")
@@ -174,7 +180,7 @@ class ProductViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             outlet = self.get_outlet_for_request(self.request)
             if outlet:
                 queryset = queryset.filter(outlet=outlet)
-                logger.info(f"SaaS admin - Applied outlet filter: {outlet.id} ({outlet.name}) - {queryset.count()} products found")
+                logger.debug(f"SaaS admin - Applied outlet filter: {outlet.id} ({outlet.name})")
         
         return queryset
     
@@ -456,6 +462,38 @@ class ProductViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         serializer = self.get_serializer(low_stock_products, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], url_path='changes-since', renderer_classes=[JSONRenderer, MessagePackRenderer])
+    def changes_since(self, request):
+        """
+        Delta sync of the outlet catalogue for POS tills
+        
+        Query params: outlet (or X-Outlet-ID), cursor (0 or omitted for a full snapshot).
+        Send Accept: application/msgpack or ?format=msgpack for msgpack.
+        
+        Output:
+        {
+            "cursor": <pass back on the next call>,
+            "reset": <true when the till must replace its catalogue>,
+            "has_more": <true when another page is waiting>,
+            "products": {"columns": [...], "rows": [[...], ...]},
+            "units": {"columns": [...], "rows": [...]},
+            "categories": {"columns": [...], "rows": [...]},
+            "deleted": {"products": [ids], "units": [ids], "categories": [ids]}
+        }
+        
+        Units of a deleted product are not listed separately.
+        """
+        outlet = self.get_outlet_for_request(request)
+        if not outlet:
+            return Response({"detail": "outlet is required"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            cursor = int(request.query_params.get('cursor') or 0)
+        except (TypeError, ValueError):
+            return Response({"detail": "cursor must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(CatalogSyncService.changes_since(outlet, cursor))
+    
     @action(detail=False, methods=['get'], url_path='generate-sku')
     def generate_sku_preview(self, request):
         """Generate a preview SKU for the current tenant"""
@@ -1027,11 +1065,19 @@ class ProductViewSet(viewsets.ModelViewSet, TenantFilterMixin):
                     )
                     
                     if not product_created:
-                        # Update existing product
+                        # Update existing product, saving only the columns that changed
+                        # so a stock-only re-import is not a catalogue change for tills
+                        changed = []
                         for key, value in product_data.items():
-                            if key != 'name':  # Don't update name
-                                setattr(product, key, value)
-                        product.save()
+                            if key == 'name':  # Don't update name
+                                continue
+                            field = Product._meta.get_field(key)
+                            value = field.to_python(value)
+                            if getattr(product, field.attname) != value:
+                                setattr(product, field.attname, value)
+                                changed.append(field.attname)
+                        if changed:
+                            product.save(update_fields=changed + ['updated_at'])
                     
                     # Now process variations for this product
                     from apps.inventory.models import LocationStock
@@ -1190,6 +1236,7 @@ class ProductViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             )
     
     @action(detail=False, methods=['get'], url_path='bulk-export')
+    @replica_reads
     def bulk_export(self, request):
         """
         Bulk export products to Excel/CSV file
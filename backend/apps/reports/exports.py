@@ -0,0 +1,199 @@
+"""
+Bulk data exports
+Sales, sale items and stock movements for a period are exported as flat
+CSV or XLSX files. Rows are read with one joined values_list() query
+through a server-side cursor (.iterator()) and written out as they arrive,
+so memory stays flat however long the period is:
+
+- CSV is streamed straight to the client (stream_csv) or written to a file;
+- XLSX uses openpyxl's write-only workbook, which spools rows to disk.
+
+Short periods are downloaded directly; longer ones run as ReportExport jobs
+that write the file to media storage (see generate_export).
+"""
+import csv
+import io
+import logging
+import tempfile
+from datetime import datetime
+
+from django.core.files import File
+from django.utils import timezone
+from openpyxl import Workbook
+
+from apps.inventory.models import StockMovement
+from apps.sales.models import Sale, SaleItem
+from primepos.db_routing import analytics_db
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+FORMATS = ('csv', 'xlsx')
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class Dataset:
+    """An exportable table: its model, how it is scoped and its columns"""
+
+    def __init__(self, model, columns, tenant='tenant', outlet='outlet', created_at='created_at'):
+        self.model = model
+        self.columns = columns
+        self.tenant = tenant
+        self.outlet = outlet
+        self.created_at = created_at
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    def queryset(self, tenant_id, start, end, outlet_id=None, using=None):
+        """Rows of the dataset created in [start, end), as value tuples in column order"""
+        filters = {self.tenant: tenant_id, f'{self.created_at}__gte': start, f'{self.created_at}__lt': end}
+        if outlet_id:
+            filters[self.outlet] = outlet_id
+        return self.model.objects.using(using or analytics_db()).filter(**filters).order_by(
+            self.created_at, 'id'
+        ).values_list(*[lookup for _, lookup in self.columns])
+
+
+DATASETS = {
+    'sales': Dataset(Sale, [
+        ('Receipt', 'receipt_number'),
+        ('Date', 'created_at'),
+        ('Outlet', 'outlet__name'),
+        ('Till', 'till__name'),
+        ('Cashier', 'user__name'),
+        ('Customer', 'customer__name'),
+        ('Payment Method', 'payment_method'),
+        ('Status', 'status'),
+        ('Payment Status', 'payment_status'),
+        ('Subtotal', 'subtotal'),
+        ('Tax', 'tax'),
+        ('Discount', 'discount'),
+        ('Total', 'total'),
+        ('Amount Paid', 'amount_paid'),
+    ]),
+    'sale_items': Dataset(SaleItem, [
+        ('Receipt', 'sale__receipt_number'),
+        ('Date', 'sale__created_at'),
+        ('Outlet', 'sale__outlet__name'),
+        ('Sale Status', 'sale__status'),
+        ('Product', 'product_name'),
+        ('SKU', 'product__sku'),
+        ('Unit', 'unit_name'),
+        ('Quantity', 'quantity'),
+        ('Base Quantity', 'quantity_in_base_units'),
+        ('Price', 'price'),
+        ('Total', 'total'),
+    ], tenant='sale__tenant', outlet='sale__outlet', created_at='sale__created_at'),
+    'stock_movements': Dataset(StockMovement, [
+        ('Date', 'created_at'),
+        ('Outlet', 'outlet__name'),
+        ('Product', 'product__name'),
+        ('SKU', 'product__sku'),
+        ('Type', 'movement_type'),
+        ('Quantity', 'quantity'),
+        ('Reason', 'reason'),
+        ('Reference', 'reference_id'),
+        ('User', 'user__name'),
+    ]),
+}
+
+
+def _cell(value):
+    """Spreadsheet-friendly value: local, naive datetimes (XLSX has no time zones)"""
+    if isinstance(value, datetime):
+        return timezone.localtime(value).replace(tzinfo=None) if timezone.is_aware(value) else value
+    return '' if value is None else value
+
+
+def rows(queryset):
+    """Iterate a dataset queryset through a server-side cursor"""
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield [_cell(value) for value in row]
+
+
+def _csv_chunks(headers, data):
+    """Encode rows as CSV, yielding every CHUNK_SIZE rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for count, row in enumerate(data, 1):
+        writer.writerow(row)
+        if count % CHUNK_SIZE == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def stream_csv(headers, queryset):
+    """CSV export of a dataset queryset as an iterator of encoded chunks"""
+    return _csv_chunks(headers, rows(queryset))
+
+
+def write_export(export_format, headers, queryset, fileobj):
+    """
+    Write an export to a binary file object.
+
+    Returns:
+        Number of data rows written
+    """
+    count = 0
+
+    def counted(data):
+        nonlocal count
+        for row in data:
+            count += 1
+            yield row
+
+    data = counted(rows(queryset))
+    if export_format == 'csv':
+        for chunk in _csv_chunks(headers, data):
+            fileobj.write(chunk)
+        return count
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Export')
+    sheet.append(headers)
+    for row in data:
+        sheet.append(row)
+    workbook.save(fileobj)
+    return count
+
+
+def generate_export(export):
+    """
+    Write a ReportExport's file to media storage.
+
+    Completed exports are left alone, so a redelivered job does not write
+    the file twice. Failures are recorded on the export and re-raised.
+    """
+    if export.status == export.STATUS_COMPLETED:
+        return export
+
+    export.status = export.STATUS_RUNNING
+    export.save(update_fields=['status'])
+    dataset = DATASETS[export.dataset]
+    queryset = dataset.queryset(export.tenant_id, export.period_start, export.period_end, export.outlet_id)
+
+    try:
+        with tempfile.TemporaryFile() as output:
+            export.row_count = write_export(export.format, dataset.headers, queryset, output)
+            output.seek(0)
+            export.file.save(export.filename, File(output), save=False)
+    except Exception as e:
+        logger.exception(f"Export {export.pk} failed")
+        export.status = export.STATUS_FAILED
+        export.error = str(e)
+        export.save(update_fields=['status', 'error'])
+        raise
+
+    export.status = export.STATUS_COMPLETED
+    export.error = ''
+    export.completed_at = timezone.now()
+    export.save(update_fields=['status', 'error', 'file', 'row_count', 'completed_at'])
+    return export
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tenants', '0005_add_logo_field'),
+        ('outlets', '0005_alter_printer_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportExport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(choices=[('sales', 'Sales'), ('sale_items', 'Sale Items'), ('stock_movements', 'Stock Movements')], max_length=20)),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'Excel')], default='csv', max_length=10)),
+                ('period_start', models.DateTimeField()),
+                ('period_end', models.DateTimeField(help_text='Exclusive end of the exported period')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('file', models.FileField(blank=True, upload_to='exports/%Y/%m/')),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('outlet', models.ForeignKey(blank=True, help_text='Export one outlet only (empty: all outlets)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='report_exports', to='outlets.outlet')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_exports', to=settings.AUTH_USER_MODEL)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_exports', to='tenants.tenant')),
+            ],
+            options={
+                'verbose_name': 'Report Export',
+                'verbose_name_plural': 'Report Exports',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['tenant', '-created_at'], name='reports_rep_tenant__bade63_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+from apps.tenants.models import Tenant
+from apps.outlets.models import Outlet
+from apps.accounts.models import User
+
+
+class ReportExport(models.Model):
+    """
+    A bulk export of sales, sale items or stock movements for a period.
+
+    Generated in the background (see apps.reports.exports.generate_export)
+    into media storage, then downloaded through the API.
+    """
+    DATASET_CHOICES = [
+        ('sales', 'Sales'),
+        ('sale_items', 'Sale Items'),
+        ('stock_movements', 'Stock Movements'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel'),
+    ]
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='report_exports')
+    outlet = models.ForeignKey(Outlet, on_delete=models.CASCADE, null=True, blank=True, related_name='report_exports', help_text="Export one outlet only (empty: all outlets)")
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='report_exports')
+    dataset = models.CharField(max_length=20, choices=DATASET_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField(help_text="Exclusive end of the exported period")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    file = models.FileField(upload_to='exports/%Y/%m/', blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Report Export'
+        verbose_name_plural = 'Report Exports'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.dataset} export {self.pk} ({self.status})"
+
+    @property
+    def filename(self):
+        """Download name, e.g. sales_2026-10-01_2026-10-31.csv"""
+        start = timezone.localdate(self.period_start)
+        end = timezone.localdate(self.period_end - timedelta(microseconds=1))
+        return f"{self.dataset}_{start}_{end}.{self.format}"
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from django.urls import reverse
+from .models import ReportExport
+
+
+class ReportExportSerializer(serializers.ModelSerializer):
+    """Report export job serializer"""
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportExport
+        fields = ('id', 'dataset', 'format', 'outlet', 'period_start', 'period_end', 'status',
+                  'row_count', 'error', 'download_url', 'created_at', 'completed_at')
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportExport.STATUS_COMPLETED:
+            return None
+        url = reverse('report-export-file', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
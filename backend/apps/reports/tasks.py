@@ -0,0 +1,17 @@
+"""
+Report tasks
+Bulk exports run on the analytics queue. generate_export skips exports that
+already completed, so a redelivered task does not write the file again.
+"""
+from celery import shared_task
+
+from . import exports
+from .models import ReportExport
+
+
+@shared_task(name='reports.generate_export')
+def generate_export(export_id):
+    """Write a ReportExport's file to media storage"""
+    export = ReportExport.objects.filter(pk=export_id).first()
+    if export is not None:
+        exports.generate_export(export)
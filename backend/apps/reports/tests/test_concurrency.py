@@ -0,0 +1,50 @@
+"""
+Concurrent report query tests
+"""
+
+import threading
+import zoneinfo
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from primepos.concurrency import gather
+
+
+class GatherTests(SimpleTestCase):
+    """Test running independent calls on the analytics pool"""
+
+    def test_calls_run_concurrently(self):
+        """Two calls that wait for each other only finish if they overlap"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def call(value):
+            barrier.wait()
+            return value
+
+        self.assertEqual(gather(a=lambda: call(1), b=lambda: call(2)), {'a': 1, 'b': 2})
+
+    def test_errors_are_raised(self):
+        def fail():
+            raise ValueError("bad query")
+
+        with self.assertRaisesMessage(ValueError, "bad query"):
+            gather(ok=lambda: 1, failing=fail)
+
+    def test_timezone_carries_over(self):
+        with timezone.override(zoneinfo.ZoneInfo('Africa/Blantyre')):
+            results = gather(a=lambda: str(timezone.get_current_timezone()), b=lambda: str(timezone.get_current_timezone()))
+        self.assertEqual(results, {'a': 'Africa/Blantyre', 'b': 'Africa/Blantyre'})
+
+    def test_nested_gather_runs_inline(self):
+        results = gather(outer=lambda: gather(x=lambda: 1, y=lambda: 2), other=lambda: 3)
+        self.assertEqual(results, {'outer': {'x': 1, 'y': 2}, 'other': 3})
+
+
+class GatherInTransactionTests(TestCase):
+    """Inside a transaction other connections cannot see its rows"""
+
+    def test_calls_run_on_the_calling_thread(self):
+        thread = threading.current_thread()
+        results = gather(a=threading.current_thread, b=threading.current_thread)
+        self.assertEqual(results, {'a': thread, 'b': thread})
@@ -0,0 +1,119 @@
+"""
+Bulk export tests
+"""
+
+import csv
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.inventory.models import StockMovement
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.reports.exports import DATASETS, write_export
+from apps.reports.models import ReportExport
+from apps.reports.views import export_download, report_export_detail, report_export_file, report_exports
+from apps.sales.models import Sale, SaleItem
+from apps.tenants.models import Tenant
+
+
+class ExportTests(TestCase):
+    """Test streamed downloads and background exports"""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.tenant = Tenant.objects.create(name="Export Tenant")
+        self.user = User.objects.create_user(username="acct", email="acct@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        self.branch = Outlet.objects.create(tenant=self.tenant, name="Branch")
+        self.soda = Product.objects.create(tenant=self.tenant, outlet=self.outlet, name="Soda", retail_price=Decimal("2.00"))
+        self.today = timezone.localdate()
+        for number, outlet, quantity in [("E-1", self.outlet, 2), ("E-2", self.outlet, 1), ("E-3", self.branch, 5)]:
+            total = self.soda.retail_price * quantity
+            sale = Sale.objects.create(
+                tenant=self.tenant, outlet=outlet, user=self.user, receipt_number=number,
+                subtotal=total, total=total, payment_method='cash',
+            )
+            SaleItem.objects.create(sale=sale, product=self.soda, product_name="Soda", quantity=quantity, price=self.soda.retail_price, total=total)
+        StockMovement.objects.create(
+            tenant=self.tenant, outlet=self.outlet, product=self.soda, movement_type='damage', quantity=1, reason="Dropped,\nbroken"
+        )
+        self.factory = APIRequestFactory()
+
+    def _call(self, view, method='get', data=None, *args):
+        request = getattr(self.factory, method)('/api/v1/reports/exports/', data or {}, format='json' if method == 'post' else None)
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return view(request, *args)
+
+    def _period(self, **params):
+        return {'start_date': self.today.isoformat(), 'end_date': self.today.isoformat(), **params}
+
+    def test_csv_download_streams_rows(self):
+        response = self._call(export_download, 'get', self._period(dataset='sales', outlet=self.outlet.id))
+        self.assertTrue(response.streaming)
+        self.assertIn(f'sales_{self.today}_{self.today}.csv', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], DATASETS['sales'].headers)
+        self.assertEqual([row[0] for row in rows[1:]], ["E-1", "E-2"])
+        self.assertEqual(rows[1][-2], "4.00")
+
+    def test_xlsx_download(self):
+        response = self._call(export_download, 'get', self._period(dataset='sale_items', file_format='xlsx'))
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True).active
+        rows = list(sheet.values)
+        self.assertEqual(list(rows[0]), DATASETS['sale_items'].headers)
+        self.assertEqual(sorted(row[0] for row in rows[1:]), ["E-1", "E-2", "E-3"])
+
+    def test_download_validation(self):
+        self.assertEqual(self._call(export_download, 'get', self._period(dataset='customers')).status_code, 400)
+        self.assertEqual(self._call(export_download, 'get', {'dataset': 'sales'}).status_code, 400)
+        self.assertEqual(self._call(export_download, 'get', self._period(start_date='2026-02-30')).status_code, 400)
+        other = Outlet.objects.create(tenant=Tenant.objects.create(name="Other"), name="Other")
+        self.assertEqual(self._call(export_download, 'get', self._period(outlet=other.id)).status_code, 404)
+        long_period = self._period(start_date=(self.today - timedelta(days=90)).isoformat())
+        self.assertEqual(self._call(export_download, 'get', long_period).status_code, 400)
+
+    def test_background_export(self):
+        data = self._period(dataset='stock_movements', start_date=(self.today - timedelta(days=90)).isoformat())
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._call(report_exports, 'post', data)
+        self.assertEqual(response.status_code, 202)
+        self.assertIsNone(response.data['download_url'])
+
+        detail = self._call(report_export_detail, 'get', None, response.data['id']).data
+        self.assertEqual((detail['status'], detail['row_count']), ('completed', 1))
+        self.assertTrue(detail['download_url'].endswith(f"/reports/exports/{detail['id']}/file/"))
+
+        download = self._call(report_export_file, 'get', None, detail['id'])
+        rows = list(csv.reader(io.StringIO(b''.join(download.streaming_content).decode())))
+        download.close()
+        self.assertEqual(rows[1][DATASETS['stock_movements'].headers.index('Reason')], "Dropped,\nbroken")
+        self.assertEqual(len(self._call(report_exports).data), 1)
+
+    def test_exports_are_tenant_scoped(self):
+        other = Tenant.objects.create(name="Other")
+        export = ReportExport.objects.create(
+            tenant=other, dataset='sales', period_start=timezone.now(), period_end=timezone.now()
+        )
+        self.assertEqual(self._call(report_export_detail, 'get', None, export.id).status_code, 404)
+        self.assertEqual(self._call(report_export_file, 'get', None, export.id).status_code, 404)
+
+    def test_write_export_counts_rows(self):
+        output = io.BytesIO()
+        start = timezone.now() - timedelta(hours=1)
+        queryset = DATASETS['sales'].queryset(self.tenant.id, start, start + timedelta(hours=2))
+        self.assertEqual(write_export('csv', DATASETS['sales'].headers, queryset, output), 3)
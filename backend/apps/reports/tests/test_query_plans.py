@@ -0,0 +1,147 @@
+"""
+Query plan regression tests
+Captures EXPLAIN output for the hot tenant/outlet-scoped queries on a seeded
+dataset and fails if any of them falls back to a sequential/full table scan.
+"""
+
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.inventory.models import Batch, StockMovement
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.reports.views import day_bounds
+from apps.restaurant.models import KitchenOrderTicket
+from apps.sales.models import Sale, Receipt
+from apps.tenants.models import Tenant
+
+
+class QueryPlanTestCase(TestCase):
+    """Seeded dataset + helpers to assert a query is served by an index"""
+
+    SALES_PER_OUTLET = 200
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        today = now.date()
+        cls.tenants = [Tenant.objects.create(name=f"Plan Tenant {i}") for i in range(2)]
+        cls.user = User.objects.create_user(username="planner", email="planner@example.com", password="pass", tenant=cls.tenants[0])
+        cls.outlets = [Outlet.objects.create(tenant=t, name=f"Outlet {i}") for t in cls.tenants for i in range(2)]
+        cls.tenant, cls.outlet = cls.tenants[0], cls.outlets[0]
+
+        products, sales, batches, movements = [], [], [], []
+        for outlet in cls.outlets:
+            for i in range(20):
+                products.append(Product(tenant=outlet.tenant, outlet=outlet, name=f"P{outlet.id}-{i}", retail_price=Decimal("5.00")))
+        Product.objects.bulk_create(products)
+        cls.product = Product.objects.filter(outlet=cls.outlet).first()
+
+        for outlet in cls.outlets:
+            for i in range(cls.SALES_PER_OUTLET):
+                sales.append(Sale(
+                    tenant=outlet.tenant, outlet=outlet, user=cls.user,
+                    receipt_number=f"PLAN-{outlet.id}-{i:05d}",
+                    subtotal=Decimal("5.00"), total=Decimal("5.00"),
+                    status='completed' if i % 5 else 'pending',
+                ))
+        Sale.objects.bulk_create(sales)
+
+        for product in Product.objects.all():
+            for i in range(5):
+                batches.append(Batch(
+                    tenant=product.tenant, outlet=product.outlet, product=product,
+                    batch_number=f"B{product.id}-{i}", expiry_date=today + timedelta(days=i * 10 - 10),
+                    quantity=0 if i == 4 else 10,
+                ))
+                movements.append(StockMovement(
+                    tenant=product.tenant, outlet=product.outlet, product=product,
+                    movement_type='sale' if i % 2 else 'purchase', quantity=1,
+                ))
+        Batch.objects.bulk_create(batches)
+        StockMovement.objects.bulk_create(movements)
+
+        cls.sale = Sale.objects.filter(outlet=cls.outlet).first()
+        Receipt.objects.bulk_create([
+            Receipt(tenant=s.tenant, sale=s, receipt_number=s.receipt_number, format='escpos', content='x', voided=(s.id % 3 == 0))
+            for s in Sale.objects.all()
+        ])
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # With seq scans disabled the planner still picks one when no index applies
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, table):
+        plan = self.explain(queryset)
+        if connection.vendor == 'postgresql':
+            full_scan = re.search(rf'Seq Scan on {table}\b', plan)
+        elif connection.vendor == 'sqlite':
+            # "SCAN <table>" walks every row (even "USING INDEX" for ordering);
+            # index lookups show up as "SEARCH <table>"
+            full_scan = re.search(rf'SCAN {table}\b', plan)
+        else:
+            self.skipTest(f"No plan parser for {connection.vendor}")
+        self.assertIsNone(full_scan, f"Sequential scan on {table}:\n{plan}")
+        return plan
+
+
+class HotQueryPlanTests(QueryPlanTestCase):
+    """Plans for SaleViewSet, stock helpers, receipts and report queries"""
+
+    def test_sale_list_for_outlet(self):
+        """SaleViewSet.get_queryset: tenant + outlet + date range, newest first"""
+        start = timezone.now() - timedelta(days=30)
+        qs = Sale.objects.filter(tenant=self.tenant, outlet=self.outlet, created_at__gte=start).order_by('-created_at', '-id')
+        self.assertUsesIndex(qs[:20], 'sales_sale')
+
+    def test_completed_sales_report(self):
+        """Report views: completed sales for an outlet over a day range"""
+        day_start, day_end = day_bounds(timezone.now().date())
+        qs = Sale.objects.filter(
+            tenant=self.tenant, outlet_id=self.outlet.id, status='completed',
+            created_at__gte=day_start, created_at__lt=day_end,
+        ).values('payment_method').order_by()
+        self.assertUsesIndex(qs, 'sales_sale')
+
+    def test_sellable_batches_fifo(self):
+        """deduct_stock / get_available_stock: non-empty, unexpired batches by expiry"""
+        today = timezone.now().date()
+        qs = Batch.objects.filter(
+            product=self.product, outlet=self.outlet, expiry_date__gt=today, quantity__gt=0,
+        ).order_by('expiry_date', 'created_at')
+        self.assertUsesIndex(qs, 'inventory_batch')
+
+    def test_stock_movements_for_outlet(self):
+        """Stock movement report / list: tenant + outlet + date range"""
+        start = timezone.now() - timedelta(days=30)
+        qs = StockMovement.objects.filter(tenant=self.tenant, outlet_id=self.outlet.id, created_at__gte=start)
+        self.assertUsesIndex(qs, 'inventory_stockmovement')
+
+    def test_current_receipt_lookup(self):
+        """ReceiptService.generate_receipt: current receipt for sale + format"""
+        qs = Receipt.objects.filter(sale=self.sale, format='escpos', is_current=True, voided=False)
+        self.assertUsesIndex(qs, 'sales_receipt')
+
+    def test_receipt_by_number(self):
+        """ReceiptService.get_receipt_by_number: newest live receipt for a number"""
+        qs = Receipt.objects.filter(receipt_number=self.sale.receipt_number, voided=False).order_by('-generated_at')
+        self.assertUsesIndex(qs[:1], 'sales_receipt')
+
+    def test_kot_by_outlet_day_number(self):
+        """Kitchen tickets looked up by their per-outlet daily number"""
+        qs = KitchenOrderTicket.objects.filter(
+            outlet=self.outlet, sequence_day=timezone.localdate(), sequence_number=1
+        )
+        self.assertUsesIndex(qs, 'restaurant_kitchenorderticket')
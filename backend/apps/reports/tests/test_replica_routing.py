@@ -0,0 +1,117 @@
+"""
+Read-replica routing tests
+"""
+
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.sales.models import Sale
+from primepos import db_routing
+from primepos.concurrency import gather
+from primepos.db_routing import (
+    ReadReplicaRouter, ReadYourWritesMiddleware, analytics_db, read_from_replica, replica_reads,
+)
+
+
+class ReplicaTestCase(SimpleTestCase):
+    """Pretend a reachable 'replica' alias is configured"""
+
+    def setUp(self):
+        cache.clear()
+        db_routing._replica_down_until = 0.0
+        patches = [
+            mock.patch.object(db_routing, 'replica_alias', return_value='replica'),
+            mock.patch.object(db_routing, '_replica_available', return_value=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.router = ReadReplicaRouter()
+
+
+class ReplicaRouterTests(ReplicaTestCase):
+    """Test which database analytical reads go to"""
+
+    def test_only_replica_reads_use_the_replica(self):
+        self.assertIsNone(self.router.db_for_read(Sale))
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Sale), 'replica')
+            self.assertEqual(analytics_db(), 'replica')
+            self.assertEqual(self.router.db_for_write(Sale), 'default')
+        self.assertEqual(analytics_db(), 'default')
+
+    def test_use_primary(self):
+        with read_from_replica(use_primary=True):
+            self.assertIsNone(self.router.db_for_read(Sale))
+
+    def test_gather_keeps_routing(self):
+        with read_from_replica():
+            results = gather(a=analytics_db, b=analytics_db)
+        self.assertEqual(results, {'a': 'replica', 'b': 'replica'})
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'sales'))
+        self.assertIsNone(self.router.allow_migrate('default', 'sales'))
+
+
+class ReplicaFallbackTests(SimpleTestCase):
+    """Test falling back to the primary"""
+
+    def setUp(self):
+        db_routing._replica_down_until = 0.0
+        self.addCleanup(setattr, db_routing, '_replica_down_until', 0.0)
+
+    def test_no_replica_configured(self):
+        with read_from_replica():
+            self.assertEqual(analytics_db(), 'default')
+
+    def test_unreachable_replica(self):
+        """A refused connection sends reads to the primary and is remembered"""
+        replica = mock.Mock()
+        replica.ensure_connection.side_effect = OperationalError("connection refused")
+        with mock.patch.object(db_routing, 'replica_alias', return_value='replica'), \
+                mock.patch.object(db_routing, 'connections', {'replica': replica}):
+            with read_from_replica():
+                self.assertEqual(analytics_db(), 'default')
+            with read_from_replica():
+                self.assertEqual(analytics_db(), 'default')
+        replica.ensure_connection.assert_called_once()
+
+
+@override_settings(REPLICA_STICKY_SECONDS=10)
+class ReadYourWritesTests(ReplicaTestCase):
+    """Test pinning a user's reads to the primary after a write"""
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def _request(self, method, user_id):
+        request = getattr(self.factory, method)('/api/v1/reports/sales/')
+        request.user = AnonymousUser()
+        request.principal_id = user_id
+
+        @replica_reads
+        def view(request):
+            return HttpResponse(analytics_db())
+
+        return ReadYourWritesMiddleware(view)(request).content.decode()
+
+    def test_reads_after_write_use_primary(self):
+        self.assertEqual(self._request('get', 7), 'replica')
+        self.assertEqual(self._request('post', 7), 'default')
+        self.assertEqual(self._request('get', 7), 'default')
+        # Other users still read from the replica
+        self.assertEqual(self._request('get', 8), 'replica')
+
+    def test_pin_expires(self):
+        with override_settings(REPLICA_STICKY_SECONDS=0.01):
+            self._request('post', 7)
+        time.sleep(0.05)
+        self.assertEqual(self._request('get', 7), 'replica')
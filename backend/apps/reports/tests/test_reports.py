@@ -0,0 +1,106 @@
+"""
+Report endpoint tests
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.inventory.models import StockMovement, StockTake, StockTakeItem
+from apps.outlets.models import Outlet, Till
+from apps.products.models import Product
+from apps.reports.views import (
+    cash_summary_report, inventory_valuation_report, profit_loss_report, sales_report,
+    shift_summary_report, stock_movement_report,
+)
+from apps.sales.models import Sale, SaleItem
+from apps.shifts.models import Shift
+from apps.tenants.models import Tenant
+
+
+class ReportTests(TestCase):
+    """Test report totals built from grouped, concurrently run queries"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Report Tenant")
+        self.user = User.objects.create_user(username="mgr", email="mgr@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        till = Till.objects.create(outlet=self.outlet, name="Till 1")
+        self.today = timezone.localdate()
+        self.shift = Shift.objects.create(
+            outlet=self.outlet, till=till, user=self.user, operating_date=self.today,
+            opening_cash_balance=Decimal("100.00"), status='CLOSED',
+        )
+        self.soda = Product.objects.create(
+            tenant=self.tenant, outlet=self.outlet, name="Soda", retail_price=Decimal("2.00"), cost=Decimal("1.00"), stock=50
+        )
+        self.bread = Product.objects.create(
+            tenant=self.tenant, outlet=self.outlet, name="Bread", retail_price=Decimal("3.00"), stock=10
+        )
+        for number, method, product, quantity in [
+            ("R-1", 'cash', self.soda, 3), ("R-2", 'card', self.bread, 2), ("R-3", 'cash', self.soda, 1),
+        ]:
+            total = product.retail_price * quantity
+            sale = Sale.objects.create(
+                tenant=self.tenant, outlet=self.outlet, user=self.user, shift=self.shift, receipt_number=number,
+                subtotal=total, total=total, tax=Decimal("0.50"), payment_method=method, status='completed',
+                cash_received=total if method == 'cash' else None, change_given=Decimal("0") if method == 'cash' else None,
+            )
+            SaleItem.objects.create(
+                sale=sale, product=product, product_name=product.name, quantity=quantity, price=product.retail_price, total=total
+            )
+        self.factory = APIRequestFactory()
+
+    def _get(self, view, **params):
+        request = self.factory.get('/api/v1/reports/', {'outlet': self.outlet.id, **params})
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return view(request).data
+
+    def test_sales_report(self):
+        data = self._get(sales_report)
+        self.assertEqual(data['total_sales'], 3)
+        self.assertEqual(data['total_revenue'], 14.0)
+        self.assertEqual(data['total_tax'], 1.5)
+        self.assertEqual(data['top_products'][0]['product_name'], "Soda")
+
+    def test_profit_loss_costs_items_in_sql(self):
+        data = self._get(profit_loss_report)
+        self.assertEqual(data['total_revenue'], 14.0)
+        self.assertEqual(data['total_cost'], 4.0)  # Bread has no cost price
+        self.assertEqual(data['gross_profit'], 10.0)
+
+    def test_shift_and_cash_summaries(self):
+        shift = self._get(shift_summary_report)['shifts'][0]
+        self.assertEqual((shift['total_sales'], shift['total_revenue']), (3, 14.0))
+        self.assertEqual((shift['cash_sales_count'], shift['cash_sales_total']), (2, 8.0))
+
+        data = self._get(cash_summary_report, date=self.today.isoformat())
+        self.assertEqual((data['total_cash_sales'], data['total_cash_amount']), (2, 8.0))
+        self.assertEqual(data['shifts'][0]['cash_sales_count'], 2)
+
+    def test_inventory_valuation(self):
+        for movement_type, quantity in [('purchase', 20), ('sale', 4), ('sale', 1), ('damage', 2)]:
+            StockMovement.objects.create(
+                tenant=self.tenant, outlet=self.outlet, product=self.soda, movement_type=movement_type, quantity=quantity
+            )
+        stock_take = StockTake.objects.create(
+            tenant=self.tenant, outlet=self.outlet, operating_date=self.today, status='completed', completed_at=timezone.now()
+        )
+        # bulk_create: StockTakeItem.save() still refers to the removed variation field
+        StockTakeItem.objects.bulk_create([
+            StockTakeItem(stock_take=stock_take, product=self.soda, expected_quantity=50, counted_quantity=48, difference=-2)
+        ])
+
+        data = self._get(inventory_valuation_report)
+        soda = next(item for item in data['items'] if item['name'] == "Soda")
+        self.assertEqual((soda['received_qty'], soda['sold_qty']), (20, 5))
+        self.assertEqual(soda['open_qty'], 50 + 5 + 2 - 20)
+        self.assertEqual((soda['counted_qty'], soda['discrepancy']), (48, -2))
+        self.assertTrue(data['has_stock_take'])
+
+        movements = self._get(stock_movement_report)
+        self.assertEqual(movements['total_movements'], 4)
@@ -2,7 +2,7 @@ from django.urls import path
 from .views import (
     sales_report, products_report, customers_report, profit_loss_report, stock_movement_report,
     daily_sales_report, top_products_report, cash_summary_report, shift_summary_report,
-    inventory_valuation_report
+    inventory_valuation_report, export_download, report_exports, report_export_detail, report_export_file
 )
 
 urlpatterns = [
@@ -18,5 +18,10 @@ urlpatterns = [
     path('reports/shift-summary/', shift_summary_report, name='shift-summary-report'),
     # Comprehensive inventory valuation report
     path('reports/inventory-valuation/', inventory_valuation_report, name='inventory-valuation-report'),
+    # Bulk exports: direct download for short periods, background jobs for long ones
+    path('reports/exports/download/', export_download, name='report-export-download'),
+    path('reports/exports/', report_exports, name='report-exports'),
+    path('reports/exports/<int:pk>/', report_export_detail, name='report-export-detail'),
+    path('reports/exports/<int:pk>/file/', report_export_file, name='report-export-file'),
 ]
 
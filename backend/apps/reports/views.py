@@ -2,15 +2,28 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Sum, Count, Avg, Q, F
+from django.conf import settings
+from django.db.models import Sum, Count, Avg, Q, F, DecimalField
+from django.http import FileResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from datetime import datetime, timedelta, date
+from django.utils.dateparse import parse_date
+from datetime import datetime, timedelta, date, time
 from decimal import Decimal
+import tempfile
 from apps.sales.models import Sale, SaleItem
 from apps.products.models import Product, Category
 from apps.customers.models import Customer
 from apps.inventory.models import StockMovement, StockTake, StockTakeItem
 from apps.shifts.models import Shift
+from apps.outlets.models import Outlet
+from primepos.celery import enqueue_on_commit
+from primepos.concurrency import gather
+from primepos.db_routing import replica_reads
+from . import exports
+from .models import ReportExport
+from .serializers import ReportExportSerializer
+from .tasks import generate_export
 
 
 def get_outlet_id_from_request(request):
@@ -23,8 +36,24 @@ def get_outlet_id_from_request(request):
     return outlet_id
 
 
+def day_bounds(start_day, end_day=None):
+    """
+    Return aware [start, end) datetimes covering whole days in the current timezone.
+    
+    Filtering with created_at__gte/__lt on these bounds keeps the predicate on the
+    raw column, so composite (tenant, outlet, ..., created_at) indexes apply;
+    created_at__date casts every row and cannot use them.
+    """
+    end_day = end_day or start_day
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def sales_report(request):
     """Sales report with filters"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -53,29 +82,33 @@ def sales_report(request):
     if payment_method:
         queryset = queryset.filter(payment_method=payment_method)
     
-    # Aggregations
-    total_sales = queryset.count()
-    total_revenue = queryset.aggregate(Sum('total'))['total__sum'] or 0
-    total_tax = queryset.aggregate(Sum('tax'))['tax__sum'] or 0
-    total_discount = queryset.aggregate(Sum('discount'))['discount__sum'] or 0
-    
     # Top products
     top_products = SaleItem.objects.filter(sale__in=queryset).values('product_name').annotate(
         total_quantity=Sum('quantity'),
         total_revenue=Sum('total')
     ).order_by('-total_revenue')[:10]
     
+    # Totals and top products run concurrently
+    results = gather(
+        totals=lambda: queryset.aggregate(
+            total_sales=Count('id'), total_revenue=Sum('total'), total_tax=Sum('tax'), total_discount=Sum('discount'),
+        ),
+        top_products=lambda: list(top_products),
+    )
+    totals = results['totals']
+    
     return Response({
-        'total_sales': total_sales,
-        'total_revenue': float(total_revenue),
-        'total_tax': float(total_tax),
-        'total_discount': float(total_discount),
-        'top_products': list(top_products),
+        'total_sales': totals['total_sales'] or 0,
+        'total_revenue': float(totals['total_revenue'] or 0),
+        'total_tax': float(totals['total_tax'] or 0),
+        'total_discount': float(totals['total_discount'] or 0),
+        'top_products': results['top_products'],
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def products_report(request):
     """Products performance report - outlet-specific"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -98,15 +131,25 @@ def products_report(request):
     if end_date:
         sales_queryset = sales_queryset.filter(created_at__lte=end_date)
     
+    # Sales per product in one grouped query, loaded alongside the products
+    sold = SaleItem.objects.filter(
+        product__in=queryset.values('pk'),
+        sale__in=sales_queryset.values('pk')
+    ).values('product_id').annotate(
+        total_sold=Sum('quantity'),
+        total_revenue=Sum('total')
+    )
+    results = gather(
+        products=lambda: list(queryset),
+        sold=lambda: {row['product_id']: row for row in sold},
+    )
+    
     # Product performance
     product_performance = []
-    for product in queryset:
-        items = SaleItem.objects.filter(
-            product=product,
-            sale__in=sales_queryset
-        )
-        total_sold = items.aggregate(Sum('quantity'))['quantity__sum'] or 0
-        total_revenue = items.aggregate(Sum('total'))['total__sum'] or 0
+    for product in results['products']:
+        product_sales = results['sold'].get(product.id, {})
+        total_sold = product_sales.get('total_sold') or 0
+        total_revenue = product_sales.get('total_revenue') or 0
         
         product_performance.append({
             'product_id': product.id,
@@ -124,6 +167,7 @@ def products_report(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def customers_report(request):
     """Customers report"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -132,27 +176,34 @@ def customers_report(request):
     
     queryset = Customer.objects.filter(tenant=tenant, is_active=True)
     
-    total_customers = queryset.count()
-    total_points = queryset.aggregate(Sum('loyalty_points'))['loyalty_points__sum'] or 0
-    total_spent = queryset.aggregate(Sum('total_spent'))['total_spent__sum'] or 0
-    avg_points = queryset.aggregate(Avg('loyalty_points'))['loyalty_points__avg'] or 0
-    
     # Top customers
     top_customers = queryset.order_by('-total_spent')[:10].values(
         'id', 'name', 'email', 'phone', 'loyalty_points', 'total_spent', 'last_visit'
     )
     
+    results = gather(
+        totals=lambda: queryset.aggregate(
+            total_customers=Count('id'),
+            total_points=Sum('loyalty_points'),
+            total_spent=Sum('total_spent'),
+            avg_points=Avg('loyalty_points'),
+        ),
+        top_customers=lambda: list(top_customers),
+    )
+    totals = results['totals']
+    
     return Response({
-        'total_customers': total_customers,
-        'total_points': total_points,
-        'total_spent': float(total_spent),
-        'avg_points': float(avg_points),
-        'top_customers': list(top_customers),
+        'total_customers': totals['total_customers'] or 0,
+        'total_points': totals['total_points'] or 0,
+        'total_spent': float(totals['total_spent'] or 0),
+        'avg_points': float(totals['avg_points'] or 0),
+        'top_customers': results['top_customers'],
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def profit_loss_report(request):
     """Profit & Loss report"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -175,15 +226,15 @@ def profit_loss_report(request):
     if outlet_id:
         sales_queryset = sales_queryset.filter(outlet_id=outlet_id)
     
-    # Revenue
-    total_revenue = sales_queryset.aggregate(Sum('total'))['total__sum'] or 0
-    
-    # Cost of goods sold
-    sale_items = SaleItem.objects.filter(sale__in=sales_queryset)
-    total_cost = 0
-    for item in sale_items:
-        if item.product and item.product.cost:
-            total_cost += item.product.cost * item.quantity
+    # Revenue and cost of goods sold (items without a product cost count as zero)
+    results = gather(
+        revenue=lambda: sales_queryset.aggregate(Sum('total'))['total__sum'] or 0,
+        cost=lambda: SaleItem.objects.filter(sale__in=sales_queryset.values('pk')).aggregate(
+            cost=Sum(F('product__cost') * F('quantity'), output_field=DecimalField(max_digits=20, decimal_places=2))
+        )['cost'] or 0,
+    )
+    total_revenue = results['revenue']
+    total_cost = results['cost']
     
     # Gross profit
     gross_profit = total_revenue - total_cost
@@ -199,6 +250,7 @@ def profit_loss_report(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def stock_movement_report(request):
     """Stock movement report"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -228,14 +280,17 @@ def stock_movement_report(request):
         count=Count('id')
     )
     
+    movements_by_type = list(movements_by_type)
+    
     return Response({
-        'movements_by_type': list(movements_by_type),
-        'total_movements': queryset.count(),
+        'movements_by_type': movements_by_type,
+        'total_movements': sum(row['count'] for row in movements_by_type),
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def daily_sales_report(request):
     """Daily sales report filtered by tenant and date"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -255,19 +310,15 @@ def daily_sales_report(request):
         return Response({"detail": "Outlet is required. Please specify X-Outlet-ID header or ?outlet=id query parameter."}, status=400)
     
     # Filter sales
+    day_start, day_end = day_bounds(report_date)
     queryset = Sale.objects.filter(
         tenant=tenant,
         outlet_id=outlet_id,
         status='completed',
-        created_at__date=report_date
+        created_at__gte=day_start,
+        created_at__lt=day_end
     )
     
-    # Aggregations
-    total_sales = queryset.count()
-    total_revenue = queryset.aggregate(Sum('total'))['total__sum'] or Decimal('0')
-    total_tax = queryset.aggregate(Sum('tax'))['tax__sum'] or Decimal('0')
-    total_discount = queryset.aggregate(Sum('discount'))['discount__sum'] or Decimal('0')
-    
     # By payment method
     by_payment_method = queryset.values('payment_method').annotate(
         count=Count('id'),
@@ -280,19 +331,29 @@ def daily_sales_report(request):
         total=Sum('total')
     )
     
+    results = gather(
+        totals=lambda: queryset.aggregate(
+            total_sales=Count('id'), total_revenue=Sum('total'), total_tax=Sum('tax'), total_discount=Sum('discount'),
+        ),
+        by_payment_method=lambda: list(by_payment_method),
+        by_shift=lambda: list(by_shift),
+    )
+    totals = results['totals']
+    
     return Response({
         'date': report_date.isoformat(),
-        'total_sales': total_sales,
-        'total_revenue': float(total_revenue),
-        'total_tax': float(total_tax),
-        'total_discount': float(total_discount),
-        'by_payment_method': list(by_payment_method),
-        'by_shift': list(by_shift),
+        'total_sales': totals['total_sales'] or 0,
+        'total_revenue': float(totals['total_revenue'] or Decimal('0')),
+        'total_tax': float(totals['total_tax'] or Decimal('0')),
+        'total_discount': float(totals['total_discount'] or Decimal('0')),
+        'by_payment_method': results['by_payment_method'],
+        'by_shift': results['by_shift'],
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def top_products_report(request):
     """Top products report filtered by tenant, outlet, and date range"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -336,6 +397,7 @@ def top_products_report(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def cash_summary_report(request):
     """Cash summary report filtered by tenant and date"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -352,57 +414,70 @@ def cash_summary_report(request):
     outlet_id = get_outlet_id_from_request(request)
     
     # Filter cash sales
+    day_start, day_end = day_bounds(report_date)
     queryset = Sale.objects.filter(
         tenant=tenant,
         payment_method='cash',
         status='completed',
-        created_at__date=report_date
+        created_at__gte=day_start,
+        created_at__lt=day_end
     )
     
     if outlet_id:
         queryset = queryset.filter(outlet_id=outlet_id)
     
-    # Aggregations
-    total_cash_sales = queryset.count()
-    total_cash_received = queryset.aggregate(Sum('cash_received'))['cash_received__sum'] or Decimal('0')
-    total_change_given = queryset.aggregate(Sum('change_given'))['change_given__sum'] or Decimal('0')
-    total_cash_amount = queryset.aggregate(Sum('total'))['total__sum'] or Decimal('0')
-    
     # By shift
     shifts = Shift.objects.filter(
         outlet__tenant=tenant,
         outlet_id=outlet_id,
         operating_date=report_date,
         status='CLOSED'
+    ).select_related('outlet', 'till')
+    shift_sales = queryset.filter(shift__in=shifts.values('pk')).values('shift_id').annotate(
+        count=Count('id'),
+        total=Sum('total')
+    )
+    
+    results = gather(
+        totals=lambda: queryset.aggregate(
+            total_cash_sales=Count('id'),
+            total_cash_received=Sum('cash_received'),
+            total_change_given=Sum('change_given'),
+            total_cash_amount=Sum('total'),
+        ),
+        shifts=lambda: list(shifts),
+        shift_sales=lambda: {row['shift_id']: row for row in shift_sales},
     )
+    totals = results['totals']
     
     shift_summaries = []
-    for shift in shifts:
-        shift_sales = queryset.filter(shift=shift)
+    for shift in results['shifts']:
+        sales = results['shift_sales'].get(shift.id, {})
         shift_summaries.append({
             'shift_id': shift.id,
             'outlet': shift.outlet.name,
             'till': shift.till.name,
             'opening_cash': float(shift.opening_cash_balance),
             'closing_cash': float(shift.closing_cash_balance) if shift.closing_cash_balance else None,
-            'system_total': float(shift.system_total) if shift.system_total else None,
-            'difference': float(shift.difference) if shift.difference else None,
-            'cash_sales_count': shift_sales.count(),
-            'cash_sales_total': float(shift_sales.aggregate(Sum('total'))['total__sum'] or Decimal('0')),
+            'system_total': float(shift.system_total) if getattr(shift, 'system_total', None) else None,
+            'difference': float(shift.difference) if getattr(shift, 'difference', None) else None,
+            'cash_sales_count': sales.get('count', 0),
+            'cash_sales_total': float(sales.get('total') or Decimal('0')),
         })
     
     return Response({
         'date': report_date.isoformat(),
-        'total_cash_sales': total_cash_sales,
-        'total_cash_received': float(total_cash_received),
-        'total_change_given': float(total_change_given),
-        'total_cash_amount': float(total_cash_amount),
+        'total_cash_sales': totals['total_cash_sales'] or 0,
+        'total_cash_received': float(totals['total_cash_received'] or Decimal('0')),
+        'total_change_given': float(totals['total_change_given'] or Decimal('0')),
+        'total_cash_amount': float(totals['total_cash_amount'] or Decimal('0')),
         'shifts': shift_summaries,
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def shift_summary_report(request):
     """Shift summary report filtered by tenant and date range"""
     tenant = getattr(request, 'tenant', None) or request.user.tenant
@@ -428,11 +503,22 @@ def shift_summary_report(request):
     # Get closed shifts with summaries
     closed_shifts = queryset.filter(status='CLOSED').select_related('outlet', 'till', 'user')
     
+    # Sales totals for every shift in one grouped query, loaded alongside the shifts
+    cash = Q(payment_method='cash')
+    shift_sales = Sale.objects.filter(shift__in=closed_shifts.values('pk'), status='completed').values('shift_id').annotate(
+        total_sales=Count('id'),
+        total_revenue=Sum('total'),
+        cash_sales_count=Count('id', filter=cash),
+        cash_sales_total=Sum('total', filter=cash),
+    )
+    results = gather(
+        shifts=lambda: list(closed_shifts),
+        shift_sales=lambda: {row['shift_id']: row for row in shift_sales},
+    )
+    
     shift_summaries = []
-    for shift in closed_shifts:
-        # Get sales for this shift
-        shift_sales = Sale.objects.filter(shift=shift, status='completed')
-        cash_sales = shift_sales.filter(payment_method='cash')
+    for shift in results['shifts']:
+        sales = results['shift_sales'].get(shift.id, {})
         
         shift_summaries.append({
             'shift_id': shift.id,
@@ -444,12 +530,12 @@ def shift_summary_report(request):
             'end_time': shift.end_time.isoformat() if shift.end_time else None,
             'opening_cash': float(shift.opening_cash_balance),
             'closing_cash': float(shift.closing_cash_balance) if shift.closing_cash_balance else None,
-            'system_total': float(shift.system_total) if shift.system_total else None,
-            'difference': float(shift.difference) if shift.difference else None,
-            'total_sales': shift_sales.count(),
-            'total_revenue': float(shift_sales.aggregate(Sum('total'))['total__sum'] or Decimal('0')),
-            'cash_sales_count': cash_sales.count(),
-            'cash_sales_total': float(cash_sales.aggregate(Sum('total'))['total__sum'] or Decimal('0')),
+            'system_total': float(shift.system_total) if getattr(shift, 'system_total', None) else None,
+            'difference': float(shift.difference) if getattr(shift, 'difference', None) else None,
+            'total_sales': sales.get('total_sales', 0),
+            'total_revenue': float(sales.get('total_revenue') or Decimal('0')),
+            'cash_sales_count': sales.get('cash_sales_count', 0),
+            'cash_sales_total': float(sales.get('cash_sales_total') or Decimal('0')),
         })
     
     return Response({
@@ -464,6 +550,7 @@ def shift_summary_report(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def inventory_valuation_report(request):
     """
     Comprehensive Inventory Valuation Report
@@ -502,22 +589,47 @@ def inventory_valuation_report(request):
     
     products = products.select_related('category').order_by('category__name', 'name')
     
-    # Get stock movements for the period
+    # Stock movements for the period, summed per product and movement type
+    period_start, period_end = day_bounds(start_dt, end_dt)
     movements = StockMovement.objects.filter(
         tenant=tenant,
         outlet_id=outlet_id,
-        created_at__date__gte=start_dt,
-        created_at__date__lte=end_dt
+        created_at__gte=period_start,
+        created_at__lt=period_end
+    ).values('product_id', 'movement_type').annotate(qty=Sum('quantity')).order_by()
+    
+    def load_movements():
+        totals = {}
+        for row in movements:
+            totals.setdefault(row['product_id'], {})[row['movement_type']] = row['qty'] or 0
+        return totals
+    
+    def load_stock_take():
+        # Latest stock take (if any) and its counted quantities per product
+        stock_take = StockTake.objects.filter(
+            tenant=tenant,
+            outlet_id=outlet_id,
+            status='completed',
+            operating_date__gte=start_dt,
+            operating_date__lte=end_dt
+        ).order_by('-completed_at').first()
+        if stock_take is None:
+            return None, {}
+        counts = dict(
+            StockTakeItem.objects.filter(stock_take=stock_take, product__isnull=False)
+            .values_list('product_id', 'counted_quantity')
+        )
+        return stock_take, counts
+    
+    # Independent reads run concurrently
+    results = gather(
+        products=lambda: list(products),
+        movements=load_movements,
+        stock_take=load_stock_take,
+        categories=lambda: list(Category.objects.filter(tenant=tenant).values('id', 'name')),
     )
-    
-    # Get latest stock take (if any)
-    latest_stock_take = StockTake.objects.filter(
-        tenant=tenant,
-        outlet_id=outlet_id,
-        status='completed',
-        operating_date__gte=start_dt,
-        operating_date__lte=end_dt
-    ).order_by('-completed_at').first()
+    movement_totals = results['movements']
+    latest_stock_take, counted_by_product = results['stock_take']
     
     # Build report data
     report_items = []
@@ -534,37 +646,23 @@ def inventory_valuation_report(request):
         'shortage_qty': 0, 'shortage_value': Decimal('0'),
     }
     
-    for product in products:
+    for product in results['products']:
         retail_price = product.retail_price or Decimal('0')
         cost_price = product.cost or retail_price  # Use cost if available, else retail
         
-        # Get movements by type for this product
-        product_movements = movements.filter(product=product)
-        
-        # Calculate quantities by movement type
-        received = product_movements.filter(movement_type='purchase').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
+        # Quantities by movement type for this product
+        product_movements = movement_totals.get(product.id, {})
+        received = product_movements.get('purchase', 0)
         
-        transferred_in = product_movements.filter(movement_type='transfer_in').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
-        transferred_out = product_movements.filter(movement_type='transfer_out').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
+        transferred_in = product_movements.get('transfer_in', 0)
+        transferred_out = product_movements.get('transfer_out', 0)
         transferred = transferred_in - transferred_out
         
-        adjusted = product_movements.filter(movement_type='adjustment').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
-        
-        sold = product_movements.filter(movement_type='sale').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
-        
-        returns = product_movements.filter(movement_type='return').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
-        
-        damage = product_movements.filter(movement_type='damage').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
-        
-        expiry = product_movements.filter(movement_type='expiry').aggregate(
-            qty=Sum('quantity'))['qty'] or 0
+        adjusted = product_movements.get('adjustment', 0)
+        sold = product_movements.get('sale', 0)
+        returns = product_movements.get('return', 0)
+        damage = product_movements.get('damage', 0)
+        expiry = product_movements.get('expiry', 0)
         
         # Current stock (from product or calculate)
         current_stock = product.stock or 0
@@ -572,15 +670,8 @@ def inventory_valuation_report(request):
         # Calculate opening stock: current + sold + transferred_out + damage + expiry - received - transferred_in - returns - adjusted
         opening_stock = current_stock + sold + transferred_out + damage + expiry - received - transferred_in - returns - adjusted
         
-        # Get stock take data if available
-        counted_qty = 0
-        if latest_stock_take:
-            stock_take_item = StockTakeItem.objects.filter(
-                stock_take=latest_stock_take,
-                product=product
-            ).first()
-            if stock_take_item:
-                counted_qty = stock_take_item.counted_quantity
+        # Stock take data if available
+        counted_qty = counted_by_product.get(product.id, 0)
         
         # Calculate discrepancy
         discrepancy = counted_qty - current_stock if counted_qty > 0 else 0
@@ -671,9 +762,6 @@ def inventory_valuation_report(request):
     # Convert totals to float
     totals = {k: float(v) if isinstance(v, Decimal) else v for k, v in totals.items()}
     
-    # Get categories for filter
-    categories = Category.objects.filter(tenant=tenant).values('id', 'name')
-    
     return Response({
         'items': report_items,
         'totals': totals,
@@ -681,9 +769,153 @@ def inventory_valuation_report(request):
             'start_date': start_date,
             'end_date': end_date,
         },
-        'categories': list(categories),
+        'categories': results['categories'],
         'has_stock_take': latest_stock_take is not None,
         'stock_take_date': latest_stock_take.operating_date.isoformat() if latest_stock_take else None,
         'item_count': len(report_items),
     })
 
+
+
+def _export_request(request, params):
+    """
+    Validate export parameters.
+    
+    Returns:
+        (dict of tenant, outlet_id, dataset, format, period_start, period_end; None)
+        or (None, error Response)
+    """
+    tenant = getattr(request, 'tenant', None) or request.user.tenant
+    if not tenant:
+        return None, Response({"detail": "User must have a tenant"}, status=400)
+    
+    dataset = params.get('dataset', 'sales')
+    if dataset not in exports.DATASETS:
+        return None, Response({"detail": f"dataset must be one of: {', '.join(exports.DATASETS)}"}, status=400)
+    # Not `format`, which DRF reserves for choosing a renderer
+    export_format = (params.get('file_format') or 'csv').lower()
+    if export_format not in exports.FORMATS:
+        return None, Response({"detail": f"file_format must be one of: {', '.join(exports.FORMATS)}"}, status=400)
+    
+    try:
+        start_day = parse_date(params.get('start_date') or '')
+        end_day = parse_date(params.get('end_date') or '')
+    except ValueError:
+        # Well-formed but impossible dates such as 2026-02-30
+        start_day = end_day = None
+    if not start_day or not end_day or start_day > end_day:
+        return None, Response({"detail": "start_date and end_date must be YYYY-MM-DD with start_date <= end_date"}, status=400)
+    
+    outlet_id = str(params.get('outlet') or get_outlet_id_from_request(request) or '')
+    if outlet_id and not (outlet_id.isdigit() and Outlet.objects.filter(pk=outlet_id, tenant=tenant).exists()):
+        return None, Response({"detail": "Outlet not found"}, status=404)
+    
+    period_start, period_end = day_bounds(start_day, end_day)
+    return {
+        'tenant': tenant,
+        'outlet_id': outlet_id or None,
+        'dataset': dataset,
+        'format': export_format,
+        'period_start': period_start,
+        'period_end': period_end,
+    }, None
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def export_download(request):
+    """
+    Download sales, sale items or stock movements for a period
+    
+    Query params: dataset (sales, sale_items, stock_movements), file_format
+    (csv, xlsx), start_date, end_date and optionally outlet. CSV is streamed as it
+    is read. Periods longer than REPORT_EXPORT_STREAM_MAX_DAYS (default 31)
+    must be exported in the background with POST reports/exports/.
+    """
+    params, error = _export_request(request, request.query_params)
+    if error:
+        return error
+    
+    max_days = getattr(settings, 'REPORT_EXPORT_STREAM_MAX_DAYS', 31)
+    if params['period_end'] - params['period_start'] > timedelta(days=max_days, hours=1):
+        return Response(
+            {"detail": f"Periods longer than {max_days} days must be exported in the background (POST reports/exports/)"},
+            status=400,
+        )
+    
+    dataset = exports.DATASETS[params['dataset']]
+    # Bound to the replica now: the response is read after the view returns
+    queryset = dataset.queryset(params['tenant'].id, params['period_start'], params['period_end'], params['outlet_id'])
+    filename = ReportExport(
+        dataset=params['dataset'], format=params['format'],
+        period_start=params['period_start'], period_end=params['period_end'],
+    ).filename
+    
+    if params['format'] == 'csv':
+        response = StreamingHttpResponse(exports.stream_csv(dataset.headers, queryset), content_type=exports.CONTENT_TYPES['csv'])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    output = tempfile.TemporaryFile()
+    exports.write_export(params['format'], dataset.headers, queryset, output)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=exports.CONTENT_TYPES[params['format']])
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def report_exports(request):
+    """
+    List the tenant's recent exports, or start a background export
+    
+    POST takes the same fields as export_download and returns the export
+    (202). Poll it until its status is completed, then fetch download_url.
+    """
+    if request.method == 'GET':
+        tenant = getattr(request, 'tenant', None) or request.user.tenant
+        if not tenant:
+            return Response({"detail": "User must have a tenant"}, status=400)
+        queryset = ReportExport.objects.filter(tenant=tenant)[:50]
+        return Response(ReportExportSerializer(queryset, many=True, context={'request': request}).data)
+    
+    params, error = _export_request(request, request.data)
+    if error:
+        return error
+    
+    export = ReportExport.objects.create(
+        tenant=params['tenant'],
+        outlet_id=params['outlet_id'],
+        requested_by=request.user,
+        dataset=params['dataset'],
+        format=params['format'],
+        period_start=params['period_start'],
+        period_end=params['period_end'],
+    )
+    enqueue_on_commit(generate_export, export.pk)
+    return Response(ReportExportSerializer(export, context={'request': request}).data, status=status.HTTP_202_ACCEPTED)
+
+
+def _get_export(request, pk):
+    tenant = getattr(request, 'tenant', None) or request.user.tenant
+    return get_object_or_404(ReportExport, pk=pk, tenant=tenant)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def report_export_detail(request, pk):
+    """Status of a background export"""
+    export = _get_export(request, pk)
+    return Response(ReportExportSerializer(export, context={'request': request}).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def report_export_file(request, pk):
+    """Download the file of a completed background export"""
+    export = _get_export(request, pk)
+    if export.status != ReportExport.STATUS_COMPLETED:
+        return Response({"detail": f"Export is {export.status}"}, status=status.HTTP_409_CONFLICT)
+    return FileResponse(
+        export.file.open('rb'), as_attachment=True, filename=export.filename, content_type=exports.CONTENT_TYPES[export.format]
+    )
@@ -15,5 +15,5 @@ class KitchenOrderTicketAdmin(admin.ModelAdmin):
     list_display = ('kot_number', 'table', 'status', 'priority', 'sent_to_kitchen_at', 'created_at')
     list_filter = ('status', 'priority', 'outlet', 'created_at')
     search_fields = ('kot_number', 'sale__receipt_number', 'table__number')
-    readonly_fields = ('kot_number', 'sent_to_kitchen_at', 'started_at', 'ready_at', 'served_at', 'created_at', 'updated_at')
+    readonly_fields = ('kot_number', 'sequence_day', 'sequence_number', 'sent_to_kitchen_at', 'started_at', 'ready_at', 'served_at', 'created_at', 'updated_at')
 
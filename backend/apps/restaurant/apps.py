@@ -6,23 +6,6 @@ class RestaurantConfig(AppConfig):
     name = 'apps.restaurant'
     verbose_name = 'Restaurant Management'
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.restaurant.signals  # noqa
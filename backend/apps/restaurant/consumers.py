@@ -0,0 +1,74 @@
+"""
+WebSocket consumer for kitchen display screens
+"""
+import json
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.utils import timezone
+
+from apps.outlets.consumers import get_scope_user, get_outlet_for_user
+from .services import KitchenService
+
+
+class KitchenConsumer(AsyncWebsocketConsumer):
+    """WebSocket consumer streaming ticket and item deltas for one outlet's kitchen"""
+
+    async def connect(self):
+        """Authenticate, join the outlet's kitchen group and send active tickets"""
+        self.group_name = None
+        user = await get_scope_user(self.scope)
+        if not user:
+            await self.close()
+            return
+
+        outlet = await get_outlet_for_user(user, self.scope['url_route']['kwargs']['outlet_id'])
+        if not outlet:
+            await self.close()
+            return
+
+        self.outlet_id = outlet.id
+        self.group_name = KitchenService.group_name(outlet.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send_snapshot()
+
+    async def disconnect(self, close_code):
+        """Leave the kitchen group"""
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data):
+        """Handle ping and resync requests from the screen"""
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+
+        message_type = data.get('type')
+        if message_type == 'ping':
+            await self.send(text_data=json.dumps({
+                'type': 'pong',
+                'timestamp': timezone.now().isoformat()
+            }))
+        elif message_type == 'snapshot':
+            await self.send_snapshot()
+
+    async def send_snapshot(self):
+        tickets = await database_sync_to_async(KitchenService.active_tickets)(self.outlet_id)
+        await self.send(text_data=json.dumps({'type': 'kitchen_snapshot', 'tickets': tickets}))
+
+    async def kitchen_ticket_created(self, event):
+        """Forward a newly sent ticket"""
+        await self.send(text_data=json.dumps({
+            'type': 'ticket_created',
+            'ticket': event['ticket'],
+        }))
+
+    async def kitchen_items_updated(self, event):
+        """Forward item status changes with the affected tickets' counters"""
+        await self.send(text_data=json.dumps({
+            'type': 'items_updated',
+            'tickets': event['tickets'],
+            'items': event['items'],
+        }))
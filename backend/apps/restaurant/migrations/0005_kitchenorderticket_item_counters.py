@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_item_counters(apps, schema_editor):
+    """Count existing tickets' sale items by kitchen status"""
+    KitchenOrderTicket = apps.get_model('restaurant', 'KitchenOrderTicket')
+    SaleItem = apps.get_model('sales', 'SaleItem')
+    counts = {}
+    for row in SaleItem.objects.values('sale_id', 'kitchen_status').annotate(n=Count('id')).order_by():
+        counts.setdefault(row['sale_id'], {})[row['kitchen_status']] = row['n']
+
+    tickets = list(KitchenOrderTicket.objects.all())
+    for ticket in tickets:
+        sale_counts = counts.get(ticket.sale_id, {})
+        for status in ('pending', 'preparing', 'ready', 'served', 'cancelled'):
+            setattr(ticket, f'items_{status}', sale_counts.get(status, 0))
+    KitchenOrderTicket.objects.bulk_update(
+        tickets,
+        ['items_pending', 'items_preparing', 'items_ready', 'items_served', 'items_cancelled'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '1005_hot_query_indexes'),
+        ('restaurant', '0004_restaurantorder_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kitchenorderticket',
+            name='items_cancelled',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='kitchenorderticket',
+            name='items_pending',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='kitchenorderticket',
+            name='items_preparing',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='kitchenorderticket',
+            name='items_ready',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='kitchenorderticket',
+            name='items_served',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_item_counters, migrations.RunPython.noop),
+    ]
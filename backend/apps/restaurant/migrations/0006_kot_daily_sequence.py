@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outlets', '0005_alter_printer_options'),
+        ('restaurant', '0005_kitchenorderticket_item_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KitchenTicketSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('last_number', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Kitchen Ticket Sequence',
+                'verbose_name_plural': 'Kitchen Ticket Sequences',
+                'db_table': 'restaurant_kitchenticketsequence',
+            },
+        ),
+        migrations.AddField(
+            model_name='kitchenorderticket',
+            name='sequence_day',
+            field=models.DateField(blank=True, help_text='Business day the ticket number belongs to', null=True),
+        ),
+        migrations.AddField(
+            model_name='kitchenorderticket',
+            name='sequence_number',
+            field=models.PositiveIntegerField(blank=True, help_text='Per-outlet daily ticket number', null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='kitchenorderticket',
+            constraint=models.UniqueConstraint(condition=models.Q(('sequence_number__isnull', False)), fields=('outlet', 'sequence_day', 'sequence_number'), name='restaurant_kot_outlet_day_number_uniq'),
+        ),
+        migrations.AddField(
+            model_name='kitchenticketsequence',
+            name='outlet',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='kitchen_ticket_sequences', to='outlets.outlet'),
+        ),
+        migrations.AddConstraint(
+            model_name='kitchenticketsequence',
+            constraint=models.UniqueConstraint(fields=('outlet', 'day'), name='restaurant_kot_sequence_outlet_day_uniq'),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
 from apps.tenants.models import Tenant
 from apps.outlets.models import Outlet
 
@@ -40,6 +42,51 @@ class Table(models.Model):
         return f"{self.tenant.name} - Table {self.number} ({outlet_name})"
 
 
+class KitchenTicketSequence(models.Model):
+    """Per-outlet daily counter used to number kitchen order tickets"""
+    outlet = models.ForeignKey(Outlet, on_delete=models.CASCADE, related_name='kitchen_ticket_sequences')
+    day = models.DateField()
+    last_number = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'restaurant_kitchenticketsequence'
+        verbose_name = 'Kitchen Ticket Sequence'
+        verbose_name_plural = 'Kitchen Ticket Sequences'
+        constraints = [
+            models.UniqueConstraint(fields=['outlet', 'day'], name='restaurant_kot_sequence_outlet_day_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.outlet_id} {self.day}: {self.last_number}"
+
+    @classmethod
+    def allocate(cls, outlet_id, day):
+        """
+        Reserve the next ticket number for an outlet and day.
+
+        On PostgreSQL and SQLite this is a single upsert statement, so
+        concurrent orders serialize on the counter row and never collide.
+        
+        Returns:
+            The allocated number (1 for the first ticket of the day)
+        """
+        table = cls._meta.db_table
+        if connection.vendor in ('postgresql', 'sqlite'):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (outlet_id, day, last_number) VALUES (%s, %s, 1) "
+                    f"ON CONFLICT (outlet_id, day) DO UPDATE SET last_number = {table}.last_number + 1 "
+                    f"RETURNING last_number",
+                    [outlet_id, day],
+                )
+                return cursor.fetchone()[0]
+
+        with transaction.atomic():
+            sequence, _ = cls.objects.select_for_update().get_or_create(outlet_id=outlet_id, day=day)
+            cls.objects.filter(pk=sequence.pk).update(last_number=F('last_number') + 1)
+            return sequence.last_number + 1
+
+
 class KitchenOrderTicket(models.Model):
     """Kitchen Order Ticket (KOT) model for tracking orders sent to kitchen"""
     STATUS_CHOICES = [
@@ -50,6 +97,10 @@ class KitchenOrderTicket(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
+    # Sale item kitchen statuses, each with an items_<status> counter
+    ITEM_STATUSES = ('pending', 'preparing', 'ready', 'served', 'cancelled')
+    COUNTER_FIELDS = tuple(f'items_{item_status}' for item_status in ITEM_STATUSES)
+    
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='kitchen_tickets')
     outlet = models.ForeignKey(Outlet, on_delete=models.CASCADE, related_name='kitchen_tickets', null=True, blank=True)
     till = models.ForeignKey('outlets.Till', on_delete=models.SET_NULL, null=True, blank=True, related_name='kitchen_orders', help_text="Till/POS terminal that created this order")
@@ -57,6 +108,8 @@ class KitchenOrderTicket(models.Model):
     table = models.ForeignKey(Table, on_delete=models.SET_NULL, null=True, blank=True, related_name='kitchen_orders')
     
     kot_number = models.CharField(max_length=50, unique=True, db_index=True, help_text="Kitchen Order Ticket number")
+    sequence_day = models.DateField(null=True, blank=True, help_text="Business day the ticket number belongs to")
+    sequence_number = models.PositiveIntegerField(null=True, blank=True, help_text="Per-outlet daily ticket number")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     priority = models.CharField(max_length=20, choices=[('normal', 'Normal'), ('high', 'High'), ('urgent', 'Urgent')], default='normal')
     
@@ -65,6 +118,13 @@ class KitchenOrderTicket(models.Model):
     ready_at = models.DateTimeField(null=True, blank=True)
     served_at = models.DateTimeField(null=True, blank=True)
     
+    # Item status counters (kept in step with the sale items' kitchen_status)
+    items_pending = models.PositiveIntegerField(default=0)
+    items_preparing = models.PositiveIntegerField(default=0)
+    items_ready = models.PositiveIntegerField(default=0)
+    items_served = models.PositiveIntegerField(default=0)
+    items_cancelled = models.PositiveIntegerField(default=0)
+    
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -82,9 +142,76 @@ class KitchenOrderTicket(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['sent_to_kitchen_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['outlet', 'sequence_day', 'sequence_number'],
+                condition=models.Q(sequence_number__isnull=False),
+                name='restaurant_kot_outlet_day_number_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"KOT-{self.kot_number} - Table {self.table.number if self.table else 'N/A'}"
+    
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            if not self.kot_number:
+                self.assign_number()
+            # New tickets start with counters taken from the sale's items
+            if self.sale_id:
+                self.sync_item_counters(commit=False)
+        super().save(*args, **kwargs)
+    
+    def assign_number(self):
+        """Allocate the outlet's next daily number: KOT-YYYYMMDD-<outlet>-NNNN"""
+        if not self.outlet_id and self.sale_id:
+            self.outlet_id = self.sale.outlet_id
+        if not self.outlet_id:
+            raise ValueError("Kitchen order tickets need an outlet to be numbered")
+        self.sequence_day = timezone.localdate()
+        self.sequence_number = KitchenTicketSequence.allocate(self.outlet_id, self.sequence_day)
+        self.kot_number = (
+            f"KOT-{self.sequence_day:%Y%m%d}-{self.outlet_id}-{self.sequence_number:04d}"
+        )
+    
+    def sync_item_counters(self, commit=True):
+        """Recount item statuses from the sale items (one grouped query)"""
+        counts = dict(
+            self.sale.items.values_list('kitchen_status').annotate(n=Count('id')).order_by()
+        )
+        for item_status in self.ITEM_STATUSES:
+            setattr(self, f'items_{item_status}', counts.get(item_status, 0))
+        if commit:
+            self.save(update_fields=list(self.COUNTER_FIELDS) + ['updated_at'])
+    
+    @property
+    def item_counts(self):
+        """Item counts by kitchen status"""
+        return {item_status: getattr(self, f'items_{item_status}') for item_status in self.ITEM_STATUSES}
+    
+    def shift_item_status(self, old_status, new_status):
+        """Move one item between status counters (in memory)"""
+        old_field, new_field = f'items_{old_status}', f'items_{new_status}'
+        setattr(self, old_field, max(getattr(self, old_field) - 1, 0))
+        setattr(self, new_field, getattr(self, new_field) + 1)
+    
+    def apply_item_transition(self, new_status, now):
+        """
+        Advance the ticket status after items moved to `new_status`.
+
+        Ready once no item is pending/preparing; served once nothing is left
+        to serve. Decided from the counters, so no item query is needed.
+        """
+        open_items = self.items_pending + self.items_preparing
+        if new_status == 'ready' and open_items == 0:
+            self.status = 'ready'
+            self.ready_at = now
+        elif new_status == 'preparing' and self.status == 'pending':
+            self.status = 'preparing'
+            self.started_at = now
+        elif new_status == 'served' and open_items + self.items_ready == 0:
+            self.status = 'served'
+            self.served_at = now
 
 
 
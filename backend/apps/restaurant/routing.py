@@ -0,0 +1,9 @@
+"""
+WebSocket URL routing for kitchen display screens
+"""
+from django.urls import re_path
+from . import consumers
+
+websocket_urlpatterns = [
+    re_path(r'ws/kitchen/(?P<outlet_id>\d+)/$', consumers.KitchenConsumer.as_asgi()),
+]
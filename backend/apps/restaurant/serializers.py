@@ -49,11 +49,12 @@ class KitchenOrderTicketSerializer(serializers.ModelSerializer):
     till = serializers.SerializerMethodField(read_only=True)
     till_id = serializers.IntegerField(write_only=True, required=False)
     items = serializers.SerializerMethodField()
+    item_counts = serializers.DictField(child=serializers.IntegerField(), read_only=True)
     
     class Meta:
         model = KitchenOrderTicket
         fields = ('id', 'kot_number', 'status', 'priority', 'table', 'table_id', 
-                  'sale', 'sale_id', 'till', 'till_id', 'items', 'sent_to_kitchen_at', 'started_at', 
+                  'sale', 'sale_id', 'till', 'till_id', 'items', 'item_counts', 'sent_to_kitchen_at', 'started_at', 
                   'ready_at', 'served_at', 'notes', 'created_at', 'updated_at')
         read_only_fields = ('id', 'kot_number', 'sent_to_kitchen_at', 'started_at', 
                            'ready_at', 'served_at', 'created_at', 'updated_at')
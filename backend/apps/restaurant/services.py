@@ -0,0 +1,159 @@
+"""
+Kitchen display services - batched item status changes and the live kitchen feed
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+
+from .models import KitchenOrderTicket
+
+logger = logging.getLogger(__name__)
+
+# Tickets still shown on kitchen screens
+ACTIVE_TICKET_STATUSES = ('pending', 'preparing', 'ready')
+
+
+class KitchenService:
+    """Service for kitchen ticket status changes and kitchen screen updates"""
+
+    @staticmethod
+    def group_name(outlet_id):
+        """Channels group receiving kitchen updates for an outlet"""
+        return f'kitchen_{outlet_id}'
+
+    @staticmethod
+    def ticket_state(kot):
+        """Compact ticket status for feed deltas"""
+        return {
+            'id': kot.id,
+            'kot_number': kot.kot_number,
+            'status': kot.status,
+            'item_counts': kot.item_counts,
+            'started_at': kot.started_at.isoformat() if kot.started_at else None,
+            'ready_at': kot.ready_at.isoformat() if kot.ready_at else None,
+            'served_at': kot.served_at.isoformat() if kot.served_at else None,
+        }
+
+    @staticmethod
+    def active_tickets(outlet_id):
+        """Serialized tickets a kitchen screen should show, with items prefetched"""
+        from .serializers import KitchenOrderTicketSerializer
+
+        tickets = KitchenOrderTicket.objects.filter(
+            outlet_id=outlet_id, status__in=ACTIVE_TICKET_STATUSES
+        ).select_related('table', 'sale', 'till').prefetch_related('sale__items').order_by('sent_to_kitchen_at')
+        return KitchenOrderTicketSerializer(tickets, many=True).data
+
+    @staticmethod
+    def set_items_status(kots, new_status, item_ids=None):
+        """
+        Move sale items of one or more tickets to a kitchen status.
+
+        Tickets are locked, their items updated with a single UPDATE, and the
+        per-status counters and ticket statuses written back with one
+        bulk_update. Cost does not depend on how many items the tickets hold.
+
+        Args:
+            kots: KitchenOrderTicket instances
+            new_status: Target kitchen status
+            item_ids: Restrict to these sale item IDs; by default every
+                non-cancelled item on the tickets is moved ("bump")
+
+        Returns:
+            Tuple of (updated tickets, list of changed item dicts)
+        """
+        from apps.sales.models import SaleItem
+
+        kot_ids = [kot.pk for kot in kots]
+        if not kot_ids:
+            return [], []
+        now = timezone.now()
+
+        with transaction.atomic():
+            locked = list(
+                KitchenOrderTicket.objects.select_for_update().filter(pk__in=kot_ids).order_by('pk')
+            )
+            by_sale = {}
+            for kot in locked:
+                by_sale.setdefault(kot.sale_id, []).append(kot)
+
+            items = SaleItem.objects.filter(sale_id__in=by_sale)
+            if item_ids is not None:
+                items = items.filter(id__in=item_ids)
+            else:
+                items = items.exclude(kitchen_status='cancelled')
+            changed = list(items.exclude(kitchen_status=new_status).values('id', 'sale_id', 'kitchen_status'))
+            if not changed:
+                return locked, []
+
+            update = {'kitchen_status': new_status}
+            if new_status == 'ready':
+                update['prepared_at'] = now
+            SaleItem.objects.filter(id__in=[row['id'] for row in changed]).update(**update)
+
+            touched = {}
+            for row in changed:
+                for kot in by_sale[row['sale_id']]:
+                    kot.shift_item_status(row['kitchen_status'], new_status)
+                    touched[kot.pk] = kot
+            for kot in touched.values():
+                kot.apply_item_transition(new_status, now)
+                kot.updated_at = now
+            KitchenOrderTicket.objects.bulk_update(
+                list(touched.values()),
+                list(KitchenOrderTicket.COUNTER_FIELDS) + [
+                    'status', 'started_at', 'ready_at', 'served_at', 'updated_at'
+                ],
+            )
+
+            changed_items = [
+                {
+                    'id': row['id'],
+                    'sale_id': row['sale_id'],
+                    'kitchen_status': new_status,
+                    'previous_status': row['kitchen_status'],
+                    'prepared_at': now.isoformat() if new_status == 'ready' else None,
+                }
+                for row in changed
+            ]
+            tickets = list(touched.values())
+            transaction.on_commit(lambda: KitchenService.push_items_updated(tickets, changed_items))
+
+        return locked, changed_items
+
+    @staticmethod
+    def push_items_updated(tickets, items):
+        """Push item and ticket status deltas to each affected outlet"""
+        by_outlet = {}
+        for kot in tickets:
+            by_outlet.setdefault(kot.outlet_id, []).append(kot)
+        for outlet_id, outlet_tickets in by_outlet.items():
+            sale_ids = {kot.sale_id for kot in outlet_tickets}
+            KitchenService._push(outlet_id, {
+                'type': 'kitchen_items_updated',
+                'tickets': [KitchenService.ticket_state(kot) for kot in outlet_tickets],
+                'items': [item for item in items if item['sale_id'] in sale_ids],
+            })
+
+    @staticmethod
+    def push_ticket_created(kot):
+        """Push a newly sent ticket to its outlet's kitchen screens"""
+        from .serializers import KitchenOrderTicketSerializer
+
+        KitchenService._push(kot.outlet_id, {
+            'type': 'kitchen_ticket_created',
+            'ticket': KitchenOrderTicketSerializer(kot).data,
+        })
+
+    @staticmethod
+    def _push(outlet_id, event):
+        channel_layer = get_channel_layer()
+        if not channel_layer or outlet_id is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(KitchenService.group_name(outlet_id), event)
+        except Exception as e:
+            logger.warning(f"Failed to push kitchen update for outlet {outlet_id}: {e}")
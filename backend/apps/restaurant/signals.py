@@ -0,0 +1,32 @@
+"""
+Django signals keeping the restaurant floor plan and kitchen screens current
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.outlets.floor_plan import FloorPlanService, RESTAURANT
+from apps.sales.models import Sale
+from .models import Table, KitchenOrderTicket
+from .services import KitchenService
+
+
+@receiver(post_save, sender=Table)
+@receiver(post_delete, sender=Table)
+def refresh_restaurant_floor_plan(sender, instance, **kwargs):
+    """Refresh the table's floor plan entry after commit"""
+    FloorPlanService.tables_changed(RESTAURANT, instance.outlet_id, [instance.pk])
+
+
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+def refresh_floor_plan_for_order(sender, instance, **kwargs):
+    """Orders seated at a table change its open order, total and guests"""
+    if instance.table_id:
+        FloorPlanService.tables_changed(RESTAURANT, instance.outlet_id, [instance.table_id])
+
+
+@receiver(post_save, sender=KitchenOrderTicket)
+def push_new_kitchen_ticket(sender, instance, created, **kwargs):
+    """Send new tickets to the outlet's kitchen screens after commit"""
+    if created:
+        transaction.on_commit(lambda: KitchenService.push_ticket_created(instance))
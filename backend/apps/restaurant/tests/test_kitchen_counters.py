@@ -0,0 +1,120 @@
+"""
+Kitchen ticket status counter and bump tests
+"""
+
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.restaurant.models import KitchenOrderTicket, Table
+from apps.restaurant.services import KitchenService
+from apps.restaurant.views import KitchenOrderTicketViewSet
+from apps.sales.models import Sale, SaleItem
+from apps.tenants.models import Tenant
+
+
+class KitchenCounterTests(TestCase):
+    """Test KOT item counters, status transitions and the bump endpoint"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Kitchen Tenant")
+        self.user = User.objects.create_user(username="chef", email="chef@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Kitchen")
+        self.table = Table.objects.create(tenant=self.tenant, outlet=self.outlet, number="K1")
+        self.factory = APIRequestFactory()
+        self.kot = self._ticket("KOT-A", items=3)
+
+    def _ticket(self, number, items):
+        sale = Sale.objects.create(
+            tenant=self.tenant, outlet=self.outlet, user=self.user, table=self.table,
+            receipt_number=f"R-{number}", subtotal=Decimal("30.00"), total=Decimal("30.00"), status='pending',
+        )
+        for i in range(items):
+            SaleItem.objects.create(
+                sale=sale, product_name=f"Dish {i}", quantity=1, price=Decimal("10.00"), total=Decimal("10.00")
+            )
+        return KitchenOrderTicket.objects.create(
+            tenant=self.tenant, outlet=self.outlet, sale=sale, table=self.table, kot_number=number
+        )
+
+    def _post(self, action, data, pk=None):
+        request = self.factory.post(f'/api/v1/restaurant/kitchen-orders/{action}/', data, format='json')
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        kwargs = {'pk': str(pk)} if pk else {}
+        return KitchenOrderTicketViewSet.as_view({'post': action})(request, **kwargs)
+
+    def test_counters_initialised_from_sale_items(self):
+        """New tickets count their sale items by status"""
+        self.assertEqual(self.kot.item_counts['pending'], 3)
+        self.assertEqual(sum(self.kot.item_counts.values()), 3)
+
+    def test_item_status_transitions_use_counters(self):
+        """The ticket becomes ready and served from counter state"""
+        items = list(self.kot.sale.items.order_by('id'))
+
+        self.assertEqual(self._post('update_item_status', {'item_id': items[0].id, 'status': 'preparing'}, self.kot.pk).status_code, 200)
+        self.kot.refresh_from_db()
+        self.assertEqual(self.kot.status, 'preparing')
+        self.assertIsNotNone(self.kot.started_at)
+
+        self._post('update_item_status', {'item_id': items[2].id, 'status': 'cancelled'}, self.kot.pk)
+        self._post('update_item_status', {'item_id': items[0].id, 'status': 'ready'}, self.kot.pk)
+        self.kot.refresh_from_db()
+        self.assertEqual(self.kot.status, 'preparing')
+
+        self._post('update_item_status', {'item_id': items[1].id, 'status': 'ready'}, self.kot.pk)
+        self.kot.refresh_from_db()
+        self.assertEqual(self.kot.status, 'ready')
+        self.assertEqual(self.kot.item_counts, {'pending': 0, 'preparing': 0, 'ready': 2, 'served': 0, 'cancelled': 1})
+
+        # Counters match a full recount
+        expected = self.kot.item_counts
+        self.kot.sync_item_counters()
+        self.assertEqual(self.kot.item_counts, expected)
+
+    def test_status_change_does_not_scan_items(self):
+        """One item change costs a fixed number of queries regardless of ticket size"""
+        big = self._ticket("KOT-BIG", items=40)
+        item = big.sale.items.first()
+        # Savepoint, lock ticket, read changed items, update items, update ticket, release
+        with self.assertNumQueries(6):
+            KitchenService.set_items_status([big], 'ready', item_ids=[item.id])
+
+    def test_bump_many_tickets_and_push(self):
+        """Bump moves every live item on several tickets in one call"""
+        other = self._ticket("KOT-B", items=2)
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(KitchenService.group_name(self.outlet.id), channel)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._post('bump', {'kot_ids': [self.kot.pk, other.pk], 'status': 'ready'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated_items'], 5)
+        self.assertEqual(set(KitchenOrderTicket.objects.values_list('status', flat=True)), {'ready'})
+        self.assertFalse(SaleItem.objects.exclude(kitchen_status='ready').exists())
+
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message['type'], 'kitchen_items_updated')
+        self.assertEqual(len(message['items']), 5)
+        self.assertEqual({t['status'] for t in message['tickets']}, {'ready'})
+
+    def test_bump_rejects_foreign_tickets(self):
+        """Tickets of other tenants are not found"""
+        other_tenant = Tenant.objects.create(name="Other Kitchen")
+        other_outlet = Outlet.objects.create(tenant=other_tenant, name="Other")
+        sale = Sale.objects.create(
+            tenant=other_tenant, outlet=other_outlet, receipt_number="R-X",
+            subtotal=Decimal("5.00"), total=Decimal("5.00"), status='pending',
+        )
+        foreign = KitchenOrderTicket.objects.create(tenant=other_tenant, outlet=other_outlet, sale=sale, kot_number="KOT-X")
+
+        response = self._post('bump', {'kot_ids': [foreign.pk], 'status': 'ready'})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,61 @@
+"""
+Per-outlet daily KOT numbering tests
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.restaurant.models import KitchenOrderTicket, KitchenTicketSequence
+from apps.sales.models import Sale
+from apps.tenants.models import Tenant
+
+
+class KotNumberingTests(TestCase):
+    """Test atomic per-outlet daily ticket sequences"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Numbering Tenant")
+        self.user = User.objects.create_user(username="waiter", email="waiter@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="First")
+        self.other_outlet = Outlet.objects.create(tenant=self.tenant, name="Second")
+        self.receipts = 0
+
+    def _ticket(self, outlet):
+        self.receipts += 1
+        sale = Sale.objects.create(
+            tenant=self.tenant, outlet=outlet, user=self.user, receipt_number=f"NUM-{self.receipts}",
+            subtotal=Decimal("10.00"), total=Decimal("10.00"), status='pending',
+        )
+        return KitchenOrderTicket.objects.create(tenant=self.tenant, outlet=outlet, sale=sale)
+
+    def test_sequential_numbers_per_outlet(self):
+        """Each outlet counts its own tickets from 1"""
+        first = [self._ticket(self.outlet) for _ in range(3)]
+        other = self._ticket(self.other_outlet)
+
+        self.assertEqual([kot.sequence_number for kot in first], [1, 2, 3])
+        self.assertEqual(other.sequence_number, 1)
+        today = timezone.localdate()
+        self.assertEqual(first[2].kot_number, f"KOT-{today:%Y%m%d}-{self.outlet.id}-0003")
+        self.assertNotEqual(first[0].kot_number, other.kot_number)
+
+    def test_allocate_is_a_single_statement(self):
+        """Allocation is one upsert and sequences restart each day"""
+        with self.assertNumQueries(1):
+            self.assertEqual(KitchenTicketSequence.allocate(self.outlet.id, date(2026, 1, 1)), 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(KitchenTicketSequence.allocate(self.outlet.id, date(2026, 1, 1)), 2)
+        self.assertEqual(KitchenTicketSequence.allocate(self.outlet.id, date(2026, 1, 2)), 1)
+
+    def test_lookup_by_outlet_day_number(self):
+        """Tickets are found directly by (outlet, day, number)"""
+        kot = self._ticket(self.outlet)
+        found = KitchenOrderTicket.objects.get(
+            outlet=self.outlet, sequence_day=kot.sequence_day, sequence_number=kot.sequence_number
+        )
+        self.assertEqual(found.pk, kot.pk)
@@ -8,6 +8,8 @@ from django.utils import timezone
 from .models import Table, KitchenOrderTicket, RestaurantOrder
 from .serializers import TableSerializer, KitchenOrderTicketSerializer, RestaurantOrderSerializer
 from apps.tenants.permissions import TenantFilterMixin
+from apps.outlets.floor_plan import FloorPlanService, RESTAURANT
+from .services import KitchenService
 
 
 class TableViewSet(viewsets.ModelViewSet, TenantFilterMixin):
@@ -52,12 +54,9 @@ class TableViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         if not is_saas_admin:
             if tenant:
                 queryset = queryset.filter(tenant=tenant)
-                logger.info(f"Filtered tables by tenant {tenant.id}, count: {queryset.count()}")
             else:
                 logger.warning("No tenant found for user, returning empty queryset")
                 return queryset.none()
-        else:
-            logger.info(f"SaaS admin - returning all tables, count: {queryset.count()}")
         
         return queryset
     
@@ -67,6 +66,22 @@ class TableViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         context['request'] = self.request
         return context
     
+    @action(detail=False, methods=['get'])
+    def floor_plan(self, request):
+        """
+        Get the outlet's tables with occupancy (open order, total, guests)
+        Served from the cached per-outlet snapshot; live changes are pushed on
+        ws/floor-plan/<outlet_id>/.
+        """
+        outlet = self.get_outlet_for_request(request)
+        if not outlet:
+            return Response(
+                {"detail": "Outlet is required. Pass ?outlet=<id> or the X-Outlet-ID header."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(FloorPlanService.get_snapshot(RESTAURANT, outlet.id))
+    
     def perform_create(self, serializer):
         """Set tenant and validate outlet belongs to tenant"""
         tenant = getattr(self.request, 'tenant', None) or self.request.user.tenant
@@ -148,8 +163,10 @@ class KitchenOrderTicketViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         user_tenant = getattr(user, 'tenant', None)
         tenant = request_tenant or user_tenant
         
-        # Get base queryset
-        queryset = KitchenOrderTicket.objects.select_related('tenant', 'outlet', 'sale', 'table').all()
+        # Get base queryset (sale items are listed on every ticket)
+        queryset = KitchenOrderTicket.objects.select_related(
+            'tenant', 'outlet', 'sale', 'table', 'till'
+        ).prefetch_related('sale__items')
         
         # Apply tenant filter - CRITICAL for security
         if not is_saas_admin:
@@ -181,10 +198,6 @@ class KitchenOrderTicketViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             from rest_framework.exceptions import ValidationError
             raise ValidationError("Sale does not belong to your tenant.")
         
-        # Generate KOT number
-        import random
-        kot_number = f"KOT-{timezone.now().strftime('%Y%m%d')}-{random.randint(1000, 9999)}"
-        
         # Get outlet from sale
         outlet = sale.outlet
         
@@ -201,13 +214,13 @@ class KitchenOrderTicketViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         # Get till from sale (inherit from sale if not provided)
         till = sale.till if hasattr(sale, 'till') else None
         
+        # kot_number is allocated from the outlet's daily sequence on save
         serializer.save(
             tenant=tenant,
             outlet=outlet,
             sale=sale,
             table=table,
             till=till,
-            kot_number=kot_number
         )
     
     def update(self, request, *args, **kwargs):
@@ -269,43 +282,78 @@ class KitchenOrderTicketViewSet(viewsets.ModelViewSet, TenantFilterMixin):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        from apps.sales.models import SaleItem
+        # CRITICAL: Ensure sale item belongs to tenant through sale
         try:
-            from apps.sales.models import SaleItem
-            # CRITICAL: Ensure sale item belongs to tenant through sale
-            item = SaleItem.objects.get(id=item_id, sale=kot.sale, sale__tenant=tenant)
-            item.kitchen_status = new_status
-            
-            if new_status == 'ready':
-                item.prepared_at = timezone.now()
-                # Update KOT status if all items are ready
-                if kot.sale.items.exclude(kitchen_status='ready').exclude(kitchen_status='served').exclude(kitchen_status='cancelled').count() == 0:
-                    kot.status = 'ready'
-                    kot.ready_at = timezone.now()
-            elif new_status == 'preparing' and kot.status == 'pending':
-                kot.status = 'preparing'
-                kot.started_at = timezone.now()
-            elif new_status == 'served':
-                # Update KOT status if all items are served
-                if kot.sale.items.exclude(kitchen_status='served').exclude(kitchen_status='cancelled').count() == 0:
-                    kot.status = 'served'
-                    kot.served_at = timezone.now()
-            
-            item.save()
-            kot.save()
-            
-            return Response({
-                "message": "Item status updated",
-                "item": {
-                    "id": str(item.id),
-                    "product_name": item.product_name,
-                    "kitchen_status": item.kitchen_status,
-                }
-            })
-        except SaleItem.DoesNotExist:
+            item = SaleItem.objects.only('id', 'product_name').get(id=item_id, sale=kot.sale_id, sale__tenant=tenant)
+        except (SaleItem.DoesNotExist, ValueError):
             return Response(
                 {"detail": "Sale item not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
+        
+        # Counters on the ticket decide ready/served; no per-change item scans
+        KitchenService.set_items_status([kot], new_status, item_ids=[item.id])
+        
+        return Response({
+            "message": "Item status updated",
+            "item": {
+                "id": str(item.id),
+                "product_name": item.product_name,
+                "kitchen_status": new_status,
+            }
+        })
+    
+    @action(detail=False, methods=['post'])
+    def bump(self, request):
+        """
+        Bump many tickets/items in one call
+        Body: {"status": "ready", "kot_ids": [...]} moves every live item on
+        those tickets; add "item_ids": [...] to move only specific items.
+        """
+        new_status = request.data.get('status')
+        kot_ids = request.data.get('kot_ids') or []
+        item_ids = request.data.get('item_ids')
+        
+        if new_status not in KitchenOrderTicket.ITEM_STATUSES:
+            return Response(
+                {"detail": "Invalid status"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not isinstance(kot_ids, list) or not kot_ids:
+            return Response(
+                {"detail": "kot_ids is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if item_ids is not None and not isinstance(item_ids, list):
+            return Response(
+                {"detail": "item_ids must be a list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # get_queryset() is tenant-scoped, so foreign tickets are simply not found
+        try:
+            kots = list(self.get_queryset().filter(pk__in=kot_ids))
+        except (ValueError, TypeError):
+            kots = []
+        if len(kots) != len(set(kot_ids)):
+            return Response(
+                {"detail": "Kitchen order ticket not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            tickets, items = KitchenService.set_items_status(kots, new_status, item_ids=item_ids)
+        except (ValueError, TypeError):
+            return Response(
+                {"detail": "Invalid item_ids"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            "updated_items": len(items),
+            "tickets": [KitchenService.ticket_state(kot) for kot in tickets],
+        })
     
     @action(detail=False, methods=['get'])
     def pending(self, request):
@@ -29,13 +29,13 @@ class ReceiptAdmin(admin.ModelAdmin):
     list_display = ('receipt_number', 'sale', 'tenant', 'format', 'is_sent', 'sent_via', 'access_count', 'generated_at')
     list_filter = ('tenant', 'format', 'is_sent', 'sent_via', 'generated_at')
     search_fields = ('receipt_number', 'sale__receipt_number')
-    readonly_fields = ('receipt_number', 'generated_at', 'access_count', 'last_accessed_at')
+    readonly_fields = ('receipt_number', 'content_hash', 'generated_at', 'access_count', 'last_accessed_at')
     fieldsets = (
         ('Basic Information', {
             'fields': ('tenant', 'sale', 'receipt_number', 'format')
         }),
         ('Content', {
-            'fields': ('content', 'pdf_file')
+            'fields': ('content', 'pdf_file', 'content_hash')
         }),
         ('Metadata', {
             'fields': ('generated_at', 'generated_by')
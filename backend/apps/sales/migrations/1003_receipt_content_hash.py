@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '1002_remove_saleitem_sales_salei_variati_742672_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='receipt',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the rendered receipt bytes (content address)', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['content_hash'], name='sales_recei_content_641dbc_idx'),
+        ),
+    ]
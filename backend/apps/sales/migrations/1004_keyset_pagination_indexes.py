@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '1003_receipt_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['tenant', '-generated_at', '-id'], name='sales_recei_tenant__c68ecc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['tenant', 'outlet', '-created_at', '-id'], name='sales_sale_tenant__c3c240_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '1004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(condition=models.Q(('is_current', True), ('voided', False)), fields=['sale', 'format'], name='sales_receipt_current_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(condition=models.Q(('voided', False)), fields=['receipt_number', '-generated_at'], name='sales_receipt_live_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['tenant', 'outlet', 'status', 'created_at'], name='sales_sale_tenant__24e578_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '1005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['tenant', 'payment_status', 'due_date'], name='sales_sale_tenant__b9ab66_idx'),
+        ),
+    ]
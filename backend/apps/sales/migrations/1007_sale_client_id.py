@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '1006_sale_receivables_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='client_id',
+            field=models.UUIDField(blank=True, editable=False, help_text='Client-generated ID of a sale recorded offline (idempotency key)', null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='sale',
+            constraint=models.UniqueConstraint(condition=models.Q(('client_id__isnull', False)), fields=('tenant', 'client_id'), name='sales_sale_tenant_client_id_uniq'),
+        ),
+    ]
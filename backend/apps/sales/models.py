@@ -1,3 +1,4 @@
+import hashlib
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.utils import timezone
@@ -46,6 +47,7 @@ class Sale(models.Model):
     priority = models.CharField(max_length=20, choices=[('normal', 'Normal'), ('high', 'High'), ('urgent', 'Urgent')], default='normal', help_text="Order priority for kitchen")
     
     receipt_number = models.CharField(max_length=50, unique=True, db_index=True)
+    client_id = models.UUIDField(null=True, blank=True, editable=False, help_text="Client-generated ID of a sale recorded offline (idempotency key)")
     subtotal = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal('0'))])
     tax = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'), validators=[MinValueValidator(Decimal('0'))])
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'), validators=[MinValueValidator(Decimal('0'))])
@@ -104,6 +106,20 @@ class Sale(models.Model):
             models.Index(fields=['shift']),
             models.Index(fields=['created_at']),
             models.Index(fields=['receipt_number']),
+            # Keyset pagination: outlet sales history ordered by (created_at, id)
+            models.Index(fields=['tenant', 'outlet', '-created_at', '-id']),
+            # Reports: completed sales for an outlet over a date range
+            models.Index(fields=['tenant', 'outlet', 'status', 'created_at']),
+            # Receivables: credit sales by payment status and due date (aging job, dashboards)
+            models.Index(fields=['tenant', 'payment_status', 'due_date']),
+        ]
+        constraints = [
+            # Offline sync: each client sale ID is accepted once per tenant
+            models.UniqueConstraint(
+                fields=['tenant', 'client_id'],
+                condition=models.Q(client_id__isnull=False),
+                name='sales_sale_tenant_client_id_uniq',
+            ),
         ]
 
     def __str__(self):
@@ -244,6 +260,7 @@ class Receipt(models.Model):
     format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='json', help_text="Format of stored receipt")
     content = models.TextField(help_text="Receipt content (HTML/JSON/ESC/POS base64)")
     pdf_file = models.FileField(upload_to='receipts/pdf/', null=True, blank=True, help_text="PDF file if format is PDF")
+    content_hash = models.CharField(max_length=64, blank=True, default='', help_text="SHA-256 of the rendered receipt bytes (content address)")
     
     # Versioning / immutability
     is_current = models.BooleanField(default=True, help_text="Whether this is the current receipt for the sale/format")
@@ -274,16 +291,56 @@ class Receipt(models.Model):
             models.Index(fields=['sale']),
             models.Index(fields=['receipt_number']),
             models.Index(fields=['generated_at']),
+            models.Index(fields=['content_hash']),
+            models.Index(fields=['tenant', '-generated_at', '-id']),
+            # ReceiptService current-receipt lookups by sale/format
+            models.Index(
+                fields=['sale', 'format'],
+                condition=models.Q(is_current=True, voided=False),
+                name='sales_receipt_current_idx',
+            ),
+            # get_receipt_by_number: newest non-voided receipt for a number
+            models.Index(
+                fields=['receipt_number', '-generated_at'],
+                condition=models.Q(voided=False),
+                name='sales_receipt_live_number_idx',
+            ),
         ]
     
     def __str__(self):
         return f"Receipt {self.receipt_number}"
 
+    @staticmethod
+    def compute_content_hash(data):
+        """Return the SHA-256 hex digest used to content-address receipt bytes"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return hashlib.sha256(data).hexdigest()
+
+    def get_content_bytes(self):
+        """Return the stored receipt payload as bytes (PDF file or text content)"""
+        if self.pdf_file:
+            with self.pdf_file.open('rb') as fh:
+                return fh.read()
+        return (self.content or '').encode('utf-8')
+
+    def ensure_content_hash(self):
+        """Backfill `content_hash` for receipts stored before content addressing"""
+        if not self.content_hash:
+            self.content_hash = Receipt.compute_content_hash(self.get_content_bytes())
+            # Queryset update: content_hash is derived metadata, not receipt content
+            Receipt.objects.filter(pk=self.pk).update(content_hash=self.content_hash)
+        return self.content_hash
+
     def increment_access(self):
-        """Increment access count and update last accessed time"""
-        self.access_count += 1
-        self.last_accessed_at = timezone.now()
-        self.save(update_fields=['access_count', 'last_accessed_at'])
+        """Record an access.
+
+        Accesses are buffered in-process and flushed to the database in a single
+        batched UPDATE, so repeated fetches of the same receipt do not cost a row
+        write each.
+        """
+        from .services import receipt_access_counter
+        receipt_access_counter.record(self.pk)
 
     def save(self, *args, **kwargs):
         """Enforce immutability for created receipts.
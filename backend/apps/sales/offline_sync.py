@@ -0,0 +1,330 @@
+"""
+Offline sale sync
+Tills queue sales while offline and drain them through one bulk request.
+Every sale carries a client-generated UUID (Sale.client_id) that is unique per
+tenant, so replaying a batch after a dropped response never records a sale,
+or deducts its stock, twice.
+
+Sales are processed in chunks. Each chunk is one transaction that locks the
+products it touches, validates every sale against the running stock and
+writes sales, items, stock movements, customer totals and loyalty points
+with bulk statements. A sale that fails validation is reported and skipped without
+affecting the rest of its chunk.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from apps.admin.metrics import mark_days_changed
+from apps.customers.loyalty import LoyaltyLedger
+from apps.inventory.models import StockMovement
+from apps.products.models import Product, ProductUnit
+from primepos.celery import enqueue_on_commit
+
+from .models import Sale, SaleItem
+from .serializers import OfflineSaleSerializer
+from .tasks import generate_sale_receipts
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+DUPLICATE = 'duplicate'
+REJECTED = 'rejected'
+
+
+class OfflineSaleRejected(Exception):
+    """Raised while preparing an offline sale that cannot be recorded"""
+
+
+class OfflineSyncService:
+    """Service for ingesting batches of sales recorded offline"""
+
+    @staticmethod
+    def receipt_number(tenant, client_id):
+        """Receipt number for an offline sale, stable across replays"""
+        prefix = tenant.name[:3].upper().replace(' ', '')
+        return f"{prefix}-OFF-{client_id.hex[:12].upper()}"
+
+    @classmethod
+    def sync(cls, tenant, outlet, user, sales, till=None, shift=None):
+        """
+        Record a batch of offline sales.
+
+        Args:
+            tenant: Tenant the till belongs to
+            outlet: Outlet the sales were made at
+            user: User syncing the till
+            sales: Raw sale dicts (validated here one by one)
+            till: Optional Till the sales were rung on
+            shift: Optional Shift the sales belong to
+
+        Returns:
+            List of result dicts in request order, each with client_id and
+            status ('created', 'duplicate' or 'rejected') plus sale_id and
+            receipt_number, or errors
+        """
+        chunk_size = getattr(settings, 'OFFLINE_SYNC_CHUNK_SIZE', 100)
+        results = [None] * len(sales)
+        valid = []
+        first_seen = {}
+        repeats = []
+
+        for index, raw in enumerate(sales):
+            serializer = OfflineSaleSerializer(data=raw)
+            if not serializer.is_valid():
+                results[index] = {
+                    'client_id': raw.get('client_id'),
+                    'status': REJECTED,
+                    'errors': serializer.errors,
+                }
+                continue
+            client_id = serializer.validated_data['client_id']
+            if client_id in first_seen:
+                repeats.append((index, first_seen[client_id]))
+                continue
+            first_seen[client_id] = index
+            valid.append((index, serializer.validated_data))
+
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            try:
+                chunk_results = cls._sync_chunk(tenant, outlet, user, chunk, till, shift)
+            except IntegrityError:
+                # A concurrent replay recorded some of these sales first; the
+                # retry sees them as duplicates
+                logger.info(f"Offline sync chunk for outlet {outlet.id} raced a replay, retrying")
+                chunk_results = cls._sync_chunk(tenant, outlet, user, chunk, till, shift)
+            for index, result in chunk_results.items():
+                results[index] = result
+
+        # The same sale listed twice in one request
+        for index, original in repeats:
+            result = dict(results[original])
+            if result['status'] == CREATED:
+                result['status'] = DUPLICATE
+            results[index] = result
+
+        logger.info(
+            f"Offline sync for outlet {outlet.id}: "
+            f"{sum(1 for r in results if r['status'] == CREATED)} created, "
+            f"{sum(1 for r in results if r['status'] == DUPLICATE)} duplicate, "
+            f"{sum(1 for r in results if r['status'] == REJECTED)} rejected"
+        )
+        return results
+
+    @classmethod
+    def _sync_chunk(cls, tenant, outlet, user, chunk, till, shift):
+        from apps.customers.models import Customer
+
+        now = timezone.now()
+        results = {}
+
+        with transaction.atomic():
+            product_ids = {item['product_id'] for _, data in chunk for item in data['items']}
+            products = {
+                product.pk: product
+                for product in Product.objects.select_for_update().filter(
+                    tenant=tenant, outlet=outlet, pk__in=product_ids
+                ).order_by('pk')
+            }
+            existing = {
+                client_id: (sale_id, receipt_number)
+                for client_id, sale_id, receipt_number in Sale.objects.filter(
+                    tenant=tenant, client_id__in=[data['client_id'] for _, data in chunk]
+                ).values_list('client_id', 'id', 'receipt_number')
+            }
+            unit_ids = {item['unit_id'] for _, data in chunk for item in data['items'] if item.get('unit_id')}
+            units = ProductUnit.objects.filter(
+                pk__in=unit_ids, product_id__in=products, is_active=True
+            ).in_bulk() if unit_ids else {}
+            customer_ids = {data['customer'] for _, data in chunk if data.get('customer')}
+            customers = Customer.objects.filter(tenant=tenant, pk__in=customer_ids).in_bulk() if customer_ids else {}
+
+            prepared = []
+            pending_credit = defaultdict(Decimal)
+            for index, data in chunk:
+                client_id = data['client_id']
+                if client_id in existing:
+                    sale_id, receipt_number = existing[client_id]
+                    results[index] = {
+                        'client_id': str(client_id),
+                        'status': DUPLICATE,
+                        'sale_id': sale_id,
+                        'receipt_number': receipt_number,
+                    }
+                    continue
+                try:
+                    prepared.append((index, cls._prepare(
+                        tenant, outlet, user, data, products, units, customers, till, shift, now, pending_credit
+                    )))
+                except OfflineSaleRejected as e:
+                    results[index] = {'client_id': str(client_id), 'status': REJECTED, 'errors': [str(e)]}
+
+            if prepared:
+                cls._write(tenant, outlet, user, [entry for _, entry in prepared], products, now)
+                for index, entry in prepared:
+                    sale = entry['sale']
+                    results[index] = {
+                        'client_id': str(sale.client_id),
+                        'status': CREATED,
+                        'sale_id': sale.pk,
+                        'receipt_number': sale.receipt_number,
+                    }
+
+        return results
+
+    @classmethod
+    def _prepare(cls, tenant, outlet, user, data, products, units, customers, till, shift, now, pending_credit):
+        """Build an unsaved sale and its items, reserving stock on the locked products"""
+        items = []
+        needed = defaultdict(int)
+        subtotal = Decimal('0')
+
+        for position, item in enumerate(data['items'], start=1):
+            product = products.get(item['product_id'])
+            if product is None:
+                raise OfflineSaleRejected(
+                    f"Item {position}: Product {item['product_id']} not found or does not belong to your tenant/outlet"
+                )
+            unit = None
+            quantity_in_base_units = item['quantity']
+            unit_name = product.unit
+            if item.get('unit_id'):
+                unit = units.get(item['unit_id'])
+                if unit is None or unit.product_id != product.pk:
+                    raise OfflineSaleRejected(f"Item {position}: Unit {item['unit_id']} not found or inactive")
+                quantity_in_base_units = unit.convert_to_base_units(item['quantity'])
+                unit_name = unit.unit_name
+
+            total = (item['price'] * Decimal(item['quantity'])).quantize(Decimal('0.01'))
+            subtotal += total
+            needed[product.pk] += quantity_in_base_units
+            items.append(SaleItem(
+                product=product,
+                unit=unit,
+                product_name=product.name,
+                variation_name='',
+                unit_name=unit_name,
+                quantity=item['quantity'],
+                quantity_in_base_units=quantity_in_base_units,
+                price=item['price'],
+                total=total,
+                notes=item.get('notes', ''),
+            ))
+
+        for product_id, quantity in needed.items():
+            product = products[product_id]
+            if product.stock < quantity:
+                raise OfflineSaleRejected(
+                    f"Insufficient stock for {product.name}. "
+                    f"Available: {product.stock} {product.unit}, Requested: {quantity} {product.unit}"
+                )
+
+        total = (subtotal + data['tax'] - data['discount']).quantize(Decimal('0.01'))
+        if total <= 0:
+            raise OfflineSaleRejected("Sale total must be greater than 0")
+
+        customer = None
+        if data.get('customer'):
+            customer = customers.get(data['customer'])
+            if customer is None:
+                raise OfflineSaleRejected(f"Customer {data['customer']} not found")
+
+        sold_at = data.get('created_at')
+        sale = Sale(
+            tenant=tenant,
+            outlet=outlet,
+            user=user,
+            shift=shift,
+            till=till,
+            customer=customer,
+            client_id=data['client_id'],
+            receipt_number=cls.receipt_number(tenant, data['client_id']),
+            subtotal=subtotal.quantize(Decimal('0.01')),
+            tax=data['tax'],
+            discount=data['discount'],
+            total=total,
+            payment_method=data['payment_method'],
+            notes=data.get('notes', ''),
+        )
+
+        # Same status rules as SaleViewSet.create
+        if sale.payment_method == 'tab':
+            sale.status = 'pending'
+            sale.payment_status = 'unpaid'
+        elif sale.payment_method == 'credit':
+            if customer is None:
+                raise OfflineSaleRejected("Customer is required for credit sales")
+            can_sell, error_message = customer.can_make_credit_sale(total + pending_credit[customer.pk])
+            if not can_sell:
+                raise OfflineSaleRejected(error_message)
+            pending_credit[customer.pk] += total
+            sale.due_date = (sold_at or now) + timedelta(days=customer.payment_terms_days)
+            sale.amount_paid = Decimal('0')
+            sale.payment_status = 'unpaid'
+            sale.status = 'completed'
+        else:
+            sale.status = 'completed'
+            sale.payment_status = 'paid'
+
+        if data.get('cash_received') is not None:
+            sale.cash_received = data['cash_received']
+            sale.change_given = max(data['cash_received'] - total, Decimal('0'))
+
+        # Reserve stock only once the whole sale is valid
+        for product_id, quantity in needed.items():
+            products[product_id].stock -= quantity
+
+        return {'sale': sale, 'items': items, 'sold_at': sold_at, 'needed': needed}
+
+    @staticmethod
+    def _write(tenant, outlet, user, entries, products, now):
+        """Insert prepared sales with bulk statements"""
+        sales = Sale.objects.bulk_create([entry['sale'] for entry in entries], batch_size=500)
+
+        # created_at is auto_now_add; restore when the sale actually happened
+        backdated = [(entry['sale'], entry['sold_at']) for entry in entries if entry['sold_at']]
+        if backdated:
+            Sale.objects.filter(pk__in=[sale.pk for sale, _ in backdated]).update(
+                created_at=Case(
+                    *[When(pk=sale.pk, then=Value(sold_at)) for sale, sold_at in backdated],
+                    output_field=DateTimeField(),
+                )
+            )
+            for sale, sold_at in backdated:
+                sale.created_at = sold_at
+            # The update bypasses signals; re-roll platform metrics of past days
+            mark_days_changed({timezone.localdate(sold_at) for _, sold_at in backdated})
+
+        items = []
+        movements = []
+        touched = set()
+        for entry in entries:
+            sale = entry['sale']
+            touched.update(entry['needed'])
+            for item in entry['items']:
+                item.sale = sale
+                items.append(item)
+                movements.append(StockMovement(
+                    tenant=tenant,
+                    product=item.product,
+                    outlet=outlet,
+                    user=user,
+                    movement_type='sale',
+                    quantity=item.quantity_in_base_units,
+                    reference_id=str(sale.pk),
+                    reason=f"Sale {sale.receipt_number}",
+                ))
+        SaleItem.objects.bulk_create(items, batch_size=500)
+        StockMovement.objects.bulk_create(movements, batch_size=500)
+        Product.objects.bulk_update([products[pk] for pk in touched], ['stock'], batch_size=500)
+
+        LoyaltyLedger.record_sales(sales, now=now)
+
+        enqueue_on_commit(generate_sale_receipts, [sale.pk for sale in sales])
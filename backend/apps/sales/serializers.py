@@ -338,3 +338,40 @@ class ReceiptTemplateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Template content cannot be empty for text/html formats")
         return attrs
 
+
+
+class OfflineSaleItemSerializer(serializers.Serializer):
+    """Line of a sale recorded offline"""
+    product_id = serializers.IntegerField()
+    unit_id = serializers.IntegerField(required=False, allow_null=True)
+    quantity = serializers.IntegerField(min_value=1)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class OfflineSaleSerializer(serializers.Serializer):
+    """Sale recorded by a till while offline; client_id is its idempotency key"""
+    client_id = serializers.UUIDField()
+    created_at = serializers.DateTimeField(required=False, help_text="When the sale happened on the till")
+    payment_method = serializers.ChoiceField(choices=Sale.PAYMENT_METHODS, default='cash')
+    customer = serializers.IntegerField(required=False, allow_null=True)
+    tax = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'), default=Decimal('0'))
+    discount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'), default=Decimal('0'))
+    cash_received = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    items = OfflineSaleItemSerializer(many=True, allow_empty=False)
+
+
+class OfflineSyncSerializer(serializers.Serializer):
+    """Batch of offline sales from one till; sales are validated one by one"""
+    outlet = serializers.IntegerField()
+    till = serializers.IntegerField(required=False, allow_null=True)
+    shift = serializers.IntegerField(required=False, allow_null=True)
+    sales = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+    def validate_sales(self, value):
+        from django.conf import settings
+        limit = getattr(settings, 'OFFLINE_SYNC_MAX_SALES', 1000)
+        if len(value) > limit:
+            raise serializers.ValidationError(f"At most {limit} sales can be synced per request")
+        return value
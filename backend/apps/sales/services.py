@@ -3,9 +3,15 @@ Receipt generation service
 Handles creation and formatting of digital receipts
 Supports: PDF (for download/view) and ESC/POS (for thermal printing)
 """
+import atexit
 import logging
+import threading
+import time
+from django.conf import settings
 from django.template import engines, TemplateSyntaxError
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Case, When, Value, F, IntegerField
 import json
 from django.utils import timezone
 from decimal import Decimal
@@ -41,6 +47,10 @@ class ReceiptService:
             Receipt instance
         """
         try:
+            # Anything but ESC/POS is rendered (and stored) as PDF
+            if format != 'escpos':
+                format = 'pdf'
+
             # If a current receipt with the requested format already exists, return it.
             existing_same_format = Receipt.objects.filter(sale=sale, format=format, is_current=True, voided=False).first()
             if existing_same_format:
@@ -51,24 +61,7 @@ class ReceiptService:
             if not user:
                 user = sale.user
 
-            content = None
-            pdf_file = None
-
-            # Generate receipt content based on format
-            if format == 'pdf':
-                # Generate PDF and store as file
-                pdf_buffer = ReceiptService._generate_pdf_receipt(sale)
-                pdf_file = ContentFile(pdf_buffer.read(), name=f"receipt_{sale.receipt_number}.pdf")
-                pdf_buffer.close()
-            elif format == 'escpos':
-                # Return base64-encoded ESC/POS bytes as text payload
-                content = ReceiptService._generate_escpos_receipt(sale)
-            else:
-                # Default to PDF
-                pdf_buffer = ReceiptService._generate_pdf_receipt(sale)
-                pdf_file = ContentFile(pdf_buffer.read(), name=f"receipt_{sale.receipt_number}.pdf")
-                pdf_buffer.close()
-                format = 'pdf'
+            content, pdf_name, content_hash, format = ReceiptService._render(sale, format)
             
             # Create a new Receipt record (immutable once created)
             # Mark any existing current receipts for this sale+format as not current and voided
@@ -82,7 +75,8 @@ class ReceiptService:
                 receipt_number=sale.receipt_number,
                 format=format,
                 content=content or '',
-                pdf_file=pdf_file,
+                pdf_file=pdf_name,
+                content_hash=content_hash,
                 generated_by=user,
             )
 
@@ -93,17 +87,80 @@ class ReceiptService:
             logger.error(f"Error generating receipt for sale {sale.id}: {str(e)}", exc_info=True)
             raise
     
+    @staticmethod
+    def generate_sale_receipts(sale_id: int) -> None:
+        """
+        Generate the default PDF and ESC/POS receipts for a new sale.
+        Runs after commit; failures are logged, never raised.
+        """
+        try:
+            # Re-fetch sale outside the original transaction to ensure a clean DB state
+            sale = Sale.objects.select_related('tenant', 'user', 'outlet').get(pk=sale_id)
+
+            # Generate canonical PDF receipt (used for previews and archives)
+            pdf_receipt = ReceiptService.generate_receipt(sale, format='pdf', user=sale.user)
+            logger.info(f"PDF receipt {pdf_receipt.id} auto-generated for sale {sale.id}")
+
+            # Generate ESC/POS receipt (base64) for printing; ensure backend owns the
+            # conversion and stores payload so frontends can fetch it and print raw.
+            try:
+                esc_receipt = ReceiptService.generate_receipt(sale, format='escpos', user=sale.user)
+                logger.info(f"ESC/POS receipt {esc_receipt.id} auto-generated for sale {sale.id}")
+            except Exception as esc_e:
+                logger.error(f"Failed to auto-generate ESC/POS for sale {sale.id}: {str(esc_e)}", exc_info=True)
+
+        except Exception as e:
+            # Log the error. We must not raise here as this is running post-commit.
+            logger.error(f"Failed to auto-generate receipt for sale {sale_id}: {str(e)}", exc_info=True)
+
+    @staticmethod
+    def _render(sale: Sale, format: str):
+        """
+        Render receipt bytes for a sale and content-address them.
+        
+        PDFs are written once to storage under their SHA-256 digest; identical
+        bytes resolve to the same file, so regenerating an unchanged receipt
+        does not write a new file.
+        
+        Returns:
+            (content, pdf_name, content_hash, format) tuple
+        """
+        if format == 'escpos':
+            # Return base64-encoded ESC/POS bytes as text payload
+            content = ReceiptService._generate_escpos_receipt(sale)
+            return content, None, Receipt.compute_content_hash(content), format
+
+        # PDF (also the default for unknown formats)
+        pdf_buffer = ReceiptService._generate_pdf_receipt(sale)
+        data = pdf_buffer.read()
+        pdf_buffer.close()
+        content_hash = Receipt.compute_content_hash(data)
+        pdf_name = ReceiptService._store_pdf(data, content_hash)
+        return None, pdf_name, content_hash, 'pdf'
+
+    @staticmethod
+    def _store_pdf(data: bytes, content_hash: str) -> str:
+        """Write PDF bytes to content-addressed storage, skipping the write if already present"""
+        name = f"receipts/pdf/{content_hash[:2]}/{content_hash}.pdf"
+        if default_storage.exists(name):
+            logger.debug(f"Receipt PDF {content_hash} already stored, reusing {name}")
+            return name
+        return default_storage.save(name, ContentFile(data))
+
     @staticmethod
     def _generate_pdf_receipt(sale: Sale) -> BytesIO:
         """Generate PDF receipt using ReportLab"""
         buffer = BytesIO()
+        # invariant=1 drops the creation timestamp and random document ID so
+        # identical receipts render to identical bytes (required for dedup)
         doc = SimpleDocTemplate(
             buffer, 
             pagesize=A4, 
             rightMargin=20*mm, 
             leftMargin=20*mm, 
             topMargin=20*mm, 
-            bottomMargin=20*mm
+            bottomMargin=20*mm,
+            invariant=1
         )
         
         # Container for PDF elements
@@ -402,22 +459,13 @@ class ReceiptService:
             if not user:
                 user = old.generated_by
 
-            content = None
-            pdf_file = None
-
-            # Generate new content according to requested format
-            if format == 'pdf':
-                pdf_buffer = ReceiptService._generate_pdf_receipt(sale)
-                pdf_file = ContentFile(pdf_buffer.read(), name=f"receipt_{sale.receipt_number}.pdf")
-                pdf_buffer.close()
-            elif format == 'escpos':
-                content = ReceiptService._generate_escpos_receipt(sale)
-            else:
-                # Default to PDF
-                pdf_buffer = ReceiptService._generate_pdf_receipt(sale)
-                pdf_file = ContentFile(pdf_buffer.read(), name=f"receipt_{sale.receipt_number}.pdf")
-                pdf_buffer.close()
-                format = 'pdf'
+            content, pdf_name, content_hash, format = ReceiptService._render(sale, format)
+
+            # Byte-identical regeneration: keep the existing record instead of
+            # voiding it and storing a duplicate version
+            if old.format == format and old.is_current and not old.voided and old.ensure_content_hash() == content_hash:
+                logger.info(f"Receipt {old.id} regenerated with identical content; keeping existing record")
+                return old
 
             # Mark old as voided and not current
             old.voided = True
@@ -431,7 +479,8 @@ class ReceiptService:
                 receipt_number=sale.receipt_number,
                 format=format,
                 content=content or '',
-                pdf_file=pdf_file,
+                pdf_file=pdf_name,
+                content_hash=content_hash,
                 generated_by=user,
                 superseded_by=None
             )
@@ -445,3 +494,77 @@ class ReceiptService:
         except Receipt.DoesNotExist:
             raise Receipt.DoesNotExist(f"Receipt {receipt_id} not found")
 
+
+
+class ReceiptAccessCounter:
+    """
+    Batched receipt access counter.
+
+    `record()` only bumps an in-process tally. Pending tallies are written with a
+    single UPDATE (``access_count = access_count + CASE ...``) once the buffer
+    holds RECEIPT_ACCESS_FLUSH_THRESHOLD receipts or RECEIPT_ACCESS_FLUSH_INTERVAL
+    seconds have passed. Increments are additive, so concurrent workers each
+    flushing their own buffer stay correct.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_seen = {}
+        self._last_flush = time.monotonic()
+
+    @property
+    def flush_threshold(self):
+        return getattr(settings, 'RECEIPT_ACCESS_FLUSH_THRESHOLD', 100)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'RECEIPT_ACCESS_FLUSH_INTERVAL', 30)
+
+    def record(self, receipt_id):
+        """Count one access to a receipt; flushes when the buffer is due"""
+        if receipt_id is None:
+            return
+        with self._lock:
+            self._pending[receipt_id] = self._pending.get(receipt_id, 0) + 1
+            self._last_seen[receipt_id] = timezone.now()
+            due = (
+                len(self._pending) >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def pending(self, receipt_id):
+        """Accesses recorded for a receipt but not yet written"""
+        with self._lock:
+            return self._pending.get(receipt_id, 0)
+
+    def flush(self):
+        """Write all pending access counts in one UPDATE. Returns rows updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            last_seen, self._last_seen = self._last_seen, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            return Receipt.objects.filter(pk__in=pending.keys()).update(
+                access_count=F('access_count') + Case(
+                    *[When(pk=pk, then=Value(count)) for pk, count in pending.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+                last_accessed_at=Case(
+                    *[When(pk=pk, then=Value(ts)) for pk, ts in last_seen.items()],
+                    default=F('last_accessed_at'),
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Failed to flush receipt access counts: {str(e)}", exc_info=True)
+            return 0
+
+
+receipt_access_counter = ReceiptAccessCounter()
+atexit.register(receipt_access_counter.flush)
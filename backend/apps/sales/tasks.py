@@ -0,0 +1,16 @@
+"""
+Sales tasks
+Receipt rendering for new sales runs on the receipts queue after the sale
+commits. ReceiptService.generate_receipt returns the current receipt when one
+exists, so a redelivered task does not render the sale again.
+"""
+from celery import shared_task
+
+from .services import ReceiptService
+
+
+@shared_task(name='sales.generate_sale_receipts')
+def generate_sale_receipts(sale_ids):
+    """Generate the default receipts for each sale"""
+    for sale_id in sale_ids:
+        ReceiptService.generate_sale_receipts(sale_id)
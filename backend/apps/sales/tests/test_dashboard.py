@@ -0,0 +1,55 @@
+"""
+Sales dashboard endpoint tests
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.sales.models import Sale, SaleItem
+from apps.sales.views import SaleViewSet
+from apps.tenants.models import Tenant
+
+
+class SalesDashboardTests(TestCase):
+    """Test the combined dashboard action against the individual ones"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Dashboard Tenant")
+        self.user = User.objects.create_user(username="mgr", email="mgr@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        product = Product.objects.create(
+            tenant=self.tenant, outlet=self.outlet, name="Soda", sku="SODA-1", retail_price=Decimal("2.00"), stock=50
+        )
+        for number, quantity in [("D-1", 2), ("D-2", 5)]:
+            total = product.retail_price * quantity
+            sale = Sale.objects.create(
+                tenant=self.tenant, outlet=self.outlet, user=self.user, receipt_number=number,
+                subtotal=total, total=total, status='completed',
+            )
+            SaleItem.objects.create(
+                sale=sale, product=product, product_name="", quantity=quantity, price=product.retail_price, total=total
+            )
+        self.factory = APIRequestFactory()
+
+    def _get(self, action):
+        request = self.factory.get(f'/api/v1/sales/{action}/', {'outlet': self.outlet.id})
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return SaleViewSet.as_view({'get': action})(request).data
+
+    def test_dashboard_matches_individual_endpoints(self):
+        dashboard = self._get('dashboard')
+
+        self.assertEqual(dashboard['stats'], self._get('stats'))
+        self.assertEqual(dashboard['chart_data'], self._get('chart_data'))
+        self.assertEqual(dashboard['top_selling_items'], self._get('top_selling_items'))
+        self.assertEqual(dashboard['stats']['today_revenue'], 14.0)
+
+    def test_top_items_fall_back_to_product_details(self):
+        item = self._get('top_selling_items')[0]
+        self.assertEqual((item['name'], item['sku'], item['quantity']), ("Soda", "SODA-1", 7))
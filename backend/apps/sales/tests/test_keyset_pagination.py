@@ -0,0 +1,71 @@
+"""
+Keyset (cursor) pagination tests for sales history
+"""
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.sales.models import Sale
+from apps.sales.views import SaleViewSet
+from apps.outlets.models import Outlet
+from apps.tenants.models import Tenant
+from apps.accounts.models import User
+
+
+class SaleKeysetPaginationTests(TestCase):
+    """Test opt-in cursor pagination on SaleViewSet"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Keyset Tenant")
+        self.user = User.objects.create_user(username="pager", email="pager@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        for i in range(25):
+            Sale.objects.create(
+                tenant=self.tenant,
+                outlet=self.outlet,
+                user=self.user,
+                receipt_number=f"KEY-{i:03d}",
+                subtotal=Decimal("10.00"),
+                total=Decimal("10.00"),
+            )
+        self.factory = APIRequestFactory()
+
+    def _list(self, params):
+        request = self.factory.get('/api/v1/sales/', params, HTTP_X_OUTLET_ID=str(self.outlet.id))
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return SaleViewSet.as_view({'get': 'list'})(request)
+
+    def test_cursor_walk_returns_every_sale_once(self):
+        """Walking cursors covers the full history without COUNT queries"""
+        seen = []
+        params = {'pagination': 'cursor', 'page_size': 10}
+        while True:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self._list(params)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in q['sql'].upper() for q in ctx.captured_queries))
+            seen.extend(sale['id'] for sale in response.data['results'])
+            if not response.data['next_cursor']:
+                break
+            params = {'cursor': response.data['next_cursor'], 'page_size': 10}
+
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+        expected = list(Sale.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_page_number_mode_unchanged(self):
+        """Without opting in, the default page-number response is returned"""
+        response = self._list({})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_invalid_cursor(self):
+        response = self._list({'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,127 @@
+"""
+Offline sale sync tests
+"""
+
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.customers.models import Customer
+from apps.inventory.models import StockMovement
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.sales.models import Sale, SaleItem
+from apps.sales.views import SaleViewSet
+from apps.tenants.models import Tenant
+
+
+class OfflineSaleSyncTests(TestCase):
+    """Test idempotent bulk ingestion of offline sales"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Sync Tenant")
+        self.user = User.objects.create_user(username="till", email="till@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        self.product = Product.objects.create(
+            tenant=self.tenant, outlet=self.outlet, name="Soda", retail_price=Decimal("2.00"), stock=100
+        )
+        self.factory = APIRequestFactory()
+
+    def _sale(self, quantity=1, **extra):
+        sale = {
+            'client_id': str(uuid.uuid4()),
+            'payment_method': 'cash',
+            'items': [{'product_id': self.product.id, 'quantity': quantity, 'price': '2.00'}],
+        }
+        sale.update(extra)
+        return sale
+
+    def _sync(self, sales):
+        request = self.factory.post(
+            '/api/v1/sales/sync/', {'outlet': self.outlet.id, 'sales': sales}, format='json'
+        )
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return SaleViewSet.as_view({'post': 'sync'})(request)
+
+    def test_sales_are_created_with_items_and_stock(self):
+        """Each offline sale becomes a sale with items, movements and stock deducted"""
+        sold_at = datetime(2026, 10, 1, 9, 30, tzinfo=dt_timezone.utc)
+        response = self._sync([self._sale(2, created_at=sold_at.isoformat()), self._sale(3)])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 2)
+        first = Sale.objects.get(pk=response.data['results'][0]['sale_id'])
+        self.assertEqual(first.total, Decimal("4.00"))
+        self.assertEqual(first.status, 'completed')
+        self.assertEqual(first.created_at, sold_at)
+        self.assertEqual(SaleItem.objects.filter(sale__outlet=self.outlet).count(), 2)
+        self.assertEqual(StockMovement.objects.filter(movement_type='sale').count(), 2)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 95)
+
+    def test_replay_is_idempotent(self):
+        """Replaying a batch reports duplicates and does not deduct stock again"""
+        sales = [self._sale(5), self._sale(5)]
+        first = self._sync(sales)
+        replay = self._sync(sales)
+
+        self.assertEqual(replay.data['created'], 0)
+        self.assertEqual(replay.data['duplicates'], 2)
+        self.assertEqual(
+            [r['sale_id'] for r in replay.data['results']],
+            [r['sale_id'] for r in first.data['results']],
+        )
+        self.assertEqual(Sale.objects.filter(tenant=self.tenant).count(), 2)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 90)
+
+    def test_duplicate_within_batch(self):
+        """The same client_id twice in one request is recorded once"""
+        sale = self._sale(1)
+        response = self._sync([sale, sale])
+
+        self.assertEqual([r['status'] for r in response.data['results']], ['created', 'duplicate'])
+        self.assertEqual(response.data['results'][0]['sale_id'], response.data['results'][1]['sale_id'])
+        self.assertEqual(Sale.objects.filter(tenant=self.tenant).count(), 1)
+
+    def test_invalid_sales_are_rejected_individually(self):
+        """Bad sales are reported while the rest of the batch is recorded"""
+        response = self._sync([
+            self._sale(60),
+            self._sale(60),
+            {'client_id': 'not-a-uuid', 'items': []},
+            self._sale(1, payment_method='credit'),
+        ])
+
+        self.assertEqual(
+            [r['status'] for r in response.data['results']],
+            ['created', 'rejected', 'rejected', 'rejected'],
+        )
+        self.assertIn('Insufficient stock', response.data['results'][1]['errors'][0])
+        self.assertIn('Customer is required', response.data['results'][3]['errors'][0])
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, 40)
+
+    def test_customer_totals_updated_once(self):
+        """Customer spend is accumulated across the batch"""
+        customer = Customer.objects.create(tenant=self.tenant, name="Regular")
+        self._sync([self._sale(1, customer=customer.id), self._sale(2, customer=customer.id)])
+
+        customer.refresh_from_db()
+        self.assertEqual(customer.total_spent, Decimal("6.00"))
+        self.assertIsNotNone(customer.last_visit)
+
+    def test_query_count_does_not_grow_with_sales(self):
+        """A large batch is written with bulk statements"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self._sync([self._sale(1) for _ in range(50)])
+
+        self.assertEqual(response.data['created'], 50)
+        self.assertLess(len(queries), 25)
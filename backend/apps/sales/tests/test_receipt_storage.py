@@ -0,0 +1,105 @@
+"""
+Receipt storage and download caching tests
+Covers content-addressed PDF storage, conditional/range downloads and
+the batched access counter
+"""
+
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.sales.models import Sale, SaleItem, Receipt
+from apps.sales.services import ReceiptService, receipt_access_counter
+from apps.sales.views import ReceiptViewSet
+from apps.outlets.models import Outlet
+from apps.tenants.models import Tenant
+from apps.accounts.models import User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ReceiptStorageTests(TestCase):
+    """Test receipt deduplication and HTTP caching"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Receipt Test")
+        self.user = User.objects.create_user(username="cashier", email="cashier@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        self.sale = Sale.objects.create(
+            tenant=self.tenant,
+            outlet=self.outlet,
+            user=self.user,
+            receipt_number="RCT-001",
+            subtotal=Decimal("20.00"),
+            total=Decimal("20.00"),
+        )
+        SaleItem.objects.create(sale=self.sale, product_name="Soda", quantity=2, price=Decimal("10.00"), total=Decimal("20.00"))
+        self.factory = APIRequestFactory()
+
+    def tearDown(self):
+        # Don't leak buffered accesses into other tests
+        receipt_access_counter.flush()
+
+    def _download(self, receipt, **headers):
+        request = self.factory.get(f'/api/v1/receipts/{receipt.id}/download/', **headers)
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return ReceiptViewSet.as_view({'get': 'download'})(request, pk=receipt.id)
+
+    def test_regenerate_identical_content_is_deduplicated(self):
+        """Byte-identical regeneration keeps the record and the stored file"""
+        receipt = ReceiptService.generate_receipt(self.sale, format='pdf', user=self.user)
+        self.assertEqual(len(receipt.content_hash), 64)
+        self.assertIn(receipt.content_hash, receipt.pdf_file.name)
+
+        again = ReceiptService.regenerate_receipt(receipt.id, format='pdf', user=self.user)
+        self.assertEqual(again.id, receipt.id)
+        self.assertEqual(Receipt.objects.filter(sale=self.sale).count(), 1)
+
+    def test_download_conditional_and_range(self):
+        """Downloads expose validators, answer 304 and serve byte ranges"""
+        receipt = ReceiptService.generate_receipt(self.sale, format='escpos', user=self.user)
+
+        response = self._download(receipt)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{receipt.content_hash}"')
+        self.assertIn('Last-Modified', response)
+
+        response = self._download(receipt, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = self._download(receipt, HTTP_RANGE='bytes=0-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, receipt.content.encode()[:4])
+        self.assertEqual(response['Content-Range'], f'bytes 0-3/{len(receipt.content)}')
+
+        response = self._download(receipt, HTTP_RANGE=f'bytes={len(receipt.content) + 10}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_access_counter_batches_writes(self):
+        """Accesses are buffered and written in one UPDATE on flush"""
+        receipt = ReceiptService.generate_receipt(self.sale, format='escpos', user=self.user)
+        receipt_access_counter.flush()
+
+        with self.settings(RECEIPT_ACCESS_FLUSH_THRESHOLD=1000, RECEIPT_ACCESS_FLUSH_INTERVAL=3600):
+            with self.assertNumQueries(0):
+                for _ in range(5):
+                    receipt.increment_access()
+            self.assertEqual(receipt_access_counter.pending(receipt.id), 5)
+
+            with self.assertNumQueries(1):
+                receipt_access_counter.flush()
+
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.access_count, 5)
+        self.assertIsNotNone(receipt.last_accessed_at)
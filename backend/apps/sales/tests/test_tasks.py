@@ -0,0 +1,48 @@
+"""
+Receipt task tests (tasks run eagerly under manage.py test)
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.sales.models import Receipt, Sale
+from apps.sales.tasks import generate_sale_receipts
+from apps.tenants.models import Tenant
+
+
+class ReceiptTaskTests(TestCase):
+    """Test that new sales get their receipts from a post-commit task"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Task Tenant")
+        self.user = User.objects.create_user(username="till", email="till@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+
+    def _sale(self, number):
+        return Sale.objects.create(
+            tenant=self.tenant, outlet=self.outlet, user=self.user, receipt_number=number,
+            subtotal=Decimal("5.00"), total=Decimal("5.00"),
+        )
+
+    def test_receipts_are_generated_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            sale = self._sale("RCT-100")
+            self.assertFalse(Receipt.objects.exists())
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(
+            set(Receipt.objects.filter(sale=sale).values_list('format', flat=True)), {'pdf', 'escpos'}
+        )
+
+    def test_redelivered_task_does_not_duplicate_receipts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sale = self._sale("RCT-101")
+        count = Receipt.objects.filter(sale=sale).count()
+
+        generate_sale_receipts([sale.id])
+
+        self.assertEqual(Receipt.objects.filter(sale=sale).count(), count)
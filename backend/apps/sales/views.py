@@ -11,12 +11,17 @@ import logging
 from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
 from .models import Sale, SaleItem, Receipt, ReceiptTemplate
-from .serializers import SaleSerializer, SaleItemSerializer, ReceiptSerializer, ReceiptTemplateSerializer
+from .serializers import SaleSerializer, SaleItemSerializer, ReceiptSerializer, ReceiptTemplateSerializer, OfflineSyncSerializer
 from .services import ReceiptService
+from .offline_sync import OfflineSyncService
 from apps.products.models import Product, ProductUnit
 from apps.inventory.models import StockMovement, LocationStock, Batch
 from apps.inventory.stock_helpers import get_available_stock, deduct_stock, add_stock
 from apps.tenants.permissions import TenantFilterMixin
+from apps.customers.loyalty import LoyaltyLedger
+from primepos.concurrency import gather
+from primepos.db_routing import replica_reads
+from primepos.pagination import KeysetOptInPagination
 
 
 class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
@@ -27,6 +32,7 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
     )
     serializer_class = SaleSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetOptInPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['tenant', 'outlet', 'user', 'status', 'payment_method']
     search_fields = ['receipt_number', 'notes']
@@ -384,44 +390,25 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         if table and sale.status == 'pending':
             from apps.restaurant.models import KitchenOrderTicket
             
-            # Generate unique KOT number (deterministic based on timestamp and count)
-            # After a sale is created and saved, don't block on generating receipts here; we use a post-commit
-            # signal to generate receipts. We also provide an on-demand endpoint for cases where the client
-            # needs to trigger generation synchronously (e.g., print attempts from POS).
-            date_str = timezone.now().strftime('%Y%m%d')
-            # Get count of KOTs for today to ensure uniqueness
-            today_kot_count = KitchenOrderTicket.objects.filter(
-                kot_number__startswith=f"KOT-{date_str}"
-            ).count()
-            kot_number = f"KOT-{date_str}-{today_kot_count + 1:04d}"
-            
-            # Ensure KOT number is unique (in case of race condition)
-            counter = 1
-            while KitchenOrderTicket.objects.filter(kot_number=kot_number).exists():
-                kot_number = f"KOT-{date_str}-{today_kot_count + 1 + counter:04d}"
-                counter += 1
-            
+            # kot_number is allocated atomically from the outlet's daily sequence
             KitchenOrderTicket.objects.create(
                 tenant=tenant,
                 outlet=sale.outlet,
                 sale=sale,
                 table=table,
-                kot_number=kot_number,
                 status='pending',
                 priority=priority,
                 notes=sale.notes
             )
         
-        # Update customer if provided
-        if sale.customer:
-            sale.customer.total_spent += sale.total
-            sale.customer.last_visit = timezone.now()
-            sale.customer.save()
+        # Add spend and earned loyalty points to the customer (F() update, no full save)
+        if sale.customer_id:
+            LoyaltyLedger.record_sales([sale])
         
         # Create notification for completed sale (Square POS-like)
         try:
-            from apps.notifications.services import NotificationService
-            NotificationService.notify_sale_completed(sale)
+            from apps.notifications.tasks import notify_on_commit
+            notify_on_commit('sale_completed', sale)
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -715,11 +702,9 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
                     reason=f"Cash sale {sale.receipt_number}"
                 )
         
-        # Update customer if provided
+        # Add spend and earned loyalty points to the customer (F() update, no full save)
         if customer:
-            customer.total_spent += total
-            customer.last_visit = timezone.now()
-            customer.save()
+            LoyaltyLedger.record_sales([sale])
         
         # Cash movement creation removed - new payment system will handle this
         
@@ -742,6 +727,85 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             "shift": shift_serializer.data if shift_serializer else {"id": shift.id, "status": shift.status}
         }, status=status.HTTP_201_CREATED)
     
+    @action(detail=False, methods=['post'], url_path='sync')
+    def sync(self, request):
+        """
+        Bulk ingest of sales recorded while a till was offline
+        
+        Input:
+        {
+            "outlet": <outlet_id>,
+            "till": <till_id> (optional),
+            "shift": <shift_id> (optional),
+            "sales": [
+                {
+                    "client_id": "<uuid generated on the till>",
+                    "created_at": "<when the sale happened>" (optional),
+                    "payment_method": "cash",
+                    "items": [{"product_id": 1, "quantity": 2, "price": "10.00"}],
+                    ...
+                },
+                ...
+            ]
+        }
+        
+        client_id is the idempotency key: replaying a batch returns the
+        already-recorded sales as duplicates without deducting stock again.
+        
+        Output:
+        {
+            "results": [{"client_id": "...", "status": "created" | "duplicate" | "rejected",
+                         "sale_id": <id>, "receipt_number": "...", "errors": [...]}],
+            "created": <n>, "duplicates": <n>, "rejected": <n>
+        }
+        """
+        envelope = OfflineSyncSerializer(data=request.data)
+        if not envelope.is_valid():
+            return Response(
+                {"detail": "Validation failed", "errors": envelope.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        data = envelope.validated_data
+        
+        tenant = self.get_tenant_for_request(request)
+        if not tenant:
+            return Response({"detail": "User must have a tenant"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        from apps.outlets.models import Outlet, Till
+        outlet = Outlet.objects.filter(id=data['outlet'], tenant=tenant).first()
+        if not outlet:
+            return Response(
+                {"detail": "Outlet not found or does not belong to your tenant"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        till = None
+        if data.get('till'):
+            till = Till.objects.filter(id=data['till'], outlet=outlet).first()
+            if not till:
+                return Response(
+                    {"detail": f"Till {data['till']} does not belong to selected outlet"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        shift = None
+        if data.get('shift'):
+            from apps.shifts.models import Shift
+            shift = Shift.objects.filter(id=data['shift'], outlet=outlet).first()
+            if not shift:
+                return Response(
+                    {"detail": f"Shift {data['shift']} does not belong to selected outlet"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        results = OfflineSyncService.sync(tenant, outlet, request.user, data['sales'], till=till, shift=shift)
+        return Response({
+            "results": results,
+            "created": sum(1 for result in results if result['status'] == 'created'),
+            "duplicates": sum(1 for result in results if result['status'] == 'duplicate'),
+            "rejected": sum(1 for result in results if result['status'] == 'rejected'),
+        })
+    
     def _generate_receipt_number(self, tenant):
         """Generate unique receipt number"""
         prefix = tenant.name[:3].upper().replace(' ', '')
@@ -777,7 +841,7 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
                     # CRITICAL: Verify product belongs to tenant
                     product = Product.objects.select_for_update().get(id=item.product.id, tenant=sale.tenant)
                     product.stock += item.quantity
-                    product.save()
+                    product.save(update_fields=['stock', 'updated_at'])
                     
                     # Record stock movement
                     StockMovement.objects.create(
@@ -795,10 +859,9 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             sale.status = 'refunded'
             sale.save()
             
-            # Update customer if exists
-            if sale.customer:
-                sale.customer.total_spent = max(0, sale.customer.total_spent - sale.total)
-                sale.customer.save()
+            # Take the spend and earned points back off the customer
+            if sale.customer_id:
+                LoyaltyLedger.reverse_sale(sale)
         
         serializer = self.get_serializer(sale)
         return Response(serializer.data)
@@ -854,52 +917,46 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             logger.error(f"Failed to generate escpos receipt for sale {sale.id}: {str(e)}", exc_info=True)
             return Response({"detail": "Failed to generate escpos receipt"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    @action(detail=False, methods=['get'])
-    def stats(self, request):
-        """Get sales statistics - optimized with database aggregation"""
-        from django.db.models import Sum, Count
-        
-        queryset = self.filter_queryset(self.get_queryset())
+    # Dashboard helpers take the filtered queryset and outlet resolved on the
+    # request thread, so they only run queries and are safe to run concurrently
+    
+    @staticmethod
+    def _stats_data(queryset, params):
+        """Sales totals, overall and for today, in one aggregate query"""
+        from django.db.models import Sum, Count, Q
         
         # Date range filters
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
+        start_date = params.get('start_date')
+        end_date = params.get('end_date')
         
         if start_date:
             queryset = queryset.filter(created_at__gte=start_date)
         if end_date:
             queryset = queryset.filter(created_at__lte=end_date)
         
-        # Use database aggregation instead of Python iteration (much faster)
-        stats = queryset.aggregate(
+        today = Q(created_at__date=timezone.now().date())
+        stats = queryset.order_by().aggregate(
             total_sales=Count('id'),
             total_revenue=Sum('total'),
+            today_sales=Count('id', filter=today),
+            today_revenue=Sum('total', filter=today),
         )
         
-        today = timezone.now().date()
-        today_stats = queryset.filter(created_at__date=today).aggregate(
-            today_sales=Count('id'),
-            today_revenue=Sum('total'),
-        )
-        
-        return Response({
+        return {
             'total_sales': stats['total_sales'] or 0,
             'total_revenue': float(stats['total_revenue'] or 0),
-            'today_sales': today_stats['today_sales'] or 0,
-            'today_revenue': float(today_stats['today_revenue'] or 0),
-        })
+            'today_sales': stats['today_sales'] or 0,
+            'today_revenue': float(stats['today_revenue'] or 0),
+        }
     
-    @action(detail=False, methods=['get'])
-    def chart_data(self, request):
-        """Get chart data for last 7 days - optimized single query"""
+    @staticmethod
+    def _chart_data(queryset, outlet):
+        """Daily sales for the last 7 days"""
         from django.db.models import Sum, Count
         from django.db.models.functions import TruncDate
         from datetime import timedelta
         
-        queryset = self.filter_queryset(self.get_queryset())
-        
         # Get outlet filter if provided
-        outlet = self.get_outlet_for_request(request)
         if outlet:
             queryset = queryset.filter(outlet=outlet)
         
@@ -934,17 +991,14 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
                 'profit': float(day_stats['sales'] or 0) * 0.7,  # TODO: Calculate properly with expenses
             })
         
-        return Response(chart_data)
+        return chart_data
     
-    @action(detail=False, methods=['get'])
-    def top_selling_items(self, request):
-        """Get top selling items - optimized database query"""
+    @staticmethod
+    def _top_selling_items(queryset, outlet, params):
+        """Top 5 products by revenue, with product details joined in the same query"""
         from django.db.models import Sum, F
         
-        queryset = self.filter_queryset(self.get_queryset())
-        
         # Get outlet filter if provided
-        outlet = self.get_outlet_for_request(request)
         if outlet:
             queryset = queryset.filter(outlet=outlet)
         
@@ -952,8 +1006,8 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         queryset = queryset.filter(status='completed')
         
         # Get date range (optional)
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
+        start_date = params.get('start_date')
+        end_date = params.get('end_date')
         if start_date:
             queryset = queryset.filter(created_at__gte=start_date)
         if end_date:
@@ -961,33 +1015,70 @@ class SaleViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         
         # Aggregate sale items by product
         top_items = SaleItem.objects.filter(
-            sale__in=queryset
+            sale__in=queryset.values('pk')
         ).values(
             'product_id'
         ).annotate(
-            quantity=Sum('quantity'),
+            total_quantity=Sum('quantity'),
             revenue=Sum(F('price') * F('quantity')),
-            product_name=F('product_name')
+            product_name=F('product_name'),
+            current_name=F('product__name'),
+            sku=F('product__sku'),
         ).order_by('-revenue')[:5]
         
-        # Get product details
-        product_ids = [item['product_id'] for item in top_items if item['product_id']]
-        products = {p.id: p for p in Product.objects.filter(id__in=product_ids).only('id', 'name', 'sku')}
-        
         # Format response
         result = []
         for item in top_items:
-            product = products.get(item['product_id'])
             result.append({
                 'id': str(item['product_id']),
-                'name': item['product_name'] or (product.name if product else 'Unknown Product'),
-                'sku': product.sku if product else 'N/A',
-                'quantity': item['quantity'] or 0,
+                'name': item['product_name'] or item['current_name'] or 'Unknown Product',
+                'sku': item['sku'] or 'N/A',
+                'quantity': item['total_quantity'] or 0,
                 'revenue': float(item['revenue'] or 0),
                 'change': 0,  # TODO: Calculate change from previous period
             })
         
-        return Response(result)
+        return result
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def stats(self, request):
+        """Get sales statistics - optimized with database aggregation"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self._stats_data(queryset, request.query_params))
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def chart_data(self, request):
+        """Get chart data for last 7 days - optimized single query"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self._chart_data(queryset, self.get_outlet_for_request(request)))
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def top_selling_items(self, request):
+        """Get top selling items - optimized database query"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self._top_selling_items(queryset, self.get_outlet_for_request(request), request.query_params))
+    
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def dashboard(self, request):
+        """
+        Stats, chart data and top selling items in one response.
+        
+        The three queries run concurrently, so the response takes as long
+        as the slowest of them.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        outlet = self.get_outlet_for_request(request)
+        params = request.query_params
+        results = gather(
+            stats=lambda: self._stats_data(queryset, params),
+            chart_data=lambda: self._chart_data(queryset, outlet),
+            top_selling_items=lambda: self._top_selling_items(queryset, outlet, params),
+        )
+        return Response(results)
 
 
 class ReceiptViewSet(viewsets.ReadOnlyModelViewSet, TenantFilterMixin):
@@ -995,6 +1086,8 @@ class ReceiptViewSet(viewsets.ReadOnlyModelViewSet, TenantFilterMixin):
     queryset = Receipt.objects.select_related('sale', 'tenant', 'generated_by', 'sale__outlet', 'sale__customer')
     serializer_class = ReceiptSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetOptInPagination
+    keyset_field = 'generated_at'
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['tenant', 'sale', 'format', 'is_sent']
     search_fields = ['receipt_number']
@@ -1058,8 +1151,7 @@ class ReceiptViewSet(viewsets.ReadOnlyModelViewSet, TenantFilterMixin):
                         status=status.HTTP_404_NOT_FOUND
                     )
             
-            serializer = self.get_serializer(receipt)
-            return Response(serializer.data)
+            return self._conditional_receipt_response(request, receipt)
         except Receipt.DoesNotExist:
             return Response(
                 {'error': 'Receipt not found'},
@@ -1080,14 +1172,44 @@ class ReceiptViewSet(viewsets.ReadOnlyModelViewSet, TenantFilterMixin):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            serializer = self.get_serializer(receipt)
-            return Response(serializer.data)
+            return self._conditional_receipt_response(request, receipt)
         except Receipt.DoesNotExist:
             return Response(
                 {'error': 'Receipt not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
     
+    def _receipt_validators(self, receipt, weak=False):
+        """Return (etag, last_modified) for a receipt.
+
+        Receipts are immutable, so the content hash is a strong validator for
+        the stored bytes. JSON representations also carry delivery/access
+        metadata, so they get a weak ETag.
+        """
+        etag = f'"{receipt.ensure_content_hash()}"'
+        if weak:
+            sent_marker = int(receipt.sent_at.timestamp()) if receipt.sent_at else 0
+            etag = f'W/"{receipt.id}-{receipt.content_hash[:16]}-{sent_marker}"'
+        return etag, receipt.generated_at
+
+    def _conditional_receipt_response(self, request, receipt):
+        """Serialize a receipt, answering 304 when the client copy is current"""
+        from django.utils.cache import get_conditional_response
+        from django.utils.http import http_date
+
+        etag, last_modified = self._receipt_validators(receipt, weak=True)
+        last_modified_ts = int(last_modified.timestamp())
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+        if not_modified is None:
+            serializer = self.get_serializer(receipt)
+            response = Response(serializer.data)
+        else:
+            response = not_modified
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified_ts)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+    
     @action(detail=True, methods=['post'], url_path='regenerate')
     def regenerate(self, request, pk=None):
         """Regenerate receipt (admin only). This creates a new immutable receipt
@@ -1111,33 +1233,77 @@ class ReceiptViewSet(viewsets.ReadOnlyModelViewSet, TenantFilterMixin):
     # (voiding the old one) if you need a new version (admin only).    
     @action(detail=True, methods=['get'], url_path='download')
     def download(self, request, pk=None):
-        """Download receipt - PDF file if available, ESC/POS content otherwise"""
+        """Download receipt - PDF file if available, ESC/POS content otherwise
+
+        Supports conditional requests (ETag / Last-Modified -> 304) and single
+        byte ranges (Range -> 206), so repeat downloads are cheap.
+        """
         receipt = self.get_object()
         
-        from django.http import HttpResponse, FileResponse
+        from django.http import HttpResponse
+        from django.utils.cache import get_conditional_response
+        from django.utils.http import http_date
         
-        # If PDF file exists, serve it
         if receipt.pdf_file:
-            receipt.increment_access()
-            return FileResponse(
-                receipt.pdf_file.open('rb'),
-                as_attachment=True,
-                filename=f"receipt_{receipt.receipt_number}.pdf",
-                content_type='application/pdf'
+            content_type = 'application/pdf'
+            filename = f"receipt_{receipt.receipt_number}.pdf"
+        elif receipt.format == 'escpos' and receipt.content:
+            # ESC/POS content is returned as a text file
+            content_type = 'text/plain'
+            filename = f"receipt_{receipt.receipt_number}.txt"
+        else:
+            # Fallback
+            return Response(
+                {'error': 'No downloadable content available for this receipt'},
+                status=status.HTTP_404_NOT_FOUND
             )
         
-        # Otherwise, if ESC/POS content, return as text file
-        if receipt.format == 'escpos' and receipt.content:
-            receipt.increment_access()
-            response = HttpResponse(receipt.content, content_type='text/plain')
-            response['Content-Disposition'] = f'attachment; filename="receipt_{receipt.receipt_number}.txt"'
+        etag, last_modified = self._receipt_validators(receipt)
+        last_modified_ts = int(last_modified.timestamp())
+        receipt.increment_access()
+        
+        def _with_validators(response):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified_ts)
+            response['Cache-Control'] = 'private, max-age=0, must-revalidate'
+            response['Accept-Ranges'] = 'bytes'
             return response
         
-        # Fallback
-        return Response(
-            {'error': 'No downloadable content available for this receipt'},
-            status=status.HTTP_404_NOT_FOUND
-        )
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+        if not_modified is not None:
+            return _with_validators(not_modified)
+        
+        data = receipt.get_content_bytes()
+        size = len(data)
+        response = None
+        
+        # Honour a single "bytes=start-end" range unless If-Range names a stale version
+        range_header = request.META.get('HTTP_RANGE', '')
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if range_header.startswith('bytes=') and ',' not in range_header and (not if_range or if_range == etag):
+            start_str, _, end_str = range_header[len('bytes='):].strip().partition('-')
+            try:
+                if start_str:
+                    start = int(start_str)
+                    end = min(int(end_str), size - 1) if end_str else size - 1
+                else:
+                    # Suffix range: last N bytes
+                    start = max(size - int(end_str), 0)
+                    end = size - 1
+            except ValueError:
+                start = end = None
+            if start is not None:
+                if start >= size or start > end:
+                    response = HttpResponse(status=416)
+                    response['Content-Range'] = f'bytes */{size}'
+                    return _with_validators(response)
+                response = HttpResponse(data[start:end + 1], status=206, content_type=content_type)
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        
+        if response is None:
+            response = HttpResponse(data, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return _with_validators(response)
 
 
 class ReceiptTemplateViewSet(viewsets.ModelViewSet, TenantFilterMixin):
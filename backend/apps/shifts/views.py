@@ -138,8 +138,8 @@ class ShiftViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         
         # Create notification for shift opened (Square POS-like)
         try:
-            from apps.notifications.services import NotificationService
-            NotificationService.notify_shift_opened(shift)
+            from apps.notifications.tasks import notify_on_commit
+            notify_on_commit('shift_opened', shift)
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -202,8 +202,8 @@ class ShiftViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             
             # Create notification for shift closed (Square POS-like)
             try:
-                from apps.notifications.services import NotificationService
-                NotificationService.notify_shift_closed(shift)
+                from apps.notifications.tasks import notify_on_commit
+                notify_on_commit('shift_closed', shift)
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
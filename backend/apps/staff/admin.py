@@ -7,6 +7,7 @@ class RoleAdmin(admin.ModelAdmin):
     list_display = ('name', 'tenant', 'is_active', 'created_at')
     list_filter = ('tenant', 'is_active')
     search_fields = ('name', 'description')
+    readonly_fields = ('permission_bits',)
 
 
 @admin.register(Staff)
@@ -5,3 +5,6 @@ class StaffConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.staff'
 
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.staff.signals  # noqa
@@ -0,0 +1,190 @@
+"""
+Labour hours
+Rolls Attendance up into LabourHours (worked seconds per staff member, outlet
+and day) with one windowed SQL query, so labour and payroll reports aggregate
+a small daily table instead of pulling every attendance row.
+
+Overlapping shifts of one staff member (a forgotten check-out followed by a
+new check-in, or checking in at two outlets) are counted once: ordered by
+check-in, each shift only contributes the time after the latest check-out of
+the shifts before it. A shift is booked on the local day it started.
+"""
+import logging
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Max, Sum, Value, Window
+from django.db.models.expressions import RowRange
+from django.db.models.functions import Coalesce, Greatest, TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import Attendance, LabourHours, Staff
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ('day', 'week', 'total')
+
+
+class _PrecedingRows(RowRange):
+    """ROWS frame ending one row before the current row (not expressible with RowRange in Django 4.2)"""
+
+    def as_sql(self, compiler, connection):
+        return 'ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING', []
+
+
+def _seconds(value):
+    """Summed duration as seconds; backends without an interval type return microseconds"""
+    if value is None:
+        return 0
+    if isinstance(value, timedelta):
+        return int(value.total_seconds())
+    return int(value) // 1_000_000
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def worked_time(start_day, end_day, staff_ids=None, tenant_id=None):
+    """
+    Worked seconds and shift counts per (staff, outlet, day) computed from Attendance.
+
+    Args:
+        start_day: First day (inclusive)
+        end_day: Last day (inclusive)
+        staff_ids: Restrict to these staff members
+        tenant_id: Restrict to this tenant
+
+    Returns:
+        Dict of (staff_id, outlet_id, day) -> (seconds, shifts)
+    """
+    # Earlier shifts can overlap the first day; read them so the window sees
+    # their check-outs, but only report days in range
+    lookback = timedelta(hours=getattr(settings, 'ATTENDANCE_MAX_SHIFT_HOURS', 24))
+    shifts = Attendance.objects.filter(
+        check_out__isnull=False,
+        check_in__gte=_day_start(start_day) - lookback,
+        check_in__lt=_day_start(end_day + timedelta(days=1)),
+    )
+    if staff_ids is not None:
+        shifts = shifts.filter(staff_id__in=staff_ids)
+    if tenant_id is not None:
+        shifts = shifts.filter(staff__tenant_id=tenant_id)
+
+    previous_end = Window(
+        Max('check_out'),
+        partition_by=[F('staff_id')],
+        order_by=[F('check_in').asc(), F('id').asc()],
+        frame=_PrecedingRows(),
+    )
+    worked = Greatest(
+        ExpressionWrapper(
+            F('check_out') - Greatest(F('check_in'), Coalesce(previous_end, F('check_in'))),
+            output_field=DurationField(),
+        ),
+        Value(timedelta(0)),
+    )
+    inner = shifts.order_by().annotate(day=TruncDate('check_in'), worked=worked).values(
+        'staff_id', 'outlet_id', 'day', 'worked'
+    )
+
+    # Aggregates cannot wrap window functions in one SELECT, so group in an outer query
+    inner_sql, params = inner.query.sql_with_params()
+    sql = (
+        f"SELECT staff_id, outlet_id, day, SUM(worked), COUNT(*) FROM ({inner_sql}) worked_shifts "
+        f"WHERE day >= %s GROUP BY staff_id, outlet_id, day"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, start_day])
+        rows = cursor.fetchall()
+
+    return {
+        (staff_id, outlet_id, _as_date(day)): (_seconds(total), count)
+        for staff_id, outlet_id, day, total, count in rows
+    }
+
+
+def refresh_labour_hours(start_day, end_day, staff_ids=None, tenant_id=None):
+    """
+    Recompute LabourHours rows for a day range.
+
+    Returns:
+        Number of rollup rows written
+    """
+    totals = worked_time(start_day, end_day, staff_ids, tenant_id)
+    staff_tenants = dict(
+        Staff.objects.filter(pk__in={staff_id for staff_id, _, _ in totals}).values_list('id', 'tenant_id')
+    )
+
+    with transaction.atomic():
+        stale = LabourHours.objects.filter(day__gte=start_day, day__lte=end_day)
+        if staff_ids is not None:
+            stale = stale.filter(staff_id__in=staff_ids)
+        if tenant_id is not None:
+            stale = stale.filter(tenant_id=tenant_id)
+        stale.delete()
+        LabourHours.objects.bulk_create([
+            LabourHours(
+                tenant_id=staff_tenants[staff_id],
+                staff_id=staff_id,
+                outlet_id=outlet_id,
+                day=day,
+                seconds=seconds,
+                shifts=count,
+            )
+            for (staff_id, outlet_id, day), (seconds, count) in totals.items()
+        ], batch_size=500)
+
+    logger.debug(f"Refreshed {len(totals)} labour hour row(s) for {start_day}..{end_day}")
+    return len(totals)
+
+
+def shift_days(attendance):
+    """Days a shift can affect: from its check-in day to its check-out day"""
+    start_day = timezone.localdate(attendance.check_in)
+    end_day = timezone.localdate(attendance.check_out) if attendance.check_out else start_day
+    return start_day, max(start_day, end_day)
+
+
+def labour_summary(queryset, period='day'):
+    """
+    Worked hours grouped by staff, outlet and period.
+
+    Args:
+        queryset: LabourHours queryset (already tenant/date filtered)
+        period: 'day', 'week' (starting Monday) or 'total' for the whole range
+
+    Returns:
+        List of dicts with staff, staff_name, outlet, period, hours, seconds and shifts
+    """
+    fields = ['staff_id', 'staff__user__name', 'outlet_id']
+    if period == 'day':
+        queryset = queryset.annotate(period=F('day'))
+        fields.append('period')
+    elif period == 'week':
+        queryset = queryset.annotate(period=TruncWeek('day'))
+        fields.append('period')
+
+    rows = queryset.order_by().values(*fields).annotate(
+        total_seconds=Sum('seconds'), total_shifts=Sum('shifts'), days=Count('id'),
+    ).order_by(*fields)
+
+    return [
+        {
+            'staff': row['staff_id'],
+            'staff_name': row['staff__user__name'],
+            'outlet': row['outlet_id'],
+            'period': row.get('period'),
+            'days': row['days'],
+            'shifts': row['total_shifts'],
+            'seconds': row['total_seconds'],
+            'hours': round(row['total_seconds'] / 3600, 2),
+        }
+        for row in rows
+    ]
+
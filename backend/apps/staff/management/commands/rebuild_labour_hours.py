@@ -0,0 +1,43 @@
+"""
+Management command to rebuild the LabourHours rollup from Attendance
+Use after importing attendance or editing shifts outside the API
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.staff.labour import refresh_labour_hours
+
+
+class Command(BaseCommand):
+    help = 'Recompute daily labour hours per staff member and outlet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='First day to rebuild, YYYY-MM-DD (default: 31 days ago)',
+        )
+        parser.add_argument(
+            '--until',
+            help='Last day to rebuild, YYYY-MM-DD (default: today)',
+        )
+        parser.add_argument(
+            '--tenant',
+            type=int,
+            help='Rebuild only this tenant ID',
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        try:
+            since = parse_date(options['since']) if options.get('since') else today - timedelta(days=31)
+            until = parse_date(options['until']) if options.get('until') else today
+        except ValueError:
+            since = until = None
+        if not since or not until or since > until:
+            raise CommandError('--since and --until must be YYYY-MM-DD with since <= until')
+
+        rows = refresh_labour_hours(since, until, tenant_id=options.get('tenant'))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} labour hour row(s) for {since}..{until}"))
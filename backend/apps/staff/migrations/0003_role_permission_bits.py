@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:38
+
+from django.db import migrations, models
+
+
+PERMISSION_FIELDS = (
+    'can_sales',
+    'can_inventory',
+    'can_products',
+    'can_customers',
+    'can_reports',
+    'can_staff',
+    'can_settings',
+    'can_dashboard',
+)
+
+
+def populate_permission_bits(apps, schema_editor):
+    """Compute the bitmap for existing roles"""
+    Role = apps.get_model('staff', 'Role')
+    roles = list(Role.objects.all())
+    for role in roles:
+        role.permission_bits = sum(
+            1 << index for index, name in enumerate(PERMISSION_FIELDS) if getattr(role, name)
+        )
+    Role.objects.bulk_update(roles, ['permission_bits'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0002_alter_staff_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='role',
+            name='permission_bits',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Bitmap of granted permissions, recomputed on save'),
+        ),
+        migrations.RunPython(populate_permission_bits, migrations.RunPython.noop),
+    ]
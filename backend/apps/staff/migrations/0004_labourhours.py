@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0005_add_logo_field'),
+        ('outlets', '0005_alter_printer_options'),
+        ('staff', '0003_role_permission_bits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LabourHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('seconds', models.PositiveIntegerField(default=0)),
+                ('shifts', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Labour Hours',
+                'verbose_name_plural': 'Labour Hours',
+                'db_table': 'staff_labourhours',
+                'ordering': ['day', 'staff'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['staff', 'check_in'], name='staff_atten_staff_i_b8e045_idx'),
+        ),
+        migrations.AddField(
+            model_name='labourhours',
+            name='outlet',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='labour_hours', to='outlets.outlet'),
+        ),
+        migrations.AddField(
+            model_name='labourhours',
+            name='staff',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='labour_hours', to='staff.staff'),
+        ),
+        migrations.AddField(
+            model_name='labourhours',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='labour_hours', to='tenants.tenant'),
+        ),
+        migrations.AddIndex(
+            model_name='labourhours',
+            index=models.Index(fields=['tenant', 'day'], name='staff_labou_tenant__8e1b17_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='labourhours',
+            index=models.Index(fields=['outlet', 'day'], name='staff_labou_outlet__a4b241_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='labourhours',
+            constraint=models.UniqueConstraint(fields=('staff', 'outlet', 'day'), name='staff_labourhours_staff_outlet_day_uniq'),
+        ),
+    ]
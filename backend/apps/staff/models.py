@@ -1,7 +1,7 @@
 from django.db import models
 from apps.tenants.models import Tenant
 from apps.outlets.models import Outlet
-from apps.accounts.models import User
+from apps.accounts.models import User, PERMISSION_FIELDS, permission_bits_for
 
 
 class Role(models.Model):
@@ -19,6 +19,8 @@ class Role(models.Model):
     can_staff = models.BooleanField(default=False)
     can_settings = models.BooleanField(default=False)
     can_dashboard = models.BooleanField(default=True)
+    # Precomputed bitmap of the can_* flags above (bit order: PERMISSION_FIELDS)
+    permission_bits = models.PositiveIntegerField(default=0, editable=False, help_text="Bitmap of granted permissions, recomputed on save")
     
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -37,6 +39,18 @@ class Role(models.Model):
     def __str__(self):
         return f"{self.tenant.name} - {self.name}"
 
+    def compute_permission_bits(self):
+        """Build the permission bitmap from the can_* flags"""
+        return permission_bits_for(name for name in PERMISSION_FIELDS if getattr(self, name, False))
+
+    def save(self, *args, **kwargs):
+        """Keep permission_bits in sync with the permission flags"""
+        self.permission_bits = self.compute_permission_bits()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'permission_bits' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['permission_bits']
+        super().save(*args, **kwargs)
+
 
 class Staff(models.Model):
     """Staff member model (links User to Tenant/Outlet)"""
@@ -80,8 +94,46 @@ class Attendance(models.Model):
             models.Index(fields=['staff']),
             models.Index(fields=['outlet']),
             models.Index(fields=['check_in']),
+            models.Index(fields=['staff', 'check_in']),
         ]
 
     def __str__(self):
         return f"{self.staff.user.name} - {self.check_in}"
 
+
+
+class LabourHours(models.Model):
+    """
+    Daily worked time per staff member and outlet, rolled up from Attendance.
+
+    Refreshed when a shift is checked out, edited or deleted. Overlapping
+    shifts of the same staff member are counted once, and a shift is booked
+    on the day it started.
+    """
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name='labour_hours')
+    staff = models.ForeignKey(Staff, on_delete=models.CASCADE, related_name='labour_hours')
+    outlet = models.ForeignKey(Outlet, on_delete=models.CASCADE, related_name='labour_hours')
+    day = models.DateField()
+    seconds = models.PositiveIntegerField(default=0)
+    shifts = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'staff_labourhours'
+        verbose_name = 'Labour Hours'
+        verbose_name_plural = 'Labour Hours'
+        ordering = ['day', 'staff']
+        constraints = [
+            models.UniqueConstraint(fields=['staff', 'outlet', 'day'], name='staff_labourhours_staff_outlet_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'day']),
+            models.Index(fields=['outlet', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.staff_id} @ {self.outlet_id} {self.day}: {self.seconds}s"
+
+    @property
+    def hours(self):
+        return round(self.seconds / 3600, 2)
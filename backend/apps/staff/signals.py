@@ -0,0 +1,56 @@
+"""
+Django signals keeping the LabourHours rollup in step with Attendance and
+cached principals in step with staff profiles and roles
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.tenants.authentication import forget_principal
+from primepos.cache import invalidate
+from primepos.celery import enqueue_on_commit
+from .labour import shift_days
+from .models import Attendance, Role, Staff
+from .tasks import refresh_labour_hours
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_stored_shift(sender, instance, raw=False, **kwargs):
+    """Keep the stored shift so an edit also re-rolls the days it moves away from"""
+    instance._stored_shift = None
+    if not raw and instance.pk is not None:
+        instance._stored_shift = Attendance.objects.filter(pk=instance.pk).values(
+            'staff_id', 'check_in', 'check_out'
+        ).first()
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def refresh_labour_hours_for_shift(sender, instance, raw=False, **kwargs):
+    """Re-roll the days a closed shift touches, before and after an edit; open shifts are not counted yet"""
+    if raw:
+        return
+    ranges = set()
+    if instance.check_out:
+        ranges.add((instance.staff_id, *shift_days(instance)))
+    stored = getattr(instance, '_stored_shift', None)
+    if stored and stored['check_out']:
+        ranges.add((stored['staff_id'], *shift_days(Attendance(**stored))))
+
+    for staff_id, start_day, end_day in ranges:
+        enqueue_on_commit(
+            refresh_labour_hours, start_day.isoformat(), end_day.isoformat(), staff_ids=[staff_id]
+        )
+
+
+@receiver(post_save, sender=Staff)
+@receiver(post_delete, sender=Staff)
+def invalidate_staff_principal(sender, instance, **kwargs):
+    """The cached user carries its staff profile and role"""
+    forget_principal(instance.user_id)
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_principals(sender, instance, **kwargs):
+    """Permission bits are cached with every user of the tenant"""
+    invalidate('principals', instance.tenant_id)
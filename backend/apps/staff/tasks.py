@@ -0,0 +1,18 @@
+"""
+Staff tasks
+Labour hour rollups run on the analytics queue. A refresh recomputes its
+days from Attendance, so running it twice leaves the same rows.
+"""
+from datetime import date
+
+from celery import shared_task
+
+from . import labour
+
+
+@shared_task(name='staff.refresh_labour_hours')
+def refresh_labour_hours(start_day, end_day, staff_ids=None, tenant_id=None):
+    """Recompute LabourHours for an ISO date range"""
+    return labour.refresh_labour_hours(
+        date.fromisoformat(start_day), date.fromisoformat(end_day), staff_ids=staff_ids, tenant_id=tenant_id
+    )
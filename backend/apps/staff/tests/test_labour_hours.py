@@ -0,0 +1,158 @@
+"""
+Labour hours rollup tests
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.staff.models import Attendance, LabourHours, Staff
+from apps.staff.views import AttendanceViewSet
+from apps.tenants.models import Tenant
+
+
+def at(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=minute))
+
+
+class LabourHoursTests(TestCase):
+    """Test SQL labour aggregation and its rollup refresh"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Labour Tenant")
+        self.user = User.objects.create_user(username="boss", email="boss@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Main")
+        self.branch = Outlet.objects.create(tenant=self.tenant, name="Branch")
+        self.staff = self._staff("ann")
+        self.monday = date(2026, 10, 12)
+        self.factory = APIRequestFactory()
+
+    def _staff(self, username):
+        user = User.objects.create_user(username=username, email=f"{username}@example.com", password="pass", tenant=self.tenant)
+        staff, _ = Staff.objects.update_or_create(user=user, defaults={'tenant': self.tenant})
+        return staff
+
+    def _shift(self, start, end, staff=None, outlet=None):
+        # The rollup is refreshed by a task sent on commit (eager in tests)
+        with self.captureOnCommitCallbacks(execute=True):
+            return Attendance.objects.create(
+                staff=staff or self.staff, outlet=outlet or self.outlet, check_in=start, check_out=end
+            )
+
+    def _hours(self, **params):
+        request = self.factory.get('/api/v1/attendance/hours/', params)
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+        return AttendanceViewSet.as_view({'get': 'hours'})(request)
+
+    def test_check_out_refreshes_rollup(self):
+        """Checking out writes the shift's day into the rollup"""
+        shift = Attendance.objects.create(staff=self.staff, outlet=self.outlet, check_in=at(self.monday, 9))
+        self.assertFalse(LabourHours.objects.exists())
+
+        shift.check_out = at(self.monday, 17, 30)
+        with self.captureOnCommitCallbacks(execute=True):
+            shift.save()
+
+        row = LabourHours.objects.get(staff=self.staff, outlet=self.outlet, day=self.monday)
+        self.assertEqual(row.seconds, 8.5 * 3600)
+        self.assertEqual(row.shifts, 1)
+        self.assertEqual(row.tenant, self.tenant)
+
+    def test_overlapping_shifts_count_once(self):
+        """A second check-in during an open shift only adds the time past the first check-out"""
+        self._shift(at(self.monday, 9), at(self.monday, 13))
+        self._shift(at(self.monday, 12), at(self.monday, 15))
+        self._shift(at(self.monday, 10), at(self.monday, 11))
+
+        row = LabourHours.objects.get(staff=self.staff, day=self.monday)
+        self.assertEqual(row.seconds, 6 * 3600)
+        self.assertEqual(row.shifts, 3)
+
+    def test_overlap_across_outlets_and_midnight(self):
+        """Overlap is per staff member; a night shift is booked on the day it started"""
+        self._shift(at(self.monday, 20), at(self.monday, 26))
+        self._shift(at(self.monday + timedelta(days=1), 1), at(self.monday + timedelta(days=1), 4), outlet=self.branch)
+
+        self.assertEqual(LabourHours.objects.get(outlet=self.outlet, day=self.monday).seconds, 6 * 3600)
+        self.assertEqual(
+            LabourHours.objects.get(outlet=self.branch, day=self.monday + timedelta(days=1)).seconds, 2 * 3600
+        )
+
+    def test_deleting_shift_updates_rollup(self):
+        shift = self._shift(at(self.monday, 9), at(self.monday, 12))
+        self.assertTrue(LabourHours.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            shift.delete()
+        self.assertFalse(LabourHours.objects.exists())
+
+    def test_moving_shift_to_another_day_clears_old_day(self):
+        """An edit re-rolls both the days the shift leaves and the days it moves to"""
+        shift = self._shift(at(self.monday, 9), at(self.monday, 12))
+        tuesday = self.monday + timedelta(days=1)
+
+        shift.check_in, shift.check_out = at(tuesday, 9), at(tuesday, 11)
+        with self.captureOnCommitCallbacks(execute=True):
+            shift.save()
+
+        self.assertFalse(LabourHours.objects.filter(day=self.monday).exists())
+        self.assertEqual(LabourHours.objects.get(day=tuesday).seconds, 2 * 3600)
+
+        # Reopening the shift removes it from the rollup
+        shift.check_out = None
+        with self.captureOnCommitCallbacks(execute=True):
+            shift.save()
+        self.assertFalse(LabourHours.objects.exists())
+
+    def test_hours_endpoint_groups_by_week(self):
+        """Weekly totals per staff member come from one grouped query over the rollup"""
+        other = self._staff("bob")
+        for offset in range(5):
+            day = self.monday + timedelta(days=offset)
+            self._shift(at(day, 9), at(day, 17))
+            self._shift(at(day, 10), at(day, 14), staff=other)
+
+        # Tenant lookup for the user, then the single aggregate
+        with self.assertNumQueries(2):
+            response = self._hours(start_date='2026-10-12', end_date='2026-10-18', group_by='week')
+
+        self.assertEqual(response.status_code, 200)
+        hours = {row['staff']: row['hours'] for row in response.data['results']}
+        self.assertEqual(hours, {self.staff.id: 40.0, other.id: 20.0})
+        self.assertEqual(response.data['results'][0]['period'], self.monday)
+        self.assertEqual(response.data['total_hours'], 60.0)
+
+    def test_hours_endpoint_is_tenant_scoped(self):
+        other_tenant = Tenant.objects.create(name="Other")
+        outsider_user = User.objects.create_user(username="x", email="x@example.com", password="pass", tenant=other_tenant)
+        outsider, _ = Staff.objects.update_or_create(user=outsider_user, defaults={'tenant': other_tenant})
+        other_outlet = Outlet.objects.create(tenant=other_tenant, name="Elsewhere")
+        self._shift(at(self.monday, 9), at(self.monday, 10), staff=outsider, outlet=other_outlet)
+
+        response = self._hours(start_date='2026-10-12', end_date='2026-10-12', group_by='total')
+
+        self.assertEqual(response.data['results'], [])
+
+    def test_hours_endpoint_rejects_bad_params(self):
+        self.assertEqual(self._hours(group_by='month').status_code, 400)
+        self.assertEqual(self._hours(start_date='2026-10-20', end_date='2026-10-01').status_code, 400)
+        self.assertEqual(self._hours(start_date='2026-02-30', end_date='2026-03-01').status_code, 400)
+
+    def test_rebuild_command(self):
+        """The rebuild command restores the rollup after out-of-band attendance writes"""
+        Attendance.objects.bulk_create([
+            Attendance(staff=self.staff, outlet=self.outlet, check_in=at(self.monday, 8), check_out=at(self.monday, 12)),
+        ])
+        self.assertFalse(LabourHours.objects.exists())
+
+        call_command('rebuild_labour_hours', since='2026-10-12', until='2026-10-12', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(LabourHours.objects.get(day=self.monday).seconds, 4 * 3600)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_labour_hours', since='2026-02-30', stdout=open('/dev/null', 'w'))
@@ -0,0 +1,50 @@
+"""
+Role permission bitmap tests
+"""
+
+from django.test import TestCase
+
+from apps.accounts.models import User, PERMISSION_BITS
+from apps.staff.models import Role, Staff
+from apps.tenants.models import Tenant
+
+
+class RolePermissionBitsTests(TestCase):
+    """Test precomputed Role.permission_bits and User permission checks"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Bits Tenant")
+        self.role = Role.objects.create(tenant=self.tenant, name="Till", can_sales=True, can_dashboard=True)
+        self.user = User.objects.create_user(username="till", email="till@example.com", password="pass", tenant=self.tenant)
+        Staff.objects.update_or_create(user=self.user, defaults={'tenant': self.tenant, 'role': self.role})
+
+    def _load_user(self):
+        return User.objects.select_related('tenant', 'staff_profile__role').get(pk=self.user.pk)
+
+    def test_bits_follow_role_flags(self):
+        """Saving a role recomputes its bitmap"""
+        self.assertEqual(self.role.permission_bits, PERMISSION_BITS['can_sales'] | PERMISSION_BITS['can_dashboard'])
+
+        self.role.can_reports = True
+        self.role.save(update_fields=['can_reports'])
+        self.role.refresh_from_db()
+        self.assertTrue(self.role.permission_bits & PERMISSION_BITS['can_reports'])
+
+    def test_permission_checks_without_queries(self):
+        """Checks on a user loaded with its role do not hit the database"""
+        user = self._load_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_permission('can_sales'))
+            self.assertFalse(user.has_permission('can_settings'))
+            self.assertFalse(user.has_permission('can_unknown'))
+            permissions = user.get_permissions()
+        self.assertTrue(permissions['can_sales'])
+        self.assertFalse(permissions['can_inventory'])
+
+    def test_legacy_role_fallback(self):
+        """Users without a staff role fall back to User.role"""
+        manager = User.objects.create_user(username="mgr", email="mgr@example.com", password="pass", role='manager')
+        self.assertTrue(manager.has_permission('can_reports'))
+        self.assertFalse(manager.has_permission('can_settings'))
+        admin = User.objects.create_user(username="adm", email="adm@example.com", password="pass", role='admin')
+        self.assertTrue(all(admin.get_permissions().values()))
@@ -5,7 +5,10 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
-from .models import Role, Staff, Attendance
+from django.utils.dateparse import parse_date
+from datetime import timedelta
+from .models import Role, Staff, Attendance, LabourHours
+from .labour import PERIODS, labour_summary
 from .serializers import RoleSerializer, StaffSerializer, AttendanceSerializer
 from apps.tenants.permissions import TenantFilterMixin
 
@@ -178,8 +181,8 @@ class StaffViewSet(viewsets.ModelViewSet, TenantFilterMixin):
             
             # Create notification for new staff (Square POS-like)
             try:
-                from apps.notifications.services import NotificationService
-                NotificationService.notify_staff_added(staff)
+                from apps.notifications.tasks import notify_on_commit
+                notify_on_commit('staff_added', staff)
             except Exception as e:
                 logger.error(f"Failed to create staff notification: {str(e)}")
             
@@ -309,4 +312,58 @@ class AttendanceViewSet(viewsets.ModelViewSet, TenantFilterMixin):
         
         serializer = self.get_serializer(attendance)
         return Response(serializer.data)
-
+    
+    @action(detail=False, methods=['get'])
+    def hours(self, request):
+        """
+        Worked hours per staff member and outlet, from the LabourHours rollup
+        
+        Query params:
+            start_date, end_date: YYYY-MM-DD, inclusive (default: last 7 days)
+            group_by: day (default), week or total
+            outlet, staff: optional filters
+        
+        Overlapping shifts are counted once and open shifts are not counted.
+        """
+        tenant = self.get_tenant_for_request(request)
+        if not tenant:
+            return Response({"detail": "User must have a tenant"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        group_by = request.query_params.get('group_by', 'day')
+        if group_by not in PERIODS:
+            return Response(
+                {"detail": f"group_by must be one of: {', '.join(PERIODS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        today = timezone.localdate()
+        start_param = request.query_params.get('start_date')
+        end_param = request.query_params.get('end_date')
+        try:
+            start_date = parse_date(start_param) if start_param else today - timedelta(days=6)
+            end_date = parse_date(end_param) if end_param else today
+        except ValueError:
+            # Well-formed but impossible dates such as 2026-02-30
+            start_date = end_date = None
+        if not start_date or not end_date or start_date > end_date:
+            return Response(
+                {"detail": "start_date and end_date must be YYYY-MM-DD with start_date <= end_date"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = LabourHours.objects.filter(tenant=tenant, day__gte=start_date, day__lte=end_date)
+        outlet_id = request.query_params.get('outlet')
+        if outlet_id:
+            queryset = queryset.filter(outlet_id=outlet_id)
+        staff_id = request.query_params.get('staff')
+        if staff_id:
+            queryset = queryset.filter(staff_id=staff_id)
+        
+        rows = labour_summary(queryset, group_by)
+        return Response({
+            'start_date': start_date,
+            'end_date': end_date,
+            'group_by': group_by,
+            'total_hours': round(sum(row['seconds'] for row in rows) / 3600, 2),
+            'results': rows,
+        })
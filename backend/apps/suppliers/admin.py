@@ -1,6 +1,6 @@
 from django.contrib import admin
 from .models import (
-    Supplier, PurchaseOrder,
+    Supplier, PurchaseOrder, PurchaseOrderItem,
     SupplierInvoice, PurchaseReturn,
     ProductSupplier
 )
@@ -14,6 +14,13 @@ class SupplierAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
 
 
+class PurchaseOrderItemInline(admin.TabularInline):
+    model = PurchaseOrderItem
+    extra = 0
+    raw_id_fields = ('product',)
+    readonly_fields = ('received_quantity',)
+
+
 @admin.register(PurchaseOrder)
 class PurchaseOrderAdmin(admin.ModelAdmin):
     list_display = ('po_number', 'supplier', 'outlet', 'order_date', 'status', 'total', 'created_at')
@@ -21,6 +28,7 @@ class PurchaseOrderAdmin(admin.ModelAdmin):
     search_fields = ('po_number', 'supplier__name', 'notes')
     readonly_fields = ('po_number', 'created_at', 'updated_at', 'approved_at', 'received_at')
     date_hierarchy = 'order_date'
+    inlines = [PurchaseOrderItemInline]
 
 
 @admin.register(SupplierInvoice)
@@ -0,0 +1,146 @@
+"""
+Receivables aging
+Re-ages supplier invoices and customer credit sales with set-based UPDATEs so
+list pages and finance dashboards can filter on the stored status instead of
+computing it row by row. Work is done per tenant in primary-key chunks; each
+chunk is one short UPDATE in its own transaction.
+
+Rules match SupplierInvoice.update_status() and Sale.update_payment_status():
+unpaid documents past their due date become overdue, and overdue documents
+whose due date was pushed back return to pending/unpaid. Partially paid
+documents keep their status.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, CharField, Q, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _chunk_bounds(queryset, chunk_size):
+    """Yield (after_pk, upto_pk) ranges covering queryset; upto_pk None means open-ended"""
+    last = 0
+    while True:
+        bound = list(
+            queryset.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True)[chunk_size - 1:chunk_size]
+        )
+        if not bound:
+            yield last, None
+            return
+        yield last, bound[0]
+        last = bound[0]
+
+
+def _age(name, queryset, candidates, status_field, new_status, tenant_ids, chunk_size, now):
+    """Apply new_status to candidate rows of each tenant, chunked by pk"""
+    started = time.monotonic()
+    candidates_qs = queryset.filter(candidates)
+    if tenant_ids is None:
+        tenant_ids = candidates_qs.order_by().values_list('tenant_id', flat=True).distinct()
+
+    stats = {'updated': 0, 'tenants': 0, 'chunks': 0, 'slowest_tenant': None, 'slowest_seconds': 0.0}
+    for tenant_id in list(tenant_ids):
+        tenant_started = time.monotonic()
+        tenant_qs = candidates_qs.filter(tenant_id=tenant_id)
+        updated = 0
+        for after, upto in _chunk_bounds(tenant_qs, chunk_size):
+            chunk = tenant_qs.filter(pk__gt=after)
+            if upto is not None:
+                chunk = chunk.filter(pk__lte=upto)
+            with transaction.atomic():
+                updated += chunk.update(**{status_field: new_status, 'updated_at': now})
+            stats['chunks'] += 1
+
+        elapsed = time.monotonic() - tenant_started
+        stats['tenants'] += 1
+        stats['updated'] += updated
+        if elapsed > stats['slowest_seconds']:
+            stats['slowest_tenant'] = tenant_id
+            stats['slowest_seconds'] = round(elapsed, 4)
+        logger.debug(f"Aged {updated} {name} for tenant {tenant_id} in {elapsed:.3f}s")
+
+    stats['seconds'] = round(time.monotonic() - started, 4)
+    logger.info(
+        f"Aged {name}: {stats['updated']} updated across {stats['tenants']} tenant(s) "
+        f"in {stats['chunks']} chunk(s), {stats['seconds']}s"
+    )
+    return stats
+
+
+def age_supplier_invoices(tenant_ids=None, chunk_size=None, now=None):
+    """
+    Mark unpaid supplier invoices past due as overdue and undo stale overdue flags.
+
+    Args:
+        tenant_ids: Restrict to these tenants (default: tenants with rows to change)
+        chunk_size: Rows per UPDATE (default AGING_CHUNK_SIZE)
+        now: Reference time (default timezone.now())
+
+    Returns:
+        Dict of timing and row counts
+    """
+    from apps.suppliers.models import SupplierInvoice
+
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    candidates = Q(status='pending', due_date__lt=today) | Q(status='overdue', due_date__gte=today)
+    new_status = Case(
+        When(due_date__lt=today, then=Value('overdue')),
+        default=Value('pending'),
+        output_field=CharField(),
+    )
+    return _age(
+        'supplier invoices', SupplierInvoice.objects.all(), candidates, 'status', new_status,
+        tenant_ids, chunk_size or getattr(settings, 'AGING_CHUNK_SIZE', 1000), now,
+    )
+
+
+def age_credit_sales(tenant_ids=None, chunk_size=None, now=None):
+    """
+    Mark unpaid credit sales past due as overdue and undo stale overdue flags.
+
+    Args:
+        tenant_ids: Restrict to these tenants (default: tenants with rows to change)
+        chunk_size: Rows per UPDATE (default AGING_CHUNK_SIZE)
+        now: Reference time (default timezone.now())
+
+    Returns:
+        Dict of timing and row counts
+    """
+    from apps.sales.models import Sale
+
+    now = now or timezone.now()
+    candidates = (
+        Q(payment_status='unpaid', due_date__lt=now)
+        | Q(payment_status='overdue') & (Q(due_date__gte=now) | Q(due_date__isnull=True))
+    )
+    new_status = Case(
+        When(due_date__lt=now, then=Value('overdue')),
+        default=Value('unpaid'),
+        output_field=CharField(),
+    )
+    return _age(
+        'credit sales', Sale.objects.filter(payment_method='credit'), candidates, 'payment_status', new_status,
+        tenant_ids, chunk_size or getattr(settings, 'AGING_CHUNK_SIZE', 1000), now,
+    )
+
+
+def age_receivables(tenant_ids=None, chunk_size=None):
+    """
+    Re-age supplier invoices and credit sales.
+
+    Returns:
+        Dict with per-document stats and total seconds
+    """
+    started = time.monotonic()
+    now = timezone.now()
+    result = {
+        'supplier_invoices': age_supplier_invoices(tenant_ids, chunk_size, now),
+        'credit_sales': age_credit_sales(tenant_ids, chunk_size, now),
+    }
+    result['seconds'] = round(time.monotonic() - started, 4)
+    return result
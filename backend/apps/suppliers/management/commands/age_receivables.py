@@ -0,0 +1,50 @@
+"""
+Management command to re-age supplier invoices and customer credit sales
+Run from cron, or with --every to keep running as a lightweight scheduler
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.suppliers.aging import age_receivables
+
+
+class Command(BaseCommand):
+    help = 'Mark past-due supplier invoices and credit sales overdue (set-based, chunked per tenant)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tenant',
+            type=int,
+            action='append',
+            help='Age only this tenant ID (repeatable)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Rows per UPDATE (default: AGING_CHUNK_SIZE setting)',
+        )
+        parser.add_argument(
+            '--every',
+            type=int,
+            metavar='SECONDS',
+            help='Keep running, re-aging every SECONDS',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = age_receivables(options.get('tenant'), options.get('chunk_size'))
+            for name in ('supplier_invoices', 'credit_sales'):
+                stats = result[name]
+                self.stdout.write(
+                    f"{name}: {stats['updated']} updated, {stats['tenants']} tenant(s), "
+                    f"{stats['chunks']} chunk(s), {stats['seconds']}s "
+                    f"(slowest tenant {stats['slowest_tenant']}: {stats['slowest_seconds']}s)"
+                )
+            self.stdout.write(self.style.SUCCESS(f"Aging completed in {result['seconds']}s"))
+
+            if not options.get('every'):
+                return
+            close_old_connections()
+            time.sleep(options['every'])
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:05
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0016_alter_itemvariation_unique_together_and_more'),
+        ('suppliers', '0009_remove_autopurchaseordersettings_tenant_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurchaseOrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('received_quantity', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchase_order_items', to='products.product')),
+                ('purchase_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='suppliers.purchaseorder')),
+            ],
+            options={
+                'verbose_name': 'Purchase Order Item',
+                'verbose_name_plural': 'Purchase Order Items',
+                'db_table': 'suppliers_purchaseorderitem',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['purchase_order'], name='suppliers_p_purchas_f035df_idx'), models.Index(fields=['product'], name='suppliers_p_product_60b559_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suppliers', '0010_purchaseorderitem'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supplierinvoice',
+            index=models.Index(fields=['tenant', 'status', 'due_date'], name='suppliers_s_tenant__85a86f_idx'),
+        ),
+    ]
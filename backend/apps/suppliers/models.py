@@ -112,6 +112,37 @@ class PurchaseOrder(models.Model):
                 )
 
 
+class PurchaseOrderItem(models.Model):
+    """Purchase Order line item"""
+    purchase_order = models.ForeignKey(PurchaseOrder, on_delete=models.CASCADE, related_name='items')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='purchase_order_items')
+    quantity = models.IntegerField(validators=[MinValueValidator(1)])
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(Decimal('0'))])
+    total = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0'), validators=[MinValueValidator(Decimal('0'))])
+    received_quantity = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'suppliers_purchaseorderitem'
+        verbose_name = 'Purchase Order Item'
+        verbose_name_plural = 'Purchase Order Items'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['purchase_order']),
+            models.Index(fields=['product']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name} x {self.quantity} ({self.purchase_order.po_number})"
+
+    @property
+    def outstanding_quantity(self):
+        """Quantity still to be delivered"""
+        return max(self.quantity - self.received_quantity, 0)
+
+
 class SupplierInvoice(models.Model):
     """Supplier Invoice model"""
     STATUS_CHOICES = [
@@ -160,6 +191,8 @@ class SupplierInvoice(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['invoice_number']),
             models.Index(fields=['due_date']),
+            # Payables aging: invoices by status and due date per tenant
+            models.Index(fields=['tenant', 'status', 'due_date']),
         ]
 
     def __str__(self):
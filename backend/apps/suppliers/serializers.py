@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import (
-    Supplier, PurchaseOrder, SupplierInvoice,
+    Supplier, PurchaseOrder, PurchaseOrderItem, SupplierInvoice,
     PurchaseReturn, ProductSupplier
 )
 from apps.outlets.serializers import OutletSerializer
@@ -70,6 +70,38 @@ class SupplierSerializer(serializers.ModelSerializer):
         return instance
 
 
+class PurchaseOrderItemSerializer(serializers.ModelSerializer):
+    """Purchase Order line serializer"""
+    product = serializers.SerializerMethodField()
+    product_id = serializers.IntegerField(read_only=True)
+    outstanding_quantity = serializers.ReadOnlyField()
+
+    class Meta:
+        model = PurchaseOrderItem
+        fields = (
+            'id', 'product', 'product_id', 'quantity', 'unit_price', 'total',
+            'received_quantity', 'outstanding_quantity', 'notes'
+        )
+        read_only_fields = fields
+
+    def get_product(self, obj):
+        return {'id': obj.product_id, 'name': obj.product.name, 'sku': obj.product.sku}
+
+
+class ReceiveLineSerializer(serializers.Serializer):
+    """One delivered line of a purchase order receipt"""
+    item_id = serializers.IntegerField()
+    received_quantity = serializers.IntegerField(min_value=0)
+    unit_cost = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    batch_number = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    expiry_date = serializers.DateField(required=False)
+
+
+class ReceivePurchaseOrderSerializer(serializers.Serializer):
+    """Receive request; omit items to receive every outstanding line in full"""
+    items = ReceiveLineSerializer(many=True, required=False)
+
+
 class PurchaseOrderSerializer(serializers.ModelSerializer):
     """Purchase Order serializer"""
     supplier = SupplierSerializer(read_only=True)
@@ -77,6 +109,7 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
     outlet = OutletSerializer(read_only=True)
     outlet_id = serializers.IntegerField(write_only=True)
     created_by = serializers.StringRelatedField(read_only=True)
+    items = PurchaseOrderItemSerializer(many=True, read_only=True)
     items_data = serializers.ListField(
         child=serializers.DictField(),
         write_only=True,
@@ -91,7 +124,7 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
             'po_number', 'order_date', 'expected_delivery_date', 'status',
             'subtotal', 'tax', 'discount', 'total', 'notes', 'terms',
             'created_by', 'created_at', 'updated_at',
-            'approved_at', 'received_at', 'items_data'
+            'approved_at', 'received_at', 'items', 'items_data'
         )
         read_only_fields = ('id', 'tenant', 'po_number', 'created_by', 'created_at', 'updated_at', 'approved_at', 'received_at')
     
@@ -132,40 +165,28 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
         if items_data:
             from apps.products.models import Product
             from decimal import Decimal
-            from django.apps import apps
-            
-            # Try to get PurchaseOrderItem model
-            try:
-                PurchaseOrderItem = apps.get_model('suppliers', 'PurchaseOrderItem')
-            except LookupError:
-                # If model doesn't exist, skip item creation
-                PurchaseOrderItem = None
-            
-            if PurchaseOrderItem:
-                for item_data in items_data:
-                    product_id = item_data.get('product_id')
-                    quantity = item_data.get('quantity', 1)
-                    unit_price = Decimal(str(item_data.get('unit_price', '0')))
-                    notes = item_data.get('notes', '')
-                    
-                    if product_id:
-                        try:
-                            product = Product.objects.get(id=product_id)
-                            total = unit_price * Decimal(str(quantity))
-                            
-                            # Create PurchaseOrderItem
-                            PurchaseOrderItem.objects.create(
-                                purchase_order=purchase_order,
-                                product=product,
-                                quantity=quantity,
-                                unit_price=unit_price,
-                                total=total,
-                                notes=notes,
-                                received_quantity=0
-                            )
-                        except Product.DoesNotExist:
-                            # Skip if product doesn't exist
-                            pass
+
+            products = Product.objects.filter(tenant=tenant).in_bulk(
+                [int(item_data['product_id']) for item_data in items_data if item_data.get('product_id')]
+            )
+            items = []
+            for item_data in items_data:
+                product_id = item_data.get('product_id')
+                product = products.get(int(product_id)) if product_id else None
+                if product is None:
+                    # Skip if product doesn't exist
+                    continue
+                quantity = int(item_data.get('quantity', 1))
+                unit_price = Decimal(str(item_data.get('unit_price', '0')))
+                items.append(PurchaseOrderItem(
+                    purchase_order=purchase_order,
+                    product=product,
+                    quantity=quantity,
+                    unit_price=unit_price,
+                    total=unit_price * quantity,
+                    notes=item_data.get('notes', ''),
+                ))
+            PurchaseOrderItem.objects.bulk_create(items)
         
         return purchase_order
 
@@ -0,0 +1,145 @@
+"""
+Purchase order services - receiving deliveries into stock
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from apps.inventory.stock_helpers import add_stock_bulk
+from apps.products.models import Product
+
+from .models import PurchaseOrder, PurchaseOrderItem
+
+logger = logging.getLogger(__name__)
+
+RECEIVABLE_STATUSES = ('approved', 'ordered', 'partial')
+
+
+class PurchaseOrderService:
+    """Service for receiving purchase orders"""
+
+    @staticmethod
+    def receive(po, lines=None, user=None):
+        """
+        Receive a delivery against a purchase order.
+
+        Every delivered line is posted to its batch (add_stock semantics) with
+        a fixed number of queries regardless of line count: batches and stock
+        movements are written in bulk, line received quantities are
+        incremented in one UPDATE, and product costs are set from the line
+        cost and product stock incremented by the received quantity. The order becomes 'partial' until every line is fully received.
+
+        Args:
+            po: PurchaseOrder instance
+            lines: List of dicts with item_id, received_quantity and optional
+                unit_cost, batch_number and expiry_date. None receives every
+                outstanding line in full.
+            user: User receiving the delivery
+
+        Returns:
+            Updated PurchaseOrder instance
+
+        Raises:
+            ValueError: If the order cannot be received or a line is invalid
+        """
+        now = timezone.now()
+
+        with transaction.atomic():
+            po = PurchaseOrder.objects.select_for_update().select_related('outlet').get(pk=po.pk)
+            if po.status not in RECEIVABLE_STATUSES:
+                raise ValueError(f"Cannot receive PO with status '{po.status}'")
+
+            items = {
+                item.pk: item
+                for item in PurchaseOrderItem.objects.filter(purchase_order=po).select_related('product')
+            }
+            if lines is None:
+                lines = [
+                    {'item_id': item.pk, 'received_quantity': item.outstanding_quantity}
+                    for item in items.values()
+                ]
+
+            received = {}
+            for line in lines:
+                item = items.get(line['item_id'])
+                if item is None:
+                    raise ValueError(f"Item {line['item_id']} is not on PO {po.po_number}")
+                received[item.pk] = received.get(item.pk, 0) + line['received_quantity']
+                if received[item.pk] > item.outstanding_quantity:
+                    raise ValueError(
+                        f"Cannot receive {received[item.pk]} of {item.product.name}; "
+                        f"{item.outstanding_quantity} outstanding"
+                    )
+
+            delivered = [line for line in lines if line['received_quantity'] > 0]
+            if items and not delivered:
+                raise ValueError("No quantities to receive")
+
+            default_expiry = timezone.localdate() + timedelta(
+                days=getattr(settings, 'PO_RECEIPT_DEFAULT_SHELF_LIFE_DAYS', 365)
+            )
+            stock_lines = []
+            costs = {}
+            quantities = {}
+            for line in delivered:
+                item = items[line['item_id']]
+                cost = line.get('unit_cost')
+                if cost is None:
+                    cost = item.unit_price
+                stock_lines.append({
+                    'product': item.product,
+                    'quantity': line['received_quantity'],
+                    'batch_number': line.get('batch_number') or po.po_number,
+                    'expiry_date': line.get('expiry_date') or default_expiry,
+                    'cost_price': cost,
+                })
+                costs[item.product_id] = (item.product, cost)
+                quantities[item.product_id] = quantities.get(item.product_id, 0) + line['received_quantity']
+
+            add_stock_bulk(
+                po.outlet,
+                stock_lines,
+                user=user,
+                reference_id=po.po_number,
+                reason=f"Received on {po.po_number}",
+            )
+
+            products = []
+            for product, cost in costs.values():
+                product.cost = cost
+                product.updated_at = now
+                products.append(product)
+            Product.objects.bulk_update(products, ['cost', 'updated_at'], batch_size=500)
+            if quantities:
+                Product.objects.filter(pk__in=quantities).update(
+                    stock=F('stock') + Case(
+                        *[When(pk=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    ),
+                )
+
+            if received:
+                PurchaseOrderItem.objects.filter(pk__in=received).update(
+                    received_quantity=F('received_quantity') + Case(
+                        *[When(pk=item_id, then=Value(quantity)) for item_id, quantity in received.items()],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    ),
+                    updated_at=now,
+                )
+
+            outstanding = PurchaseOrderItem.objects.filter(
+                purchase_order=po, received_quantity__lt=F('quantity')
+            ).exists()
+            po.status = 'partial' if outstanding else 'received'
+            if not outstanding:
+                po.received_at = now
+            po.save(update_fields=['status', 'received_at', 'updated_at'])
+
+        logger.info(f"Received {len(stock_lines)} line(s) on {po.po_number}, status now {po.status}")
+        return po
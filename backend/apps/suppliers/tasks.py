@@ -0,0 +1,14 @@
+"""
+Supplier tasks
+Scheduled receivables aging on the maintenance queue (see aging.py; the
+UPDATEs only touch rows whose status changes, so reruns are no-ops).
+"""
+from celery import shared_task
+
+from . import aging
+
+
+@shared_task(name='suppliers.age_receivables')
+def age_receivables(tenant_ids=None):
+    """Re-age supplier invoices and credit sales"""
+    return aging.age_receivables(tenant_ids)
@@ -0,0 +1,106 @@
+"""
+Receivables aging job tests
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.outlets.models import Outlet
+from apps.sales.models import Sale
+from apps.suppliers.aging import age_credit_sales, age_supplier_invoices
+from apps.suppliers.models import Supplier, SupplierInvoice
+from apps.tenants.models import Tenant
+
+
+class ReceivablesAgingTests(TestCase):
+    """Test set-based re-aging of invoices and credit sales"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Aging Tenant")
+        self.other_tenant = Tenant.objects.create(name="Other Tenant")
+        self.user = User.objects.create_user(username="clerk", email="clerk@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Store")
+        self.other_outlet = Outlet.objects.create(tenant=self.other_tenant, name="Other")
+        self.today = timezone.localdate()
+        self.count = 0
+
+    def _invoice(self, due_date, status='pending', outlet=None):
+        outlet = outlet or self.outlet
+        self.count += 1
+        supplier = Supplier.objects.create(tenant=outlet.tenant, name=f"Supplier {self.count}")
+        return SupplierInvoice.objects.create(
+            tenant=outlet.tenant, supplier=supplier, outlet=outlet, invoice_number=f"INV-{self.count}",
+            invoice_date=date(2026, 1, 1), due_date=due_date, status=status,
+            subtotal=Decimal("100.00"), total=Decimal("100.00"),
+        )
+
+    def _credit_sale(self, due_date, payment_status='unpaid'):
+        self.count += 1
+        return Sale.objects.create(
+            tenant=self.tenant, outlet=self.outlet, user=self.user, receipt_number=f"CR-{self.count}",
+            subtotal=Decimal("50.00"), total=Decimal("50.00"), payment_method='credit',
+            due_date=due_date, payment_status=payment_status,
+        )
+
+    def test_invoices_are_aged(self):
+        """Past-due pending invoices become overdue; extended ones return to pending"""
+        past_due = self._invoice(self.today - timedelta(days=1))
+        not_due = self._invoice(self.today)
+        extended = self._invoice(self.today + timedelta(days=5), status='overdue')
+        partial = self._invoice(self.today - timedelta(days=1), status='partial')
+        other = self._invoice(self.today - timedelta(days=3), outlet=self.other_outlet)
+
+        stats = age_supplier_invoices(chunk_size=1)
+
+        statuses = dict(SupplierInvoice.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[past_due.id], 'overdue')
+        self.assertEqual(statuses[not_due.id], 'pending')
+        self.assertEqual(statuses[extended.id], 'pending')
+        self.assertEqual(statuses[partial.id], 'partial')
+        self.assertEqual(statuses[other.id], 'overdue')
+        self.assertEqual(stats['updated'], 3)
+        self.assertEqual(stats['tenants'], 2)
+
+    def test_tenant_filter(self):
+        """Only the requested tenants are touched"""
+        mine = self._invoice(self.today - timedelta(days=1))
+        other = self._invoice(self.today - timedelta(days=1), outlet=self.other_outlet)
+
+        age_supplier_invoices(tenant_ids=[self.tenant.id])
+
+        self.assertEqual(SupplierInvoice.objects.get(id=mine.id).status, 'overdue')
+        self.assertEqual(SupplierInvoice.objects.get(id=other.id).status, 'pending')
+
+    def test_credit_sales_are_aged(self):
+        """Unpaid credit sales past due become overdue"""
+        now = timezone.now()
+        late = self._credit_sale(now - timedelta(hours=1))
+        upcoming = self._credit_sale(now + timedelta(days=1))
+        cleared = self._credit_sale(None, payment_status='overdue')
+        paying = self._credit_sale(now - timedelta(days=2), payment_status='partially_paid')
+
+        stats = age_credit_sales(now=now)
+
+        statuses = dict(Sale.objects.values_list('id', 'payment_status'))
+        self.assertEqual(statuses[late.id], 'overdue')
+        self.assertEqual(statuses[upcoming.id], 'unpaid')
+        self.assertEqual(statuses[cleared.id], 'unpaid')
+        self.assertEqual(statuses[paying.id], 'partially_paid')
+        self.assertEqual(stats['updated'], 2)
+
+    def test_command_reports_timings(self):
+        """The command runs both jobs once and prints their metrics"""
+        invoice = self._invoice(self.today - timedelta(days=10))
+        out = StringIO()
+
+        call_command('age_receivables', stdout=out)
+
+        self.assertEqual(SupplierInvoice.objects.get(id=invoice.id).status, 'overdue')
+        self.assertIn('supplier_invoices: 1 updated', out.getvalue())
+        self.assertIn('credit_sales: 0 updated', out.getvalue())
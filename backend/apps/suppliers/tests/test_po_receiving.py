@@ -0,0 +1,134 @@
+"""
+Purchase order receiving tests
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.inventory.models import Batch, LocationStock, StockMovement
+from apps.outlets.models import Outlet
+from apps.products.models import Product
+from apps.suppliers.models import PurchaseOrder, PurchaseOrderItem, Supplier
+from apps.suppliers.services import PurchaseOrderService
+from apps.suppliers.views import PurchaseOrderViewSet
+from apps.tenants.models import Tenant
+
+
+class PurchaseOrderReceivingTests(TestCase):
+    """Test that receiving a PO posts stock in bulk"""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Receiving Tenant")
+        self.user = User.objects.create_user(username="receiver", email="receiver@example.com", password="pass", tenant=self.tenant)
+        self.outlet = Outlet.objects.create(tenant=self.tenant, name="Store")
+        self.supplier = Supplier.objects.create(tenant=self.tenant, name="Wholesaler")
+        self.po = PurchaseOrder.objects.create(
+            tenant=self.tenant, supplier=self.supplier, outlet=self.outlet,
+            po_number="PO-REC-0001", order_date=date(2026, 1, 1), status='ordered',
+        )
+
+    def _lines(self, count, quantity=10, unit_price=Decimal("2.50")):
+        products = Product.objects.bulk_create([
+            Product(tenant=self.tenant, outlet=self.outlet, name=f"Item {i}", retail_price=Decimal("5.00"))
+            for i in range(count)
+        ])
+        return PurchaseOrderItem.objects.bulk_create([
+            PurchaseOrderItem(
+                purchase_order=self.po, product=product, quantity=quantity,
+                unit_price=unit_price, total=unit_price * quantity,
+            )
+            for product in products
+        ])
+
+    def test_full_receipt_posts_every_line(self):
+        """Receiving without lines takes every outstanding quantity into stock"""
+        items = self._lines(3)
+
+        po = PurchaseOrderService.receive(self.po, user=self.user)
+
+        self.assertEqual(po.status, 'received')
+        self.assertIsNotNone(po.received_at)
+        for item in items:
+            item.refresh_from_db()
+            self.assertEqual(item.received_quantity, 10)
+            batch = Batch.objects.get(product=item.product, outlet=self.outlet, batch_number="PO-REC-0001")
+            self.assertEqual(batch.quantity, 10)
+            self.assertEqual(batch.cost_price, Decimal("2.50"))
+            self.assertEqual(LocationStock.objects.get(product=item.product, outlet=self.outlet).quantity, 10)
+            item.product.refresh_from_db()
+            self.assertEqual(item.product.cost, Decimal("2.50"))
+            self.assertEqual(item.product.stock, 10)
+        self.assertEqual(
+            StockMovement.objects.filter(movement_type='purchase', reference_id="PO-REC-0001").count(), 3
+        )
+
+    def test_partial_receipts_accumulate(self):
+        """Partial deliveries add to the same batch and leave the PO partial"""
+        item, = self._lines(1)
+
+        po = PurchaseOrderService.receive(
+            self.po, [{'item_id': item.pk, 'received_quantity': 4, 'unit_cost': Decimal("2.00")}], self.user
+        )
+        self.assertEqual(po.status, 'partial')
+        self.assertIsNone(po.received_at)
+
+        po = PurchaseOrderService.receive(po, [{'item_id': item.pk, 'received_quantity': 6}], self.user)
+        self.assertEqual(po.status, 'received')
+        item.refresh_from_db()
+        self.assertEqual(item.received_quantity, 10)
+        self.assertEqual(Batch.objects.get(product=item.product).quantity, 10)
+        item.product.refresh_from_db()
+        self.assertEqual(item.product.stock, 10)
+
+        with self.assertRaises(ValueError):
+            PurchaseOrderService.receive(po, [{'item_id': item.pk, 'received_quantity': 1}], self.user)
+
+    def test_over_receipt_is_rejected(self):
+        """Receiving more than is outstanding changes nothing"""
+        item, = self._lines(1, quantity=5)
+
+        with self.assertRaises(ValueError):
+            PurchaseOrderService.receive(self.po, [{'item_id': item.pk, 'received_quantity': 6}], self.user)
+
+        item.refresh_from_db()
+        self.assertEqual(item.received_quantity, 0)
+        self.assertFalse(Batch.objects.exists())
+
+    def test_query_count_does_not_grow_with_lines(self):
+        """A large delivery costs the same number of queries as a small one"""
+        self._lines(300)
+
+        with CaptureQueriesContext(connection) as queries:
+            PurchaseOrderService.receive(self.po, user=self.user)
+
+        # Bulk statements only; SQLite may split them into a few batches
+        self.assertLess(len(queries), 30)
+
+        self.assertEqual(Batch.objects.filter(outlet=self.outlet).count(), 300)
+        self.assertEqual(StockMovement.objects.filter(outlet=self.outlet).count(), 300)
+
+    def test_receive_endpoint(self):
+        """The receive action validates lines and returns the updated PO"""
+        item, = self._lines(1)
+        factory = APIRequestFactory()
+        request = factory.post(
+            f'/api/v1/purchase-orders/{self.po.pk}/receive/?outlet={self.outlet.pk}',
+            {'items': [{'item_id': item.pk, 'received_quantity': 3, 'batch_number': 'LOT-7', 'expiry_date': '2027-06-30'}]},
+            format='json',
+        )
+        force_authenticate(request, user=self.user)
+        request.tenant = self.tenant
+
+        response = PurchaseOrderViewSet.as_view({'post': 'receive'})(request, pk=self.po.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'partial')
+        self.assertEqual(response.data['items'][0]['received_quantity'], 3)
+        batch = Batch.objects.get(batch_number='LOT-7')
+        self.assertEqual(batch.expiry_date, date(2027, 6, 30))
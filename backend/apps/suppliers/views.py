@@ -13,8 +13,9 @@ from .models import (
 from .serializers import (
     SupplierSerializer, PurchaseOrderSerializer,
     SupplierInvoiceSerializer, PurchaseReturnSerializer,
-    ProductSupplierSerializer
+    ProductSupplierSerializer, ReceivePurchaseOrderSerializer
 )
+from .services import PurchaseOrderService
 from apps.tenants.permissions import TenantFilterMixin, is_admin_user
 import logging
 
@@ -116,7 +117,7 @@ class SupplierViewSet(viewsets.ModelViewSet, TenantFilterMixin):
 
 class PurchaseOrderViewSet(viewsets.ModelViewSet, TenantFilterMixin):
     """Purchase Order ViewSet - outlet-specific"""
-    queryset = PurchaseOrder.objects.select_related('tenant', 'supplier', 'outlet', 'created_by')
+    queryset = PurchaseOrder.objects.select_related('tenant', 'supplier', 'outlet', 'created_by').prefetch_related('items__product')
     serializer_class = PurchaseOrderSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -197,19 +198,26 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet, TenantFilterMixin):
     
     @action(detail=True, methods=['post'])
     def receive(self, request, pk=None):
-        """Mark purchase order as received"""
+        """
+        Receive a delivery and post it to stock.
+        Body: {"items": [{"item_id", "received_quantity", "unit_cost"?,
+        "batch_number"?, "expiry_date"?}]}; omit items to receive the
+        full outstanding quantity of every line.
+        """
         po = self.get_object()
-        if po.status not in ['approved', 'ordered', 'partial']:
-            return Response(
-                {"detail": f"Cannot receive PO with status '{po.status}'"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        receive_serializer = ReceivePurchaseOrderSerializer(data=request.data)
+        receive_serializer.is_valid(raise_exception=True)
         
-        po.status = 'received'
-        po.received_at = timezone.now()
-        po.save()
+        try:
+            po = PurchaseOrderService.receive(
+                po,
+                lines=receive_serializer.validated_data.get('items'),
+                user=request.user,
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = self.get_serializer(po)
+        serializer = self.get_serializer(self.get_queryset().get(pk=po.pk))
         return Response(serializer.data)
 
 
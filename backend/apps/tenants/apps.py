@@ -5,3 +5,7 @@ class TenantsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.tenants'
 
+    def ready(self):
+        """Import signals when app is ready"""
+        import apps.tenants.signals  # noqa
+
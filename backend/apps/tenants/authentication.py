@@ -1,26 +1,83 @@
 """
 Custom JWT Authentication that ensures tenant is loaded
 """
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
 from django.contrib.auth import get_user_model
 
+from primepos.cache import cached
+
 User = get_user_model()
 
 
+def _principal_ttl():
+    return getattr(settings, 'PRINCIPAL_CACHE_TTL', 300)
+
+
+@cached('user_tenants', ttl=_principal_ttl)
+def _user_tenant_id(_tenant_id, user_id):
+    """Tenant of a user (unscoped lookup, so _tenant_id is always None)"""
+    return User.objects.filter(pk=user_id).values_list('tenant_id', flat=True).first()
+
+
+@cached('principals', ttl=_principal_ttl)
+def _principal(tenant_id, user_id):
+    return User.objects.select_related('tenant', 'staff_profile__role').filter(pk=user_id).first()
+
+
+def load_principal(user_id):
+    """
+    User with tenant, staff profile and role, read through the cache.
+
+    Entries live in the user's tenant namespace, so editing the tenant or
+    one of its roles drops them all (see apps.tenants.signals).
+
+    Returns:
+        User instance, or None if the user does not exist
+    """
+    user = _principal(_user_tenant_id(None, user_id), user_id)
+    if user is not None:
+        user._tenant_loaded = True
+    return user
+
+
+def forget_principal(user_id):
+    """Drop one cached user (e.g. after its staff profile changed)"""
+    _principal.forget(_user_tenant_id(None, user_id), user_id)
+
+
 class TenantJWTAuthentication(JWTAuthentication):
     """
     Custom JWT authentication that ensures user.tenant is loaded
     This ensures TenantFilterMixin can access request.user.tenant
+
+    The staff profile and role are loaded in the same query so permission
+    checks read Role.permission_bits without further queries, and the whole
+    principal is cached, so an authenticated request usually costs none.
     """
-    
+
     def get_user(self, validated_token):
         """
-        Override to ensure tenant relationship is loaded
+        Load the user with tenant and role relationships through the principal cache
         """
-        user = super().get_user(validated_token)
-        # Reload user with tenant relationship if not already loaded
-        if user and not hasattr(user, '_tenant_loaded'):
-            user = User.objects.select_related('tenant').get(pk=user.pk)
-            user._tenant_loaded = True
-        return user
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = load_principal(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
 
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
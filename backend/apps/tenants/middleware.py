@@ -2,6 +2,7 @@ from django.utils.deprecation import MiddlewareMixin
 from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model
+from .authentication import load_principal
 from .models import Tenant
 
 User = get_user_model()
@@ -17,6 +18,7 @@ class TenantMiddleware(MiddlewareMixin):
     """
     def process_request(self, request):
         request.tenant = None
+        request.principal_id = None
         
         # Skip for admin and static files
         if request.path.startswith('/admin/') or request.path.startswith('/static/'):
@@ -35,8 +37,14 @@ class TenantMiddleware(MiddlewareMixin):
             user_id = untyped_token.get('user_id')
             
             if user_id:
-                # Load user with tenant relationship
-                user = User.objects.select_related('tenant').get(id=user_id)
+                # Load user with tenant relationship (cached, shared with TenantJWTAuthentication)
+                user = load_principal(user_id)
+                if user is None:
+                    # User not found - let DRF authentication handle it
+                    return None
+                
+                # Token owner, for middleware that runs before DRF authentication
+                request.principal_id = user.pk
                 
                 # SaaS admins don't have tenant restrictions
                 if user.is_saas_admin:
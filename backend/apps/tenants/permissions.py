@@ -29,6 +29,27 @@ class IsTenantAdmin(permissions.BasePermission):
         return user.has_permission('can_settings') or user.effective_role == 'admin'
 
 
+class HasRolePermission(permissions.BasePermission):
+    """
+    Permission check against the user's role permission bitmap.
+    
+    Set `required_permission` (e.g. 'can_reports') on the view, or a
+    `required_permissions` dict mapping action names to permissions.
+    Bits come from Role.permission_bits loaded with the user, so the
+    check does not touch the database.
+    """
+    
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        required = getattr(view, 'required_permissions', {}).get(getattr(view, 'action', None))
+        required = required or getattr(view, 'required_permission', None)
+        if not required:
+            return True
+        return user.has_permission(required)
+
+
 def is_tenant_admin(user):
     """Helper function to check if user is a tenant admin"""
     if not user or not user.is_authenticated:
@@ -97,7 +118,7 @@ class TenantFilterMixin:
             from django.contrib.auth import get_user_model
             User = get_user_model()
             try:
-                user = User.objects.select_related('tenant').get(pk=user.pk)
+                user = User.objects.select_related('tenant', 'staff_profile__role').get(pk=user.pk)
                 request.user = user
                 user._tenant_loaded = True
             except User.DoesNotExist:
@@ -155,6 +176,10 @@ class TenantFilterMixin:
         Checks query params, headers, and request data.
         SaaS admins can access outlets from any tenant.
         
+        Lookups are memoized on the request (viewsets call this several times per
+        request) and served from the shared outlet cache, so validating the
+        X-Outlet-ID header normally costs no queries.
+        
         Returns:
             Outlet instance or None
         """
@@ -172,18 +197,30 @@ class TenantFilterMixin:
         if not outlet_id:
             return None
         
-        try:
-            from apps.outlets.models import Outlet
-            # SaaS admins can access outlets from any tenant
-            if request.user.is_saas_admin:
-                return Outlet.objects.get(id=outlet_id)
-            else:
-                tenant = self.get_tenant_for_request(request)
-                if not tenant:
-                    return None
-                return Outlet.objects.get(id=outlet_id, tenant=tenant)
-        except (Outlet.DoesNotExist, ValueError, TypeError):
-            return None
+        # Memoize on the underlying HttpRequest so it is shared by every
+        # viewset/helper handling this request
+        http_request = getattr(request, '_request', request)
+        memo = getattr(http_request, '_outlet_memo', None)
+        if memo is None:
+            memo = {}
+            http_request._outlet_memo = memo
+        
+        is_saas_admin = request.user.is_saas_admin
+        memo_key = (is_saas_admin, str(outlet_id))
+        if memo_key in memo:
+            return memo[memo_key]
+        
+        from apps.outlets.cache import resolve_outlet
+        # SaaS admins can access outlets from any tenant
+        if is_saas_admin:
+            outlet = resolve_outlet(outlet_id)
+        else:
+            # Prefer the tenant resolved by middleware to avoid reloading the user
+            tenant = getattr(request, 'tenant', None) or self.get_tenant_for_request(request)
+            outlet = resolve_outlet(outlet_id, tenant_id=tenant.id) if tenant else None
+        
+        memo[memo_key] = outlet
+        return outlet
     
     def validate_tenant_id(self, request, tenant_id_from_data):
         """
@@ -0,0 +1,29 @@
+"""
+Django signals for principal cache invalidation
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from primepos.cache import invalidate
+from .authentication import _principal, _user_tenant_id
+from .models import Tenant
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_tenant_principals(sender, instance, **kwargs):
+    """Cached users carry their tenant, so drop the tenant's whole namespace"""
+    invalidate('principals', instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_principal(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached user and its tenant mapping; logins only touch last_login"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    _user_tenant_id.forget(None, instance.pk)
+    _principal.forget(instance.tenant_id, instance.pk)
@@ -0,0 +1,92 @@
+"""
+Shared cache and cached principal tests
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import User
+from apps.staff.models import Role, Staff
+from apps.tenants.authentication import TenantJWTAuthentication
+from apps.tenants.models import Tenant
+from primepos.cache import get_or_set, invalidate, make_key
+
+
+class SharedCacheTests(TestCase):
+    """Test tenant-namespaced, versioned keys"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_drops_one_tenant_namespace(self):
+        loads = []
+
+        def lookup(tenant_id):
+            return get_or_set('things', tenant_id, ('list',), lambda: loads.append(tenant_id) or [tenant_id])
+
+        lookup(1), lookup(1), lookup(2)
+        self.assertEqual(loads, [1, 2])
+
+        invalidate('things', 1)
+        lookup(1), lookup(2)
+        self.assertEqual(loads, [1, 2, 1])
+
+    def test_missing_rows_are_cached(self):
+        loads = []
+        for _ in range(2):
+            self.assertIsNone(get_or_set('things', None, ('missing',), lambda: loads.append(1)))
+        self.assertEqual(loads, [1])
+
+    def test_keys_are_tenant_scoped(self):
+        self.assertNotEqual(make_key('things', 1, 'x'), make_key('things', 2, 'x'))
+        self.assertNotEqual(make_key('things', None, 'x'), make_key('things', 1, 'x'))
+
+
+class PrincipalCacheTests(TestCase):
+    """Test that authentication reads the user, tenant and role from the cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Auth Tenant")
+        self.user = User.objects.create_user(username="ann", email="ann@example.com", password="pass", tenant=self.tenant)
+        self.role = Role.objects.create(tenant=self.tenant, name="Till", can_sales=True)
+        Staff.objects.update_or_create(user=self.user, defaults={'tenant': self.tenant, 'role': self.role})
+        self.token = AccessToken.for_user(self.user)
+        self.auth = TenantJWTAuthentication()
+
+    def test_repeat_authentication_costs_no_queries(self):
+        self.auth.get_user(self.token)
+
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(self.token)
+            self.assertEqual(user.tenant, self.tenant)
+            self.assertTrue(user.has_permission('can_sales'))
+
+    def test_role_and_tenant_edits_are_seen(self):
+        self.auth.get_user(self.token)
+
+        self.role.can_reports = True
+        self.role.save()
+        self.assertTrue(self.auth.get_user(self.token).has_permission('can_reports'))
+
+        self.tenant.currency = 'USD'
+        self.tenant.save()
+        self.assertEqual(self.auth.get_user(self.token).tenant.currency, 'USD')
+
+    def test_deactivated_user_is_rejected(self):
+        self.auth.get_user(self.token)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_login_does_not_invalidate(self):
+        self.auth.get_user(self.token)
+        self.user.save(update_fields=['last_login'])
+
+        with self.assertNumQueries(0):
+            self.auth.get_user(self.token)
@@ -65,10 +65,12 @@ def api_root(request):
                 'customers': '/api/v1/reports/customers/',
                 'profit_loss': '/api/v1/reports/profit-loss/',
                 'stock_movement': '/api/v1/reports/stock-movement/',
+                'exports': '/api/v1/reports/exports/',
             },
             'admin': {
                 'tenants': '/api/v1/admin/tenants/',
                 'analytics': '/api/v1/admin/analytics/',
+                'tenant_analytics': '/api/v1/admin/analytics/tenants/{tenant_id}/',
             },
         },
         'documentation': 'Visit /admin/ for Django admin interface',
@@ -13,6 +13,8 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from channels.security.websocket import AllowedHostsOriginValidator
 import apps.notifications.routing
+import apps.outlets.routing
+import apps.restaurant.routing
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'primepos.settings.base')
 
@@ -26,6 +28,8 @@ application = ProtocolTypeRouter({
         AuthMiddlewareStack(
             URLRouter(
                 apps.notifications.routing.websocket_urlpatterns
+                + apps.outlets.routing.websocket_urlpatterns
+                + apps.restaurant.routing.websocket_urlpatterns
             )
         )
     ),
@@ -0,0 +1,132 @@
+"""
+Shared cache layer
+Read-through caching of ORM lookups on the Django cache (Redis when
+CACHE_REDIS_URL is set, per-process memory otherwise).
+
+Keys are namespaced per tenant and versioned: every key embeds the current
+version of its (namespace, tenant) pair, so invalidate() drops everything a
+tenant has cached in a namespace in O(1) by bumping that version; orphaned
+entries simply expire. forget() drops a single entry.
+
+Invalidation is wired to post_save/post_delete in each app's signals.py.
+Both helpers act immediately and once more after commit, so a reader that
+re-caches the old row while the writer's transaction is still open does not
+keep it until the TTL runs out.
+"""
+import functools
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connection, transaction
+
+# Owner of keys that are not scoped to a tenant (SaaS admin lookups)
+GLOBAL = 'all'
+
+# Stored for lookups that found nothing, so misses are cached too
+_NONE = '__none__'
+_MISSING = object()
+
+
+def _owner(tenant_id):
+    return GLOBAL if tenant_id is None else tenant_id
+
+
+def _version_key(namespace, tenant_id):
+    return f'ns:{namespace}:{_owner(tenant_id)}'
+
+
+def _initial_version():
+    # Time based so a version key that was evicted restarts above any
+    # version still embedded in live entries
+    return int(time.time() * 1000)
+
+
+def namespace_version(namespace, tenant_id):
+    """Current version of a tenant's namespace"""
+    key = _version_key(namespace, tenant_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def make_key(namespace, tenant_id, *parts):
+    """Cache key for parts within the current version of a tenant's namespace"""
+    version = namespace_version(namespace, tenant_id)
+    return ':'.join([namespace, str(_owner(tenant_id)), f'v{version}', *(str(part) for part in parts)])
+
+
+def _after_commit_too(func):
+    """Run func now and, inside a transaction, again once it commits"""
+    func()
+    if connection.in_atomic_block:
+        transaction.on_commit(func)
+
+
+def invalidate(namespace, tenant_id):
+    """Drop every entry a tenant has in a namespace"""
+    def bump():
+        key = _version_key(namespace, tenant_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), None)
+
+    _after_commit_too(bump)
+
+
+def get_or_set(namespace, tenant_id, parts, loader, ttl=None):
+    """
+    Return the cached value for parts, calling loader() on a miss.
+
+    Args:
+        namespace: Cache namespace (e.g. 'outlets')
+        tenant_id: Tenant owning the entry, or None for unscoped lookups
+        parts: Key parts identifying the entry within the namespace
+        loader: Callable returning the value; None results are cached as misses
+        ttl: Seconds to keep the entry (default: the cache's TIMEOUT)
+    """
+    key = make_key(namespace, tenant_id, *parts)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = loader()
+        cache.set(key, _NONE if value is None else value, DEFAULT_TIMEOUT if ttl is None else ttl)
+        return value
+    if isinstance(value, str) and value == _NONE:
+        return None
+    return value
+
+
+def cached(namespace, ttl=None):
+    """
+    Read-through cache decorator for lookups keyed by tenant.
+
+    The decorated function takes the tenant id (or None) first; it and the
+    remaining positional arguments form the key. ttl may be a number of
+    seconds or a callable returning one (to read a setting at call time).
+    The wrapper gains forget(tenant_id, *args) to drop one entry.
+
+        @cached('outlets')
+        def load_outlet(tenant_id, outlet_id):
+            ...
+    """
+    def decorator(func):
+        def ttl_seconds():
+            return ttl() if callable(ttl) else ttl
+
+        @functools.wraps(func)
+        def wrapper(tenant_id, *args):
+            return get_or_set(
+                namespace, tenant_id, (func.__name__, *args), lambda: func(tenant_id, *args), ttl_seconds()
+            )
+
+        def forget(tenant_id, *args):
+            _after_commit_too(lambda: cache.delete(make_key(namespace, tenant_id, func.__name__, *args)))
+
+        wrapper.forget = forget
+        wrapper.namespace = namespace
+        return wrapper
+
+    return decorator
@@ -0,0 +1,54 @@
+"""
+Celery application for PrimePOS
+
+Side effects that do not have to finish before a response is returned
+(receipts, notifications and their WebSocket fan-out, analytics rollups,
+scheduled sweeps) run as tasks. Task modules live next to their domain
+(apps/<app>/tasks.py) and are found by autodiscovery; settings come from
+CELERY_* in Django settings.
+
+Tasks are dispatched with enqueue_on_commit so a worker never sees rows
+from a transaction that has not committed (or that rolled back). Every task
+is idempotent: it re-reads its rows by id and skips work already done, so a
+redelivery after a worker crash (acks are late) is harmless.
+
+Brokers: redis:// in production, memory:// for a single-process setup, or
+filesystem:// (see CELERY_BROKER_DIR) to run a worker locally without Redis.
+With CELERY_TASK_ALWAYS_EAGER (the default under `manage.py test`) tasks run
+inline when dispatched.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'primepos.settings.development')
+
+app = Celery('primepos')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+@app.on_after_configure.connect
+def _create_filesystem_broker_folders(sender, **kwargs):
+    """The filesystem transport expects its folders to exist"""
+    options = sender.conf.broker_transport_options or {}
+    for key in ('data_folder_in', 'data_folder_out', 'processed_folder', 'control_folder'):
+        if options.get(key):
+            os.makedirs(options[key], exist_ok=True)
+
+
+def enqueue_on_commit(task, *args, **kwargs):
+    """
+    Send a task once the current transaction commits.
+
+    Outside a transaction the task is sent immediately. Nothing is sent if
+    the transaction rolls back. A broker outage is logged rather than
+    failing a request whose data is already committed.
+    """
+    from django.db import transaction
+
+    def send():
+        task.apply_async(args=args, kwargs=kwargs)
+
+    send.__qualname__ = f"send({task.name})"
+    transaction.on_commit(send, robust=True)
@@ -0,0 +1,92 @@
+"""
+Concurrent read queries
+Dashboards and reports issue several independent aggregates. gather() runs
+them at the same time, each on its own database connection, so an endpoint
+takes as long as its slowest query instead of the sum of all of them.
+
+Extra queries run on one small process-wide thread pool
+(ANALYTICS_QUERY_WORKERS threads, default 4). Because the pool is bounded,
+slow analytical reads cannot take more than that many extra connections per
+process, and request threads and connections stay free for checkout.
+
+Other connections cannot see rows that an open transaction has not
+committed yet. So inside an atomic block (ATOMIC_REQUESTS, tests, a
+caller's transaction.atomic) the calls run one after another on the
+caller's connection.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone, translation
+
+from primepos.db_routing import analytics_db, reads_from
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _workers():
+    return getattr(settings, 'ANALYTICS_QUERY_WORKERS', 4)
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix='analytics')
+    return _executor
+
+
+def _run_in_worker(func, tz, language, alias):
+    _worker.active = True
+    try:
+        with timezone.override(tz), translation.override(language), reads_from(alias):
+            return func()
+    finally:
+        _worker.active = False
+        # Pool threads never see request_finished; apply CONN_MAX_AGE here
+        close_old_connections()
+
+
+def _run_inline():
+    return (
+        connection.in_atomic_block
+        or getattr(_worker, 'active', False)  # nested gather() must not wait on its own pool
+        or _workers() < 1
+    )
+
+
+def gather(**calls):
+    """
+    Run independent callables concurrently and return their results by name.
+
+        results = gather(
+            totals=lambda: sales.aggregate(revenue=Sum('total')),
+            top=lambda: list(items.values('product_name')[:10]),
+        )
+
+    Querysets are lazy, so each callable must evaluate its own (list(),
+    aggregate(), count(), ...). The first call runs on the calling thread and
+    the rest run on the pool. Timezone, translation and replica routing
+    (primepos.db_routing) carry over.
+    An exception raised by any call is re-raised here.
+    """
+    if len(calls) < 2 or _run_inline():
+        return {name: func() for name, func in calls.items()}
+
+    (first_name, first), *rest = calls.items()
+    # Request-scoped settings are thread-local; hand them to the workers
+    tz, language, alias = timezone.get_current_timezone(), translation.get_language(), analytics_db()
+    pool = _pool()
+    futures = {name: pool.submit(_run_in_worker, func, tz, language, alias) for name, func in rest}
+    try:
+        results = {first_name: first()}
+    finally:
+        # Always wait for submitted queries so none outlive the request
+        for future in futures.values():
+            future.exception()
+    results.update((name, future.result()) for name, future in futures.items())
+    return results
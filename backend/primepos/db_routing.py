@@ -0,0 +1,171 @@
+"""
+Read-replica routing
+Reports and analytics can read from a replica (the REPLICA_DATABASE_ALIAS
+database, default 'replica', configured with REPLICA_DATABASE_URL) so their
+scans do not compete with checkout writes on the primary. Everything else,
+and every write, stays on the primary.
+
+Only code running under replica_reads (a view decorator) or
+read_from_replica() (a context manager) reads from the replica.
+ReadReplicaRouter applies this to implicit queries. Code that passes
+querysets to other threads or tasks can call analytics_db() and use
+.using() explicitly.
+
+Reads go back to the primary when:
+- no replica is configured, or it refused a connection within the last
+  REPLICA_RETRY_SECONDS;
+- the request itself writes (POST, PUT, PATCH, DELETE);
+- the same user made a write within the last REPLICA_STICKY_SECONDS
+  (read-your-writes, tracked by ReadYourWritesMiddleware), so replication
+  lag never hides a change from the user who made it.
+"""
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_state = threading.local()
+# Monotonic time until which the replica is considered down (per process)
+_replica_down_until = 0.0
+
+
+def replica_alias():
+    """Alias of the configured replica, or None"""
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica')
+    return alias if alias in connections.settings else None
+
+
+def _replica_available(alias):
+    """Connect to the replica, remembering a failure for REPLICA_RETRY_SECONDS"""
+    global _replica_down_until
+    if time.monotonic() < _replica_down_until:
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except OperationalError as e:
+        _replica_down_until = time.monotonic() + getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+        logger.warning(f"Replica {alias} unavailable, reading from the primary: {e}")
+        return False
+    return True
+
+
+def analytics_db():
+    """Alias analytical reads should use right now"""
+    return getattr(_state, 'alias', None) or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def reads_from(alias):
+    """Route implicit reads in this thread to alias (None: the primary)"""
+    previous = getattr(_state, 'alias', None)
+    _state.alias = alias
+    try:
+        yield
+    finally:
+        _state.alias = previous
+
+
+@contextmanager
+def read_from_replica(use_primary=False):
+    """
+    Route implicit reads to the replica if one is configured and reachable.
+
+    Args:
+        use_primary: Read from the primary anyway (e.g. for read-your-writes)
+    """
+    alias = replica_alias()
+    if use_primary or alias is None or not _replica_available(alias):
+        alias = None
+    with reads_from(alias):
+        yield
+
+
+def _pin_key(user_id):
+    return f'db:pin_primary:{user_id}'
+
+
+def _user_id(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    # Set by TenantMiddleware from the JWT before DRF authenticates the request
+    return getattr(request, 'principal_id', None)
+
+
+def replica_reads(view):
+    """
+    Serve a read-only view from the replica.
+
+    Works on function views and viewset methods; placed below @api_view or
+    @action. Requests that write, or come from a user who wrote within
+    REPLICA_STICKY_SECONDS, read from the primary.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        request = next((arg for arg in args if hasattr(arg, 'method')), None)
+        http_request = getattr(request, '_request', request)
+        use_primary = request is None or getattr(http_request, 'use_primary', request.method not in SAFE_METHODS)
+        with read_from_replica(use_primary=use_primary):
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a user's reads to the primary for REPLICA_STICKY_SECONDS after a write.
+
+    Sets request.use_primary for replica_reads. Does nothing when no replica
+    is configured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if replica_alias() is None:
+            return self.get_response(request)
+
+        writes = request.method not in SAFE_METHODS
+        user_id = _user_id(request)
+        request.use_primary = writes or (user_id is not None and bool(cache.get(_pin_key(user_id))))
+
+        response = self.get_response(request)
+
+        # DRF authenticates inside the view, so look the user up again
+        user_id = _user_id(request)
+        if writes and user_id is not None:
+            cache.set(_pin_key(user_id), True, getattr(settings, 'REPLICA_STICKY_SECONDS', 10))
+        return response
+
+
+class ReadReplicaRouter:
+    """Send reads under read_from_replica() to the replica; everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        return getattr(_state, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica rows are copies of primary rows
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica follows the primary through replication
+        if db == replica_alias():
+            return False
+        return None
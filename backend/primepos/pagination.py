@@ -0,0 +1,129 @@
+"""
+Pagination classes for high-volume list endpoints
+
+KeysetOptInPagination behaves exactly like the default PageNumberPagination
+unless the client opts in with ``?pagination=cursor`` (or sends a ``cursor``
+returned by a previous page). In cursor mode the list is ordered by
+(<keyset_field> DESC, id DESC) and each page is fetched with a
+``WHERE (ts, id) < (cursor_ts, cursor_id)`` seek, so there is no COUNT(*)
+and no OFFSET scan: deep pages cost the same as the first one.
+"""
+import base64
+from collections import OrderedDict
+from datetime import datetime
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination on (<keyset_field>, id), newest first.
+
+    Views may set `keyset_field` (default 'created_at') when the list is
+    ordered by another timestamp, e.g. Receipt.generated_at.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 20
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_keyset_field(self, view):
+        return getattr(view, 'keyset_field', 'created_at')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, timestamp, pk):
+        raw = f"{timestamp.isoformat()}|{pk}".encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            timestamp, pk = raw.rsplit('|', 1)
+            return datetime.fromisoformat(timestamp), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.field = self.get_keyset_field(view)
+        self.page_size_value = self.get_page_size(request)
+
+        queryset = queryset.order_by(f'-{self.field}', '-id')
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            timestamp, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__lt': timestamp}) | Q(**{self.field: timestamp, 'id__lt': pk})
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        page = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(page) > self.page_size_value
+        page = page[:self.page_size_value]
+        self.next_cursor = None
+        if self.has_next and page:
+            last = page[-1]
+            self.next_cursor = self.encode_cursor(getattr(last, self.field), last.pk)
+        return page
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, 'pagination', 'cursor')
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('next_cursor', self.next_cursor),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class KeysetOptInPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode.
+
+    ``?pagination=cursor`` or ``?cursor=<token>`` switches the request to
+    KeysetPagination; otherwise responses are unchanged (count/next/previous).
+    """
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get('pagination') == 'cursor'
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self._keyset = None
+        if self.use_keyset(request):
+            self._keyset = self.keyset_class()
+            return self._keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self._keyset is not None:
+            return self._keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
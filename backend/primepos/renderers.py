@@ -0,0 +1,22 @@
+"""
+Renderers for compact machine-to-machine payloads
+
+MessagePackRenderer lets a client ask for msgpack instead of JSON with
+``Accept: application/msgpack`` or ``?format=msgpack``. Payloads are expected
+to be plain data already (strings, numbers, lists, dicts); views that offer it
+encode decimals and datetimes themselves.
+"""
+import msgpack
+from rest_framework.renderers import BaseRenderer
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, use_bin_type=True)
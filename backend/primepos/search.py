@@ -0,0 +1,56 @@
+"""
+Ranked search for list endpoints
+
+RankedSearchFilter replaces DRF's SearchFilter (an ILIKE '%term%' over every
+search field) with a view-supplied search function. On PostgreSQL those
+functions filter through pg_trgm / tsvector GIN indexes and rank by
+relevance; on other databases (SQLite in tests) they fall back to plain
+lookups with the same ranking rules.
+
+Results come back ordered by relevance unless the client asks for an
+explicit ?ordering=, so list this backend after OrderingFilter.
+"""
+import re
+
+from django.db import connections
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+MAX_TERM_LENGTH = 100
+
+
+def is_postgres(queryset):
+    """Whether a queryset runs on PostgreSQL (trigram and full-text search available)"""
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def prefix_tsquery(term):
+    """Raw tsquery matching every word of term as a prefix ('coca co' -> 'coca:* & co:*')"""
+    words = re.findall(r'\w+', term)
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+class RankedSearchFilter(SearchFilter):
+    """
+    ?search= handled by the view's search_function(queryset, term).
+
+    The function returns the matching rows annotated with search_rank.
+    """
+
+    def get_search_term(self, request):
+        term = request.query_params.get(self.search_param, '')
+        return term.replace('\x00', '').strip()[:MAX_TERM_LENGTH]
+
+    def filter_queryset(self, request, queryset, view):
+        search_function = getattr(view, 'search_function', None)
+        if search_function is None:
+            return super().filter_queryset(request, queryset, view)
+
+        term = self.get_search_term(request)
+        if not term:
+            return queryset
+
+        results = search_function(queryset, term)
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return results
+        return results.order_by('-search_rank', *queryset.query.order_by or ('pk',))
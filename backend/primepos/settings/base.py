@@ -4,6 +4,7 @@ Django settings for primepos project - Base Configuration
 from pathlib import Path
 from decouple import config
 import os
+import sys
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -66,6 +67,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.tenants.middleware.TenantMiddleware',
+    'primepos.db_routing.ReadYourWritesMiddleware',
     'apps.activity_logs.middleware.ActivityLogMiddleware',
 ]
 
@@ -112,6 +114,18 @@ else:
         }
 }
 
+# Optional read replica for reports and analytics (see primepos.db_routing).
+# Tests mirror it onto the default database.
+if config('REPLICA_DATABASE_URL', default=None):
+    DATABASES['replica'] = dj_database_url.config(
+        default=config('REPLICA_DATABASE_URL'),
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['primepos.db_routing.ReadReplicaRouter']
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -215,6 +229,89 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache Configuration (see primepos/cache.py)
+# Redis when CACHE_REDIS_URL is set; per-process memory otherwise (tests, local dev)
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+        'KEY_PREFIX': 'primepos',
+        'TIMEOUT': 300,
+    } if CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'primepos',
+        'KEY_PREFIX': 'primepos',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Celery Configuration (see primepos/celery.py)
+# CELERY_BROKER_URL may be redis://..., memory:// or filesystem:// (local
+# worker without Redis; messages are files under CELERY_BROKER_DIR)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://127.0.0.1:6379/1')
+if CELERY_BROKER_URL.startswith('filesystem://'):
+    CELERY_BROKER_DIR = Path(config('CELERY_BROKER_DIR', default=str(BASE_DIR / '.celery-broker')))
+    CELERY_BROKER_TRANSPORT_OPTIONS = {
+        'data_folder_in': str(CELERY_BROKER_DIR / 'queue'),
+        'data_folder_out': str(CELERY_BROKER_DIR / 'queue'),
+        'processed_folder': str(CELERY_BROKER_DIR / 'processed'),
+        'control_folder': str(CELERY_BROKER_DIR / 'control'),
+        'store_processed': False,
+    }
+
+# Run tasks inline (tests, or development without a worker)
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=TESTING, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = CELERY_TASK_ALWAYS_EAGER
+
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = TIME_ZONE
+
+# Tasks are idempotent, so acknowledge after they finish and redeliver if a worker dies
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# One queue per kind of work so slow rollups never hold up receipts
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'sales.*': {'queue': 'receipts'},
+    'notifications.*': {'queue': 'notifications'},
+    'staff.*': {'queue': 'analytics'},
+    'platform_admin.*': {'queue': 'analytics'},
+    'reports.*': {'queue': 'analytics'},
+    'inventory.*': {'queue': 'maintenance'},
+    'suppliers.*': {'queue': 'maintenance'},
+    'activity_logs.*': {'queue': 'maintenance'},
+}
+
+from celery.schedules import crontab
+
+CELERY_BEAT_SCHEDULE = {
+    'sweep-expired-batches': {
+        'task': 'inventory.sweep_expired_batches',
+        'schedule': crontab(hour=0, minute=15),
+    },
+    'age-receivables': {
+        'task': 'suppliers.age_receivables',
+        'schedule': crontab(minute=5),
+    },
+    'refresh-platform-metrics': {
+        'task': 'platform_admin.refresh_platform_metrics',
+        'schedule': crontab(minute='*/15'),
+    },
+    'archive-activity-logs': {
+        'task': 'activity_logs.archive_activity_logs',
+        'schedule': crontab(day_of_month=1, hour=2, minute=30),
+    },
+}
+
 # QZ Tray signing configuration
 # Set these in environment for production. Example:
 # QZ_CERT_PATH=/etc/primepos/qz_cert.pem